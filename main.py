@@ -7,6 +7,11 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# --profile-startup はCLI自体のインポートから計測する
+if "--profile-startup" in sys.argv:
+    from src.infrastructure.performance.startup_profiler import startup_profiler
+    startup_profiler.install()
+
 from src.presentation.cli.main import main
 
 if __name__ == "__main__":
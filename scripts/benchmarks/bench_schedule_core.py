@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Scheduleエンティティの基本操作ベンチマーク
+
+data/input/input.csv を実データとして読み込み、assign / get_assignment /
+is_teacher_available / has_daily_duplicate / fork（近傍解1つ分の複製と変更）の
+1回あたりの処理時間を計測する。
+
+使い方:
+    python3 scripts/benchmarks/bench_schedule_core.py [--repeat 20]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# timetable_v5ディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.infrastructure.config.path_config import path_config
+from src.infrastructure.repositories.csv_repository import CSVScheduleRepository, CSVSchoolRepository
+from src.domain.entities.schedule import Schedule
+
+
+def load_real_data():
+    """実データ（学校・希望時間割）を読み込む"""
+    school_repo = CSVSchoolRepository(path_config.data_dir)
+    school = school_repo.load_school_data("config/base_timetable.csv")
+    schedule_repo = CSVScheduleRepository(path_config.data_dir)
+    schedule = schedule_repo.load("input/input.csv", school)
+    return school, schedule
+
+
+def measure(label, func, calls, trials=5):
+    """funcを複数回実行し、最速の1回あたり処理時間（マイクロ秒）を表示"""
+    elapsed = float("inf")
+    for _ in range(trials):
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    per_call_us = elapsed / calls * 1e6
+    print(f"  {label:<28} {per_call_us:8.2f} µs/call  ({calls:,} calls, {elapsed * 1000:.1f} ms)")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schedule基本操作のベンチマーク")
+    parser.add_argument("--repeat", type=int, default=20, help="各操作の繰り返し回数")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    school, source = load_real_data()
+
+    cells = [(time_slot, assignment) for time_slot, assignment in source.get_all_assignments()]
+    classes = school.get_all_classes()
+    teachers = school.get_all_teachers()
+    time_slots = sorted({ts for ts, _ in cells}, key=lambda ts: (ts.day, ts.period))
+
+    print("=== Scheduleベンチマーク (data/input/input.csv) ===")
+    print(f"割り当て: {len(cells)}件, クラス: {len(classes)}, 教員: {len(teachers)}, 繰り返し: {args.repeat}")
+
+    def run_assign():
+        for _ in range(args.repeat):
+            schedule = Schedule()
+            schedule.disable_grade5_sync()
+            for time_slot, assignment in cells:
+                schedule.assign(time_slot, assignment)
+
+    def run_get_assignment():
+        for _ in range(args.repeat):
+            for time_slot in time_slots:
+                for class_ref in classes:
+                    source.get_assignment(time_slot, class_ref)
+
+    def run_is_teacher_available():
+        for _ in range(args.repeat):
+            for time_slot in time_slots:
+                for teacher in teachers:
+                    source.is_teacher_available(time_slot, teacher)
+
+    def run_has_daily_duplicate():
+        for _ in range(args.repeat):
+            for class_ref in classes:
+                for day in ["月", "火", "水", "木", "金"]:
+                    source.has_daily_duplicate(class_ref, day)
+
+    # 近傍解の生成: 複製して1セルだけ入れ替える
+    movable = [(ts, a) for ts, a in cells if not source.is_locked(ts, a.class_ref)]
+
+    def run_fork_neighbor():
+        for _ in range(args.repeat):
+            for time_slot, assignment in movable[:100]:
+                neighbor = source.fork()
+                neighbor.remove_assignment(time_slot, assignment.class_ref)
+                neighbor.assign(time_slot, assignment)
+
+    def run_replay_neighbor():
+        for _ in range(args.repeat):
+            for time_slot, assignment in movable[:100]:
+                neighbor = Schedule()
+                for ts, a in source.get_all_assignments():
+                    neighbor.assign(ts, a)
+                neighbor.remove_assignment(time_slot, assignment.class_ref)
+                neighbor.assign(time_slot, assignment)
+
+    measure("assign", run_assign, args.repeat * len(cells))
+    measure("get_assignment", run_get_assignment, args.repeat * len(time_slots) * len(classes))
+    measure("is_teacher_available", run_is_teacher_available,
+            args.repeat * len(time_slots) * len(teachers))
+    measure("has_daily_duplicate", run_has_daily_duplicate, args.repeat * len(classes) * 5)
+    neighbor_calls = args.repeat * min(len(movable), 100)
+    measure("neighbor (fork)", run_fork_neighbor, neighbor_calls)
+    measure("neighbor (replay copy)", run_replay_neighbor, neighbor_calls, trials=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
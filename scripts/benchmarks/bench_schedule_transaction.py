@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""配置の試行と取り消しのベンチマーク
+
+data/input/input.csv の希望時間割の空きセルに仮の授業を置いては取り消す操作を、
+従来の assign → remove_assignment と、取り消しログ（begin / savepoint / rollback_to）
+で比べる。バックトラッキングで1手試して戻す操作の1回あたりの処理時間に相当する。
+
+使い方:
+    python3 scripts/benchmarks/bench_schedule_transaction.py [--repeat 200]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# timetable_v5ディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.infrastructure.config.path_config import path_config
+from src.infrastructure.repositories.csv_repository import CSVScheduleRepository, CSVSchoolRepository
+from src.domain.entities.schedule_grid import ALL_TIME_SLOTS
+from src.domain.value_objects.time_slot import Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+
+
+def load_real_data():
+    """実データ（学校・希望時間割）を読み込む"""
+    school_repo = CSVSchoolRepository(path_config.data_dir)
+    school = school_repo.load_school_data("config/base_timetable.csv")
+    schedule_repo = CSVScheduleRepository(path_config.data_dir)
+    schedule = schedule_repo.load("input/input.csv", school)
+    return school, schedule
+
+
+def measure(label, func, calls, trials=5):
+    """funcを複数回実行し、最速の1回あたり処理時間を表示"""
+    elapsed = float("inf")
+    for _ in range(trials):
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    per_call_us = elapsed / calls * 1e6
+    print(f"  {label:<28} {per_call_us:8.3f} µs/call  ({calls:,} calls, {elapsed * 1000:.1f} ms)")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="配置の試行と取り消しのベンチマーク")
+    parser.add_argument("--repeat", type=int, default=200, help="各操作の繰り返し回数")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    school, schedule = load_real_data()
+
+    # 変更可能な空きセル（5組を除く）
+    cells = [
+        (time_slot, class_ref)
+        for class_ref in school.get_all_classes() if class_ref.class_number != 5
+        for time_slot in ALL_TIME_SLOTS
+        if schedule.get_assignment(time_slot, class_ref) is None and not schedule.is_locked(time_slot, class_ref)
+    ]
+    trials = [(time_slot, Assignment(class_ref, Subject("数"), Teacher("梶永"))) for time_slot, class_ref in cells]
+
+    print("=== 配置の試行と取り消しのベンチマーク (data/input/input.csv) ===")
+    print(f"空きセル: {len(cells)}, 繰り返し: {args.repeat}")
+
+    def run_remove():
+        for _ in range(args.repeat):
+            for time_slot, assignment in trials:
+                schedule.assign(time_slot, assignment)
+                schedule.remove_assignment(time_slot, assignment.class_ref)
+
+    def run_rollback():
+        schedule.begin()
+        try:
+            for _ in range(args.repeat):
+                for time_slot, assignment in trials:
+                    savepoint = schedule.savepoint()
+                    schedule.assign(time_slot, assignment)
+                    schedule.rollback_to(savepoint)
+        finally:
+            schedule.commit()
+
+    calls = args.repeat * len(trials)
+    before = measure("assign + remove_assignment", run_remove, calls)
+    after = measure("assign + rollback_to", run_rollback, calls)
+    print(f"  → {before / after:.2f}倍")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""値オブジェクト（TimeSlot / ClassReference / Subject / Teacher）の生成ベンチマーク
+
+data/input/input.csv に現れる値で、制約チェックのループと同じように値オブジェクトを
+作り直した時の1回あたりの処理時間を計測する。あわせて、生成した値をリストに保持した
+状態のメモリブロック数（tracemalloc）を数え、同じ値のオブジェクトが重複して確保されて
+いないかを見る。
+
+使い方:
+    python3 scripts/benchmarks/bench_value_objects.py [--repeat 200]
+"""
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# timetable_v5ディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.infrastructure.config.path_config import path_config
+from src.infrastructure.repositories.csv_repository import CSVScheduleRepository, CSVSchoolRepository
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+
+DAYS = ["月", "火", "水", "木", "金"]
+
+
+def load_real_data():
+    """実データ（学校・希望時間割）を読み込む"""
+    school_repo = CSVSchoolRepository(path_config.data_dir)
+    school = school_repo.load_school_data("config/base_timetable.csv")
+    schedule_repo = CSVScheduleRepository(path_config.data_dir)
+    schedule = schedule_repo.load("input/input.csv", school)
+    return school, schedule
+
+
+def measure(label, func, calls, trials=5):
+    """funcを複数回実行し、最速の1回あたり処理時間と、戻り値が保持しているメモリブロック数を表示"""
+    elapsed = float("inf")
+    for _ in range(trials):
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    kept = func()
+    after = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    del kept
+
+    per_call_us = elapsed / calls * 1e6
+    print(f"  {label:<28} {per_call_us:8.3f} µs/call  ({calls:,} calls, {elapsed * 1000:.1f} ms, "
+          f"保持ブロック {after - before:,})")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="値オブジェクト生成のベンチマーク")
+    parser.add_argument("--repeat", type=int, default=200, help="各操作の繰り返し回数")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    school, schedule = load_real_data()
+
+    classes = [(c.grade, c.class_number) for c in school.get_all_classes()]
+    subjects = sorted({a.subject.name for _, a in schedule.get_all_assignments()})
+    teachers = sorted({a.teacher.name for _, a in schedule.get_all_assignments() if a.teacher})
+
+    print("=== 値オブジェクト生成ベンチマーク (data/input/input.csv) ===")
+    print(f"クラス: {len(classes)}, 教科: {len(subjects)}, 教員: {len(teachers)}, 繰り返し: {args.repeat}")
+
+    # 制約チェックの典型的なループ（全コマ × 全クラス）
+    def run_iterate_all_time_slots():
+        kept = []
+        for _ in range(args.repeat):
+            for day in DAYS:
+                for period in range(1, 7):
+                    time_slot = TimeSlot(day, period)
+                    kept.append(time_slot)
+                    for grade, class_number in classes:
+                        kept.append(ClassReference(grade, class_number))
+        return kept
+
+    def run_subject():
+        kept = []
+        for _ in range(args.repeat):
+            for name in subjects:
+                kept.append(Subject(name))
+        return kept
+
+    def run_teacher():
+        kept = []
+        for _ in range(args.repeat):
+            for name in teachers:
+                kept.append(Teacher(name))
+        return kept
+
+    measure("TimeSlot + ClassReference", run_iterate_all_time_slots, args.repeat * 30 * (len(classes) + 1))
+    measure("Subject", run_subject, args.repeat * len(subjects))
+    measure("Teacher", run_teacher, args.repeat * len(teachers))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,11 @@
 """アプリケーションサービス"""
 
-from .schedule_fixer_service import ScheduleFixerService
+__all__ = ['ScheduleFixerService']
 
-__all__ = ['ScheduleFixerService']
\ No newline at end of file
+
+def __getattr__(name):
+    # ScheduleFixerService は pandas を読み込むため、使われるまでインポートしない
+    if name == 'ScheduleFixerService':
+        from .schedule_fixer_service import ScheduleFixerService
+        return ScheduleFixerService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -22,6 +22,7 @@ from ...domain.interfaces.csp_configuration import ICSPConfiguration
 from ...domain.interfaces.followup_parser import IFollowUpParser
 from ...domain.interfaces.path_configuration import IPathConfiguration
 from ...domain.services.validators.constraint_validator import ConstraintValidatorImproved
+from .generation_helpers.phase_checkpoint import PhaseCheckpointStore
 
 
 class SearchMode(Enum):
@@ -46,7 +47,8 @@ class CSPOrchestratorImproved:
                  constraint_validator: ConstraintValidatorImproved = None,
                  csp_config: Optional[ICSPConfiguration] = None,
                  followup_parser: Optional[IFollowUpParser] = None,
-                 path_config: Optional[IPathConfiguration] = None):
+                 path_config: Optional[IPathConfiguration] = None,
+                 checkpoint_store: Optional[PhaseCheckpointStore] = None):
         """CSPオーケストレーターを初期化
         
         Args:
@@ -54,6 +56,7 @@ class CSPOrchestratorImproved:
             csp_config: CSP設定
             followup_parser: フォローアップパーサー
             path_config: パス設定
+            checkpoint_store: フェーズごとのチェックポイントの保存先（Noneなら保存しない）
         """
         # 改良版制約検証器を使用
         self.constraint_validator = constraint_validator or ConstraintValidatorImproved()
@@ -73,6 +76,7 @@ class CSPOrchestratorImproved:
         self.config = csp_config
         self.followup_parser = followup_parser
         self.path_config = path_config
+        self.checkpoint_store = checkpoint_store
         
         # テスト期間情報を初期化
         self.test_periods = set()
@@ -128,13 +132,17 @@ class CSPOrchestratorImproved:
         self.jiritsu_service.set_test_periods(test_periods_dict)
     
     def generate(self, school: School, max_iterations: int = 200,
-                 initial_schedule: Optional[Schedule] = None) -> Schedule:
+                 initial_schedule: Optional[Schedule] = None,
+                 resume: bool = False) -> Schedule:
         """CSPアプローチでスケジュールを生成
         
+        checkpoint_storeが設定されていれば各フェーズの終了時にチェックポイントを保存する。
+        
         Args:
             school: 学校情報
             max_iterations: 最大反復回数
             initial_schedule: 初期スケジュール
+            resume: 入力が変わっていないフェーズをチェックポイントから再開するか
             
         Returns:
             生成されたスケジュール
@@ -147,23 +155,43 @@ class CSPOrchestratorImproved:
         # 初期スケジュールの準備
         schedule = initial_schedule if initial_schedule else Schedule()
         
-        # Phase 1: 初期設定と保護
-        self._phase1_initialization(schedule, school)
-        
-        # Phase 2: 自立活動の配置
-        self._phase2_jiritsu_placement(schedule, school)
-        
-        # Phase 3: 5組の同期配置
-        self._phase3_grade5_synchronization(schedule, school)
-        
-        # Phase 4: 交流学級の早期同期
-        self._phase4_exchange_class_sync(schedule, school)
-        
-        # Phase 5: 通常教科の配置（改良版）
-        self._phase5_regular_subjects(schedule, school)
-        
-        # Phase 6: 最適化
-        self._phase6_optimization(schedule, school, max_iterations)
+        phases = [
+            # Phase 1: 初期設定と保護
+            ('initialization', lambda s: self._phase1_initialization(s, school)),
+            # Phase 2: 自立活動の配置
+            ('jiritsu', lambda s: self._phase2_jiritsu_placement(s, school)),
+            # Phase 3: 5組の同期配置
+            ('grade5', lambda s: self._phase3_grade5_synchronization(s, school)),
+            # Phase 4: 交流学級の早期同期
+            ('exchange_sync', lambda s: self._phase4_exchange_class_sync(s, school)),
+            # Phase 5: 通常教科の配置（改良版）
+            ('regular_subjects', lambda s: self._phase5_regular_subjects(s, school)),
+            # Phase 6: 最適化
+            ('optimization', lambda s: self._phase6_optimization(s, school, max_iterations)),
+        ]
+        phase_names = [name for name, _ in phases]
+        
+        keys = None
+        start = 0
+        if self.checkpoint_store:
+            keys = self.checkpoint_store.compute_phase_keys(
+                schedule, phase_names, {'optimization': {'max_iterations': max_iterations}}
+            )
+            if resume:
+                latest = self.checkpoint_store.find_latest(phase_names, keys)
+                if latest:
+                    index, schedule, statistics = latest
+                    self.statistics.update(statistics)
+                    start = index + 1
+                    self.logger.info(f"チェックポイントから再開: {phase_names[index]}まで完了済み")
+                else:
+                    self.logger.info("再利用できるチェックポイントがないため最初から生成します")
+        
+        for index in range(start, len(phases)):
+            name, run_phase = phases[index]
+            run_phase(schedule)
+            if keys:
+                self.checkpoint_store.save(name, keys[index], schedule, self.statistics)
         
         # 最終評価と統計出力
         self._final_evaluation(schedule, school)
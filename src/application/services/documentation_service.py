@@ -6,6 +6,7 @@ import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from ...infrastructure.cache.artifact_cache import get_artifact_cache
 from ...infrastructure.documentation.doc_analyzer import DocumentationAnalyzer
 from ...infrastructure.documentation.doc_generator import DocumentationGenerator
 
@@ -36,11 +37,17 @@ class DocumentationService:
             self._initialized = True
     
     def initialize(self) -> None:
-        """サービスを初期化してドキュメントを読み込む"""
+        """サービスを初期化してドキュメントを読み込む
+        
+        ドキュメントが前回の解析時から変わっていなければ、保存済みの解析結果を使う。
+        """
         self.logger.info("=== ドキュメント管理サービスを初期化 ===")
         
         # ドキュメントを解析
-        doc_info = self.analyzer.analyze_documentation()
+        doc_info = get_artifact_cache().get_or_build(
+            "documentation", self.analyzer.source_paths, self.analyzer.analyze_documentation
+        )
+        self.analyzer.restore_analysis(doc_info)
         self._architecture_info = doc_info.get("architecture", {})
         self._sequence_info = doc_info.get("sequence_flows", {})
         
@@ -73,7 +80,7 @@ class DocumentationService:
     
     def log_architecture_understanding(self) -> None:
         """理解したアーキテクチャをログ出力"""
-        if not self._architecture_info:
+        if self._architecture_info is None:
             self.initialize()
         
         self.logger.info("\n=== システムアーキテクチャの理解 ===")
@@ -106,7 +113,7 @@ class DocumentationService:
         self.logger.info(f"\n=== {target_module} の変更前チェック ===")
         
         # アーキテクチャ情報を確認
-        if not self._architecture_info:
+        if self._architecture_info is None:
             self.initialize()
         
         # 対象モジュールに関連する情報をログ出力
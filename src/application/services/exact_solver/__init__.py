@@ -0,0 +1,21 @@
+"""
+厳密解法 - 時間割問題の制約モデルとソルバーバックエンド
+
+時間割全体を0-1変数の制約モデルに変換し、OR-Tools CP-SAT または PuLP/CBC で解きます。
+"""
+
+from .timetable_model import (
+    LinearConstraint,
+    CellVariables,
+    TimetableModel,
+    TimetableModelBuilder
+)
+
+from .solver_backends import (
+    SolveResult,
+    SolverBackend,
+    CpSatBackend,
+    PulpBackend,
+    available_backends,
+    get_backend
+)
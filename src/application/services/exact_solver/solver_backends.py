@@ -0,0 +1,219 @@
+"""制約モデルのソルバーバックエンド
+
+TimetableModel をローカルのソルバーで解く。
+- CpSatBackend: OR-Tools CP-SAT（マルチスレッド、最初の実行可能解を素早く返し、期限まで改善）
+- PulpBackend: PuLP + CBC（OR-Toolsが無い場合の代替）
+
+どちらも任意の依存パッケージで、インストールされていない場合は使えないだけで
+このモジュール自体は読み込める。get_backend('auto') は使えるものを優先順に選ぶ。
+"""
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from .timetable_model import TimetableModel
+
+try:
+    from ortools.sat.python import cp_model
+    HAS_ORTOOLS = True
+except ImportError:
+    HAS_ORTOOLS = False
+
+try:
+    import pulp
+    HAS_PULP = True
+except ImportError:
+    HAS_PULP = False
+
+logger = logging.getLogger(__name__)
+
+# CP-SAT は LNS・feasibility jump などを並列に走らせるポートフォリオで、8ワーカー未満だと
+# 最初の解が大きく遅れる。CPU数が少なくても最低この数のワーカーを時分割で動かす
+MIN_CP_SAT_WORKERS = 8
+
+
+@dataclass
+class SolveResult:
+    """ソルバーの実行結果
+
+    status は 'optimal'（最適解）/ 'feasible'（期限内の最良解）/ 'infeasible' / 'unknown'。
+    """
+    backend: str
+    status: str
+    values: List[int] = field(default_factory=list)
+    objective: Optional[float] = None
+    bound: Optional[float] = None
+    wall_time: float = 0.0
+    # 解が改善されるたびの (経過秒, 目的関数値)
+    progress: List[Tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def has_solution(self) -> bool:
+        return self.status in ('optimal', 'feasible')
+
+
+class SolverBackend(ABC):
+    """ソルバーバックエンドの基底クラス"""
+
+    name = ""
+
+    @classmethod
+    @abstractmethod
+    def is_available(cls) -> bool:
+        """ソルバーがインストールされているか"""
+
+    @abstractmethod
+    def solve(self, model: TimetableModel, time_limit: float,
+              num_workers: Optional[int] = None) -> SolveResult:
+        """モデルを解く
+
+        Args:
+            model: 制約モデル
+            time_limit: 制限時間（秒）
+            num_workers: 探索スレッド数（省略時はバックエンドごとの既定値）
+        """
+
+
+class CpSatBackend(SolverBackend):
+    """OR-Tools CP-SAT"""
+
+    name = "cp-sat"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return HAS_ORTOOLS
+
+    def solve(self, model: TimetableModel, time_limit: float,
+              num_workers: Optional[int] = None) -> SolveResult:
+        cp = cp_model.CpModel()
+        variables = [
+            cp.NewBoolVar(name) if upper == 1 else cp.NewIntVar(0, upper, name)
+            for name, upper in zip(model.var_names, model.upper_bounds)
+        ]
+        for constraint in model.constraints:
+            expr = sum(coef * variables[var] for var, coef in constraint.terms)
+            if constraint.sense == '<=':
+                cp.Add(expr <= constraint.rhs)
+            elif constraint.sense == '>=':
+                cp.Add(expr >= constraint.rhs)
+            else:
+                cp.Add(expr == constraint.rhs)
+        cp.Minimize(sum(coef * variables[var] for var, coef in model.objective.items()))
+        for var, value in model.hints.items():
+            cp.AddHint(variables[var], value)
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_workers = num_workers or max(os.cpu_count() or 1, MIN_CP_SAT_WORKERS)
+        progress = _CpSatProgress()
+        status = solver.Solve(cp, progress)
+
+        result = SolveResult(self.name, {
+            cp_model.OPTIMAL: 'optimal',
+            cp_model.FEASIBLE: 'feasible',
+            cp_model.INFEASIBLE: 'infeasible',
+        }.get(status, 'unknown'), wall_time=solver.WallTime(), progress=progress.history)
+        if result.has_solution:
+            result.values = [int(solver.Value(v)) for v in variables]
+            result.objective = solver.ObjectiveValue()
+            result.bound = solver.BestObjectiveBound()
+        return result
+
+
+if HAS_ORTOOLS:
+    class _CpSatProgress(cp_model.CpSolverSolutionCallback):
+        """解が見つかるたびに経過時間と目的関数値を記録"""
+
+        def __init__(self):
+            super().__init__()
+            self.history: List[Tuple[float, float]] = []
+
+        def on_solution_callback(self) -> None:
+            self.history.append((self.WallTime(), self.ObjectiveValue()))
+            logger.debug(f"CP-SAT: {self.WallTime():.1f}秒 目的関数値 {self.ObjectiveValue():.0f}")
+
+
+class PulpBackend(SolverBackend):
+    """PuLP + CBC"""
+
+    name = "pulp-cbc"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return HAS_PULP
+
+    def solve(self, model: TimetableModel, time_limit: float,
+              num_workers: Optional[int] = None) -> SolveResult:
+        problem = pulp.LpProblem("timetable", pulp.LpMinimize)
+        variables = [
+            pulp.LpVariable(f"x{i}", 0, upper, cat=pulp.LpBinary if upper == 1 else pulp.LpInteger)
+            for i, upper in enumerate(model.upper_bounds)
+        ]
+        problem += pulp.lpSum(coef * variables[var] for var, coef in model.objective.items())
+        for constraint in model.constraints:
+            expr = pulp.lpSum(coef * variables[var] for var, coef in constraint.terms)
+            if constraint.sense == '<=':
+                problem += expr <= constraint.rhs
+            elif constraint.sense == '>=':
+                problem += expr >= constraint.rhs
+            else:
+                problem += expr == constraint.rhs
+        for var, value in model.hints.items():
+            variables[var].setInitialValue(value)
+
+        solver = pulp.PULP_CBC_CMD(
+            msg=False, timeLimit=time_limit, threads=num_workers or os.cpu_count() or 1,
+            warmStart=bool(model.hints)
+        )
+        start_time = time.time()
+        problem.solve(solver)
+        wall_time = time.time() - start_time
+
+        status = {
+            pulp.LpSolutionOptimal: 'optimal',
+            pulp.LpSolutionIntegerFeasible: 'feasible',
+            pulp.LpSolutionInfeasible: 'infeasible',
+        }.get(problem.sol_status, 'unknown')
+        result = SolveResult(self.name, status, wall_time=wall_time)
+        if result.has_solution:
+            result.values = [int(round(v.varValue or 0)) for v in variables]
+            result.objective = pulp.value(problem.objective)
+            result.progress = [(wall_time, result.objective)]
+        return result
+
+
+# 'auto' で選ぶ順
+BACKENDS = {
+    CpSatBackend.name: CpSatBackend,
+    PulpBackend.name: PulpBackend,
+}
+
+
+def available_backends() -> List[str]:
+    """インストールされているバックエンド名"""
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def get_backend(name: str = 'auto') -> SolverBackend:
+    """バックエンドを取得
+
+    Raises:
+        ValueError: 未知のバックエンド名
+        RuntimeError: ソルバーがインストールされていない
+    """
+    if name == 'auto':
+        available = available_backends()
+        if not available:
+            raise RuntimeError(
+                "厳密解法のソルバーがありません（ortools または pulp をインストールしてください）"
+            )
+        name = available[0]
+    if name not in BACKENDS:
+        raise ValueError(f"未知のソルバーバックエンド: {name}")
+    backend = BACKENDS[name]
+    if not backend.is_available():
+        raise RuntimeError(f"ソルバーバックエンド {name} は使用できません")
+    return backend()
@@ -0,0 +1,472 @@
+"""時間割問題の制約モデル（ソルバー非依存）
+
+スケジュールのうち変更してよいセル（自由セル）ごとに「(教科, 教員) の選択肢を1つ選ぶ、
+または空きにする」0-1変数を作り、時間割のルールを線形制約として表す。
+モデルは変数・線形制約・最小化する目的関数だけを持ち、CP-SAT / PuLP などの
+バックエンド（solver_backends）がそのまま解ける形になっている。
+
+定数として扱うセル:
+- ロックされたセル、固定科目（欠・YT・道・学・総・行・テストなど）、テスト期間のコマ
+- free_cells を指定した場合はその外側のセル
+- 5組は3クラスのうち1つでも定数なら、そのコマの3クラスとも定数
+
+ハード制約:
+- 自由セルは選択肢1つか空きのどちらか
+- 教員は1コマに1つの授業単位まで（5組の合同授業・交流学級の自立活動は1単位）
+- 不在教員・配置禁止教科（非保など）・定数セルで埋まっている教員は選択肢から除く
+- 5組の3クラスは同じ選択肢
+- 交流学級は自立活動以外は親学級と同じ教科、自立活動の時は親学級が数・英・算
+- 体育館（保）はテスト期間以外は1コマに1グループまで（5組、交流学級と親学級は合同）
+
+目的関数（最小化）:
+- 空きセル、日内重複、標準時数との差、初期スケジュールからの変更
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from ....shared.mixins.logging_mixin import LoggingMixin
+from ....domain.constants import WEEKDAYS
+from ....domain.entities.schedule_grid import ALL_TIME_SLOTS, slot_index
+from ....domain.services.synchronizers.exchange_class_service import ExchangeClassService
+from ....domain.utils.schedule_utils import ScheduleUtils
+from ....domain.value_objects.assignment import Assignment
+from ....domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+
+if TYPE_CHECKING:
+    from ....domain.entities.schedule import Schedule
+    from ....domain.entities.school import School
+
+# 目的関数の重み
+EMPTY_CELL_PENALTY = 30
+DAILY_DUPLICATE_PENALTY = 200
+STANDARD_HOURS_PENALTY = 20
+CHANGE_PENALTY = 1
+
+GYM_SUBJECT = "保"
+
+Option = Tuple[Subject, Optional[Teacher]]
+Cell = Tuple[int, ClassReference]
+# (変数番号, 係数)
+Terms = List[Tuple[int, int]]
+
+
+@dataclass
+class LinearConstraint:
+    """sum(係数 × 変数) <sense> rhs"""
+    terms: Terms
+    sense: str  # '<=', '==', '>='
+    rhs: int
+    name: str = ""
+
+
+@dataclass
+class CellVariables:
+    """自由セル1つ分の変数"""
+    empty: int
+    options: List[Tuple[int, Option]]
+
+
+@dataclass
+class TimetableModel:
+    """ソルバー非依存の制約モデル
+
+    変数は全て 0 以上の整数で、上限は upper_bounds（0-1変数は上限1）。
+    """
+    var_names: List[str] = field(default_factory=list)
+    upper_bounds: List[int] = field(default_factory=list)
+    constraints: List[LinearConstraint] = field(default_factory=list)
+    objective: Dict[int, int] = field(default_factory=dict)
+    hints: Dict[int, int] = field(default_factory=dict)
+    cells: Dict[Cell, CellVariables] = field(default_factory=dict)
+
+    def new_var(self, name: str, upper_bound: int = 1) -> int:
+        self.var_names.append(name)
+        self.upper_bounds.append(upper_bound)
+        return len(self.var_names) - 1
+
+    def add_constraint(self, terms: Terms, sense: str, rhs: int, name: str = "") -> None:
+        """制約を追加（変数を含まない制約は何も決めないので捨てる）"""
+        if terms:
+            self.constraints.append(LinearConstraint(terms, sense, rhs, name))
+
+    def add_objective(self, var: int, coefficient: int) -> None:
+        self.objective[var] = self.objective.get(var, 0) + coefficient
+
+    @property
+    def num_vars(self) -> int:
+        return len(self.var_names)
+
+    def decode(self, values: List[int]) -> Dict[Tuple[TimeSlot, ClassReference], Optional[Option]]:
+        """解の変数値を 自由セル → 選ばれた (教科, 教員)（空きはNone）に変換"""
+        result = {}
+        for (slot, class_ref), cell in self.cells.items():
+            chosen = None
+            for var, option in cell.options:
+                if values[var]:
+                    chosen = option
+                    break
+            result[(ALL_TIME_SLOTS[slot], class_ref)] = chosen
+        return result
+
+
+def _teaching_unit(class_ref: ClassReference, subject: Subject, grade5: Set[ClassReference]):
+    """教員が同時に担当してよい授業のまとまり（Schedule.is_teacher_free と同じ基準）"""
+    if class_ref in grade5:
+        return "5組"
+    if subject.name == "自立" and class_ref.is_exchange_class():
+        return ("自立", class_ref.class_number)
+    return class_ref
+
+
+class TimetableModelBuilder(LoggingMixin):
+    """School とスケジュールから TimetableModel を作る"""
+
+    def __init__(self, school: 'School',
+                 forbidden_cells: Optional[Dict[Tuple[TimeSlot, ClassReference], Set[str]]] = None,
+                 test_periods: Optional[Set[Tuple[str, int]]] = None):
+        """
+        Args:
+            school: 学校情報
+            forbidden_cells: (時間枠, クラス) → 配置禁止の教科名
+            test_periods: テスト期間の (曜日, 校時)
+        """
+        super().__init__()
+        self.school = school
+        self.compiled = school.compile()
+        self.classes = self.compiled.classes
+        self.grade5_classes = [c for c in self.classes if c.class_number == 5]
+        self.grade5 = set(self.grade5_classes)
+        self.forbidden: Dict[Cell, Set[str]] = {
+            (slot_index(time_slot), class_ref): names
+            for (time_slot, class_ref), names in (forbidden_cells or {}).items()
+        }
+        self.test_slots = {
+            slot for slot, time_slot in enumerate(ALL_TIME_SLOTS)
+            if (time_slot.day, time_slot.period) in (test_periods or set())
+        }
+        self.standard_hours = {
+            c: {subject: int(round(hours))
+                for subject, hours in school.get_all_standard_hours(c).items()
+                if hours > 0 and not ScheduleUtils.is_fixed_subject(subject.name)}
+            for c in self.classes
+        }
+        self.class_options = {c: self._class_options(c) for c in self.classes}
+
+    def _class_options(self, class_ref: ClassReference) -> List[Option]:
+        """クラスの全選択肢（担当教員がいれば担当教員、いなければ教科の担当教員全員）"""
+        options = []
+        for subject in sorted(self.standard_hours[class_ref], key=lambda s: s.name):
+            assigned = self.school.get_assigned_teacher(subject, class_ref)
+            if assigned:
+                options.append((subject, assigned))
+            else:
+                for teacher in sorted(self.school.get_subject_teachers(subject), key=lambda t: t.name):
+                    options.append((subject, teacher))
+        return options
+
+    # ========== モデル構築 ==========
+
+    def build(self, schedule: 'Schedule',
+              free_cells: Optional[Iterable[Tuple[TimeSlot, ClassReference]]] = None) -> TimetableModel:
+        """スケジュールの自由セルを変数にしたモデルを作る
+
+        Args:
+            schedule: 初期スケジュール（自由セルの現在の割り当てはヒントになる）
+            free_cells: 変更してよいセル（省略時は定数セル以外の全セル）
+        """
+        model = TimetableModel()
+        allowed = None if free_cells is None else {
+            (slot_index(time_slot), class_ref) for time_slot, class_ref in free_cells
+        }
+        constants: Dict[Cell, Optional[Assignment]] = {}
+        for slot, time_slot in enumerate(ALL_TIME_SLOTS):
+            free = {c for c in self.classes
+                    if self._is_free(schedule, slot, time_slot, c, allowed)}
+            if not self.grade5 <= free:
+                free -= self.grade5
+            for class_ref in self.classes:
+                if class_ref not in free:
+                    constants[(slot, class_ref)] = schedule.get_assignment(time_slot, class_ref)
+            self._add_cells(model, schedule, slot, time_slot, free, constants)
+
+        self._add_teacher_constraints(model, constants)
+        self._add_exchange_constraints(model, constants)
+        self._add_gym_constraints(model, constants)
+        self._add_daily_duplicate_objective(model, constants)
+        self._add_standard_hours_objective(model, constants)
+
+        self.logger.info(
+            f"制約モデルを作成: 自由セル{len(model.cells)}, 変数{model.num_vars}, "
+            f"制約{len(model.constraints)}"
+        )
+        return model
+
+    def _is_free(self, schedule: 'Schedule', slot: int, time_slot: TimeSlot,
+                 class_ref: ClassReference, allowed: Optional[Set[Cell]]) -> bool:
+        if allowed is not None and (slot, class_ref) not in allowed:
+            return False
+        if slot in self.test_slots or schedule.is_locked(time_slot, class_ref):
+            return False
+        assignment = schedule.get_assignment(time_slot, class_ref)
+        return assignment is None or not ScheduleUtils.is_fixed_subject(assignment.subject.name)
+
+    def _add_cells(self, model: TimetableModel, schedule: 'Schedule', slot: int,
+                   time_slot: TimeSlot, free: Set[ClassReference],
+                   constants: Dict[Cell, Optional[Assignment]]) -> None:
+        """自由セルの変数を作る"""
+        # 定数セルで埋まっている教員 → 授業単位
+        busy: Dict[Teacher, Set] = {}
+        for class_ref in self.classes:
+            assignment = constants.get((slot, class_ref))
+            if assignment and assignment.teacher:
+                busy.setdefault(assignment.teacher, set()).add(
+                    _teaching_unit(class_ref, assignment.subject, self.grade5))
+
+        def usable(class_ref: ClassReference, option: Option) -> bool:
+            subject, teacher = option
+            if subject.name in self.forbidden.get((slot, class_ref), ()):
+                return False
+            if teacher is None:
+                return True
+            if self.compiled.is_teacher_absent(teacher, slot):
+                return False
+            units = busy.get(teacher)
+            return not units or units == {_teaching_unit(class_ref, subject, self.grade5)}
+
+        grade5_options = None
+        if self.grade5 and self.grade5 <= free:
+            # 5組は3クラス全てで使える選択肢だけ
+            grade5_options = [
+                option for option in self.class_options[self.grade5_classes[0]]
+                if all(option in self.class_options[c] and usable(c, option) for c in self.grade5)
+            ]
+
+        for class_ref in self.classes:
+            if class_ref not in free:
+                continue
+            if class_ref in self.grade5:
+                options = grade5_options
+            else:
+                options = [o for o in self.class_options[class_ref] if usable(class_ref, o)]
+            name = f"{class_ref}_{time_slot}"
+            cell = CellVariables(model.new_var(f"{name}_空き"), [])
+            for subject, teacher in options:
+                var = model.new_var(f"{name}_{subject.name}_{teacher.name if teacher else ''}")
+                cell.options.append((var, (subject, teacher)))
+            model.cells[(slot, class_ref)] = cell
+            model.add_constraint(
+                [(cell.empty, 1)] + [(var, 1) for var, _ in cell.options], '==', 1, f"{name}_1つ"
+            )
+            model.add_objective(cell.empty, EMPTY_CELL_PENALTY)
+            self._add_hint(model, cell, schedule.get_assignment(time_slot, class_ref))
+
+        # 5組は同じ選択肢
+        if grade5_options is not None:
+            first, *others = self.grade5_classes
+            base = model.cells[(slot, first)]
+            for other in others:
+                cell = model.cells[(slot, other)]
+                pairs = [(base.empty, cell.empty)] + [
+                    (v1, v2) for (v1, _), (v2, _) in zip(base.options, cell.options)
+                ]
+                for v1, v2 in pairs:
+                    model.add_constraint([(v1, 1), (v2, -1)], '==', 0, f"5組_{time_slot}")
+
+    @staticmethod
+    def _add_hint(model: TimetableModel, cell: CellVariables,
+                  current: Optional[Assignment]) -> None:
+        """現在の割り当てをヒントにし、それ以外を選んだ場合に変更ペナルティを付ける"""
+        chosen = cell.empty
+        if current is not None:
+            for var, (subject, teacher) in cell.options:
+                if subject == current.subject and teacher == current.teacher:
+                    chosen = var
+                    break
+            else:
+                return
+        for var in [cell.empty] + [v for v, _ in cell.options]:
+            model.hints[var] = int(var == chosen)
+            if var != chosen:
+                model.add_objective(var, CHANGE_PENALTY)
+
+    def _subject_terms(self, model: TimetableModel, constants: Dict[Cell, Optional[Assignment]],
+                       cell: Cell, names: Set[str]) -> Tuple[Terms, int]:
+        """セルの教科が names に含まれるかを (変数の項, 定数) で表す"""
+        if cell in model.cells:
+            return [(var, 1) for var, (subject, _) in model.cells[cell].options
+                    if subject.name in names], 0
+        assignment = constants.get(cell)
+        return [], int(assignment is not None and assignment.subject.name in names)
+
+    # ========== ハード制約 ==========
+
+    def _add_teacher_constraints(self, model: TimetableModel,
+                                 constants: Dict[Cell, Optional[Assignment]]) -> None:
+        """教員は1コマに1つの授業単位まで"""
+        representative = self.grade5_classes[0] if self.grade5_classes else None
+        for slot, time_slot in enumerate(ALL_TIME_SLOTS):
+            # 教員 → 授業単位 → [(クラス, 変数)]
+            units: Dict[Teacher, Dict[object, List[Tuple[ClassReference, int]]]] = {}
+            for class_ref in self.classes:
+                cell = model.cells.get((slot, class_ref))
+                if cell is None or (class_ref in self.grade5 and class_ref != representative):
+                    continue
+                for var, (subject, teacher) in cell.options:
+                    if teacher is not None:
+                        unit = _teaching_unit(class_ref, subject, self.grade5)
+                        units.setdefault(teacher, {}).setdefault(unit, []).append((class_ref, var))
+
+            for teacher, by_unit in units.items():
+                if len(by_unit) < 2:
+                    continue
+                terms = []
+                for unit, members in by_unit.items():
+                    if len({class_ref for class_ref, _ in members}) == 1:
+                        terms.extend((var, 1) for _, var in members)
+                        continue
+                    # 複数クラスのチームティーチングは1単位として数える
+                    unit_var = model.new_var(f"{teacher.name}_{time_slot}_{unit}")
+                    for _, var in members:
+                        model.add_constraint([(var, 1), (unit_var, -1)], '<=', 0)
+                    terms.append((unit_var, 1))
+                model.add_constraint(terms, '<=', 1, f"{teacher.name}_{time_slot}_重複")
+
+    def _add_exchange_constraints(self, model: TimetableModel,
+                                  constants: Dict[Cell, Optional[Assignment]]) -> None:
+        """交流学級は自立活動以外は親学級と同じ教科"""
+        jiritsu = ExchangeClassService.JIRITSU_SUBJECTS
+        allowed_parent = ExchangeClassService.ALLOWED_PARENT_SUBJECTS
+        for exchange, parent in self.compiled.exchange_parents.items():
+            if exchange not in self.class_options or parent not in self.class_options:
+                continue
+            subjects = {s.name for s, _ in self.class_options[exchange]} - jiritsu
+            for slot, time_slot in enumerate(ALL_TIME_SLOTS):
+                e_cell, p_cell = (slot, exchange), (slot, parent)
+                if e_cell not in model.cells and p_cell not in model.cells:
+                    continue
+                name = f"交流_{exchange}_{time_slot}"
+                e_const = constants.get(e_cell)
+                names = set(subjects)
+                if e_const is not None and e_const.subject.name not in jiritsu:
+                    names.add(e_const.subject.name)
+                for subject_name in names:
+                    e_terms, e_value = self._subject_terms(model, constants, e_cell, {subject_name})
+                    p_terms, p_value = self._subject_terms(model, constants, p_cell, {subject_name})
+                    if e_terms or p_terms:
+                        model.add_constraint(
+                            e_terms + [(v, -c) for v, c in p_terms], '<=', p_value - e_value, name
+                        )
+                j_terms, j_value = self._subject_terms(model, constants, e_cell, jiritsu)
+                p_terms, p_value = self._subject_terms(model, constants, p_cell, allowed_parent)
+                model.add_constraint(j_terms + [(v, -c) for v, c in p_terms], '<=', p_value - j_value, name)
+                # 交流学級が空きなら親学級も空き（親学級が定数の場合は空きペナルティに任せる）
+                if p_cell in model.cells:
+                    p_empty = model.cells[p_cell].empty
+                    if e_cell in model.cells:
+                        model.add_constraint(
+                            [(model.cells[e_cell].empty, 1), (p_empty, -1)], '<=', 0, name)
+                    elif e_const is None:
+                        model.add_constraint([(p_empty, -1)], '<=', -1, name)
+
+    def _gym_group(self, class_ref: ClassReference):
+        """合同で体育を行うグループ（5組、交流学級と親学級）"""
+        if class_ref in self.grade5:
+            return "5組"
+        return self.compiled.exchange_parents.get(class_ref, class_ref)
+
+    def _add_gym_constraints(self, model: TimetableModel,
+                             constants: Dict[Cell, Optional[Assignment]]) -> None:
+        """体育館はテスト期間以外は1コマに1グループまで"""
+        for slot, time_slot in enumerate(ALL_TIME_SLOTS):
+            if slot in self.test_slots:
+                continue
+            fixed_groups = set()
+            group_terms: Dict[object, List[Tuple[ClassReference, Terms]]] = {}
+            for class_ref in self.classes:
+                terms, value = self._subject_terms(model, constants, (slot, class_ref), {GYM_SUBJECT})
+                group = self._gym_group(class_ref)
+                if value:
+                    fixed_groups.add(group)
+                elif terms and not (class_ref in self.grade5 and group in group_terms):
+                    # 5組は3クラスが同じ選択肢なので1クラス分だけ数える
+                    group_terms.setdefault(group, []).append((class_ref, terms))
+            capacity = max(0, 1 - len(fixed_groups))
+            total = []
+            for group, members in group_terms.items():
+                if group in fixed_groups:
+                    continue
+                if len(members) == 1:
+                    total.extend(members[0][1])
+                    continue
+                group_var = model.new_var(f"体育館_{time_slot}_{group}")
+                for _, terms in members:
+                    model.add_constraint(terms + [(group_var, -1)], '<=', 0)
+                total.append((group_var, 1))
+            if len(total) > capacity:
+                model.add_constraint(total, '<=', capacity, f"体育館_{time_slot}")
+
+    # ========== 目的関数 ==========
+
+    def _add_daily_duplicate_objective(self, model: TimetableModel,
+                                       constants: Dict[Cell, Optional[Assignment]]) -> None:
+        """同じ教科の1日2コマ目以降にペナルティ"""
+        slots_by_day = {
+            day: [slot for slot, ts in enumerate(ALL_TIME_SLOTS) if ts.day == day] for day in WEEKDAYS
+        }
+        for class_ref in self.classes:
+            for subject in {s for s, _ in self.class_options[class_ref]}:
+                for day, slots in slots_by_day.items():
+                    terms, count = [], 0
+                    for slot in slots:
+                        t, v = self._subject_terms(model, constants, (slot, class_ref), {subject.name})
+                        terms += t
+                        count += v
+                    if not terms:
+                        continue
+                    over = model.new_var(f"{class_ref}_{day}_{subject.name}_重複", len(slots))
+                    model.add_constraint(terms + [(over, -1)], '<=', 1 - count)
+                    model.add_objective(over, DAILY_DUPLICATE_PENALTY)
+
+    def _add_standard_hours_objective(self, model: TimetableModel,
+                                      constants: Dict[Cell, Optional[Assignment]]) -> None:
+        """標準時数との差（過不足とも）にペナルティ"""
+        slot_count = len(ALL_TIME_SLOTS)
+        for class_ref in self.classes:
+            for subject, hours in self.standard_hours[class_ref].items():
+                terms, count = [], 0
+                for slot in range(slot_count):
+                    t, v = self._subject_terms(model, constants, (slot, class_ref), {subject.name})
+                    terms += t
+                    count += v
+                if not terms:
+                    continue
+                deviation = model.new_var(f"{class_ref}_{subject.name}_時数差", slot_count)
+                model.add_constraint(terms + [(deviation, -1)], '<=', hours - count)
+                model.add_constraint([(v, -c) for v, c in terms] + [(deviation, -1)], '<=', count - hours)
+                model.add_objective(deviation, STANDARD_HOURS_PENALTY)
+
+    # ========== 解の反映 ==========
+
+    def apply(self, schedule: 'Schedule', model: TimetableModel, values: List[int]) -> int:
+        """解をスケジュールの自由セルに書き込み、変更したセル数を返す
+
+        5組は同期が有効なら最初のクラスへの書き込みで3クラスとも更新される。
+        """
+        changed = 0
+        for (time_slot, class_ref), chosen in model.decode(values).items():
+            current = schedule.get_assignment(time_slot, class_ref)
+            if current is None and chosen is None:
+                continue
+            if current is not None and chosen is not None and \
+                    (current.subject, current.teacher) == chosen:
+                continue
+            try:
+                if current is not None:
+                    schedule.remove_assignment(time_slot, class_ref)
+                if chosen is not None:
+                    subject, teacher = chosen
+                    schedule.assign(time_slot, Assignment(class_ref, subject, teacher))
+                changed += 1
+            except Exception as e:
+                self.logger.warning(f"{time_slot} {class_ref}: 解を反映できませんでした: {e}")
+        return changed
@@ -3,9 +3,13 @@
 from .schedule_helper import ScheduleHelper
 from .empty_slot_filler import EmptySlotFiller
 from .followup_loader import FollowupLoader
+from .phase_checkpoint import PhaseCheckpointStore
+from .teacher_schedule_tracker import TeacherScheduleTracker
 
 __all__ = [
     'ScheduleHelper',
     'EmptySlotFiller',
-    'FollowupLoader'
+    'FollowupLoader',
+    'PhaseCheckpointStore',
+    'TeacherScheduleTracker'
 ]
\ No newline at end of file
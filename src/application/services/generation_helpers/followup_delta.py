@@ -0,0 +1,140 @@
+"""Follow-up.csvの週ごとの差分
+
+EnhancedFollowUpParser の解析結果（教員不在・会議・テスト期間）をコマ単位の集合に
+展開したスナップショットとして保存し、前回の生成時のスナップショットとの差分を取ります。
+generate --incremental はこの差分で新しく増えた不在・会議に当たるセルだけを解き直します。
+"""
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ....domain.interfaces.path_configuration import IPathConfiguration
+
+ALL_PERIODS = tuple(range(1, 7))
+
+# (教員名, 曜日, 校時)
+Absence = Tuple[str, str, int]
+# (会議名, 曜日, 校時)
+Meeting = Tuple[str, str, int]
+# (曜日, 校時)
+Period = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class FollowUpSnapshot:
+    """Follow-up.csvの解析結果をコマ単位に展開したもの"""
+    absences: FrozenSet[Absence] = frozenset()
+    meetings: FrozenSet[Meeting] = frozenset()
+    test_periods: FrozenSet[Period] = frozenset()
+
+    @classmethod
+    def from_parse_result(cls, result: Dict[str, Any]) -> 'FollowUpSnapshot':
+        """EnhancedFollowUpParser.parse_file() の結果から作成（不在の時限が空なら終日）"""
+        return cls(
+            absences=frozenset(
+                (absence.teacher_name, absence.day, period)
+                for absence in result.get('teacher_absences', [])
+                for period in (absence.periods or ALL_PERIODS)
+            ),
+            meetings=frozenset(
+                (meeting.meeting_name, meeting.day, meeting.period)
+                for meeting in result.get('meetings', [])
+            ),
+            test_periods=frozenset(
+                (test_period.day, period)
+                for test_period in result.get('test_periods', [])
+                for period in test_period.periods
+            )
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'absences': sorted(list(item) for item in self.absences),
+            'meetings': sorted(list(item) for item in self.meetings),
+            'test_periods': sorted(list(item) for item in self.test_periods)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FollowUpSnapshot':
+        return cls(
+            absences=frozenset(tuple(item) for item in data.get('absences', [])),
+            meetings=frozenset(tuple(item) for item in data.get('meetings', [])),
+            test_periods=frozenset(tuple(item) for item in data.get('test_periods', []))
+        )
+
+    def diff(self, previous: Optional['FollowUpSnapshot']) -> 'FollowUpDelta':
+        """前回のスナップショットからの差分（前回がなければ今回の全項目が追加）"""
+        previous = previous or FollowUpSnapshot()
+        return FollowUpDelta(
+            added_absences=self.absences - previous.absences,
+            removed_absences=previous.absences - self.absences,
+            added_meetings=self.meetings - previous.meetings,
+            removed_meetings=previous.meetings - self.meetings,
+            added_test_periods=self.test_periods - previous.test_periods,
+            removed_test_periods=previous.test_periods - self.test_periods
+        )
+
+
+@dataclass(frozen=True)
+class FollowUpDelta:
+    """2つのスナップショットの差分"""
+    added_absences: FrozenSet[Absence] = field(default_factory=frozenset)
+    removed_absences: FrozenSet[Absence] = field(default_factory=frozenset)
+    added_meetings: FrozenSet[Meeting] = field(default_factory=frozenset)
+    removed_meetings: FrozenSet[Meeting] = field(default_factory=frozenset)
+    added_test_periods: FrozenSet[Period] = field(default_factory=frozenset)
+    removed_test_periods: FrozenSet[Period] = field(default_factory=frozenset)
+
+    @property
+    def is_empty(self) -> bool:
+        return not any((
+            self.added_absences, self.removed_absences,
+            self.added_meetings, self.removed_meetings,
+            self.added_test_periods, self.removed_test_periods
+        ))
+
+    def summary(self) -> str:
+        return (
+            f"不在 +{len(self.added_absences)}/-{len(self.removed_absences)}, "
+            f"会議 +{len(self.added_meetings)}/-{len(self.removed_meetings)}, "
+            f"テスト +{len(self.added_test_periods)}/-{len(self.removed_test_periods)}"
+        )
+
+
+class FollowUpSnapshotStore:
+    """前回の生成時のFollow-upスナップショットをJSONファイルに保存・読み込みする"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_path_config(cls, path_config: 'IPathConfiguration') -> 'FollowUpSnapshotStore':
+        """パス設定からデータディレクトリ配下のcheckpointsに保存するストアを作成"""
+        return cls(path_config.data_dir / 'checkpoints' / 'followup_snapshot.json')
+
+    def load(self) -> Optional[FollowUpSnapshot]:
+        """保存済みのスナップショット（なければNone）"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return FollowUpSnapshot.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Follow-upスナップショットを読み込めません: {e}")
+            return None
+
+    def save(self, snapshot: FollowUpSnapshot) -> None:
+        """スナップショットを保存（書き込み途中で中断しても既存のファイルは壊れない）"""
+        tmp_path = self.path.with_suffix('.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot.to_dict(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Follow-upスナップショットの保存に失敗しました: {e}")
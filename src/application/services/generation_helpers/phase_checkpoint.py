@@ -0,0 +1,130 @@
+"""フェーズごとのチェックポイント
+
+CSPOrchestratorImprovedの各フェーズ終了時のスケジュールと統計情報を保存し、
+--resume 指定時に入力が変わっていないフェーズを読み込んで再実行を省略します。
+
+チェックポイントのキーは入力CSV・設定ディレクトリ・Follow-up.csvと初期スケジュールの
+ハッシュから始まり、フェーズ名とそのフェーズ固有のパラメータ（最適化の反復回数など）を
+順に連結してハッシュしたものです。前のフェーズのキーが変わると後続のキーもすべて変わるため、
+入力を変えれば最初から、最適化の設定だけを変えれば最適化フェーズだけがやり直しになります。
+"""
+import hashlib
+import json
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from ....domain.entities.schedule import Schedule
+from ....domain.exceptions import DataLoadingError
+
+if TYPE_CHECKING:
+    from ....domain.interfaces.path_configuration import IPathConfiguration
+
+_LENGTH = struct.Struct('<I')
+
+
+class PhaseCheckpointStore:
+    """フェーズごとのチェックポイントをファイルに保存・読み込みする"""
+    
+    def __init__(self, checkpoint_dir: Path, input_csv: Path, config_dir: Path, followup_csv: Path):
+        """初期化
+        
+        Args:
+            checkpoint_dir: チェックポイントの保存先ディレクトリ
+            input_csv: 入力CSV（希望時間割）
+            config_dir: 設定ディレクトリ
+            followup_csv: Follow-up.csv
+        """
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.input_csv = Path(input_csv)
+        self.config_dir = Path(config_dir)
+        self.followup_csv = Path(followup_csv)
+        self.logger = logging.getLogger(__name__)
+    
+    @classmethod
+    def from_path_config(cls, path_config: 'IPathConfiguration') -> 'PhaseCheckpointStore':
+        """パス設定からデータディレクトリ配下のcheckpointsに保存するストアを作成"""
+        return cls(
+            path_config.data_dir / 'checkpoints',
+            path_config.input_csv,
+            path_config.config_dir,
+            path_config.followup_csv
+        )
+    
+    def compute_input_hash(self, initial_schedule: Schedule) -> str:
+        """入力ファイル・設定ディレクトリ・初期スケジュールのハッシュを計算"""
+        digest = hashlib.sha256()
+        for label, path in (('input', self.input_csv), ('followup', self.followup_csv)):
+            digest.update(label.encode('utf-8'))
+            digest.update(path.read_bytes() if path.is_file() else b'')
+        if self.config_dir.is_dir():
+            for path in sorted(p for p in self.config_dir.rglob('*') if p.is_file()):
+                digest.update(path.relative_to(self.config_dir).as_posix().encode('utf-8'))
+                digest.update(path.read_bytes())
+        digest.update(initial_schedule.to_bytes())
+        return digest.hexdigest()
+    
+    def compute_phase_keys(
+        self,
+        initial_schedule: Schedule,
+        phase_names: Sequence[str],
+        phase_params: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[str]:
+        """各フェーズのチェックポイントキーを計算（前のフェーズのキーを連結）"""
+        phase_params = phase_params or {}
+        key = self.compute_input_hash(initial_schedule)
+        keys = []
+        for name in phase_names:
+            params = json.dumps(phase_params.get(name, {}), sort_keys=True)
+            key = hashlib.sha256(f"{key}:{name}:{params}".encode('utf-8')).hexdigest()
+            keys.append(key)
+        return keys
+    
+    def save(self, phase_name: str, key: str, schedule: Schedule, statistics: Dict[str, Any]) -> None:
+        """フェーズ終了時の状態を保存（書き込み途中で中断しても既存のファイルは壊れない）"""
+        header = json.dumps({'key': key, 'statistics': dict(statistics)}, ensure_ascii=False).encode('utf-8')
+        path = self._path(phase_name)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(_LENGTH.pack(len(header)))
+                f.write(header)
+                f.write(schedule.to_bytes())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"チェックポイントの保存に失敗しました ({phase_name}): {e}")
+    
+    def load(self, phase_name: str, key: str) -> Optional[Tuple[Schedule, Dict[str, Any]]]:
+        """キーが一致するチェックポイントを読み込む（なければNone）"""
+        path = self._path(phase_name)
+        try:
+            data = memoryview(path.read_bytes())
+            (header_size,) = _LENGTH.unpack_from(data, 0)
+            header = json.loads(bytes(data[_LENGTH.size:_LENGTH.size + header_size]))
+            if header.get('key') != key:
+                return None
+            schedule = Schedule.from_bytes(data[_LENGTH.size + header_size:])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error, DataLoadingError) as e:
+            self.logger.warning(f"チェックポイントを読み込めません ({phase_name}): {e}")
+            return None
+        return schedule, header.get('statistics', {})
+    
+    def find_latest(self, phase_names: Sequence[str], keys: Sequence[str]) -> Optional[Tuple[int, Schedule, Dict[str, Any]]]:
+        """キーが一致する最も後ろのフェーズのチェックポイントを探す
+        
+        Returns:
+            (フェーズの添字, スケジュール, 統計情報)、再利用できるものがなければNone
+        """
+        for index in range(len(phase_names) - 1, -1, -1):
+            loaded = self.load(phase_names[index], keys[index])
+            if loaded is not None:
+                return (index,) + loaded
+        return None
+    
+    def _path(self, phase_name: str) -> Path:
+        return self.checkpoint_dir / f"{phase_name}.ckpt"
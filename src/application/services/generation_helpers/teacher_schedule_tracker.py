@@ -0,0 +1,55 @@
+"""教師の占有状況ビュー
+
+生成戦略が教師名・曜日・時限で教師の空きを問い合わせるためのビューです。
+占有状況はScheduleの教員インデックスをそのまま参照するため、
+割り当て・削除のたびにトラッカー側を更新する必要はありません。
+"""
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+from ....domain.value_objects.time_slot import TimeSlot, ClassReference, Teacher
+
+if TYPE_CHECKING:
+    from ....domain.entities.schedule import Schedule
+
+
+class TeacherScheduleTracker:
+    """Scheduleの教員インデックスを教師名で引くビュー"""
+    
+    # is_joint=True の問い合わせは5組の合同授業として扱う
+    _GRADE5_CLASS = ClassReference(1, 5)
+    
+    def __init__(self, schedule: Optional['Schedule'] = None):
+        self.schedule = schedule
+    
+    def bind(self, schedule: 'Schedule') -> None:
+        """参照するスケジュールを設定"""
+        self.schedule = schedule
+    
+    def mark_unavailable(self, teacher: str, day: str, period: int, assigned_class: str,
+                         subject: str, is_joint: bool = False) -> None:
+        """教師の時間を使用済みにマーク
+        
+        占有状況はScheduleへの割り当てで更新されるため、何もしない（互換用）。
+        """
+    
+    def is_available(self, teacher: str, day: str, period: int, is_joint: bool = False) -> bool:
+        """教師が利用可能か確認（is_joint なら5組の合同授業同士の重複は許可）"""
+        if self.schedule is None:
+            return True
+        class_ref = self._GRADE5_CLASS if is_joint else None
+        return self.schedule.is_teacher_free(TimeSlot(day, period), Teacher(teacher), class_ref)
+    
+    def get_daily_load(self, teacher: str, day: str) -> int:
+        """教師がその曜日に授業を持っているコマ数"""
+        if self.schedule is None:
+            return 0
+        return self.schedule.get_teacher_daily_load(Teacher(teacher), day)
+    
+    def get_conflicts(self) -> List[Tuple[str, str, int, List[str]]]:
+        """教師の重複を (教師名, 曜日, 時限, クラス名) で取得（合同授業を除く）"""
+        if self.schedule is None:
+            return []
+        return [
+            (teacher.name, time_slot.day, time_slot.period, [str(c) for c in classes])
+            for time_slot, teacher, classes in self.schedule.get_teacher_conflicts()
+        ]
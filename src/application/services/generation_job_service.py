@@ -0,0 +1,480 @@
+"""時間割生成・検証ジョブの非同期実行（Webエディタ用）
+
+Webエディタから受け付けた生成・検証をジョブとしてキューに積み、すぐにジョブIDを返します。
+ジョブは設定・学校データ・生成処理のモジュールを起動時に読み込んでおいたワーカープロセスで
+実行するため、リクエストごとのインタプリタ起動とデータの読み込み直しが発生しません。
+
+- 進捗（フェーズ、現在の違反数、これまでの最少違反数）はイベントとして記録し、
+  Server-Sent Events の形式で順に取り出せる
+- 入力（リクエスト内容・設定ファイルの内容・入力CSV）のハッシュが同じジョブは、
+  実行中なら同じジョブを、完了済みなら保存済みの結果をすぐに返す
+
+ワーカーはデーモンでないプロセス（ProcessPoolExecutor）なので、ジョブの中で
+ポートフォリオ戦略などがさらにプロセスプールを使うこともできます。
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# ジョブの種類
+JOB_GENERATE = 'generate'
+JOB_VALIDATE = 'validate'
+
+# ジョブの状態
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# 生成ジョブの既定の戦略（従来の /api/run-timetable と同じ）
+DEFAULT_STRATEGY = 'ultrathink'
+
+# 進捗の通知先（フェーズ名, 詳細）
+ProgressReporter = Callable[[str, Dict[str, Any]], None]
+
+
+@dataclass
+class JobEvent:
+    """ジョブのイベント（queued / progress / done / failed）"""
+    seq: int
+    event: str
+    data: Dict[str, Any]
+
+    def to_sse(self) -> str:
+        """Server-Sent Events の1件分"""
+        payload = json.dumps(self.data, ensure_ascii=False, default=str)
+        return f"id: {self.seq}\nevent: {self.event}\ndata: {payload}\n\n"
+
+
+@dataclass
+class GenerationJob:
+    """生成・検証ジョブ"""
+    job_id: str
+    kind: str
+    params: Dict[str, Any]
+    input_hash: str
+    status: str = STATUS_QUEUED
+    # 最新の進捗（phase, step, total, violations, best_violations）
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # 同じ入力の保存済みの結果を返したか
+    cached: bool = False
+    events: List[JobEvent] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (STATUS_DONE, STATUS_FAILED)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            'jobId': self.job_id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': dict(self.progress),
+            'cached': self.cached,
+            'error': self.error,
+            'createdAt': self.created_at,
+            'finishedAt': self.finished_at,
+        }
+        if include_result:
+            data['result'] = self.result
+        return data
+
+
+# ========== ワーカー ==========
+
+# ワーカープロセス内の共有状態（_init_worker で設定）
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(events) -> None:
+    """ワーカープロセスの初期化（プロセスごとに一度だけ呼ばれる）
+
+    設定・学校データを読み込み、生成・検証のモジュールをインポートしておく。
+    """
+    _worker['events'] = events
+    try:
+        from ..use_cases import generate_schedule_use_case_refactored, validate_schedule_use_case  # noqa: F401
+        from ...domain.interfaces.repositories import ISchoolRepository
+        from ...infrastructure.di_container import get_config_loader, get_container
+
+        get_config_loader().initialize_validators()
+        get_container().resolve(ISchoolRepository).load_school_data()
+    except Exception as e:
+        # 読み込みに失敗してもジョブの実行時に改めて読み込む
+        logging.getLogger(__name__).warning(f"ワーカーの事前読み込みに失敗しました: {e}")
+
+
+def _warm_up() -> int:
+    """ワーカーの起動を待つための空のジョブ"""
+    return len(_worker)
+
+
+def _run_job(job_id: str, kind: str, params: Dict[str, Any]) -> None:
+    """ジョブを実行し、進捗・結果をイベントキューに送る
+
+    結果もキューで送るため、進捗と完了の順序が入れ替わらない。
+    """
+    events = _worker['events']
+
+    def report(phase: str, data: Dict[str, Any]) -> None:
+        events.put((job_id, 'progress', dict(data, phase=phase)))
+
+    events.put((job_id, 'started', {}))
+    try:
+        result = JOB_RUNNERS[kind](params, report)
+    except Exception as e:
+        events.put((job_id, STATUS_FAILED, {'error': f"{type(e).__name__}: {e}"}))
+    else:
+        events.put((job_id, STATUS_DONE, result))
+
+
+def _run_generate(params: Dict[str, Any], report: ProgressReporter) -> Dict[str, Any]:
+    """時間割を生成（CLIの generate と同じ入出力ファイルを使う）"""
+    from ..use_cases.request_models import GenerateScheduleRequest
+    from ..use_cases.use_case_factory import UseCaseFactory
+    from ...infrastructure.config.path_config import path_config
+
+    output_path = path_config.default_output_csv
+    request = GenerateScheduleRequest(
+        base_timetable_file=str(path_config.base_timetable_csv),
+        desired_timetable_file=str(path_config.input_csv),
+        followup_prompt_file=str(path_config.followup_csv),
+        output_file=str(output_path),
+        data_directory=path_config.data_dir,
+        strategy=params.get('strategy', DEFAULT_STRATEGY),
+        max_iterations=int(params.get('max_iterations', 100)),
+        incremental=bool(params.get('incremental', False)),
+        progress_callback=report
+    )
+    result = UseCaseFactory.create_generate_schedule_use_case().execute(request)
+    return {
+        'success': result.success,
+        'message': result.message,
+        'violations_count': result.violations_count,
+        'execution_time': result.execution_time,
+        'output_path': str(output_path),
+        'output_csv': output_path.read_text(encoding='utf-8') if output_path.exists() else None,
+    }
+
+
+def _run_validate(params: Dict[str, Any], report: ProgressReporter) -> Dict[str, Any]:
+    """時間割を検証（params['csv'] を省略すると現在の出力を検証）"""
+    from ..use_cases.request_models import ValidateScheduleRequest
+    from ..use_cases.validate_schedule_use_case import ValidateScheduleUseCase
+    from ...infrastructure.config.path_config import path_config
+
+    report("検証", {'step': 1, 'total': 1})
+    csv_text = params.get('csv')
+    if csv_text is None:
+        schedule_path, temporary = path_config.default_output_csv, False
+    else:
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', delete=False) as f:
+            f.write(csv_text)
+        schedule_path, temporary = Path(f.name), True
+    try:
+        result = ValidateScheduleUseCase().execute(
+            ValidateScheduleRequest(schedule_file=str(schedule_path), data_directory=path_config.data_dir)
+        )
+    finally:
+        if temporary:
+            schedule_path.unlink()
+
+    report("検証", {'step': 1, 'total': 1, 'violations': result.violations_count})
+    return {
+        'success': True,
+        'is_valid': result.is_valid,
+        'message': result.message,
+        'violations_count': result.violations_count,
+        'violations': json.loads(json.dumps(result.violations, ensure_ascii=False, default=str)),
+    }
+
+
+# ジョブの種類 → 実行関数(params, report)
+JOB_RUNNERS: Dict[str, Callable[[Dict[str, Any], ProgressReporter], Dict[str, Any]]] = {
+    JOB_GENERATE: _run_generate,
+    JOB_VALIDATE: _run_validate,
+}
+
+
+# ========== サービス ==========
+
+class GenerationJobService:
+    """生成・検証ジョブを事前読み込み済みのワーカープロセスで非同期に実行する"""
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_cached_results: int = 32,
+        input_files: Optional[Callable[[str, Dict[str, Any]], List[Path]]] = None,
+        on_output_written: Optional[Callable[[Path], None]] = None
+    ):
+        """
+        Args:
+            max_workers: ワーカープロセス数（生成ジョブは同じ出力ファイルに書くため既定は1）
+            max_cached_results: 入力ハッシュごとに保存する完了済みの結果の数
+            input_files: ジョブの入力ファイルを返す関数（省略時は input.csv・Follow-up.csv など）
+            on_output_written: 生成ジョブの完了・保存済みの結果の復元で出力ファイルが
+                書き換わったときに、そのパスを渡して呼ぶ関数（編集中の内容の破棄など）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.max_cached_results = max_cached_results
+        self.input_files = input_files or _default_input_files
+        self.on_output_written = on_output_written
+        self._condition = threading.Condition()
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._inflight: Dict[str, GenerationJob] = {}
+        self._results: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._events = None
+        self._listener: Optional[threading.Thread] = None
+
+    # ----- ライフサイクル -----
+
+    def start(self) -> 'GenerationJobService':
+        """ワーカープロセスを起動し、事前読み込みが終わるまで待つ"""
+        if self._executor is not None:
+            return self
+        context = multiprocessing.get_context()
+        self._events = context.Queue()
+        self._executor = ProcessPoolExecutor(
+            self.max_workers, mp_context=context,
+            initializer=_init_worker, initargs=(self._events,)
+        )
+        self._listener = threading.Thread(target=self._listen, name="generation-job-events", daemon=True)
+        self._listener.start()
+        for future in [self._executor.submit(_warm_up) for _ in range(self.max_workers)]:
+            future.result()
+        self.logger.info(f"生成ジョブのワーカーを起動しました: {self.max_workers}プロセス")
+        return self
+
+    def shutdown(self) -> None:
+        """ワーカープロセスを終了（実行中のジョブは完了を待つ）"""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True)
+        self._events.put(None)
+        self._listener.join()
+        self._executor = None
+
+    def __enter__(self) -> 'GenerationJobService':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    # ----- ジョブ -----
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> GenerationJob:
+        """ジョブを受け付けてすぐに返す
+
+        同じ入力のジョブが実行中ならそのジョブを、完了済みなら保存済みの結果を持つ
+        完了状態のジョブを返す。
+        """
+        if kind not in JOB_RUNNERS:
+            raise ValueError(f"不明なジョブの種類です: {kind}")
+        params = dict(params or {})
+        input_hash = self._input_hash(kind, params)
+        self.start()
+
+        with self._condition:
+            running = self._inflight.get(input_hash)
+            if running is not None:
+                return running
+
+            job = GenerationJob(uuid.uuid4().hex, kind, params, input_hash)
+            self._jobs[job.job_id] = job
+            cached = self._results.get(input_hash)
+            if cached is not None:
+                self._results.move_to_end(input_hash)
+                job.cached = True
+                self._restore_output(cached)
+                self._finish(job, STATUS_DONE, cached)
+                return job
+
+            self._inflight[input_hash] = job
+            self._append_event(job, STATUS_QUEUED, {'jobId': job.job_id})
+
+        future = self._executor.submit(_run_job, job.job_id, kind, params)
+        future.add_done_callback(lambda f, job=job: self._on_future_done(job, f))
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._condition:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> GenerationJob:
+        """ジョブの完了を待つ"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            job = self._require(job_id)
+            while not job.is_finished:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"ジョブが時間内に完了しませんでした: {job_id}")
+                self._condition.wait(remaining)
+            return job
+
+    def iter_events(self, job_id: str, after: int = 0, heartbeat: Optional[float] = None) -> Iterator[Optional[JobEvent]]:
+        """seq が after より大きいイベントを順に返し、ジョブが完了したら終わる
+
+        heartbeat を指定すると、その秒数イベントがなければ None を返す（接続維持用）。
+        """
+        while True:
+            with self._condition:
+                job = self._require(job_id)
+                pending = [event for event in job.events if event.seq > after]
+                if not pending and not job.is_finished:
+                    self._condition.wait(heartbeat)
+                    pending = [event for event in job.events if event.seq > after]
+                finished = job.is_finished
+            if not pending and not finished:
+                yield None
+                continue
+            for event in pending:
+                after = event.seq
+                yield event
+            if finished and not any(event.seq > after for event in job.events):
+                return
+
+    # ----- 内部処理 -----
+
+    def _require(self, job_id: str) -> GenerationJob:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"ジョブが見つかりません: {job_id}")
+        return job
+
+    def _listen(self) -> None:
+        """ワーカーから届いた進捗・結果をジョブに反映する"""
+        while True:
+            item = self._events.get()
+            if item is None:
+                return
+            job_id, event, data = item
+            with self._condition:
+                job = self._jobs.get(job_id)
+                if job is None or job.is_finished:
+                    continue
+                if event == 'started':
+                    job.status = STATUS_RUNNING
+                elif event == 'progress':
+                    self._update_progress(job, data)
+                    self._append_event(job, 'progress', dict(job.progress))
+                elif event == STATUS_DONE:
+                    self._store_result(job.input_hash, data)
+                    self._notify_output_written(data)
+                    self._finish(job, STATUS_DONE, data)
+                else:
+                    self._finish(job, STATUS_FAILED, error=data.get('error'))
+
+    def _on_future_done(self, job: GenerationJob, future: Future) -> None:
+        """ワーカープロセスが異常終了した場合だけジョブを失敗にする"""
+        error = future.exception()
+        if error is None:
+            return
+        with self._condition:
+            if not job.is_finished:
+                self._finish(job, STATUS_FAILED, error=f"{type(error).__name__}: {error}")
+
+    @staticmethod
+    def _update_progress(job: GenerationJob, data: Dict[str, Any]) -> None:
+        job.status = STATUS_RUNNING
+        job.progress.update(data)
+        violations = data.get('violations')
+        if violations is not None:
+            best = job.progress.get('best_violations')
+            job.progress['best_violations'] = violations if best is None else min(best, violations)
+
+    def _finish(
+        self,
+        job: GenerationJob,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """（ロック取得済みで呼ぶ）ジョブを完了状態にして待機中の呼び出し元に知らせる"""
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        self._inflight.pop(job.input_hash, None)
+        if status == STATUS_DONE:
+            self._append_event(job, STATUS_DONE, {'jobId': job.job_id, 'cached': job.cached, 'result': result})
+        else:
+            self._append_event(job, STATUS_FAILED, {'jobId': job.job_id, 'error': error})
+            self.logger.warning(f"ジョブが失敗しました ({job.kind} {job.job_id}): {error}")
+
+    def _append_event(self, job: GenerationJob, event: str, data: Dict[str, Any]) -> None:
+        job.events.append(JobEvent(len(job.events) + 1, event, data))
+        self._condition.notify_all()
+
+    def _store_result(self, input_hash: str, result: Dict[str, Any]) -> None:
+        # 完了したジョブは違反が残っていても保存する（success は違反0件の意味）。
+        # 例外で失敗したジョブは 'failed' になりここには来ないため、次回はやり直す
+        self._results[input_hash] = result
+        self._results.move_to_end(input_hash)
+        while len(self._results) > self.max_cached_results:
+            self._results.popitem(last=False)
+
+    def _restore_output(self, result: Dict[str, Any]) -> None:
+        """保存済みの生成結果を返すときは、出力ファイルもその内容に戻す"""
+        output_path, content = result.get('output_path'), result.get('output_csv')
+        if not output_path or content is None:
+            return
+        path = Path(output_path)
+        if not path.exists() or path.read_text(encoding='utf-8') != content:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding='utf-8')
+        self._notify_output_written(result)
+
+    def _notify_output_written(self, result: Dict[str, Any]) -> None:
+        """（ロック取得済みで呼ぶ）出力ファイルを書いた結果なら on_output_written に知らせる
+
+        ジョブの完了を待っている呼び出し元より先に呼ぶため、完了を受け取った時点で
+        出力ファイルの編集中の内容は破棄されている。
+        """
+        output_path = result.get('output_path') if isinstance(result, dict) else None
+        if not output_path or self.on_output_written is None:
+            return
+        try:
+            self.on_output_written(Path(output_path))
+        except Exception as e:
+            self.logger.warning(f"出力ファイル更新の通知に失敗しました ({output_path}): {e}")
+
+    def _input_hash(self, kind: str, params: Dict[str, Any]) -> str:
+        """リクエスト内容・設定ファイルの内容・入力ファイルから計算したハッシュ"""
+        from ...infrastructure.di_container import get_config_snapshot
+
+        digest = hashlib.sha256(json.dumps([kind, params], sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        snapshot = get_config_snapshot()
+        digest.update((snapshot.content_hash if snapshot else '').encode('utf-8'))
+        for path in self.input_files(kind, params):
+            digest.update(str(path).encode('utf-8') + b'\0')
+            digest.update(hashlib.sha256(path.read_bytes()).digest() if path.exists() else b'-')
+        return digest.hexdigest()
+
+
+def _default_input_files(kind: str, params: Dict[str, Any]) -> List[Path]:
+    """ジョブの結果を左右する入力ファイル"""
+    from ...infrastructure.config.path_config import path_config
+
+    files = [path_config.input_csv, path_config.followup_csv]
+    # 差分生成と、CSVを指定しない検証は現在の出力が入力になる
+    if (kind == JOB_GENERATE and params.get('incremental')) or (kind == JOB_VALIDATE and 'csv' not in params):
+        files.append(path_config.default_output_csv)
+    return files
@@ -33,6 +33,7 @@ class AdvancedCSPStrategy(BaseGenerationStrategy):
     ) -> 'Schedule':
         """高度なCSPアルゴリズムでスケジュールを生成"""
         search_mode = kwargs.get('search_mode', 'standard')
+        resume = kwargs.get('resume', False)
         
         # テスト期間保持チェッカーを初期化
         from ....domain.services.core.test_period_preservation_check import TestPeriodPreservationChecker
@@ -69,8 +70,12 @@ class AdvancedCSPStrategy(BaseGenerationStrategy):
             from ..csp_orchestrator import CSPOrchestrator
             csp_orchestrator = CSPOrchestrator(adapter)
         
+        # フェーズごとのチェックポイントを保存（--resume で再開できるように）
+        from ..generation_helpers.phase_checkpoint import PhaseCheckpointStore
+        csp_orchestrator.checkpoint_store = PhaseCheckpointStore.from_path_config(csp_orchestrator.path_config)
+        
         # 生成実行
-        schedule = csp_orchestrator.generate(school, max_iterations, initial_schedule)
+        schedule = csp_orchestrator.generate(school, max_iterations, initial_schedule, resume=resume)
         
         # テスト期間データ保持チェック（CSP生成後）
         if initial_schedule:
@@ -0,0 +1,120 @@
+"""厳密解法による生成戦略
+
+時間割全体を制約モデル（exact_solver.TimetableModel）に変換し、ローカルのソルバー
+（OR-Tools CP-SAT、無ければ PuLP/CBC）で解きます。
+
+- 学校情報・ロック/固定科目のセル・Follow-upの教員不在・テスト期間・5組の同期・
+  交流学級と自立活動・体育館・標準時数を1つのモデルに入れる
+- 初期スケジュールの割り当てを解のヒントにし、最初の実行可能解を素早く見つけてから
+  制限時間まで目的関数（空き・日内重複・時数の過不足・変更数）を改善する
+- 解が見つからなければ初期スケジュールをそのまま返す
+"""
+import logging
+from typing import Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+from .base_generation_strategy import BaseGenerationStrategy
+
+if TYPE_CHECKING:
+    from ..exact_solver import SolveResult
+    from ....domain.entities.schedule import Schedule
+    from ....domain.entities.school import School
+    from ....domain.value_objects.time_slot import TimeSlot, ClassReference
+
+
+class ExactStrategy(BaseGenerationStrategy):
+    """制約モデルをソルバーで解く厳密解法戦略"""
+
+    def __init__(
+        self,
+        constraint_system,
+        time_limit: float = 60.0,
+        num_workers: Optional[int] = None,
+        backend: str = 'auto'
+    ):
+        """
+        Args:
+            constraint_system: 統一制約システム
+            time_limit: ソルバーの制限時間（秒）
+            num_workers: 探索スレッド数（省略時はCPU数）
+            backend: 'auto' / 'cp-sat' / 'pulp-cbc'
+        """
+        super().__init__(constraint_system)
+        self.logger = logging.getLogger(__name__)
+        self.time_limit = time_limit
+        self.num_workers = num_workers
+        self.backend = backend
+        self.last_result: Optional['SolveResult'] = None
+
+    def get_name(self) -> str:
+        return "exact"
+
+    def generate(
+        self,
+        school: 'School',
+        initial_schedule: Optional['Schedule'] = None,
+        max_iterations: int = 100,
+        **kwargs
+    ) -> 'Schedule':
+        """制約モデルを解いてスケジュールを生成
+
+        max_iterations は使わない（探索の長さは time_limit で決まる）。
+        """
+        from ....domain.entities.schedule import Schedule
+        from ..exact_solver import TimetableModelBuilder, get_backend
+
+        schedule = initial_schedule.fork() if initial_schedule else Schedule()
+        backend = get_backend(self.backend)
+        time_limit = kwargs.get('time_limit', self.time_limit)
+
+        builder = TimetableModelBuilder(
+            school,
+            forbidden_cells=self._load_forbidden_cells(),
+            test_periods=self._load_test_periods(schedule)
+        )
+        model = builder.build(schedule)
+
+        self.logger.info(f"=== 厳密解法を開始: {backend.name}, 制限時間{time_limit}秒 ===")
+        result = backend.solve(model, time_limit, self.num_workers)
+        self.last_result = result
+
+        if not result.has_solution:
+            self.logger.warning(f"解が見つかりませんでした（{result.status}）。初期スケジュールを返します")
+            return schedule
+
+        if result.progress:
+            first_time, first_objective = result.progress[0]
+            self.logger.info(f"最初の解: {first_time:.1f}秒 目的関数値 {first_objective:.0f}")
+        self.logger.info(
+            f"最終解: {result.status} 目的関数値 {result.objective:.0f} "
+            f"(下界 {result.bound if result.bound is not None else '-'}, {result.wall_time:.1f}秒)"
+        )
+        changed = builder.apply(schedule, model, result.values)
+        self.logger.info(f"{changed}セルを変更しました")
+        return schedule
+
+    def _load_forbidden_cells(self) -> Dict[Tuple['TimeSlot', 'ClassReference'], Set[str]]:
+        """登録済みのセル別配置禁止制約から配置禁止セルを取得"""
+        from ....domain.constraints.cell_forbidden_subject_constraint import CellForbiddenSubjectConstraint
+
+        forbidden_cells: Dict[Tuple['TimeSlot', 'ClassReference'], Set[str]] = {}
+        for constraints in getattr(self.constraint_system, 'constraints', {}).values():
+            for constraint in constraints:
+                if isinstance(constraint, CellForbiddenSubjectConstraint):
+                    for cell, names in constraint.forbidden_cells.items():
+                        forbidden_cells.setdefault(cell, set()).update(names)
+        return forbidden_cells
+
+    def _load_test_periods(self, schedule: 'Schedule') -> Set[Tuple[str, int]]:
+        """スケジュールとFollow-up.csvからテスト期間を取得"""
+        test_periods = {
+            (day, period) for day, periods in schedule.test_periods.items() for period in periods
+        }
+        try:
+            from ....infrastructure.di_container import get_followup_parser
+            for test_period in get_followup_parser().parse_test_periods():
+                if hasattr(test_period, 'day') and hasattr(test_period, 'periods'):
+                    for period in test_period.periods:
+                        test_periods.add((test_period.day, period))
+        except Exception as e:
+            self.logger.warning(f"テスト期間情報の読み込みに失敗: {e}")
+        return test_periods
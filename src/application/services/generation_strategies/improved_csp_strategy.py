@@ -48,6 +48,7 @@ class ImprovedCSPStrategy(BaseGenerationStrategy):
         # 改良版コンポーネントを使用
         from ....domain.services.unified_constraint_validator import UnifiedConstraintValidator
         from ..csp_orchestrator import CSPOrchestratorImproved
+        from ..generation_helpers.phase_checkpoint import PhaseCheckpointStore
         
         # 統合制約検証器を作成
         improved_validator = UnifiedConstraintValidator(
@@ -57,8 +58,13 @@ class ImprovedCSPStrategy(BaseGenerationStrategy):
         # 改良版CSPオーケストレーターを作成
         csp_orchestrator = CSPOrchestratorImproved(improved_validator)
         
+        # フェーズごとのチェックポイントを保存（--resume で再開できるように）
+        csp_orchestrator.checkpoint_store = PhaseCheckpointStore.from_path_config(csp_orchestrator.path_config)
+        
         # 生成実行
-        schedule = csp_orchestrator.generate(school, max_iterations, initial_schedule)
+        schedule = csp_orchestrator.generate(
+            school, max_iterations, initial_schedule, resume=kwargs.get('resume', False)
+        )
         
         # テスト期間データ保持チェック（CSP生成後）
         if initial_schedule:
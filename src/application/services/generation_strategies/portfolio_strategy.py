@@ -0,0 +1,321 @@
+"""ポートフォリオ生成戦略
+
+複数の生成アルゴリズムとシードの組み合わせ（メンバー）をプロセスプールで並列に実行し、
+最も制約違反の少ないスケジュールを採用します。
+
+- 各ワーカーには学校情報・制約システム・初期スケジュールを起動時に一度だけ渡す
+- スケジュールはコンパクトなバイナリ形式（Schedule.to_bytes）でやり取りする
+- これまでの最良の違反数（インカンベント）と停止フラグを共有メモリに置き、
+  インカンベントを更新したワーカーだけがスケジュールを返送する
+- 違反0件のスケジュールが見つかった時点で残りのメンバーを打ち切る
+"""
+import logging
+import math
+import multiprocessing
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+
+from .base_generation_strategy import BaseGenerationStrategy
+
+if TYPE_CHECKING:
+    from ....domain.entities.schedule import Schedule
+    from ....domain.entities.school import School
+
+
+# ========== メンバー ==========
+
+@dataclass(frozen=True)
+class PortfolioMember:
+    """ポートフォリオの1メンバー（生成アルゴリズムとシード）"""
+    generator: str
+    seed: int = 0
+
+
+@dataclass
+class PortfolioResult:
+    """メンバーの実行結果
+    
+    schedule_data はインカンベントを更新した場合だけ設定される。
+    """
+    member: PortfolioMember
+    violations: Optional[int] = None
+    schedule_data: Optional[bytes] = None
+    elapsed: float = 0.0
+    skipped: bool = False
+    error: Optional[str] = None
+
+
+# アニーリングのパラメータ
+ANNEALING_STEPS = 300
+ANNEALING_CANDIDATES = 64
+ANNEALING_HARD_WEIGHT = 10.0
+ANNEALING_INITIAL_TEMPERATURE = 5.0
+ANNEALING_COOLING_RATE = 0.98
+
+
+def _run_csp(school, schedule, constraint_system, max_iterations):
+    """CSPOrchestrator（高度なCSP戦略）"""
+    from .advanced_csp_strategy import AdvancedCSPStrategy
+    return AdvancedCSPStrategy(constraint_system).generate(school, schedule, max_iterations)
+
+
+def _run_unified_hybrid_v3(school, schedule, constraint_system, max_iterations):
+    """統一ハイブリッド戦略 V3"""
+    from .unified_hybrid_strategy_v3 import UnifiedHybridStrategyV3
+    return UnifiedHybridStrategyV3(constraint_system).generate(school, schedule, max_iterations)
+
+
+def _run_ultrathink_v14(school, schedule, constraint_system, max_iterations):
+    """Ultrathink Perfect Generator V14"""
+    from ..ultrathink.ultrathink_perfect_generator_v14 import UltrathinkPerfectGeneratorV14
+    return UltrathinkPerfectGeneratorV14().generate(school, [], initial_schedule=schedule)
+
+
+def _run_annealing(school, schedule, constraint_system, max_iterations):
+    """CSPの結果を起点に、一括評価したスワップ候補でシミュレーテッドアニーリング
+    
+    同じクラス内のスワップのみを使うため時数は変わらず、教員重複・日内重複・
+    不在教員を減らす方向に探索する。停止フラグが立てば途中で打ち切る。
+    """
+    from ....domain.entities.schedule_grid import ALL_TIME_SLOTS
+    from ....domain.services.core.batch_move_evaluator import BatchMoveEvaluator
+    
+    schedule = _run_csp(school, schedule, constraint_system, max_iterations)
+    absences = _teacher_absences(school)
+    stop_event = _worker.get('stop_event')
+    temperature = ANNEALING_INITIAL_TEMPERATURE
+    
+    for _ in range(ANNEALING_STEPS):
+        if stop_event is not None and stop_event.is_set():
+            break
+        evaluator = BatchMoveEvaluator(schedule, school, absences)
+        if evaluator.totals()[0] == 0:
+            break
+        
+        candidates = []
+        for _ in range(ANNEALING_CANDIDATES):
+            class_ref = random.choice(evaluator.classes)
+            time_slot1, time_slot2 = random.sample(ALL_TIME_SLOTS, 2)
+            candidates.append((time_slot1, class_ref, time_slot2, class_ref))
+        scores = evaluator.score_swaps(
+            evaluator.encode_cells([(ts1, c1) for ts1, c1, _, _ in candidates]),
+            evaluator.encode_cells([(ts2, c2) for _, _, ts2, c2 in candidates])
+        )
+        ranking = scores.ranking()
+        if len(ranking) == 0:
+            continue
+        
+        index = ranking[0]
+        cost = scores.hard_delta[index] * ANNEALING_HARD_WEIGHT + scores.soft_delta[index]
+        if cost <= 0 or random.random() < math.exp(-cost / temperature):
+            candidate = schedule.fork()
+            try:
+                _apply_swap(candidate, *candidates[index])
+            except Exception:
+                continue
+            schedule = candidate
+        temperature = max(temperature * ANNEALING_COOLING_RATE, 1e-3)
+    
+    return schedule
+
+
+def _teacher_absences(school) -> Dict[str, Set[Tuple[str, int]]]:
+    """学校情報から 教員名 → {(曜日, 時限)} の不在情報を作成"""
+    from ....domain.entities.schedule_grid import ALL_TIME_SLOTS
+    
+    absences: Dict[str, Set[Tuple[str, int]]] = {}
+    for time_slot in ALL_TIME_SLOTS:
+        for teacher in school.get_unavailable_teachers(time_slot.day, time_slot.period):
+            absences.setdefault(teacher.name, set()).add((time_slot.day, time_slot.period))
+    return absences
+
+
+def _apply_swap(schedule, time_slot1, class1, time_slot2, class2) -> None:
+    """2つのセルの割り当てを入れ替える"""
+    from ....domain.value_objects.assignment import Assignment
+    
+    assignment1 = schedule.get_assignment(time_slot1, class1)
+    assignment2 = schedule.get_assignment(time_slot2, class2)
+    schedule.remove_assignment(time_slot1, class1)
+    schedule.remove_assignment(time_slot2, class2)
+    if assignment2:
+        schedule.assign(time_slot1, Assignment(class1, assignment2.subject, assignment2.teacher))
+    if assignment1:
+        schedule.assign(time_slot2, Assignment(class2, assignment1.subject, assignment1.teacher))
+
+
+# 生成アルゴリズム名 → 実行関数(school, schedule, constraint_system, max_iterations)
+PORTFOLIO_GENERATORS: Dict[str, Callable[..., 'Schedule']] = {
+    'csp': _run_csp,
+    'unified_hybrid_v3': _run_unified_hybrid_v3,
+    'ultrathink_v14': _run_ultrathink_v14,
+    'annealing': _run_annealing,
+}
+
+
+# ========== ワーカー ==========
+
+# ワーカープロセス内の共有状態（_init_worker で設定）
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(school, constraint_system, initial_data, max_iterations, best_violations, stop_event):
+    """ワーカープロセスの初期化（プロセスごとに一度だけ呼ばれる）"""
+    _worker.update(
+        school=school,
+        constraint_system=constraint_system,
+        initial_data=initial_data,
+        max_iterations=max_iterations,
+        best_violations=best_violations,
+        stop_event=stop_event,
+    )
+
+
+def _run_member(member: PortfolioMember) -> PortfolioResult:
+    """メンバーを1つ実行し、インカンベントを更新した場合だけスケジュールを返す"""
+    from ....domain.entities.schedule import Schedule
+    
+    if _worker['stop_event'].is_set():
+        return PortfolioResult(member, skipped=True)
+    
+    start_time = time.time()
+    random.seed(member.seed)
+    try:
+        import numpy as np
+        np.random.seed(member.seed)
+    except ImportError:
+        pass
+    
+    try:
+        school = _worker['school']
+        constraint_system = _worker['constraint_system']
+        generator = PORTFOLIO_GENERATORS[member.generator]
+        schedule = generator(
+            school, Schedule.from_bytes(_worker['initial_data']),
+            constraint_system, _worker['max_iterations']
+        )
+        violations = len(constraint_system.validate_schedule(schedule, school).violations)
+    except Exception as e:
+        return PortfolioResult(member, elapsed=time.time() - start_time, error=f"{type(e).__name__}: {e}")
+    
+    best_violations = _worker['best_violations']
+    with best_violations.get_lock():
+        improved = best_violations.value < 0 or violations < best_violations.value
+        if improved:
+            best_violations.value = violations
+    if violations == 0:
+        _worker['stop_event'].set()
+    
+    schedule_data = schedule.to_bytes() if improved else None
+    return PortfolioResult(member, violations, schedule_data, time.time() - start_time)
+
+
+# ========== 戦略 ==========
+
+class PortfolioStrategy(BaseGenerationStrategy):
+    """複数の生成アルゴリズム・シードを並列に実行するポートフォリオ戦略"""
+    
+    DEFAULT_MEMBERS: Tuple[PortfolioMember, ...] = (
+        PortfolioMember('csp', 0),
+        PortfolioMember('unified_hybrid_v3', 0),
+        PortfolioMember('ultrathink_v14', 0),
+        PortfolioMember('annealing', 0),
+        PortfolioMember('csp', 1),
+        PortfolioMember('unified_hybrid_v3', 1),
+        PortfolioMember('annealing', 1),
+        PortfolioMember('unified_hybrid_v3', 2),
+    )
+    
+    def __init__(
+        self,
+        constraint_system,
+        members: Optional[Sequence[PortfolioMember]] = None,
+        max_workers: Optional[int] = None,
+        time_limit: float = 300.0
+    ):
+        super().__init__(constraint_system)
+        self.logger = logging.getLogger(__name__)
+        self.members = list(members or self.DEFAULT_MEMBERS)
+        self.max_workers = max_workers
+        self.time_limit = time_limit
+        self.results: List[PortfolioResult] = []
+    
+    def get_name(self) -> str:
+        return "portfolio"
+    
+    def generate(
+        self,
+        school: 'School',
+        initial_schedule: Optional['Schedule'] = None,
+        max_iterations: int = 100,
+        **kwargs
+    ) -> 'Schedule':
+        """全メンバーを並列に実行し、最も違反の少ないスケジュールを返す"""
+        from ....domain.entities.schedule import Schedule
+        
+        initial_data = (initial_schedule or Schedule()).to_bytes()
+        workers = self.max_workers or min(len(self.members), os.cpu_count() or 1)
+        self.logger.info(
+            f"=== ポートフォリオ戦略を開始: メンバー{len(self.members)}件, ワーカー{workers}プロセス ==="
+        )
+        
+        context = multiprocessing.get_context()
+        best_violations = context.Value('i', -1)
+        stop_event = context.Event()
+        self.results = []
+        best: Optional[PortfolioResult] = None
+        deadline = time.time() + self.time_limit
+        
+        pool = context.Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(school, self.constraint_system, initial_data,
+                      max_iterations, best_violations, stop_event)
+        )
+        try:
+            iterator = pool.imap_unordered(_run_member, self.members)
+            for _ in self.members:
+                try:
+                    result = iterator.next(timeout=max(deadline - time.time(), 0))
+                except multiprocessing.TimeoutError:
+                    self.logger.warning(f"制限時間（{self.time_limit}秒）に達したため打ち切ります")
+                    break
+                
+                self.results.append(result)
+                self._log_result(result)
+                if result.schedule_data is not None and (
+                    best is None or result.violations < best.violations
+                ):
+                    best = result
+                if result.violations == 0:
+                    self.logger.info("違反0件のスケジュールが見つかったため、残りのメンバーを打ち切ります")
+                    break
+        finally:
+            stop_event.set()
+            pool.terminate()
+            pool.join()
+        
+        if best is None:
+            self.logger.warning("ポートフォリオの全メンバーが失敗しました。Advanced CSPで生成します。")
+            from .advanced_csp_strategy import AdvancedCSPStrategy
+            return AdvancedCSPStrategy(self.constraint_system).generate(
+                school, initial_schedule, max_iterations, **kwargs
+            )
+        
+        self.logger.info(
+            f"採用: {best.member.generator} (seed={best.member.seed}), 違反{best.violations}件"
+        )
+        return Schedule.from_bytes(best.schedule_data)
+    
+    def _log_result(self, result: PortfolioResult) -> None:
+        """メンバーの結果をログ出力"""
+        name = f"{result.member.generator} (seed={result.member.seed})"
+        if result.error:
+            self.logger.warning(f"  {name}: エラー {result.error}")
+        elif result.skipped:
+            self.logger.info(f"  {name}: スキップ")
+        else:
+            self.logger.info(f"  {name}: 違反{result.violations}件 ({result.elapsed:.1f}秒)")
@@ -209,7 +209,8 @@ class UltrathinkStrategy(BaseGenerationStrategy):
         self.logger.info("=== Ultrathink V14（最新版）を使用 ===")
         
         generator = UltrathinkPerfectGeneratorV14()
-        schedule = generator.generate(school, initial_schedule)
+        # V14は制約リストを使わない（初期スケジュールはキーワードで渡す）
+        schedule = generator.generate(school, [], initial_schedule=initial_schedule)
         
         self._validate_and_log(schedule, school, "V14")
         return schedule
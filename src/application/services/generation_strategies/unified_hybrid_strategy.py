@@ -6,10 +6,10 @@
 import logging
 from typing import Optional, Dict, List, Set, Tuple, TYPE_CHECKING
 from collections import defaultdict
-from dataclasses import dataclass
 import random
 
 from .base_generation_strategy import BaseGenerationStrategy
+from ..generation_helpers.teacher_schedule_tracker import TeacherScheduleTracker
 
 if TYPE_CHECKING:
     from ....domain.entities.schedule import Schedule
@@ -18,76 +18,6 @@ if TYPE_CHECKING:
     from ....domain.value_objects.assignment import Assignment
 
 
-@dataclass
-class TeacherScheduleSlot:
-    """教師のスケジュールスロット"""
-    is_available: bool = True
-    assigned_class: Optional[str] = None
-    subject: Optional[str] = None
-    is_joint_class: bool = False  # 5組合同授業フラグ
-
-
-class TeacherScheduleTracker:
-    """教師スケジュール追跡システム"""
-    
-    def __init__(self):
-        # 教師名 -> 曜日 -> 時限 -> TeacherScheduleSlot
-        self.schedules: Dict[str, Dict[str, Dict[int, TeacherScheduleSlot]]] = defaultdict(
-            lambda: defaultdict(lambda: defaultdict(TeacherScheduleSlot))
-        )
-        self.teacher_subjects: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
-        self.logger = logging.getLogger(__name__)
-        
-    def mark_unavailable(self, teacher: str, day: str, period: int, assigned_class: str, subject: str, is_joint: bool = False):
-        """教師の時間を使用済みにマーク"""
-        self.schedules[teacher][day][period] = TeacherScheduleSlot(
-            is_available=False,
-            assigned_class=assigned_class,
-            subject=subject,
-            is_joint_class=is_joint
-        )
-        
-    def is_available(self, teacher: str, day: str, period: int) -> bool:
-        """教師が利用可能か確認"""
-        return self.schedules[teacher][day][period].is_available
-        
-    def get_conflicts(self) -> List[Tuple[str, str, int, List[str]]]:
-        """教師の重複を検出"""
-        conflicts = []
-        for teacher, days in self.schedules.items():
-            for day, periods in days.items():
-                for period, slot in periods.items():
-                    if not slot.is_available:
-                        # 同じ時間の他の割り当てを確認
-                        assignments = []
-                        for t, d in self.schedules.items():
-                            if t == teacher and day in d and period in d[day]:
-                                if not d[day][period].is_available:
-                                    assignments.append(d[day][period].assigned_class)
-                        if len(assignments) > 1 and not slot.is_joint_class:
-                            conflicts.append((teacher, day, period, assignments))
-        return conflicts
-    
-    def register_teacher_subjects(self, teacher_mapping: Dict):
-        """教師と科目の対応を登録"""
-        for subject, mapping in teacher_mapping.items():
-            if isinstance(mapping, str):
-                # 単一教師
-                self.teacher_subjects[mapping][subject] = ["all"]
-            elif isinstance(mapping, list):
-                # 複数教師（体育など）
-                for teacher in mapping:
-                    self.teacher_subjects[teacher][subject] = ["all"]
-            elif isinstance(mapping, dict):
-                # 学年・クラス別マッピング
-                for grade, grade_mapping in mapping.items():
-                    if isinstance(grade_mapping, dict):
-                        for class_num, teacher in grade_mapping.items():
-                            self.teacher_subjects[teacher][subject].append(f"{grade}年{class_num}組")
-                    else:
-                        self.teacher_subjects[grade_mapping][subject].append(f"{grade}年")
-
-
 class UnifiedHybridStrategy(BaseGenerationStrategy):
     """統一ハイブリッド生成戦略"""
     
@@ -107,7 +37,6 @@ class UnifiedHybridStrategy(BaseGenerationStrategy):
         
         # 教師マッピング（CLAUDE.mdより）
         self.teacher_mapping = self._load_teacher_mapping()
-        self.teacher_tracker.register_teacher_subjects(self.teacher_mapping)
         
     def get_name(self) -> str:
         return "unified_hybrid"
@@ -134,6 +63,7 @@ class UnifiedHybridStrategy(BaseGenerationStrategy):
             schedule = initial_schedule
         else:
             schedule = Schedule()
+        self.teacher_tracker.bind(schedule)
         
         # 教師不在情報を読み込む
         teacher_absences = self._load_teacher_absences()
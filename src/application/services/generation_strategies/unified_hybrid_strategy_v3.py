@@ -5,10 +5,10 @@
 import logging
 from typing import Optional, Dict, List, Set, Tuple, TYPE_CHECKING
 from collections import defaultdict
-from dataclasses import dataclass
 import random
 
 from .base_generation_strategy import BaseGenerationStrategy
+from ..generation_helpers.teacher_schedule_tracker import TeacherScheduleTracker
 
 if TYPE_CHECKING:
     from ....domain.entities.schedule import Schedule
@@ -18,87 +18,6 @@ if TYPE_CHECKING:
     from ....domain.entities.teacher import Teacher
 
 
-@dataclass
-class TeacherScheduleSlot:
-    """教師のスケジュールスロット"""
-    is_available: bool = True
-    assigned_class: Optional[str] = None
-    subject: Optional[str] = None
-    is_joint_class: bool = False  # 5組合同授業フラグ
-
-
-class TeacherScheduleTracker:
-    """教師スケジュール追跡システム（改良版）"""
-    
-    def __init__(self):
-        # 教師名 -> 曜日 -> 時限 -> TeacherScheduleSlot
-        self.schedules: Dict[str, Dict[str, Dict[int, TeacherScheduleSlot]]] = defaultdict(
-            lambda: defaultdict(lambda: defaultdict(TeacherScheduleSlot))
-        )
-        self.logger = logging.getLogger(__name__)
-        
-    def mark_unavailable(self, teacher: str, day: str, period: int, assigned_class: str, subject: str, is_joint: bool = False):
-        """教師の時間を使用済みにマーク"""
-        if not is_joint or not self.schedules[teacher][day][period].is_available:
-            # 非合同授業または既に使用済みの場合
-            self.schedules[teacher][day][period] = TeacherScheduleSlot(
-                is_available=False,
-                assigned_class=assigned_class,
-                subject=subject,
-                is_joint_class=is_joint
-            )
-        
-    def is_available(self, teacher: str, day: str, period: int, is_joint: bool = False) -> bool:
-        """教師が利用可能か確認"""
-        slot = self.schedules[teacher][day][period]
-        if slot.is_available:
-            return True
-        # 既に使用済みでも、両方が合同授業なら可
-        if is_joint and slot.is_joint_class:
-            return True
-        return False
-        
-    def get_conflicts(self) -> List[Tuple[str, str, int, List[str]]]:
-        """教師の重複を検出（合同授業と交流学級ペアを除外）"""
-        conflicts = []
-        
-        # 交流学級と親学級のマッピング
-        exchange_parent_map = {
-            "1年6組": "1年1組", "1年7組": "1年2組",
-            "2年6組": "2年3組", "2年7組": "2年2組",
-            "3年6組": "3年3組", "3年7組": "3年2組"
-        }
-        
-        # 各教師の各時間をチェック
-        for teacher, days in self.schedules.items():
-            for day, periods in days.items():
-                for period, slot in periods.items():
-                    if not slot.is_available and not slot.is_joint_class:
-                        # この教師・時間の全ての割り当てを収集
-                        assignments_at_time = []
-                        
-                        # 全ての時間割を再チェック
-                        for t, d in self.schedules.items():
-                            if t == teacher and day in d and period in d[day]:
-                                s = d[day][period]
-                                if not s.is_available and s.assigned_class:
-                                    assignments_at_time.append(s.assigned_class)
-                        
-                        # 重複があれば記録（交流学級ペアを除外）
-                        unique_assignments = list(set(assignments_at_time))
-                        if len(unique_assignments) > 1:
-                            # 交流学級ペアかチェック
-                            if len(unique_assignments) == 2:
-                                class1, class2 = unique_assignments[0], unique_assignments[1]
-                                if ((class1 in exchange_parent_map and exchange_parent_map[class1] == class2) or
-                                    (class2 in exchange_parent_map and exchange_parent_map[class2] == class1)):
-                                    continue  # 交流学級ペアは除外
-                            
-                            conflicts.append((teacher, day, period, unique_assignments))
-        
-        return conflicts
-
-
 class DailySubjectTracker:
     """日内科目追跡システム（全フェーズで共有）"""
     
@@ -216,31 +135,11 @@ class UnifiedHybridStrategyV3(BaseGenerationStrategy):
     
     def _initialize_from_existing(self, schedule: 'Schedule', school: 'School'):
         """既存のスケジュールから初期化"""
-        days = ["月", "火", "水", "木", "金"]
-        from ....domain.value_objects.time_slot import TimeSlot
-        
         # 日内科目トラッカーを初期化
         self.daily_tracker.init_from_schedule(schedule, school)
         
-        # 教師スケジュールトラッカーを初期化
-        for day in days:
-            for period in range(1, 7):
-                time_slot = TimeSlot(day, period)
-                
-                for class_ref in school.get_all_classes():
-                    assignment = schedule.get_assignment(time_slot, class_ref)
-                    if assignment and assignment.teacher:
-                        # 5組合同授業かチェック
-                        is_joint = class_ref.class_number == 5
-                        
-                        self.teacher_tracker.mark_unavailable(
-                            assignment.teacher.name,
-                            day,
-                            period,
-                            str(class_ref),
-                            assignment.subject.name,
-                            is_joint
-                        )
+        # 教師の占有状況はスケジュールの教員インデックスを参照する
+        self.teacher_tracker.bind(schedule)
     
     def _place_jiritsu_improved(self, schedule: 'Schedule', school: 'School') -> int:
         """自立活動を配置（改良版）"""
@@ -797,6 +696,7 @@ class UnifiedHybridStrategyV3(BaseGenerationStrategy):
         fixed = 0
         days = ["月", "火", "水", "木", "金"]
         
+        from ....domain.exceptions import TimetableGenerationError
         from ....domain.value_objects.time_slot import TimeSlot
         
         # 各クラス・日の科目を再確認
@@ -823,8 +723,11 @@ class UnifiedHybridStrategyV3(BaseGenerationStrategy):
                             period, assignment = occurrences[i]
                             time_slot = TimeSlot(day, period)
                             
-                            # スロットをクリア
-                            schedule.clear_slot(time_slot, class_ref)
+                            # スロットをクリア（ロック・固定科目のセルは残す）
+                            try:
+                                schedule.remove_assignment(time_slot, class_ref)
+                            except TimetableGenerationError:
+                                continue
                             fixed += 1
                             
                             # 日内科目トラッカーも更新
@@ -276,14 +276,16 @@ class BacktrackJiritsuPlacementService(JiritsuPlacementService):
                 return backtrack(index + 1, current_placed)
             
             # 固定科目保護チェックと配置
+            savepoint = schedule.savepoint()
             try:
                 # 制約チェックをパスしたので配置
                 schedule.assign(slot, jiritsu_assignment)
                 schedule.assign(slot, parent_assignment)
                 used_days.add(slot.day)
             except ValueError as e:
-                # 固定科目保護により配置できない場合
+                # 固定科目保護により配置できない場合（途中まで配置した分も戻す）
                 self.logger.debug(f"固定科目保護により配置不可: {e}")
+                schedule.rollback_to(savepoint)
                 return backtrack(index + 1, current_placed)
             
             # 配置成功、次の要件へ
@@ -294,14 +296,17 @@ class BacktrackJiritsuPlacementService(JiritsuPlacementService):
                 )
                 return True
             
-            # バックトラック: 配置を取り消し
-            schedule.remove_assignment(slot, req.exchange_class)
-            schedule.remove_assignment(slot, req.parent_class)
+            # バックトラック: 配置を取り消し（親学級の元の授業も戻る）
+            schedule.rollback_to(savepoint)
             used_days.remove(slot.day)
             
             return backtrack(index + 1, current_placed)
         
-        backtrack(0, 0)
+        schedule.begin()
+        try:
+            backtrack(0, 0)
+        finally:
+            schedule.commit()
         return placed_count
     
     def _is_teacher_available(self, teacher: Teacher, slot: TimeSlot,
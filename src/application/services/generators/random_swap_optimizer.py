@@ -203,10 +203,6 @@ class RandomSwapOptimizer(LocalSearchOptimizer):
     def _perform_swap(self, schedule: Schedule, school: School,
                      slot1, assignment1, slot2, assignment2) -> bool:
         """実際の交換を実行"""
-        # 一時的に削除
-        schedule.remove_assignment(slot1, assignment1.class_ref)
-        schedule.remove_assignment(slot2, assignment2.class_ref)
-        
         # 新しい割り当てを作成
         new_assignment1 = Assignment(
             assignment1.class_ref, assignment2.subject, assignment2.teacher
@@ -215,18 +211,27 @@ class RandomSwapOptimizer(LocalSearchOptimizer):
             assignment2.class_ref, assignment1.subject, assignment1.teacher
         )
         
-        # 制約チェック
-        if (self.constraint_validator.check_assignment(schedule, school, slot1, new_assignment1) and
-            self.constraint_validator.check_assignment(schedule, school, slot2, new_assignment2)):
-            schedule.assign(slot1, new_assignment1)
-            schedule.assign(slot2, new_assignment2)
-            self.stats['swap_success'] += 1
-            return True
-        else:
+        schedule.begin()
+        try:
+            savepoint = schedule.savepoint()
+            
+            # 一時的に削除
+            schedule.remove_assignment(slot1, assignment1.class_ref)
+            schedule.remove_assignment(slot2, assignment2.class_ref)
+            
+            # 制約チェック
+            if (self.constraint_validator.check_assignment(schedule, school, slot1, new_assignment1) and
+                self.constraint_validator.check_assignment(schedule, school, slot2, new_assignment2)):
+                schedule.assign(slot1, new_assignment1)
+                schedule.assign(slot2, new_assignment2)
+                self.stats['swap_success'] += 1
+                return True
+            
             # 元に戻す
-            schedule.assign(slot1, assignment1)
-            schedule.assign(slot2, assignment2)
+            schedule.rollback_to(savepoint)
             return False
+        finally:
+            schedule.commit()
     
     def _try_jiritsu_swap(self, schedule: Schedule, school: School,
                          slot1, assignment1, slot2, assignment2,
@@ -292,19 +297,21 @@ class RandomSwapOptimizer(LocalSearchOptimizer):
         current_score = self.evaluator.evaluate(schedule, school, [])
         
         # 一時的に交換
-        schedule.remove_assignment(slot1, assignment1.class_ref)
-        schedule.remove_assignment(slot2, assignment2.class_ref)
-        schedule.assign(slot1, assignment2)
-        schedule.assign(slot2, assignment1)
-        
-        # 交換後のスコアを評価
-        new_score = self.evaluator.evaluate(schedule, school, [])
-        
-        # 元に戻す
-        schedule.remove_assignment(slot1, assignment2.class_ref)
-        schedule.remove_assignment(slot2, assignment1.class_ref)
-        schedule.assign(slot1, assignment1)
-        schedule.assign(slot2, assignment2)
+        schedule.begin()
+        try:
+            savepoint = schedule.savepoint()
+            schedule.remove_assignment(slot1, assignment1.class_ref)
+            schedule.remove_assignment(slot2, assignment2.class_ref)
+            schedule.assign(slot1, assignment2)
+            schedule.assign(slot2, assignment1)
+            
+            # 交換後のスコアを評価
+            new_score = self.evaluator.evaluate(schedule, school, [])
+            
+            # 元に戻す
+            schedule.rollback_to(savepoint)
+        finally:
+            schedule.commit()
         
         # 改善量を返す（大きいほど良い）
         return new_score - current_score
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""Follow-up.csvの差分による時間割の部分再生成（generate --incremental）
+
+前回の出力（output.csv）を土台に、前回の生成時から新しく増えた教員不在・会議に
+当たるセルだけを空けて解き直します。それ以外のセルはそのまま残すため、週ごとの
+変更が少なく、生成も全体を解き直すより速く終わります。
+
+- 新しい不在: その教員がそのコマに担当している授業
+- 新しい会議: 設定ファイルの参加教員がそのコマに担当している授業
+- 5組は3クラス、交流学級は親学級と組にして空ける
+- テスト期間のセルはロックして変更しない
+- 不在・会議がなくなった分は空けない（変更を最小にするため）
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from .generation_helpers.followup_delta import FollowUpDelta, FollowUpSnapshot
+from ...domain.entities.schedule import Schedule
+from ...domain.entities.school import School, Teacher
+from ...domain.value_objects.time_slot import TimeSlot, ClassReference
+from ...shared.mixins.validation_mixin import ValidationError
+
+if TYPE_CHECKING:
+    from ...domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+
+Cell = Tuple[TimeSlot, ClassReference]
+
+DEFAULT_FIXED_SUBJECTS = {"欠", "YT", "道", "道徳", "学", "学活", "学総", "総", "総合", "行"}
+
+
+@dataclass
+class IncrementalRegenerationResult:
+    """部分再生成の結果"""
+    delta: FollowUpDelta
+    invalidated_cells: List[Cell] = field(default_factory=list)
+    changed_cells: int = 0
+    repaired: bool = False
+
+
+class IncrementalRegenerationService:
+    """前回の出力を土台に、Follow-upの差分に当たるセルだけを解き直す"""
+
+    def __init__(
+        self,
+        constraint_system: 'UnifiedConstraintSystem',
+        time_limit: float = 10.0,
+        backend: str = 'auto',
+        fixed_subjects: Optional[Iterable[str]] = None,
+        meeting_members: Optional[Dict[str, List[str]]] = None,
+        forbidden_cells: Optional[Dict[Cell, Set[str]]] = None
+    ):
+        """
+        Args:
+            constraint_system: 統一制約システム（セル別の配置禁止を読む）
+            time_limit: 解き直しの制限時間（秒）
+            backend: ソルバー（'auto' / 'cp-sat' / 'pulp-cbc'、無ければスマートバックトラッキング）
+            fixed_subjects: 空けない固定科目（省略時はCSP設定のもの）
+            meeting_members: 会議名 → 参加教員（省略時は設定ファイルの会議情報）
+            forbidden_cells: 追加の配置禁止（セル → 科目名）。今の科目が禁止されたセルも空ける
+        """
+        self.logger = logging.getLogger(__name__)
+        self.constraint_system = constraint_system
+        self.time_limit = time_limit
+        self.backend = backend
+        self.fixed_subjects = set(fixed_subjects) if fixed_subjects is not None else None
+        self.meeting_members = meeting_members
+        self.forbidden_cells = forbidden_cells or {}
+
+    def regenerate(
+        self,
+        school: School,
+        base_schedule: Schedule,
+        snapshot: FollowUpSnapshot,
+        previous: Optional[FollowUpSnapshot]
+    ) -> Tuple[Schedule, IncrementalRegenerationResult]:
+        """差分に当たるセルを空けて解き直す（base_schedule は変更しない）
+
+        Args:
+            school: 学校情報（今週の不在・会議の参加教員を不在として追加する）
+            base_schedule: 前回の出力
+            snapshot: 今週のFollow-up
+            previous: 前回の生成時のFollow-up（なければ今週の全項目を新規として扱う）
+        """
+        from ...domain.services.ultrathink.components.large_neighborhood_search import (
+            LargeNeighborhoodSearchStrategy
+        )
+
+        delta = snapshot.diff(previous)
+        result = IncrementalRegenerationResult(delta)
+        self.logger.info(f"Follow-upの差分: {delta.summary()}")
+
+        schedule = base_schedule.fork()
+        schedule.set_test_periods(snapshot.test_periods)
+        self._apply_unavailability(school, snapshot)
+        self._lock_test_periods(schedule, school, snapshot.test_periods)
+
+        cells = self.find_affected_cells(schedule, school, delta)
+        result.invalidated_cells = sorted(cells, key=_cell_key)
+        if not cells:
+            self.logger.info("解き直すセルはありません")
+            return schedule, result
+
+        for time_slot, class_ref in result.invalidated_cells:
+            if schedule.get_assignment(time_slot, class_ref):
+                schedule.remove_assignment(time_slot, class_ref)
+
+        lns = LargeNeighborhoodSearchStrategy(
+            backend=self.backend, forbidden_cells=self._load_forbidden_cells()
+        )
+        result.repaired = lns.repair(schedule, school, cells, self.time_limit)
+        result.changed_cells = sum(
+            1 for time_slot, class_ref in cells
+            if schedule.get_assignment(time_slot, class_ref)
+            != base_schedule.get_assignment(time_slot, class_ref)
+        )
+        self.logger.info(
+            f"{len(cells)}セルを解き直し、{result.changed_cells}セルを変更しました"
+        )
+        return schedule, result
+
+    def find_affected_cells(
+        self,
+        schedule: Schedule,
+        school: School,
+        delta: FollowUpDelta
+    ) -> Set[Cell]:
+        """新しい不在・会議の教員が担当しているセルと、今の科目が配置禁止になったセルのうち空けてよいもの"""
+        # (曜日, 校時) → そのコマに授業を持てなくなった教員名
+        blocked: Dict[Tuple[str, int], Set[str]] = {}
+        for teacher_name, day, period in delta.added_absences:
+            blocked.setdefault((day, period), set()).add(teacher_name)
+        for meeting_name, day, period in delta.added_meetings:
+            blocked.setdefault((day, period), set()).update(self._get_meeting_members(meeting_name))
+
+        cells: Set[Cell] = set()
+        for (day, period), teacher_names in blocked.items():
+            time_slot = TimeSlot(day, period)
+            for class_ref in school.get_all_classes():
+                assignment = schedule.get_assignment(time_slot, class_ref)
+                if (assignment is not None and assignment.teacher is not None
+                        and assignment.teacher.name.replace("先生", "") in teacher_names):
+                    cells.add((time_slot, class_ref))
+        for (time_slot, class_ref), subject_names in self.forbidden_cells.items():
+            assignment = schedule.get_assignment(time_slot, class_ref)
+            if assignment is not None and assignment.subject.name in subject_names:
+                cells.add((time_slot, class_ref))
+        return {
+            cell for cell in self._expand_linked_cells(cells, school)
+            if self._is_changeable(schedule, *cell)
+        }
+
+    def _is_changeable(self, schedule: Schedule, time_slot: TimeSlot, class_ref: ClassReference) -> bool:
+        """ロックされておらず、固定科目でもないセルか"""
+        if schedule.is_locked(time_slot, class_ref):
+            return False
+        assignment = schedule.get_assignment(time_slot, class_ref)
+        return assignment is None or assignment.subject.name not in self._get_fixed_subjects()
+
+    def _expand_linked_cells(self, cells: Set[Cell], school: School) -> Set[Cell]:
+        """5組は3クラス、交流学級は親学級と組にする"""
+        compiled = school.compile()
+        grade5 = [class_ref for class_ref in compiled.classes if class_ref.class_number == 5]
+        children: Dict[ClassReference, List[ClassReference]] = {}
+        for child, parent in compiled.exchange_parents.items():
+            children.setdefault(parent, []).append(child)
+
+        expanded = set(cells)
+        for time_slot, class_ref in cells:
+            if class_ref in grade5:
+                expanded.update((time_slot, other) for other in grade5)
+            parent = compiled.exchange_parents.get(class_ref)
+            if parent is not None:
+                expanded.add((time_slot, parent))
+            expanded.update((time_slot, child) for child in children.get(class_ref, []))
+        return expanded
+
+    def _apply_unavailability(self, school: School, snapshot: FollowUpSnapshot) -> None:
+        """今週の不在と会議の参加教員を学校情報に不在として追加"""
+        unavailable = set(snapshot.absences)
+        for meeting_name, day, period in snapshot.meetings:
+            unavailable.update(
+                (teacher_name, day, period) for teacher_name in self._get_meeting_members(meeting_name)
+            )
+        for teacher_name, day, period in unavailable:
+            try:
+                teacher = Teacher(teacher_name)
+            except ValidationError:
+                # 自然文の解析で教員名として切り出された別の語句
+                self.logger.debug(f"教員名として扱えないためスキップ: {teacher_name}")
+                continue
+            school.set_teacher_unavailable(day, period, teacher)
+
+    def _lock_test_periods(
+        self,
+        schedule: Schedule,
+        school: School,
+        test_periods: Iterable[Tuple[str, int]]
+    ) -> None:
+        for day, period in test_periods:
+            time_slot = TimeSlot(day, period)
+            for class_ref in school.get_all_classes():
+                if schedule.get_assignment(time_slot, class_ref):
+                    schedule.lock_cell(time_slot, class_ref)
+
+    def _get_fixed_subjects(self) -> Set[str]:
+        if self.fixed_subjects is None:
+            try:
+                from ...infrastructure.di_container import get_csp_configuration
+                params = get_csp_configuration().get_all_parameters()
+                self.fixed_subjects = set(params.get('fixed_subjects', DEFAULT_FIXED_SUBJECTS))
+            except Exception as e:
+                self.logger.warning(f"固定科目の設定を読み込めません: {e}")
+                self.fixed_subjects = set(DEFAULT_FIXED_SUBJECTS)
+        return self.fixed_subjects
+
+    def _get_meeting_members(self, meeting_name: str) -> List[str]:
+        if self.meeting_members is None:
+            self.meeting_members = {}
+            try:
+                # 設定アダプターの会議情報には参加者が無いため meeting_members.csv から読む
+                from ...infrastructure.config.path_config import path_config
+                from ...infrastructure.repositories.config_repository import ConfigRepository
+                for name, members in ConfigRepository(path_config.config_dir).load_meeting_info().values():
+                    self.meeting_members.setdefault(name, []).extend(members)
+            except Exception as e:
+                self.logger.warning(f"会議情報を読み込めません: {e}")
+        return self.meeting_members.get(meeting_name, [])
+
+    def _load_forbidden_cells(self) -> Dict[Cell, Set[str]]:
+        """登録済みのセル別配置禁止制約と追加の配置禁止から配置禁止セルを取得"""
+        from ...domain.constraints.cell_forbidden_subject_constraint import CellForbiddenSubjectConstraint
+
+        forbidden_cells: Dict[Cell, Set[str]] = {}
+        for constraints in getattr(self.constraint_system, 'constraints', {}).values():
+            for constraint in constraints:
+                if isinstance(constraint, CellForbiddenSubjectConstraint):
+                    for cell, names in constraint.forbidden_cells.items():
+                        forbidden_cells.setdefault(cell, set()).update(names)
+        for cell, names in self.forbidden_cells.items():
+            forbidden_cells.setdefault(cell, set()).update(names)
+        return forbidden_cells
+
+
+def _cell_key(cell: Cell) -> Tuple:
+    time_slot, class_ref = cell
+    return ("月火水木金".index(time_slot.day), time_slot.period, class_ref.grade, class_ref.class_number)
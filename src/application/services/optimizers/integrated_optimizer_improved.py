@@ -1,20 +1,32 @@
 """統合最適化サービス - 交流学級同期を改善"""
 import logging
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional, TYPE_CHECKING
 from collections import defaultdict
 from ....domain.entities.schedule import Schedule
 from ....domain.entities.school import School
+from ....domain.exceptions import TimetableGenerationError
 from ....domain.value_objects.time_slot import TimeSlot, ClassReference, Subject
 from ....domain.value_objects.assignment import Assignment
 from ....domain.interfaces.followup_parser import IFollowUpParser
 
+if TYPE_CHECKING:
+    from ....domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+
 
 class IntegratedOptimizerImproved:
     """統合最適化サービス - 交流学級同期を強化"""
     
-    def __init__(self, followup_parser: IFollowUpParser = None):
+    def __init__(
+        self,
+        followup_parser: IFollowUpParser = None,
+        constraint_system: Optional['UnifiedConstraintSystem'] = None
+    ):
         self.logger = logging.getLogger(__name__)
         
+        # 指定された場合、科目の入れ替えごとに変更箇所だけを再検証し、違反が増える入れ替えは戻す
+        self.constraint_system = constraint_system
+        self._evaluator = None
+        
         # 固定科目
         self.fixed_subjects = {"欠", "YT", "道", "学", "学活", "学総", "総", "総合", "行", "行事", "テスト", "技家"}
         
@@ -74,6 +86,22 @@ class IntegratedOptimizerImproved:
             'exchange_sync_fixed': 0
         }
         
+        if self.constraint_system is not None:
+            self._evaluator = self.constraint_system.create_incremental_evaluator(school)
+            self._evaluator.attach(schedule)
+            results['constraint_score_before'] = self._evaluator.score
+        try:
+            self._run_optimization(schedule, school, results)
+        finally:
+            if self._evaluator is not None:
+                results['constraint_score_after'] = self._evaluator.score
+                self._evaluator.detach()
+                self._evaluator = None
+        
+        return results
+    
+    def _run_optimization(self, schedule: Schedule, school: School, results: Dict[str, int]) -> None:
+        """テスト期間の保護・交流学級の同期・空きコマ埋め・標準時数の最適化を順に実行"""
         # 初期状態の分析
         initial_analysis = self._analyze_schedule(schedule, school)
         results['violations_before'] = initial_analysis['total_violations']
@@ -105,8 +133,6 @@ class IntegratedOptimizerImproved:
                         f"空きコマ埋め={results['empty_slots_filled']}個, "
                         f"標準時数改善={results['standard_hours_improved']}件, "
                         f"交流学級同期修正={results['exchange_sync_fixed']}件 ===")
-        
-        return results
     
     def _analyze_schedule(self, schedule: Schedule, school: School) -> Dict[str, int]:
         """スケジュールの現状を分析（交流学級同期違反を含む）"""
@@ -187,10 +213,10 @@ class IntegratedOptimizerImproved:
                         )
                         
                         schedule.remove_assignment(time_slot, exchange_class)
-                        if schedule.assign(time_slot, new_assignment):
-                            self.logger.info(f"交流学級同期修正: {exchange_class} {time_slot} "
-                                           f"{exchange_assignment.subject.name} → {parent_assignment.subject.name}")
-                            fixed_count += 1
+                        schedule.assign(time_slot, new_assignment)
+                        self.logger.info(f"交流学級同期修正: {exchange_class} {time_slot} "
+                                       f"{exchange_assignment.subject.name} → {parent_assignment.subject.name}")
+                        fixed_count += 1
         
         return fixed_count
     
@@ -292,21 +318,25 @@ class IntegratedOptimizerImproved:
                             teacher = self._get_teacher_for_subject(school, class_ref, subject)
                             if teacher:
                                 assignment = Assignment(class_ref, subject, teacher)
-                                if schedule.assign(time_slot, assignment):
-                                    filled_count += 1
-                                    current_hours[subject] = current_hours.get(subject, 0) + 1
-                                    # shortageを更新
-                                    for i, (s, sh, p) in enumerate(needed_subjects):
-                                        if s == subject:
-                                            needed_subjects[i] = (s, sh - 1, p)
-                                            break
-                                    placed = True
-                                    
-                                    # 交流学級の同期処理
-                                    self._sync_exchange_class_if_needed(schedule, school, class_ref, time_slot, assignment)
-                                    
-                                    self.logger.info(f"空きコマを埋めました: {class_ref} {time_slot} → {subject.name}")
-                                    break
+                                try:
+                                    schedule.assign(time_slot, assignment)
+                                except TimetableGenerationError as e:
+                                    self.logger.debug(f"{class_ref} {time_slot}: {subject.name}を配置できません: {e}")
+                                    continue
+                                filled_count += 1
+                                current_hours[subject] = current_hours.get(subject, 0) + 1
+                                # shortageを更新
+                                for i, (s, sh, p) in enumerate(needed_subjects):
+                                    if s == subject:
+                                        needed_subjects[i] = (s, sh - 1, p)
+                                        break
+                                placed = True
+                                
+                                # 交流学級の同期処理
+                                self._sync_exchange_class_if_needed(schedule, school, class_ref, time_slot, assignment)
+                                
+                                self.logger.info(f"空きコマを埋めました: {class_ref} {time_slot} → {subject.name}")
+                                break
         
         self.logger.info(f"空きコマ埋め完了: {empty_slots_found}個中{filled_count}個を埋めました")
         return filled_count
@@ -378,13 +408,11 @@ class IntegratedOptimizerImproved:
         if not teacher:
             return False
         
-        # 教師の重複チェック（5組は除外）
+        # 教師の重複チェック（5組は除外、教員インデックスで同じ時間の担当を引く）
         if class_ref not in self.grade5_classes:
-            for other_class in school.get_all_classes():
-                if other_class == class_ref or other_class in self.grade5_classes:
-                    continue
-                other_assignment = schedule.get_assignment(time_slot, other_class)
-                if other_assignment and other_assignment.teacher == teacher:
+            for other_assignment in schedule.get_teacher_at_time(time_slot, teacher):
+                if (other_assignment.class_ref != class_ref and
+                        other_assignment.class_ref not in self.grade5_classes):
                     return False
         
         # 1日1コマ制限
@@ -447,8 +475,8 @@ class IntegratedOptimizerImproved:
                     new_assignment = Assignment(exchange_class, assignment.subject, exchange_teacher)
                     if exchange_assignment:
                         schedule.remove_assignment(time_slot, exchange_class)
-                    if schedule.assign(time_slot, new_assignment):
-                        self.logger.info(f"交流学級を同期: {exchange_class} {time_slot} → {assignment.subject.name}")
+                    schedule.assign(time_slot, new_assignment)
+                    self.logger.info(f"交流学級を同期: {exchange_class} {time_slot} → {assignment.subject.name}")
     
     def _optimize_standard_hours(self, schedule: Schedule, school: School) -> int:
         """標準時数を最適化"""
@@ -570,21 +598,68 @@ class IntegratedOptimizerImproved:
                 if assignment and assignment.subject == from_subject:
                     # to_subjectに置換可能かチェック
                     if self._can_place_subject_improved(schedule, school, class_ref, time_slot, to_subject):
-                        # 一時的に削除
-                        schedule.remove_assignment(time_slot, class_ref)
-                        
-                        # 新しい割り当て
                         teacher = self._get_teacher_for_subject(school, class_ref, to_subject)
-                        if teacher:
-                            new_assignment = Assignment(class_ref, to_subject, teacher)
-                            if schedule.assign(time_slot, new_assignment):
-                                swapped += 1
-                                self.logger.debug(f"{class_ref} {time_slot}: {from_subject.name} → {to_subject.name}")
-                                
-                                # 交流学級の同期
-                                self._sync_exchange_class_if_needed(schedule, school, class_ref, time_slot, new_assignment)
-                            else:
-                                # 失敗したら元に戻す
-                                schedule.assign(time_slot, assignment)
+                        if not teacher:
+                            continue
+                        new_assignment = Assignment(class_ref, to_subject, teacher)
+                        if self._replace_assignment(schedule, school, time_slot, assignment, new_assignment):
+                            swapped += 1
+                            self.logger.debug(f"{class_ref} {time_slot}: {from_subject.name} → {to_subject.name}")
         
-        return swapped
\ No newline at end of file
+        return swapped
+    
+    def _replace_assignment(
+        self,
+        schedule: Schedule,
+        school: School,
+        time_slot: TimeSlot,
+        old_assignment: Assignment,
+        new_assignment: Assignment
+    ) -> bool:
+        """セルを置き換えて交流学級を同期する
+        
+        配置できなかった場合や、差分評価で制約違反のスコアが悪化した場合は
+        交流学級も含めて元に戻してFalseを返す。
+        """
+        class_ref = old_assignment.class_ref
+        exchange_class = self.parent_to_exchange.get(class_ref)
+        exchange_before = schedule.get_assignment(time_slot, exchange_class) if exchange_class else None
+        # 直前までの変更を反映したスコア（変更されたスコープだけが再検証される）
+        score_before = self._evaluator.score if self._evaluator is not None else None
+        
+        try:
+            schedule.remove_assignment(time_slot, class_ref)
+            schedule.assign(time_slot, new_assignment)
+            # 交流学級の同期
+            self._sync_exchange_class_if_needed(schedule, school, class_ref, time_slot, new_assignment)
+        except TimetableGenerationError as e:
+            self.logger.debug(f"{class_ref} {time_slot}: 置換できません: {e}")
+            self._restore_cells(schedule, time_slot, old_assignment, exchange_class, exchange_before)
+            return False
+        
+        if score_before is not None and self._evaluator.score > score_before:
+            self.logger.debug(f"{class_ref} {time_slot}: 制約違反が増えるため置換を取り消しました")
+            self._restore_cells(schedule, time_slot, old_assignment, exchange_class, exchange_before)
+            return False
+        return True
+    
+    @staticmethod
+    def _restore_cells(
+        schedule: Schedule,
+        time_slot: TimeSlot,
+        assignment: Assignment,
+        exchange_class: Optional[ClassReference],
+        exchange_assignment: Optional[Assignment]
+    ) -> None:
+        """置換前のセル（と交流学級のセル）に戻す"""
+        cells = [(assignment.class_ref, assignment)]
+        if exchange_class is not None:
+            cells.append((exchange_class, exchange_assignment))
+        for class_ref, previous in cells:
+            current = schedule.get_assignment(time_slot, class_ref)
+            if current == previous:
+                continue
+            if current is not None:
+                schedule.remove_assignment(time_slot, class_ref)
+            if previous is not None:
+                schedule.assign(time_slot, previous)
\ No newline at end of file
@@ -59,7 +59,10 @@ class Question:
 class ImprovedQandAService:
     """改善されたQandAシステムを管理するサービス"""
     
-    def __init__(self, qa_file_path: str = "QandA/QA.txt", metadata_path: str = "QandA/qa_metadata.json"):
+    DEFAULT_QA_FILE = "QandA/QA.txt"
+    DEFAULT_METADATA_PATH = "QandA/qa_metadata.json"
+    
+    def __init__(self, qa_file_path: str = DEFAULT_QA_FILE, metadata_path: str = DEFAULT_METADATA_PATH):
         self.qa_file_path = Path(qa_file_path)
         self.metadata_path = Path(metadata_path)
         self.logger = logging.getLogger(__name__)
@@ -433,8 +436,13 @@ class ImprovedQandAService:
         Returns:
             生成された質問ID
         """
-        # 質問IDを生成
-        q_id = f"Q{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        # 質問IDを生成（同じ秒に複数追加しても上書きしない）
+        base_id = f"Q{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        q_id = base_id
+        suffix = 1
+        while q_id in self.questions:
+            q_id = f"{base_id}_{suffix}"
+            suffix += 1
         
         # 質問オブジェクトを作成
         new_question = Question(
@@ -452,6 +460,27 @@ class ImprovedQandAService:
         self.logger.info(f"新しい質問を追加しました: {q_id} - {question[:50]}...")
         return q_id
     
+    def add_system_question(self, question: str, context: Optional[str] = None) -> Optional[str]:
+        """
+        システム（違反分析・対話セッション）からの質問を追加
+        
+        同じ内容の未回答の質問が既にある場合は追加しない。
+        
+        Returns:
+            追加した質問ID（追加しなかった場合はNone）
+        """
+        for existing in self.get_unanswered_questions():
+            if existing.question == question:
+                return None
+        
+        return self.add_question(
+            question=question,
+            priority=QuestionPriority.HIGH,
+            category="システム生成",
+            context=context,
+            tags=["system"]
+        )
+    
     def answer_question(self, question_id: str, answer: str) -> bool:
         """
         質問に回答を追加し、ステータスを解決済みに変更
@@ -0,0 +1,246 @@
+"""時間割エディタのセル単位の検証（編集ごとの差分検証）
+
+Webエディタで1セルを書き換えるたびに、その編集で増えた違反・解消した違反を返します。
+時間割・学校情報・制約はセッションの開始時に一度だけ読み込み、メモリ上の時間割に
+編集を反映します。検証は IncrementalConstraintEvaluator が編集されたセルを含む
+スコープ（時間枠・クラスの曜日など）だけをやり直すため、1編集あたり数ミリ秒で済みます。
+
+使用例:
+    session = ScheduleEditSession.load(path_config.input_csv)
+    result = session.apply_edit(CellEdit.from_dict(
+        {'class': '1年1組', 'day': '月', 'period': 2, 'subject': '数', 'teacher': '梶永'}
+    ))
+    result.introduced  # この編集で増えた違反（教員重複・日内重複・体育館など）
+    result.resolved    # この編集で解消した違反
+"""
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from ...domain.exceptions import TimetableGenerationError
+from ...domain.value_objects.assignment import Assignment
+from ...domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from ...shared.mixins.validation_mixin import ValidationError
+
+if TYPE_CHECKING:
+    from ...domain.entities.schedule import Schedule
+    from ...domain.entities.school import School
+    from ...domain.services.core.incremental_constraint_evaluator import ViolationChanges
+    from ...domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+
+
+@dataclass(frozen=True)
+class CellEdit:
+    """1セルの編集（subject が None なら空きにする）"""
+    class_ref: ClassReference
+    time_slot: TimeSlot
+    subject: Optional[str] = None
+    # 省略時は学校情報の担当教員
+    teacher: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CellEdit':
+        """エディタからのリクエスト（class は「1年1組」、または grade と class_number）
+
+        存在しないクラス・曜日・時限は ValueError にする。
+        """
+        if 'class' in data:
+            match = re.match(r'\s*(\d+)年(\d+)組\s*$', str(data['class']))
+            if not match:
+                raise ValueError(f"クラス名は「1年1組」の形式で指定してください: {data['class']}")
+            grade, class_number = int(match.group(1)), int(match.group(2))
+        else:
+            grade, class_number = int(data['grade']), int(data['class_number'])
+        subject = (data.get('subject') or '').strip() or None
+        teacher = (data.get('teacher') or '').strip() or None
+        try:
+            return cls(ClassReference(grade, class_number), TimeSlot(data['day'], int(data['period'])),
+                       subject, teacher)
+        except ValidationError as e:
+            raise ValueError(str(e)) from e
+
+
+@dataclass
+class CellEditResult:
+    """セル編集の結果"""
+    accepted: bool
+    edit: CellEdit
+    previous: Optional[Assignment] = None
+    current: Optional[Assignment] = None
+    introduced: List[Dict[str, Any]] = field(default_factory=list)
+    resolved: List[Dict[str, Any]] = field(default_factory=list)
+    violation_count: int = 0
+    score: int = 0
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'accepted': self.accepted,
+            'cell': {
+                'class': str(self.edit.class_ref),
+                'day': self.edit.time_slot.day,
+                'period': self.edit.time_slot.period,
+            },
+            'previous': _assignment_to_dict(self.previous),
+            'current': _assignment_to_dict(self.current),
+            'introduced': self.introduced,
+            'resolved': self.resolved,
+            'violationCount': self.violation_count,
+            'score': self.score,
+            'elapsedMs': round(self.elapsed_ms, 3),
+            'error': self.error,
+        }
+
+
+def _assignment_to_dict(assignment: Optional[Assignment]) -> Optional[Dict[str, Any]]:
+    if assignment is None:
+        return None
+    return {
+        'subject': assignment.subject.name,
+        'teacher': assignment.teacher.name if assignment.teacher else None,
+    }
+
+
+class ScheduleEditSession:
+    """メモリ上の時間割へのセル編集を差分検証するセッション
+
+    Webサーバーのスレッドから同時に呼ばれてもよいよう、編集・参照はロックで直列化する。
+    """
+
+    def __init__(
+        self,
+        school: 'School',
+        schedule: 'Schedule',
+        constraint_system: 'UnifiedConstraintSystem',
+        schedule_path: Optional[Path] = None
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.school = school
+        self.schedule = schedule
+        self.schedule_path = schedule_path
+        # 読み込んだ時点のファイルの更新時刻（CLIの generate などで書き換わったら読み込み直す）
+        self._loaded_mtime = self._file_mtime()
+        self._lock = threading.Lock()
+        self.evaluator = constraint_system.create_incremental_evaluator(school)
+        self.evaluator.attach(schedule)
+
+    @classmethod
+    def load(cls, schedule_file: Path, data_dir: Optional[Path] = None) -> 'ScheduleEditSession':
+        """時間割ファイルと学校情報・制約（validate と同じもの）を読み込んでセッションを開始"""
+        from .constraint_registration_service import ConstraintRegistrationService
+        from .data_loading_service import DataLoadingService
+        from ...domain.constraints.base import ConstraintPriority
+        from ...domain.constraints.exchange_class_sync_constraint import ExchangeClassSyncConstraint
+        from ...domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+        from ...infrastructure.config.path_config import path_config
+
+        data_dir = Path(data_dir) if data_dir is not None else path_config.data_dir
+        data_loading_service = DataLoadingService()
+        school, _ = data_loading_service.load_school_data(data_dir)
+        _, teacher_absences = data_loading_service.load_weekly_requirements(data_dir, school)
+
+        constraint_system = UnifiedConstraintSystem()
+        ConstraintRegistrationService().register_all_constraints(constraint_system, data_dir, teacher_absences)
+        # 交流学級の同期は生成時に保証されるため標準の制約にないが、手で編集すると崩れる
+        registered = [c for constraints in constraint_system.constraints.values() for c in constraints]
+        if not any(isinstance(c, ExchangeClassSyncConstraint) for c in registered):
+            constraint_system.register_constraint(ExchangeClassSyncConstraint(), ConstraintPriority.CRITICAL)
+
+        _, schedule_repo = data_loading_service.get_repositories(data_dir)
+        schedule = schedule_repo.load(str(schedule_file), school)
+        return cls(school, schedule, constraint_system, Path(schedule_file))
+
+    def apply_edit(self, edit: CellEdit) -> CellEditResult:
+        """セルを書き換え、増えた違反・解消した違反を返す
+
+        ロックされたセル・固定科目・テスト期間など、時間割が変更を拒否した場合は
+        accepted=False とその理由を返す（時間割は変わらない）。
+        """
+        start_time = time.perf_counter()
+        with self._lock:
+            # 前回の編集の差分を持ち越さない
+            self.evaluator.refresh()
+            previous = self.schedule.get_assignment(edit.time_slot, edit.class_ref)
+            try:
+                current = self._assignment_for(edit)
+                if current is None:
+                    if previous is not None:
+                        self.schedule.remove_assignment(edit.time_slot, edit.class_ref)
+                else:
+                    self.schedule.assign(edit.time_slot, current)
+            except (TimetableGenerationError, ValidationError, ValueError) as e:
+                self.logger.debug(f"セルの編集を拒否しました ({edit.class_ref} {edit.time_slot}): {e}")
+                return CellEditResult(
+                    False, edit, previous, previous,
+                    violation_count=self.evaluator.violation_count,
+                    score=self.evaluator.score,
+                    elapsed_ms=(time.perf_counter() - start_time) * 1000,
+                    error=str(e)
+                )
+
+            added, resolved = self.evaluator.refresh_changes()
+            return CellEditResult(
+                True, edit, previous,
+                self.schedule.get_assignment(edit.time_slot, edit.class_ref),
+                introduced=self._violations_to_dicts(added),
+                resolved=self._violations_to_dicts(resolved),
+                violation_count=self.evaluator.violation_count,
+                score=self.evaluator.score,
+                elapsed_ms=(time.perf_counter() - start_time) * 1000
+            )
+
+    def is_stale(self) -> bool:
+        """読み込んだ後に時間割ファイルが書き換わったか（セル編集はファイルに保存しない）"""
+        return self.schedule_path is not None and self._file_mtime() != self._loaded_mtime
+
+    def _file_mtime(self) -> Optional[int]:
+        if self.schedule_path is None:
+            return None
+        try:
+            return self.schedule_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def get_violations(self) -> List[Dict[str, Any]]:
+        """現在の違反一覧（エディタの初期表示用）"""
+        with self._lock:
+            return self._violations_to_dicts(self.evaluator.get_violation_entries())
+
+    def _assignment_for(self, edit: CellEdit) -> Optional[Assignment]:
+        """編集内容の割り当て（教員を省略したら学校情報の担当教員）"""
+        if edit.subject is None:
+            return None
+        subject = Subject(edit.subject)
+        if not subject.is_valid_for_class(edit.class_ref):
+            raise ValueError(f"{edit.class_ref}には配置できない教科です: {edit.subject}")
+        if edit.teacher is not None:
+            teacher = Teacher(edit.teacher)
+        else:
+            teacher = self.school.get_assigned_teacher(subject, edit.class_ref)
+        return Assignment(edit.class_ref, subject, teacher)
+
+    @staticmethod
+    def _violations_to_dicts(changes: 'ViolationChanges') -> List[Dict[str, Any]]:
+        """違反をエディタで色付けできる形式に変換"""
+        result = []
+        for constraint, priority, violation in changes:
+            assignment = violation.assignment
+            class_ref = assignment.class_ref if assignment is not None else violation.class_ref
+            time_slot = violation.time_slot
+            result.append({
+                'constraint': constraint.name,
+                'priority': priority.name,
+                'severity': violation.severity,
+                'description': violation.description,
+                'day': time_slot.day if time_slot else None,
+                'period': time_slot.period if time_slot else None,
+                'class': str(class_ref) if class_ref else None,
+                'subject': assignment.subject.name if assignment is not None else None,
+                'teacher': assignment.teacher.name if assignment is not None and assignment.teacher else None,
+            })
+        return result
@@ -17,6 +17,8 @@ from .generation_strategies.unified_hybrid_strategy import UnifiedHybridStrategy
 from .generation_strategies.unified_hybrid_strategy_fixed import UnifiedHybridStrategyFixed
 from .generation_strategies.unified_hybrid_strategy_v2 import UnifiedHybridStrategyV2
 from .generation_strategies.unified_hybrid_strategy_v3 import UnifiedHybridStrategyV3
+from .generation_strategies.portfolio_strategy import PortfolioStrategy
+from .generation_strategies.exact_strategy import ExactStrategy
 from .simple_generator_v2 import SimpleGeneratorV2
 from .generation_helpers.followup_loader import FollowupLoader
 from .generation_helpers.empty_slot_filler import EmptySlotFiller
@@ -76,6 +78,8 @@ class ScheduleGenerationService:
             'improved_csp': ImprovedCSPStrategy(self.constraint_system),
             'grade5_priority': Grade5PriorityStrategy(self.constraint_system),
             'advanced_csp': AdvancedCSPStrategy(self.constraint_system),
+            'portfolio': PortfolioStrategy(self.constraint_system),
+            'exact': ExactStrategy(self.constraint_system),
             'legacy': LegacyStrategy(self.constraint_system)
         }
     
@@ -99,7 +103,8 @@ class ScheduleGenerationService:
         initial_schedule: Optional['Schedule'] = None,
         strategy: str = 'legacy',
         max_iterations: int = 100,
-        search_mode: str = "standard"
+        search_mode: str = "standard",
+        resume: bool = False
     ) -> 'Schedule':
         """スケジュールを生成
         
@@ -113,6 +118,7 @@ class ScheduleGenerationService:
             use_grade5_priority: 5組優先配置アルゴリズムを使用するか
             use_unified_hybrid: 統一ハイブリッドアルゴリズムを使用するか
             search_mode: 探索モード
+            resume: 入力が変わっていないフェーズをチェックポイントから再開するか（CSP系の戦略のみ）
             
         Returns:
             生成されたスケジュール
@@ -152,7 +158,8 @@ class ScheduleGenerationService:
                 school=school,
                 initial_schedule=schedule,
                 max_iterations=max_iterations,
-                search_mode=search_mode
+                search_mode=search_mode,
+                resume=resume
             )
             
             # 統計情報を更新
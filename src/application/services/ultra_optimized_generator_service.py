@@ -147,6 +147,8 @@ class UltraOptimizedGeneratorService:
                 config.optimization_level = level
         if 'enable_learning' in config_dict:
             config.enable_learning = config_dict['enable_learning']
+        if 'nogood_store_path' in config_dict:
+            config.nogood_store_path = config_dict['nogood_store_path']
         if 'time_limit' in config_dict:
             config.time_limit = config_dict['time_limit']
         if 'target_violations' in config_dict:
@@ -348,13 +348,7 @@ class HybridScheduleGeneratorV8(UltraOptimizedScheduleGenerator):
     
     # 必要最小限のヘルパーメソッド
     def _copy_schedule(self, schedule: Schedule) -> Schedule:
-        new_schedule = Schedule()
-        for time_slot, assignment in schedule.get_all_assignments():
-            try:
-                new_schedule.assign(time_slot, assignment)
-            except:
-                pass
-        return new_schedule
+        return schedule.fork()
     
     def _protect_monday_sixth_period(self, schedule: Schedule, school: School):
         pass  # 親クラスで実装
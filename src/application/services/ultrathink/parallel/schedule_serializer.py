@@ -22,54 +22,21 @@ class ScheduleSerializer:
             schedule: シリアライズするスケジュール
             
         Returns:
-            シリアライズされたバイト列
+            シリアライズされたバイト列（ロック・5組ユニット・テスト期間を含むバイナリ形式）
         """
-        data = {
-            'assignments': [],
-            'locked_cells': []
-        }
-        
-        for time_slot, assignment in schedule.get_all_assignments():
-            data['assignments'].append({
-                'day': time_slot.day,
-                'period': time_slot.period,
-                'grade': assignment.class_ref.grade,
-                'class_number': assignment.class_ref.class_number,
-                'subject': assignment.subject.name,
-                'teacher': assignment.teacher.name if assignment.teacher else None
-            })
-        
-        # TODO: ロックされたセルも記録
-        
-        return pickle.dumps(data)
+        return schedule.to_bytes()
     
     @staticmethod
     def deserialize_schedule(data: bytes) -> Schedule:
         """スケジュールをデシリアライズ
         
         Args:
-            data: シリアライズされたバイト列
+            data: シリアライズされたバイト列（memoryviewも可）
             
         Returns:
             復元されたスケジュール
         """
-        schedule = Schedule()
-        schedule_data = pickle.loads(data)
-        
-        for item in schedule_data['assignments']:
-            time_slot = TimeSlot(item['day'], item['period'])
-            class_ref = ClassReference(item['grade'], item['class_number'])
-            subject = Subject(item['subject'])
-            teacher = Teacher(item['teacher']) if item['teacher'] else None
-            assignment = Assignment(class_ref, subject, teacher)
-            
-            try:
-                schedule.assign(time_slot, assignment)
-            except:
-                # エラーは無視（ログに記録すべきだが簡略化）
-                pass
-        
-        return schedule
+        return Schedule.from_bytes(data)
     
     @staticmethod
     def serialize_school(school: School) -> bytes:
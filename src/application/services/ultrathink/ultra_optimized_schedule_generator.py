@@ -53,6 +53,7 @@ class OptimizationLevel(Enum):
     BALANCED = "balanced"   # バランスモード（5秒以内）
     QUALITY = "quality"     # 品質重視モード（10秒以内）
     EXTREME = "extreme"     # 極限最適化（時間無制限）
+    LNS = "lns"             # 大近傍探索（違反の周辺だけを解き直す）
 
 
 @dataclass
@@ -90,6 +91,7 @@ class UltraOptimizationConfig:
     learning_rate: float = 0.1
     pattern_recognition_threshold: float = 0.7
     auto_parameter_tuning: bool = True
+    nogood_store_path: Optional[str] = None  # 学習したno-goodの保存先（学校データが同じ次回の実行で再利用）
     
     @classmethod
     def from_school_size(cls, school: 'School') -> 'UltraOptimizationConfig':
@@ -246,7 +248,8 @@ class UltraOptimizedScheduleGenerator:
                 cache=self.cache,
                 parallel_engine=self.parallel_engine,
                 enable_preprocessing=self.config.enable_preprocessing,
-                enable_learning=self.config.enable_learning
+                enable_learning=self.config.enable_learning,
+                nogood_store_path=self.config.nogood_store_path
             )
         else:
             self.placement_engine = CorePlacementEngine(
@@ -359,7 +362,9 @@ class UltraOptimizedScheduleGenerator:
             constraints = {
                 'followup_data': followup_data,
                 'time_limit': self.config.time_limit,
-                'target_violations': self.config.target_violations
+                'target_violations': self.config.target_violations,
+                # 戦略プールはこのレベルで戦略を選ぶ（lns なら大近傍探索）
+                'optimization_level': self.config.optimization_level.value
             }
             
             # パイプライン実行
@@ -29,18 +29,6 @@ from ....domain.services.synchronizers.grade5_synchronizer_refactored import Ref
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class TeacherSlot:
-    """教師の時間枠"""
-    teacher: str
-    day: str
-    period: int
-    assigned_class: Optional[ClassRef] = None
-    subject: Optional[str] = None
-    is_available: bool = True
-    is_test_period: bool = False  # テスト期間フラグを追加
-
-
 @dataclass
 class TeachingRequirement:
     """教師の授業要求"""
@@ -71,7 +59,6 @@ class UltrathinkPerfectGeneratorV14:
     def __init__(self):
         self.stats = {
             'initial_assignments': 0,
-            'teacher_schedules_created': 0,
             'backtrack_count': 0,
             'conflicts_avoided': 0,
             'successful_assignments': 0,
@@ -136,13 +123,11 @@ class UltrathinkPerfectGeneratorV14:
         # 教師マッピングを読み込み
         self.teacher_mapping = self._load_teacher_mapping()
         
-        # 1. 教師スケジュールと授業要求を初期化
-        self._initialize_teacher_schedules(school, schedule)
+        # 1. 授業要求を初期化
+        # （教師の空きはScheduleの教員インデックス、不在はSchoolから引くため、
+        #   教師ごとのスケジュール表は作らない）
         self._initialize_teaching_requirements(school)
         
-        # 3. 教師不在情報を更新（Follow-up.csvから）
-        self._update_teacher_absences(school)
-        
         # 4. 固定科目の確認と配置
         self._ensure_fixed_subjects(schedule, school)
         
@@ -272,10 +257,6 @@ class UltrathinkPerfectGeneratorV14:
                     try:
                         schedule.assign(time_slot, assignment)
                         
-                        # 教師が割り当てられた場合（「欠課先生」以外）、その教師をビジーとしてマーク
-                        if teacher and teacher.name != "欠課先生":
-                            self._mark_teacher_busy(teacher.name, time_slot, class_ref, subject)
-
                         # ロック前にチェック
                         if not schedule.is_locked(time_slot, class_ref):
                             schedule.lock_cell(time_slot, class_ref)
@@ -295,8 +276,12 @@ class UltrathinkPerfectGeneratorV14:
         # 優先度でソート（テスト期間、自立活動、5組、残り時数が多い順）
         candidates.sort(key=lambda c: self._get_candidate_priority(c), reverse=True)
         
-        # バックトラッキングで配置
-        success = self._backtrack_placement(candidates, 0, schedule, school)
+        # バックトラッキングで配置（試した配置は取り消しログで巻き戻す）
+        schedule.begin()
+        try:
+            success = self._backtrack_placement(candidates, 0, schedule, school)
+        finally:
+            schedule.commit()
         
         if not success:
             logger.warning("完全な配置ができませんでした。部分的な解を使用します。")
@@ -317,8 +302,8 @@ class UltrathinkPerfectGeneratorV14:
                 
                 # この授業を配置可能な時間枠を探す
                 for time_slot in all_time_slots:
-                    # Scheduleオブジェクトを使って教師が利用可能かチェック
-                    if not schedule.is_teacher_available(time_slot, Teacher(teacher_name)):
+                    # Scheduleの教員インデックスとSchoolの不在情報で教師が利用可能かチェック
+                    if not self._is_teacher_available(schedule, school, teacher_name, time_slot):
                         continue
                     
                     # すでに配置されている場合はスキップ
@@ -394,7 +379,7 @@ class UltrathinkPerfectGeneratorV14:
         candidate = candidates[index]
         
         # この候補の教師がすでにこの時間に配置されているかチェック
-        if not schedule.is_teacher_available(candidate.time_slot, Teacher(candidate.teacher)):
+        if not self._is_teacher_available(schedule, school, candidate.teacher, candidate.time_slot):
             return self._backtrack_placement(candidates, index + 1, schedule, school)
         
         # 日内重複チェック
@@ -406,16 +391,7 @@ class UltrathinkPerfectGeneratorV14:
         if candidate.subject == "自立" and self._is_exchange_class(candidate.class_ref):
             if not self._check_jiritsu_condition(schedule, candidate.class_ref, candidate.time_slot):
                 return self._backtrack_placement(candidates, index + 1, schedule, school)
-
-        # Q&Aルールに違反しないかチェック
-        from ....presentation.cli.qanda_integration import QandAIntegration
-        qanda = QandAIntegration()
-        if qanda.violates_qa_rules(candidate.teacher, candidate.time_slot, candidate.class_ref):
-            logger.debug(f"Q&Aルール違反のためスキップ: {candidate.teacher} {candidate.time_slot}")
-            return self._backtrack_placement(candidates, index + 1, schedule, school)
-
         
-
         # 配置を試みる
         assignment = Assignment(
             class_ref=candidate.class_ref,
@@ -423,6 +399,7 @@ class UltrathinkPerfectGeneratorV14:
             teacher=Teacher(candidate.teacher)
         )
         
+        savepoint = schedule.savepoint()
         try:
             # 配置
             schedule.assign(candidate.time_slot, assignment)
@@ -440,7 +417,7 @@ class UltrathinkPerfectGeneratorV14:
                 return True  # 成功
             
             # 失敗したので戻す
-            schedule.remove_assignment(candidate.time_slot, candidate.class_ref)
+            schedule.rollback_to(savepoint)
             self.assignment_history.pop()
             self.stats['backtrack_count'] += 1
             
@@ -481,7 +458,7 @@ class UltrathinkPerfectGeneratorV14:
                         teacher_name = self._get_teacher_name(parent_assignment, school)
                         
                         # 教師がその時間に利用可能かチェック
-                        if teacher_name and self._is_teacher_available(teacher_name, time_slot):
+                        if teacher_name and self._is_teacher_available(schedule, school, teacher_name, time_slot):
                             assignment = Assignment(
                                 class_ref=exchange_ref,
                                 subject=parent_assignment.subject,
@@ -489,8 +466,6 @@ class UltrathinkPerfectGeneratorV14:
                             )
                             try:
                                 schedule.assign(time_slot, assignment)
-                                # 教師スケジュールを更新
-                                self._mark_teacher_busy(teacher_name, time_slot, exchange_ref, parent_assignment.subject.name)
                                 synced += 1
                             except Exception as e:
                                 logger.debug(f"交流学級同期エラー: {time_slot} {exchange_ref} - {e}")
@@ -521,7 +496,7 @@ class UltrathinkPerfectGeneratorV14:
             best_score = -1
             
             # この時間に空いている教師を探す
-            available_teachers = self._get_available_teachers_for_slot(schedule, time_slot)
+            available_teachers = self._get_available_teachers_for_slot(schedule, school, time_slot)
             
             for teacher_name in available_teachers:
                 # この教師がこのクラスを教えられるか確認
@@ -549,9 +524,6 @@ class UltrathinkPerfectGeneratorV14:
                     schedule.assign(time_slot, assignment)
                     filled += 1
                     self.stats['empty_slots_filled'] += 1
-                    
-                    # 教師スケジュールを更新
-                    self._mark_teacher_busy(teacher_name, time_slot, class_ref, subject)
                 except Exception:
                     pass
         
@@ -559,6 +531,21 @@ class UltrathinkPerfectGeneratorV14:
     
     # ========== ヘルパーメソッド ==========
     
+    def _is_teacher_available(self, schedule: Schedule, school: School,
+                              teacher_name: str, time_slot: TimeSlot) -> bool:
+        """教師がその時間に授業を持たず、不在でもないか"""
+        teacher = Teacher(teacher_name)
+        if not schedule.is_teacher_available(time_slot, teacher):
+            return False
+        return not school.is_teacher_unavailable(time_slot.day, time_slot.period, teacher)
+    
+    def _get_available_teachers_for_slot(self, schedule: Schedule, school: School,
+                                         time_slot: TimeSlot) -> List[str]:
+        """その時間に空いている教師（教師マッピングに載っている教師のみ）"""
+        teacher_names = sorted(set(self.teacher_mapping.values()))
+        return [name for name in teacher_names
+                if self._is_teacher_available(schedule, school, name, time_slot)]
+    
     def _get_teacher_name(self, assignment: Assignment, school: School) -> Optional[str]:
         """配置から教師名を取得"""
         if assignment.teacher:
@@ -726,7 +713,6 @@ class UltrathinkPerfectGeneratorV14:
         """統計情報をログ出力"""
         logger.info("=== 生成統計 ===")
         logger.info(f"初期割り当て数: {self.stats['initial_assignments']}")
-        logger.info(f"教師スケジュール作成数: {self.stats['teacher_schedules_created']}")
         logger.info(f"バックトラック回数: {self.stats['backtrack_count']}")
         logger.info(f"成功配置数: {self.stats['successful_assignments']}")
         logger.info(f"失敗配置数: {self.stats['failed_assignments']}")
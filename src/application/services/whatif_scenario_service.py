@@ -0,0 +1,294 @@
+"""What-ifシナリオの一括評価
+
+「木曜に井上先生が不在だったら」「会議を5校時に移したら」といった問いを、
+前回の出力を土台にまとめて評価します。学校情報と土台の時間割は一度だけ読み込み、
+各シナリオは今週のFollow-upへの差分（不在の追加・会議の移動・配置禁止の追加）として
+IncrementalRegenerationService で当たるセルだけを解き直します。
+
+- シナリオはプロセスプールで並列に評価する（土台は起動時に一度だけ各ワーカーへ渡す）
+- 結果は違反数・変更セル数・教員ごとの担当コマ数の増減の比較表にまとめる
+
+シナリオファイル（YAML、PyYAMLがなければJSON）の例:
+
+    scenarios:
+      - name: 井上先生が木曜不在
+        absences:
+          - {teacher: 井上, day: 木}              # periods を省略すると終日
+      - name: 企画会議を5校時に
+        meeting_moves:
+          - {meeting: 企画, from: [火, 3], to: [火, 5]}
+      - name: 1年1組の月曜1校時に数学を置かない
+        forbidden_cells:
+          - {class: 1年1組, day: 月, period: 1, subjects: [数]}
+"""
+import copy
+import json
+import logging
+import multiprocessing
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+
+from .generation_helpers.followup_delta import ALL_PERIODS, Absence, FollowUpSnapshot, Period
+from .incremental_regeneration_service import IncrementalRegenerationService
+from ...domain.value_objects.time_slot import TimeSlot, ClassReference
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+if TYPE_CHECKING:
+    from ...domain.entities.schedule import Schedule
+    from ...domain.entities.school import School
+    from ...domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+
+# (曜日, 校時, 学年, 組) → 配置禁止の科目名
+ForbiddenCells = Dict[Tuple[str, int, int, int], FrozenSet[str]]
+
+
+# ========== シナリオ ==========
+
+@dataclass(frozen=True)
+class MeetingMove:
+    """会議の移動"""
+    meeting_name: str
+    source: Period
+    target: Period
+
+
+@dataclass(frozen=True)
+class WhatIfScenario:
+    """今週のFollow-upに対する仮の変更"""
+    name: str
+    absences: FrozenSet[Absence] = frozenset()
+    meeting_moves: Tuple[MeetingMove, ...] = ()
+    forbidden_cells: ForbiddenCells = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WhatIfScenario':
+        """シナリオファイルの1項目から作成"""
+        if 'name' not in data:
+            raise ValueError(f"シナリオに name がありません: {data}")
+        absences = frozenset(
+            (str(item['teacher']), item['day'], int(period))
+            for item in data.get('absences', [])
+            for period in (item.get('periods') or ALL_PERIODS)
+        )
+        meeting_moves = tuple(
+            MeetingMove(str(item['meeting']), _period(item['from']), _period(item['to']))
+            for item in data.get('meeting_moves', [])
+        )
+        forbidden_cells = {}
+        for item in data.get('forbidden_cells', []):
+            grade, class_number = _class_numbers(item['class'])
+            key = (item['day'], int(item['period']), grade, class_number)
+            forbidden_cells[key] = forbidden_cells.get(key, frozenset()) | frozenset(item['subjects'])
+        return cls(str(data['name']), absences, meeting_moves, forbidden_cells)
+
+    def apply_to(self, baseline: FollowUpSnapshot) -> FollowUpSnapshot:
+        """今週のFollow-upにこのシナリオの変更を加えたもの"""
+        meetings = set(baseline.meetings)
+        for move in self.meeting_moves:
+            meetings.discard((move.meeting_name, *move.source))
+            meetings.add((move.meeting_name, *move.target))
+        return FollowUpSnapshot(
+            absences=baseline.absences | self.absences,
+            meetings=frozenset(meetings),
+            test_periods=baseline.test_periods
+        )
+
+    def get_forbidden_cells(self) -> Dict[Tuple[TimeSlot, ClassReference], Set[str]]:
+        return {
+            (TimeSlot(day, period), ClassReference(grade, class_number)): set(subjects)
+            for (day, period, grade, class_number), subjects in self.forbidden_cells.items()
+        }
+
+
+def _period(value: Sequence) -> Period:
+    day, period = value
+    return day, int(period)
+
+
+def _class_numbers(value: str) -> Tuple[int, int]:
+    match = re.match(r'(\d+)年(\d+)組', str(value))
+    if not match:
+        raise ValueError(f"クラス名は「1年1組」の形式で指定してください: {value}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def load_scenarios(path: Path) -> List[WhatIfScenario]:
+    """シナリオファイル（.yaml/.yml はPyYAML、それ以外はJSON）を読み込む"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix in ('.yaml', '.yml'):
+            if not HAS_YAML:
+                raise ImportError("YAMLのシナリオファイルにはPyYAMLが必要です（JSONなら不要）")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    items = data.get('scenarios', []) if isinstance(data, dict) else data
+    return [WhatIfScenario.from_dict(item) for item in items or []]
+
+
+# ========== 評価結果 ==========
+
+@dataclass
+class ScenarioResult:
+    """シナリオの評価結果"""
+    name: str
+    violations: Optional[int] = None
+    changed_cells: int = 0
+    teacher_load_changes: Dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+def format_comparison_table(baseline: ScenarioResult, results: List[ScenarioResult]) -> str:
+    """現状とシナリオごとの結果の比較表"""
+    lines = [
+        f"{'シナリオ':<24} {'違反':>6} {'増減':>6} {'変更セル':>8} {'秒':>6}  教員の担当コマ数の増減",
+        "-" * 90,
+        f"{baseline.name:<24} {baseline.violations:>6} {'':>6} {'':>8} {baseline.elapsed:>6.1f}"
+    ]
+    for result in results:
+        if result.error:
+            lines.append(f"{result.name:<24} エラー: {result.error}")
+            continue
+        load_changes = ", ".join(
+            f"{teacher}{change:+d}" for teacher, change in sorted(result.teacher_load_changes.items())
+        )
+        lines.append(
+            f"{result.name:<24} {result.violations:>6} {result.violations - baseline.violations:>+6} "
+            f"{result.changed_cells:>8} {result.elapsed:>6.1f}  {load_changes or '-'}"
+        )
+    return "\n".join(lines)
+
+
+# ========== ワーカー ==========
+
+# ワーカープロセス内の共有状態（_init_worker で設定）
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(school, constraint_system, base_data, baseline, time_limit, backend):
+    """ワーカープロセスの初期化（プロセスごとに一度だけ呼ばれる）"""
+    _worker.update(
+        school=school,
+        constraint_system=constraint_system,
+        base_data=base_data,
+        baseline=baseline,
+        time_limit=time_limit,
+        backend=backend,
+    )
+
+
+def _evaluate_scenario(scenario: WhatIfScenario) -> ScenarioResult:
+    """シナリオを1つ評価する（土台の学校情報・時間割は変更しない）"""
+    from ...domain.entities.schedule import Schedule
+
+    start_time = time.time()
+    try:
+        # 不在の追加で学校情報が変わるため、シナリオごとに複製する
+        school = copy.deepcopy(_worker['school'])
+        base_schedule = Schedule.from_bytes(_worker['base_data'])
+        constraint_system = _worker['constraint_system']
+        service = IncrementalRegenerationService(
+            constraint_system, time_limit=_worker['time_limit'], backend=_worker['backend'],
+            forbidden_cells=scenario.get_forbidden_cells()
+        )
+        baseline = _worker['baseline']
+        schedule, result = service.regenerate(school, base_schedule, scenario.apply_to(baseline), baseline)
+        violations = len(constraint_system.validate_schedule(schedule, school).violations)
+    except Exception as e:
+        return ScenarioResult(scenario.name, elapsed=time.time() - start_time, error=f"{type(e).__name__}: {e}")
+
+    return ScenarioResult(
+        scenario.name,
+        violations=violations,
+        changed_cells=result.changed_cells,
+        teacher_load_changes=_teacher_load_changes(base_schedule, schedule),
+        elapsed=time.time() - start_time
+    )
+
+
+def _teacher_load_changes(before: 'Schedule', after: 'Schedule') -> Dict[str, int]:
+    """教員ごとの担当コマ数の増減（変化のない教員は含めない）"""
+    changes: Dict[str, int] = {}
+    for sign, schedule in ((-1, before), (1, after)):
+        for _, assignment in schedule.get_all_assignments():
+            if assignment.teacher is not None:
+                changes[assignment.teacher.name] = changes.get(assignment.teacher.name, 0) + sign
+    return {teacher: change for teacher, change in changes.items() if change}
+
+
+# ========== サービス ==========
+
+class WhatIfScenarioService:
+    """前回の出力を土台に、複数のWhat-ifシナリオを並列に評価する"""
+
+    def __init__(
+        self,
+        constraint_system: 'UnifiedConstraintSystem',
+        time_limit: float = 10.0,
+        backend: str = 'auto',
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            constraint_system: 統一制約システム（評価とセル別の配置禁止に使う）
+            time_limit: シナリオごとの解き直しの制限時間（秒）
+            backend: ソルバー（IncrementalRegenerationService と同じ）
+            max_workers: ワーカープロセス数（省略時はCPU数、1ならこのプロセスで順に評価）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.constraint_system = constraint_system
+        self.time_limit = time_limit
+        self.backend = backend
+        self.max_workers = max_workers
+
+    def evaluate(
+        self,
+        school: 'School',
+        base_schedule: 'Schedule',
+        baseline: FollowUpSnapshot,
+        scenarios: Sequence[WhatIfScenario]
+    ) -> Tuple[ScenarioResult, List[ScenarioResult]]:
+        """現状と各シナリオを評価し、(現状, シナリオごとの結果) を返す
+
+        Args:
+            school: 学校情報（変更しない）
+            base_schedule: 土台にする前回の出力（変更しない）
+            baseline: 今週のFollow-up（シナリオはこれに対する変更）
+            scenarios: 評価するシナリオ
+        """
+        initargs = (school, self.constraint_system, base_schedule.to_bytes(),
+                    baseline, self.time_limit, self.backend)
+        workers = min(len(scenarios), self.max_workers or os.cpu_count() or 1)
+        self.logger.info(f"=== What-ifシナリオを評価: {len(scenarios)}件, ワーカー{max(workers, 1)}プロセス ===")
+
+        _init_worker(*initargs)
+        current = _evaluate_scenario(WhatIfScenario("現状"))
+        if current.error:
+            raise RuntimeError(f"土台の時間割を評価できません: {current.error}")
+
+        if workers <= 1:
+            results = [_evaluate_scenario(scenario) for scenario in scenarios]
+        else:
+            context = multiprocessing.get_context()
+            with context.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+                results = pool.map(_evaluate_scenario, scenarios)
+
+        for result in results:
+            if result.error:
+                self.logger.warning(f"  {result.name}: エラー {result.error}")
+            else:
+                self.logger.info(
+                    f"  {result.name}: 違反{result.violations}件, 変更{result.changed_cells}セル "
+                    f"({result.elapsed:.1f}秒)"
+                )
+        return current, results
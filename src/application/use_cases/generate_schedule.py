@@ -189,6 +189,7 @@ class GenerateScheduleUseCase:
             # 結果の作成
             return self._create_result(
                 schedule=schedule,
+                school=school,
                 validation_result=validation_result,
                 execution_time=execution_time,
                 generation_result=generation_result,
@@ -201,6 +202,7 @@ class GenerateScheduleUseCase:
     def _create_result(
         self,
         schedule,
+        school,
         validation_result,
         execution_time: float,
         generation_result,
@@ -239,7 +241,9 @@ class GenerateScheduleUseCase:
             execution_time=execution_time,
             meeting_improvements=optimization_stats.get('meeting_optimized', 0),
             gym_improvements=optimization_stats.get('gym_conflicts_resolved', 0),
-            workload_improvements=optimization_stats.get('workload_balanced', 0)
+            workload_improvements=optimization_stats.get('workload_balanced', 0),
+            school=school,
+            violations=list(validation_result.violations)
         )
     
     def _handle_error(self, error: Exception, start_time: float) -> GenerateScheduleResult:
@@ -1,13 +1,16 @@
 """スケジュール生成ユースケース（リファクタリング版）"""
 import logging
 import time
-from typing import Tuple
+from pathlib import Path
+from typing import Optional, Tuple
 
 from .request_models import GenerateScheduleRequest, GenerateScheduleResult
 from ..services.constraint_registration_service import ConstraintRegistrationService
 from ..services.data_loading_service import DataLoadingService
 from ..services.optimization_orchestration_service import OptimizationOrchestrationService
+from ..services.incremental_regeneration_service import IncrementalRegenerationService
 from ..services.schedule_generation_service import ScheduleGenerationService
+from ..services.generation_helpers.followup_delta import FollowUpSnapshot, FollowUpSnapshotStore
 from ...domain.entities.schedule import Schedule
 from ...domain.entities.school import School
 from ...domain.entities.grade5_unit import Grade5Unit
@@ -30,6 +33,9 @@ class GenerateScheduleUseCaseRefactored:
     このクラスは全体のオーケストレーションのみを担当します。
     """
     
+    # 進捗通知のステップ数（データ読み込み〜最終検証・保存）
+    TOTAL_STEPS = 6
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.path_manager = get_path_manager()
@@ -70,39 +76,68 @@ class GenerateScheduleUseCaseRefactored:
             self._log_execution_start(request)
             
             # Step 1: データの読み込み
+            self._report_progress(request, 1, "データ読み込み")
             school, use_enhanced_features = self._load_data(request)
             
             # Step 2: 制約の登録
+            self._report_progress(request, 2, "制約登録")
             teacher_absences = self._register_constraints(request, school)
             
-            # Step 3: 初期スケジュールの準備
-            initial_schedule = self._prepare_initial_schedule(request, school)
+            # Step 3: 初期スケジュールの準備（incremental時は前回の出力）
+            self._report_progress(request, 3, "初期スケジュール準備")
+            followup_snapshot = self._load_followup_snapshot(request)
+            if request.incremental:
+                initial_schedule = self._load_base_schedule(request, school)
+            else:
+                initial_schedule = self._prepare_initial_schedule(request, school)
             
-            # Step 4: スケジュール生成
-            generated_schedule = self._generate_schedule(
-                request, school, initial_schedule
-            )
+            # Step 4: スケジュール生成（incremental時はFollow-upの差分だけを解き直す）
+            self._report_progress(request, 4, "スケジュール生成")
+            if request.incremental:
+                generated_schedule = self._regenerate_incrementally(
+                    school, initial_schedule, followup_snapshot
+                )
+            else:
+                generated_schedule = self._generate_schedule(
+                    request, school, initial_schedule
+                )
+            
+            if request.progress_callback is not None:
+                violations = self.constraint_system.validate_schedule(generated_schedule, school).violations
+                self._report_progress(request, 4, "スケジュール生成", violations=len(violations))
             
             # Step 5: 最適化処理
+            self._report_progress(request, 5, "最適化")
             optimized_schedule, optimization_results = self._apply_optimizations(
                 request, generated_schedule, school
             )
             
             # Step 6: 最終検証と保存
+            self._report_progress(request, 6, "最終検証・保存")
             validation_result = self._finalize_schedule(
                 request, optimized_schedule, school, use_enhanced_features
             )
+            self._report_progress(request, 6, "最終検証・保存", violations=len(validation_result.violations))
+            
+            # 次回の --incremental の差分の基準として今回のFollow-upを保存
+            if followup_snapshot is not None:
+                FollowUpSnapshotStore.from_path_config(self.path_manager).save(followup_snapshot)
             
             # Step 7: 結果の作成
             execution_time = time.time() - start_time
             return self._create_success_result(
-                optimized_schedule, validation_result, 
+                optimized_schedule, school, validation_result,
                 execution_time, optimization_results
             )
             
         except Exception as e:
             return self._create_error_result(e, start_time)
     
+    def _report_progress(self, request: GenerateScheduleRequest, step: int, phase: str, **data) -> None:
+        """進捗を通知（progress_callback が指定されている場合のみ）"""
+        if request.progress_callback is not None:
+            request.progress_callback(phase, dict(data, step=step, total=self.TOTAL_STEPS))
+    
     def _initialize_configuration(self) -> None:
         """設定の初期化"""
         config_loader = get_config_loader()
@@ -198,6 +233,42 @@ class GenerateScheduleUseCaseRefactored:
         
         return initial_schedule
     
+    def _load_followup_snapshot(self, request: GenerateScheduleRequest) -> Optional[FollowUpSnapshot]:
+        """Follow-up.csvを解析してスナップショットにする（解析できなければNone）"""
+        from ...infrastructure.parsers.enhanced_followup_parser import EnhancedFollowUpParser
+        
+        parser = EnhancedFollowUpParser(self.path_manager.input_dir)
+        result = parser.parse_file(Path(request.followup_prompt_file).name)
+        if not result.get('parse_success'):
+            return None
+        return FollowUpSnapshot.from_parse_result(result)
+    
+    def _load_base_schedule(self, request: GenerateScheduleRequest, school: School) -> Schedule:
+        """incremental時の土台にする前回の出力を読み込む"""
+        base_path = self.path_manager.resolve_path(request.base_schedule_file)
+        if not base_path.exists():
+            raise FileNotFoundError(f"--incremental の土台にする時間割がありません: {base_path}")
+        
+        _, schedule_repo = self.data_loading_service.get_repositories(request.data_directory)
+        self.logger.info(f"前回の出力を読み込み中: {base_path}")
+        return schedule_repo.load(str(base_path), school)
+    
+    def _regenerate_incrementally(
+        self,
+        school: School,
+        base_schedule: Schedule,
+        followup_snapshot: Optional[FollowUpSnapshot]
+    ) -> Schedule:
+        """前回の生成時からのFollow-upの差分に当たるセルだけを解き直す"""
+        if followup_snapshot is None:
+            self.logger.warning("Follow-up.csvを解析できないため、前回の出力をそのまま使います")
+            return base_schedule
+        
+        store = FollowUpSnapshotStore.from_path_config(self.path_manager)
+        service = IncrementalRegenerationService(self.constraint_system)
+        schedule, _ = service.regenerate(school, base_schedule, followup_snapshot, store.load())
+        return schedule
+    
     def _generate_schedule(
         self,
         request: GenerateScheduleRequest,
@@ -243,7 +314,8 @@ class GenerateScheduleUseCaseRefactored:
             initial_schedule=initial_schedule,
             strategy=request.strategy,
             max_iterations=request.max_iterations,
-            search_mode=request.search_mode
+            search_mode=request.search_mode,
+            resume=request.resume
         )
     
     def _apply_optimizations(
@@ -292,6 +364,7 @@ class GenerateScheduleUseCaseRefactored:
     def _create_success_result(
         self,
         schedule: Schedule,
+        school: School,
         validation_result: ValidationResult,
         execution_time: float,
         optimization_results: dict
@@ -324,6 +397,8 @@ class GenerateScheduleUseCaseRefactored:
             success=validation_result.is_valid,
             message=message,
             execution_time=execution_time,
+            school=school,
+            violations=list(validation_result.violations),
             **optimization_results
         )
     
@@ -1,7 +1,9 @@
 """スケジュール生成・検証のリクエスト/レスポンスモデル"""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional
 from ...domain.entities.schedule import Schedule
+from ...domain.entities.school import School
 
 
 @dataclass
@@ -36,6 +38,9 @@ class GenerateScheduleRequest:
     optimize_workload: bool = False       # 教師負担最適化
     use_support_hours: bool = False       # 5組時数表記
     search_mode: str = "standard"         # 探索モード: standard, priority, smart, hybrid
+    resume: bool = False                  # 入力が変わっていないフェーズをチェックポイントから再開
+    incremental: bool = False             # 前回の出力を土台にFollow-upの差分だけを解き直す
+    base_schedule_file: str = "data/output/output.csv"  # incremental時の土台にする前回の出力
     
     # 超最適化オプション
     use_ultra_optimized: bool = False      # 超最適化ジェネレーターを使用
@@ -44,6 +49,9 @@ class GenerateScheduleRequest:
     
     # 人間的柔軟性オプション
     human_like_flexibility: bool = False   # 人間的な柔軟性（教師代替、時数借用など）を有効化
+    
+    # 進捗通知（フェーズ名, 詳細）。Webエディタのジョブ実行で使用
+    progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
 
 
 @dataclass
@@ -58,6 +66,10 @@ class GenerateScheduleResult:
     meeting_improvements: int = 0
     gym_improvements: int = 0
     workload_improvements: int = 0
+    # 生成に使った学校データと最終検証の違反（Noneは未検証）
+    # 呼び出し側は出力ファイルを読み直して検証し直さずに、これを違反分析に渡せる
+    school: Optional[School] = None
+    violations: Optional[list] = None
 
 
 @dataclass
@@ -66,6 +78,8 @@ class ValidateScheduleRequest:
     schedule_file: str
     data_directory: Path = Path(".")
     enable_soft_constraints: bool = True
+    # ベクトル化検証を使用（Falseで制約オブジェクトごとの従来方式）
+    use_vectorized: bool = True
 
 
 @dataclass 
@@ -74,4 +88,28 @@ class ValidateScheduleResult:
     is_valid: bool
     violations: list
     violations_count: int
-    message: str
\ No newline at end of file
+    message: str
+    # 検証で見つかった ConstraintViolation（QandAシステムの違反分析用）
+    constraint_violations: list = field(default_factory=list)
+
+@dataclass
+class WhatIfScenarioRequest:
+    """What-ifシナリオ一括評価リクエスト"""
+    scenarios_file: str
+    base_schedule_file: str = "data/output/output.csv"
+    followup_prompt_file: str = "data/input/Follow-up.csv"
+    data_directory: Path = Path(".")
+    # シナリオごとの解き直しの制限時間（秒）
+    time_limit: float = 10.0
+    # ワーカープロセス数（Noneで CPU数、1で並列化しない）
+    max_workers: Optional[int] = None
+
+
+@dataclass
+class WhatIfScenarioResult:
+    """What-ifシナリオ一括評価結果"""
+    success: bool
+    message: str
+    baseline: Optional[Any] = None
+    results: list = field(default_factory=list)
+    table: str = ""
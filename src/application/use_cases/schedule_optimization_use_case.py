@@ -38,8 +38,8 @@ class ScheduleOptimizationUseCase:
         self.constraint_system = constraint_system
         self.logger = logging.getLogger(__name__)
         
-        # 統合最適化サービス
-        self.integrated_optimizer = IntegratedOptimizerImproved(constraint_system)
+        # 統合最適化サービス（標準時数の入れ替えは制約システムで差分検証する）
+        self.integrated_optimizer = IntegratedOptimizerImproved(constraint_system=constraint_system)
         
         # QA.txtからルールを読み込み
         from ...infrastructure.config.qa_rules_loader import QARulesLoader
@@ -105,13 +105,9 @@ class ScheduleOptimizationUseCase:
         # 3. 統合最適化（空きスロット埋め、標準時数調整）
         if options.get('fill_empty_slots', True):
             self.logger.info("=== 統合最適化（空きスロット埋め） ===")
-            integrated_result = self.integrated_optimizer.optimize(
-                schedule,
-                school,
-                max_iterations=5
-            )
+            integrated_result = self.integrated_optimizer.optimize_schedule(schedule, school)
             stats['empty_slots_filled'] = integrated_result['empty_slots_filled']
-            stats['total_improved'] += integrated_result['improvements']
+            stats['total_improved'] += integrated_result['standard_hours_improved']
         
         # 4. 会議時間最適化
         if options.get('optimize_meeting_times', False):
@@ -33,4 +33,10 @@ class UseCaseFactory:
     def create_validate_schedule_use_case():
         """ValidateScheduleUseCaseのインスタンスを作成"""
         from .validate_schedule_use_case import ValidateScheduleUseCase
-        return ValidateScheduleUseCase()
\ No newline at end of file
+        return ValidateScheduleUseCase()
+    
+    @staticmethod
+    def create_whatif_scenario_use_case():
+        """WhatIfScenarioUseCaseのインスタンスを作成"""
+        from .whatif_scenario_use_case import WhatIfScenarioUseCase
+        return WhatIfScenarioUseCase()
\ No newline at end of file
@@ -1,12 +1,13 @@
 """スケジュール検証ユースケース"""
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from .request_models import ValidateScheduleRequest, ValidateScheduleResult
 from ...domain.entities.schedule import Schedule
 from ...domain.entities.school import School
 from ...domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+from ...domain.services.validators.vectorized_constraint_validator import VectorizedConstraintValidator
 from ...infrastructure.di_container import (
     get_container,
     get_path_manager,
@@ -30,6 +31,7 @@ class ValidateScheduleUseCase:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.path_manager = get_path_manager()
+        # 直近の検証で使った制約システム（検証ごとに作り直す）
         self.constraint_system = UnifiedConstraintSystem()
         self.followup_processor = FollowUpProcessor()
         
@@ -58,8 +60,35 @@ class ValidateScheduleUseCase:
             
             schedule = schedule_repo.load(str(schedule_file))
             
+            return self.validate(schedule, school, request.data_directory, request.use_vectorized)
+            
+        except Exception as e:
+            self.logger.error(f"スケジュール検証中にエラーが発生しました: {str(e)}")
+            return ValidateScheduleResult(
+                is_valid=False,
+                violations=[f"Validation error: {str(e)}"],
+                violations_count=1,
+                message=f"検証エラー: {str(e)}"
+            )
+    
+    def validate(
+        self,
+        schedule: Schedule,
+        school: Optional[School] = None,
+        data_directory: Path = Path("."),
+        use_vectorized: bool = True
+    ) -> ValidateScheduleResult:
+        """メモリ上のスケジュールを検証
+        
+        生成直後の時間割など、ファイルから読み直さずに検証する場合に使う。
+        school を省略した場合は学校データを読み込む。
+        """
+        try:
+            if school is None:
+                school = get_container().resolve(ISchoolRepository).load_school_data()
+            
             # Follow-upファイルの処理
-            followup_file = request.data_directory / "input" / "Follow-up.csv"
+            followup_file = data_directory / "input" / "Follow-up.csv"
             teacher_absences = {}
             
             if followup_file.exists():
@@ -76,11 +105,17 @@ class ValidateScheduleUseCase:
                         teacher_absences[teacher_name].append((time_slot.day, time_slot.period))
                 self.logger.info(f"教師不在情報を読み込みました: {len(teacher_absences)}件")
             
-            # 制約の登録
-            self._register_constraints(request.data_directory, teacher_absences)
+            # 制約の登録（同じインスタンスで何度検証しても制約が重複しないよう毎回作り直す）
+            constraint_system = UnifiedConstraintSystem()
+            self._register_constraints(constraint_system, data_directory, teacher_absences)
+            self.constraint_system = constraint_system
             
             # 検証実行
-            validation_result = self.constraint_system.validate_schedule(schedule, school)
+            if use_vectorized:
+                validator = VectorizedConstraintValidator(constraint_system)
+                validation_result = validator.validate_schedule(schedule, school)
+            else:
+                validation_result = constraint_system.validate_schedule(schedule, school)
             
             violations = []
             violations_count = len(validation_result.violations)
@@ -104,7 +139,8 @@ class ValidateScheduleUseCase:
                 is_valid=is_valid,
                 violations=violations,
                 violations_count=violations_count,
-                message=message
+                message=message,
+                constraint_violations=list(validation_result.violations)
             )
             
         except Exception as e:
@@ -116,7 +152,7 @@ class ValidateScheduleUseCase:
                 message=f"検証エラー: {str(e)}"
             )
     
-    def _register_constraints(self, data_dir: Path, teacher_absences: dict):
+    def _register_constraints(self, constraint_system: UnifiedConstraintSystem, data_dir: Path, teacher_absences: dict):
         """制約を登録"""
         # 既存の制約登録ロジックを使用（GenerateScheduleUseCaseから抽出）
         from ...domain.constraints import (
@@ -166,11 +202,11 @@ class ValidateScheduleUseCase:
         ]
         
         for constraint in standard_constraints:
-            self.constraint_system.register_constraint(constraint)
+            constraint_system.register_constraint(constraint)
         
         # 教師不在制約の登録
         if teacher_absences:
             # TeacherAbsenceConstraintは引数なしで呼び出す（DIコンテナから自動的にリポジトリを取得）
-            self.constraint_system.register_constraint(
+            constraint_system.register_constraint(
                 TeacherAbsenceConstraint()
             )
\ No newline at end of file
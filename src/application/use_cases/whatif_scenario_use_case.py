@@ -0,0 +1,80 @@
+"""What-ifシナリオ一括評価ユースケース"""
+import logging
+from pathlib import Path
+
+from .request_models import WhatIfScenarioRequest, WhatIfScenarioResult
+from ..services.constraint_registration_service import ConstraintRegistrationService
+from ..services.data_loading_service import DataLoadingService
+from ..services.generation_helpers.followup_delta import FollowUpSnapshot
+from ..services.whatif_scenario_service import (
+    WhatIfScenarioService,
+    format_comparison_table,
+    load_scenarios
+)
+from ...domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+from ...infrastructure.di_container import get_path_manager
+
+
+class WhatIfScenarioUseCase:
+    """What-ifシナリオ一括評価のユースケース
+
+    学校情報・制約・土台の時間割（前回の出力）・今週のFollow-upを一度だけ読み込み、
+    シナリオごとの評価は WhatIfScenarioService に委譲します。
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.path_manager = get_path_manager()
+        self.data_loading_service = DataLoadingService()
+        self.constraint_registration_service = ConstraintRegistrationService()
+        self.constraint_system = UnifiedConstraintSystem()
+
+    def execute(self, request: WhatIfScenarioRequest) -> WhatIfScenarioResult:
+        """シナリオを一括評価して比較表を作成"""
+        try:
+            scenarios = load_scenarios(self.path_manager.resolve_path(request.scenarios_file))
+            if not scenarios:
+                return WhatIfScenarioResult(False, f"シナリオがありません: {request.scenarios_file}")
+
+            school, _ = self.data_loading_service.load_school_data(request.data_directory)
+            _, teacher_absences = self.data_loading_service.load_weekly_requirements(
+                request.data_directory, school
+            )
+            self.constraint_registration_service.register_all_constraints(
+                self.constraint_system, request.data_directory, teacher_absences
+            )
+
+            base_path = self.path_manager.resolve_path(request.base_schedule_file)
+            if not base_path.exists():
+                raise FileNotFoundError(f"土台にする時間割がありません: {base_path}")
+            _, schedule_repo = self.data_loading_service.get_repositories(request.data_directory)
+            base_schedule = schedule_repo.load(str(base_path), school)
+
+            service = WhatIfScenarioService(
+                self.constraint_system, time_limit=request.time_limit, max_workers=request.max_workers
+            )
+            baseline, results = service.evaluate(
+                school, base_schedule, self._load_followup_snapshot(request), scenarios
+            )
+            return WhatIfScenarioResult(
+                success=True,
+                message=f"{len(scenarios)}件のシナリオを評価しました",
+                baseline=baseline,
+                results=results,
+                table=format_comparison_table(baseline, results)
+            )
+
+        except Exception as e:
+            self.logger.error(f"What-ifシナリオの評価中にエラーが発生しました: {e}")
+            return WhatIfScenarioResult(False, f"What-ifシナリオ評価エラー: {e}")
+
+    def _load_followup_snapshot(self, request: WhatIfScenarioRequest) -> FollowUpSnapshot:
+        """今週のFollow-up（解析できなければ空）"""
+        from ...infrastructure.parsers.enhanced_followup_parser import EnhancedFollowUpParser
+
+        parser = EnhancedFollowUpParser(self.path_manager.input_dir)
+        result = parser.parse_file(Path(request.followup_prompt_file).name)
+        if not result.get('parse_success'):
+            self.logger.warning("Follow-up.csvを解析できないため、空のFollow-upを土台にします")
+            return FollowUpSnapshot()
+        return FollowUpSnapshot.from_parse_result(result)
@@ -5,6 +5,7 @@ from .base import (
     ConstraintResult,
     ConstraintType,
     ConstraintPriority,
+    ConstraintScope,
     ConstraintViolation,
     ConstraintValidator,
     HardConstraint,
@@ -40,6 +41,7 @@ __all__ = [
     'ConstraintResult',
     'ConstraintType',
     'ConstraintPriority',
+    'ConstraintScope',
     'ConstraintViolation',
     'ConstraintValidator',
     'HardConstraint',
@@ -1,7 +1,7 @@
 """制約システムの基盤クラス"""
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List, Optional, Iterator
+from typing import Any, Callable, List, Optional, Iterator, TYPE_CHECKING
 from dataclasses import dataclass
 
 from ..entities.schedule import Schedule
@@ -10,6 +10,9 @@ from ..value_objects.assignment import ConstraintViolation
 from ..value_objects.time_slot import TimeSlot
 from ..constants import WEEKDAYS, PERIODS
 
+if TYPE_CHECKING:
+    from ..services.core.adaptive_check_pipeline import AdaptiveCheckPipeline
+
 
 class ConstraintType(Enum):
     """制約のタイプ"""
@@ -26,6 +29,18 @@ class ConstraintPriority(Enum):
     SUGGESTION = 20  # 提案レベル
 
 
+class ConstraintScope(Enum):
+    """制約が依存するセルの範囲
+
+    差分評価（IncrementalConstraintEvaluator）では、変更されたセルを含むスコープだけを
+    validate_scope() で再検証する。
+    """
+    TIME_SLOT = "TIME_SLOT"    # 同じ時間枠の全クラス（キー: TimeSlot）
+    CLASS_DAY = "CLASS_DAY"    # 同じクラスの同じ曜日（キー: (ClassReference, 曜日)）
+    CLASS = "CLASS"            # 同じクラスの全時間枠（キー: ClassReference）
+    SCHEDULE = "SCHEDULE"      # スケジュール全体（キー: None）
+
+
 @dataclass
 class ConstraintResult:
     """制約検証の結果"""
@@ -44,6 +59,9 @@ class ConstraintResult:
 class Constraint(ABC):
     """制約の抽象基底クラス"""
     
+    # 依存範囲。スコープ単位の検証を実装した制約は validate_scope() と合わせて上書きする
+    scope = ConstraintScope.SCHEDULE
+    
     def __init__(self, 
                  constraint_type: ConstraintType,
                  priority: ConstraintPriority,
@@ -59,6 +77,15 @@ class Constraint(ABC):
         """制約を検証する"""
         pass
     
+    def validate_scope(self, schedule: Schedule, school: School,
+                       scope_key: Any) -> List[ConstraintViolation]:
+        """指定スコープ内の違反だけを検証する
+
+        スコープ全体の結果を合わせると validate() の結果と一致しなければならない。
+        既定ではスコープ全体（SCHEDULE）として validate() を実行する。
+        """
+        return self.validate(schedule, school).violations
+    
     def is_hard_constraint(self) -> bool:
         """ハード制約かどうか判定"""
         return self.type == ConstraintType.HARD
@@ -95,23 +122,44 @@ class SoftConstraint(Constraint):
         super().__init__(ConstraintType.SOFT, priority, name, description)
 
 
+def _rejection_of(check: Callable[..., bool]) -> Callable[..., Optional[bool]]:
+    """checkメソッド（可ならTrue）をパイプライン用のチェック関数（可ならNone）に変換"""
+    def run(schedule, school, time_slot, assignment):
+        return None if check(schedule, school, time_slot, assignment) else False
+    return run
+
+
 class ConstraintValidator:
     """制約検証器"""
     
     def __init__(self, constraints: List[Constraint]):
         self.constraints = sorted(constraints)  # 優先度順にソート
+        self._pipeline = None
+        self._pipeline_source = None
     
     def check_assignment(self, schedule: Schedule, school: School, time_slot, assignment) -> bool:
-        """配置前に全ての制約をチェック"""
-        from ..value_objects.time_slot import TimeSlot
-        from ..value_objects.assignment import Assignment
+        """配置前に全ての制約をチェック
         
-        # 全ての制約に対してcheckメソッドを呼び出す（存在する場合）
-        for constraint in self.constraints:
-            if hasattr(constraint, 'check'):
-                if not constraint.check(schedule, school, time_slot, assignment):
-                    return False
-        return True
+        checkメソッドを持つ制約を事前チェックパイプラインで実行する。実行順序は
+        実行時の統計（平均コスト・不可率）で並べ替わるが、判定は変わらない。
+        """
+        return self._get_pipeline().run(schedule, school, time_slot, assignment) is None
+    
+    def _get_pipeline(self) -> 'AdaptiveCheckPipeline':
+        """checkメソッドを持つ制約のパイプライン（制約リストが変わったら作り直す）"""
+        if self._pipeline is None or self._pipeline_source is not self.constraints:
+            from ..services.core.adaptive_check_pipeline import AdaptiveCheckPipeline
+            self._pipeline = AdaptiveCheckPipeline(
+                (constraint.name, _rejection_of(constraint.check))
+                for constraint in self.constraints
+                if hasattr(constraint, 'check')
+            )
+            self._pipeline_source = self.constraints
+        return self._pipeline
+    
+    def get_statistics(self) -> dict:
+        """制約ごとの事前チェックの統計（呼び出し回数・不可回数・平均コスト・実行順序）"""
+        return self._get_pipeline().get_statistics()
     
     def validate_all(self, schedule: Schedule, school: School) -> List[ConstraintResult]:
         """全ての制約を検証"""
@@ -155,10 +203,18 @@ class ConstraintValidator:
         
         return f"制約違反: ハード制約 {hard_violations}件, ソフト制約 {soft_violations}件"
     
+    def create_incremental_evaluator(self, school: School) -> 'IncrementalConstraintEvaluator':
+        """登録済みの制約で差分評価器を作成"""
+        from ..services.core.incremental_constraint_evaluator import IncrementalConstraintEvaluator
+        return IncrementalConstraintEvaluator(
+            [(constraint, constraint.priority) for constraint in self.constraints], school
+        )
+    
     def add_constraint(self, constraint: Constraint) -> None:
         """制約を追加"""
         self.constraints.append(constraint)
         self.constraints.sort()  # 優先度順に再ソート
+        self._pipeline = None
     
     def remove_constraint(self, constraint_name: str) -> None:
         """制約を削除"""
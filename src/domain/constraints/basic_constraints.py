@@ -2,10 +2,10 @@
 from typing import List, Dict, Set
 from collections import defaultdict
 
-from .base import HardConstraint, SoftConstraint, ConstraintResult, ConstraintPriority
+from .base import HardConstraint, SoftConstraint, ConstraintResult, ConstraintPriority, ConstraintScope
 from ..entities.schedule import Schedule
 from ..entities.school import School
-from ..value_objects.time_slot import TimeSlot, Teacher
+from ..value_objects.time_slot import TimeSlot, Teacher, ClassReference
 from ..value_objects.assignment import ConstraintViolation
 from ..constants import WEEKDAYS, PERIODS, FIXED_SUBJECTS
 
@@ -338,6 +338,8 @@ class DailySubjectDuplicateConstraint(HardConstraint):
 class StandardHoursConstraint(SoftConstraint):
     """標準時数制約：各教科の週当たり時数が標準に合致することを確認"""
     
+    scope = ConstraintScope.CLASS
+    
     def __init__(self, tolerance: float = 0.5):
         super().__init__(
             priority=ConstraintPriority.MEDIUM,
@@ -350,36 +352,42 @@ class StandardHoursConstraint(SoftConstraint):
         violations = []
         
         for class_ref in school.get_all_classes():
-            required_subjects = school.get_required_subjects(class_ref)
-            
-            for subject in required_subjects:
-                required_hours = school.get_standard_hours(class_ref, subject)
-                actual_hours = schedule.count_subject_hours(class_ref, subject)
-                
-                difference = abs(actual_hours - required_hours)
-                if difference > self.tolerance:
-                    # 代表的な時間枠を取得（最初の割り当て）
-                    assignments = schedule.get_assignments_by_class(class_ref)
-                    representative_time_slot = None
-                    representative_assignment = None
-                    
-                    for ts, assignment in assignments:
-                        if assignment.subject == subject:
-                            representative_time_slot = ts
-                            representative_assignment = assignment
-                            break
-                    
-                    if representative_time_slot and representative_assignment:
-                        violation = ConstraintViolation(
-                            description=f"{class_ref}の{subject}: 標準{required_hours}時間 vs 実際{actual_hours}時間（差分: {difference}）",
-                            time_slot=representative_time_slot,
-                            assignment=representative_assignment,
-                            severity="WARNING"
-                        )
-                        violations.append(violation)
+            violations.extend(self.validate_scope(schedule, school, class_ref))
         
         return ConstraintResult(
             constraint_name=self.__class__.__name__,
             violations=violations,
             message=f"標準時数チェック完了: {len(violations)}件の違反"
-        )
\ No newline at end of file
+        )
+    
+    def validate_scope(self, schedule: Schedule, school: School,
+                       class_ref: ClassReference) -> List[ConstraintViolation]:
+        """1クラスの週当たり時数を検証"""
+        violations = []
+        required_subjects = school.get_required_subjects(class_ref)
+        # 教科ごとの代表的な時間枠（最初の割り当て）。違反があったときに一度だけ作る
+        first_assignments = None
+        
+        for subject in required_subjects:
+            required_hours = school.get_standard_hours(class_ref, subject)
+            actual_hours = schedule.count_subject_hours(class_ref, subject)
+            
+            difference = abs(actual_hours - required_hours)
+            if difference > self.tolerance:
+                # 代表的な時間枠を取得（最初の割り当て）
+                if first_assignments is None:
+                    first_assignments = {}
+                    for ts, assignment in schedule.get_assignments_by_class(class_ref):
+                        first_assignments.setdefault(assignment.subject, (ts, assignment))
+                representative_time_slot, representative_assignment = first_assignments.get(subject, (None, None))
+                
+                if representative_time_slot and representative_assignment:
+                    violation = ConstraintViolation(
+                        description=f"{class_ref}の{subject}: 標準{required_hours}時間 vs 実際{actual_hours}時間（差分: {difference}）",
+                        time_slot=representative_time_slot,
+                        assignment=representative_assignment,
+                        severity="WARNING"
+                    )
+                    violations.append(violation)
+        
+        return violations
\ No newline at end of file
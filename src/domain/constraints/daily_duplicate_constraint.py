@@ -3,12 +3,12 @@
 ConstraintValidatorを使用して重複チェックロジックを統一
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from ..entities.schedule import Schedule
 from ..entities.school import School
-from ..value_objects.time_slot import TimeSlot
+from ..value_objects.time_slot import TimeSlot, ClassReference
 from ..value_objects.assignment import Assignment
-from .base import Constraint, ConstraintResult, ConstraintType, ConstraintPriority, ConstraintViolation
+from .base import Constraint, ConstraintResult, ConstraintType, ConstraintPriority, ConstraintScope, ConstraintViolation
 from ..constants import WEEKDAYS, PERIODS, FIXED_SUBJECTS
 from ..services.validators.constraint_validator import ConstraintValidator
 
@@ -19,6 +19,8 @@ class DailyDuplicateConstraintRefactored(Constraint):
     ConstraintValidatorに委譲することで、重複したロジックを排除
     """
     
+    scope = ConstraintScope.CLASS_DAY
+    
     def __init__(self):
         """日内重複制約（同じ日に同じ教科の重複を制限）"""
         super().__init__(
@@ -36,36 +38,7 @@ class DailyDuplicateConstraintRefactored(Constraint):
         # 全クラスの全曜日をチェック
         for class_ref in school.get_all_classes():
             for day in WEEKDAYS:
-                # ConstraintValidatorを使用して各科目の出現回数を取得
-                subject_counts = {}
-                for period in PERIODS:
-                    time_slot = TimeSlot(day, period)
-                    assignment = schedule.get_assignment(time_slot, class_ref)
-                    if assignment and assignment.subject.name not in FIXED_SUBJECTS:
-                        subject_name = assignment.subject.name
-                        subject_counts[subject_name] = subject_counts.get(subject_name, 0) + 1
-                
-                # 制限を超えている科目を検出
-                for subject_name, count in subject_counts.items():
-                    max_allowed = self._get_max_allowed(subject_name)
-                    
-                    if count > max_allowed:
-                        # 違反を記録（最初の超過分のみ）
-                        violation_count = 0
-                        for period in PERIODS:
-                            time_slot = TimeSlot(day, period)
-                            assignment = schedule.get_assignment(time_slot, class_ref)
-                            if assignment and assignment.subject.name == subject_name:
-                                violation_count += 1
-                                if violation_count > max_allowed:
-                                    violation = ConstraintViolation(
-                                        description=f"日内重複違反: {class_ref}の{day}曜日に{subject_name}が{count}回配置されています（最大{max_allowed}回）",
-                                        time_slot=time_slot,
-                                        assignment=assignment,
-                                        severity="ERROR"
-                                    )
-                                    violations.append(violation)
-                                    break  # 最初の違反のみ記録
+                violations.extend(self.validate_scope(schedule, school, (class_ref, day)))
         
         return ConstraintResult(
             constraint_name=self.__class__.__name__,
@@ -73,6 +46,45 @@ class DailyDuplicateConstraintRefactored(Constraint):
             message=f"日内重複チェック完了: {len(violations)}件の違反"
         )
     
+    def validate_scope(self, schedule: Schedule, school: School,
+                       scope_key: Tuple[ClassReference, str]) -> List[ConstraintViolation]:
+        """1クラス・1曜日の日内重複を検証"""
+        class_ref, day = scope_key
+        violations = []
+        
+        # 各科目の出現回数を取得
+        subject_counts = {}
+        for period in PERIODS:
+            time_slot = TimeSlot(day, period)
+            assignment = schedule.get_assignment(time_slot, class_ref)
+            if assignment and assignment.subject.name not in FIXED_SUBJECTS:
+                subject_name = assignment.subject.name
+                subject_counts[subject_name] = subject_counts.get(subject_name, 0) + 1
+        
+        # 制限を超えている科目を検出
+        for subject_name, count in subject_counts.items():
+            max_allowed = self._get_max_allowed(subject_name)
+            
+            if count > max_allowed:
+                # 違反を記録（最初の超過分のみ）
+                violation_count = 0
+                for period in PERIODS:
+                    time_slot = TimeSlot(day, period)
+                    assignment = schedule.get_assignment(time_slot, class_ref)
+                    if assignment and assignment.subject.name == subject_name:
+                        violation_count += 1
+                        if violation_count > max_allowed:
+                            violation = ConstraintViolation(
+                                description=f"日内重複違反: {class_ref}の{day}曜日に{subject_name}が{count}回配置されています（最大{max_allowed}回）",
+                                time_slot=time_slot,
+                                assignment=assignment,
+                                severity="ERROR"
+                            )
+                            violations.append(violation)
+                            break  # 最初の違反のみ記録
+        
+        return violations
+    
     def check(self, schedule: Schedule, school: School, time_slot: TimeSlot, 
               assignment: Assignment) -> bool:
         """
@@ -2,8 +2,8 @@
 
 ExchangeClassServiceを使用して交流学級ロジックを一元化
 """
-from typing import Dict, Tuple, Optional
-from .base import Constraint, ConstraintResult, ConstraintType, ConstraintPriority, ConstraintViolation
+from typing import Dict, List, Tuple, Optional
+from .base import Constraint, ConstraintResult, ConstraintType, ConstraintPriority, ConstraintScope, ConstraintViolation
 from ..entities.schedule import Schedule
 from ..entities.school import School
 from ..value_objects.time_slot import TimeSlot, ClassReference
@@ -17,6 +17,8 @@ class ExchangeClassSyncConstraintRefactored(Constraint):
     ExchangeClassServiceに委譲することで、交流学級関連のロジックを統一
     """
     
+    scope = ConstraintScope.TIME_SLOT
+    
     def __init__(self, check_mode='normal'):
         """
         Args:
@@ -34,33 +36,38 @@ class ExchangeClassSyncConstraintRefactored(Constraint):
     
     def validate(self, schedule: Schedule, school: School) -> ConstraintResult:
         """交流学級が適切に親学級と同期しているか検証"""
-        violations = []
-        
-        # ExchangeClassServiceから違反を取得
+        # ExchangeClassServiceから違反を取得（交流学級ごと・時間枠順）
         service_violations = self.exchange_service.get_exchange_violations(schedule)
+        violations = self._to_constraint_violations(schedule, service_violations)
         
-        # サービスの違反情報をConstraintViolationに変換
+        return ConstraintResult(
+            constraint_name=self.__class__.__name__,
+            violations=violations,
+            message=f"交流学級同期チェック完了: {len(violations)}件の違反"
+        )
+    
+    def validate_scope(self, schedule: Schedule, school: School,
+                       time_slot: TimeSlot) -> List[ConstraintViolation]:
+        """1つの時間枠で交流学級が親学級と同期しているか検証"""
+        service_violations = self.exchange_service.get_exchange_violations_at(schedule, time_slot)
+        return self._to_constraint_violations(schedule, service_violations)
+    
+    @staticmethod
+    def _to_constraint_violations(schedule: Schedule, service_violations: List[Dict]) -> List[ConstraintViolation]:
+        """サービスの違反情報をConstraintViolationに変換"""
+        violations = []
         for violation_info in service_violations:
             time_slot = violation_info['time_slot']
-            exchange_class = violation_info['exchange_class']
             
             # 該当する割り当てを取得
-            assignment = schedule.get_assignment(time_slot, exchange_class)
-            
-            # ConstraintViolationオブジェクトを作成
-            violation = ConstraintViolation(
+            assignment = schedule.get_assignment(time_slot, violation_info['exchange_class'])
+            violations.append(ConstraintViolation(
                 description=violation_info['message'],
                 time_slot=time_slot,
                 assignment=assignment,
                 severity="ERROR"
-            )
-            violations.append(violation)
-        
-        return ConstraintResult(
-            constraint_name=self.__class__.__name__,
-            violations=violations,
-            message=f"交流学級同期チェック完了: {len(violations)}件の違反"
-        )
+            ))
+        return violations
     
     def check(self, schedule: Schedule, school: School, time_slot: TimeSlot, 
               assignment: Assignment) -> bool:
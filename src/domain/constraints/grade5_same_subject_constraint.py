@@ -2,7 +2,7 @@
 from typing import List, Dict
 from pathlib import Path
 from collections import defaultdict
-from .base import Constraint, ConstraintResult, ConstraintType, ConstraintPriority, ConstraintViolation
+from .base import Constraint, ConstraintResult, ConstraintType, ConstraintPriority, ConstraintScope, ConstraintViolation
 from ..entities.schedule import Schedule
 from ..entities.school import School
 from ..value_objects.time_slot import TimeSlot, ClassReference
@@ -13,6 +13,8 @@ from ..constants import WEEKDAYS, PERIODS
 class Grade5SameSubjectConstraint(Constraint):
     """5組同一教科制約 - 各学年の5組は同じ時限に同じ教科を行う"""
     
+    scope = ConstraintScope.TIME_SLOT
+    
     def __init__(self, config_reader: IConfigurationReader = None):
         super().__init__(
             constraint_type=ConstraintType.HARD,
@@ -42,32 +44,35 @@ class Grade5SameSubjectConstraint(Constraint):
         # 各時間枠をチェック
         for day in WEEKDAYS:
             for period in PERIODS:
-                time_slot = TimeSlot(day, period)
-                
-                # 5組の各クラスの教科を取得
-                subjects = {}
-                for class_ref in self.grade5_classes:
-                    assignment = schedule.get_assignment(time_slot, class_ref)
-                    if assignment:
-                        subjects[class_ref] = assignment.subject.name
-                    else:
-                        subjects[class_ref] = "空き"
-                
-                # 全ての5組が同じ教科でない場合は違反
-                if len(subjects) > 0:
-                    subject_values = list(subjects.values())
-                    if not all(s == subject_values[0] for s in subject_values):
-                        violation = ConstraintViolation(
-                            description=f"5組同一教科違反: {time_slot}に5組の教科が揃っていません - " + 
-                                      ", ".join([f"{c}: {s}" for c, s in subjects.items()]),
-                            time_slot=time_slot,
-                            assignment=None,  # 複数クラスにまたがるため特定の割り当てはない
-                            severity="ERROR"
-                        )
-                        violations.append(violation)
+                violations.extend(self.validate_scope(schedule, school, TimeSlot(day, period)))
         
         return ConstraintResult(
             constraint_name=self.__class__.__name__,
             violations=violations,
             message=f"5組同一教科チェック完了: {len(violations)}件の違反"
-        )
\ No newline at end of file
+        )
+    
+    def validate_scope(self, schedule: Schedule, school: School,
+                       time_slot: TimeSlot) -> List[ConstraintViolation]:
+        """1つの時間枠で5組の教科が揃っているか検証"""
+        # 5組の各クラスの教科を取得
+        subjects = {}
+        for class_ref in self.grade5_classes:
+            assignment = schedule.get_assignment(time_slot, class_ref)
+            if assignment:
+                subjects[class_ref] = assignment.subject.name
+            else:
+                subjects[class_ref] = "空き"
+        
+        # 全ての5組が同じ教科でない場合は違反
+        if len(subjects) > 0:
+            subject_values = list(subjects.values())
+            if not all(s == subject_values[0] for s in subject_values):
+                return [ConstraintViolation(
+                    description=f"5組同一教科違反: {time_slot}に5組の教科が揃っていません - " + 
+                              ", ".join([f"{c}: {s}" for c, s in subjects.items()]),
+                    time_slot=time_slot,
+                    assignment=None,  # 複数クラスにまたがるため特定の割り当てはない
+                    severity="ERROR"
+                )]
+        return []
@@ -7,7 +7,7 @@ import json
 import logging
 from pathlib import Path
 from typing import List, Dict, Set
-from .base import HardConstraint, ConstraintPriority, ConstraintResult, ConstraintViolation
+from .base import HardConstraint, ConstraintPriority, ConstraintResult, ConstraintScope, ConstraintViolation
 from ..entities.schedule import Schedule
 from ..entities.school import School
 from ..value_objects.time_slot import TimeSlot
@@ -26,6 +26,8 @@ class GymUsageConstraintRefactored(LoggingMixin, HardConstraint):
     ただし、設定された合同体育クラスは例外とする。
     """
     
+    scope = ConstraintScope.TIME_SLOT
+    
     def __init__(self):
         super().__init__(
             priority=ConstraintPriority.CRITICAL,
@@ -34,6 +36,14 @@ class GymUsageConstraintRefactored(LoggingMixin, HardConstraint):
         )
         self.joint_pe_groups = self._load_joint_pe_config()
         self.logger.info(f"Loaded joint PE groups: {self._format_joint_pe_groups()}")
+        self._test_period_protector = None
+    
+    def _get_test_period_protector(self):
+        """テスト期間判定用のTestPeriodProtector（Follow-up.csvの解析は初回のみ）"""
+        if self._test_period_protector is None:
+            from ..services.core.test_period_protector import TestPeriodProtector
+            self._test_period_protector = TestPeriodProtector()
+        return self._test_period_protector
     
     def _load_joint_pe_config(self) -> Dict[str, Set[ClassReference]]:
         """Load joint PE configuration from team_teaching_config.json and exchange_class_pairs.csv
@@ -195,49 +205,53 @@ class GymUsageConstraintRefactored(LoggingMixin, HardConstraint):
         # 各時間枠で保健体育の実施クラス数をチェック
         for day in WEEKDAYS:
             for period in PERIODS:
-                time_slot = TimeSlot(day, period)
-                assignments = schedule.get_assignments_by_time_slot(time_slot)
-                
-                # テスト期間中は体育館を使わないのでスキップ
-                from ..services.core.test_period_protector import TestPeriodProtector
-                test_protector = TestPeriodProtector()
-                if test_protector.is_test_period(time_slot):
-                    continue
-                
-                # 保健体育の授業を収集
-                pe_assignments = []
-                pe_classes = []
-                for assignment in assignments:
-                    if assignment.subject.name == "保":
-                        pe_assignments.append(assignment)
-                        pe_classes.append(assignment.class_ref)
-                
-                # 2クラス以上が同時に保健体育を実施している場合
-                if len(pe_classes) > 1:
-                    # 合同体育セッションかチェック
-                    if not self._is_joint_pe_session(pe_classes):
-                        # 合同体育でない場合のみ違反
-                        for assignment in pe_assignments:
-                            violation = ConstraintViolation(
-                                description=f"体育館使用制約違反: {time_slot}に{len(pe_classes)}クラスが同時に保健体育を実施 "
-                                           f"(合同体育グループではない) - {', '.join(str(c) for c in pe_classes)}",
-                                time_slot=time_slot,
-                                assignment=assignment,
-                                severity="ERROR"
-                            )
-                            violations.append(violation)
-                    else:
-                        # 合同体育の場合はログに記録（違反ではない）
-                        self.logger.info(
-                            f"{time_slot}: 合同体育セッション検出 - "
-                            f"{', '.join(str(c) for c in pe_classes)}"
-                        )
+                violations.extend(self.validate_scope(schedule, school, TimeSlot(day, period)))
         
         return ConstraintResult(
             constraint_name=self.name,
             violations=violations
         )
+    
+    def validate_scope(self, schedule: Schedule, school: School,
+                       time_slot: TimeSlot) -> List[ConstraintViolation]:
+        """1つの時間枠の体育館使用を検証"""
+        violations = []
+        
+        # テスト期間中は体育館を使わないのでスキップ
+        if self._get_test_period_protector().is_test_period(time_slot):
+            return violations
+        
+        # 保健体育の授業を収集
+        pe_assignments = []
+        pe_classes = []
+        for assignment in schedule.get_assignments_by_time_slot(time_slot):
+            if assignment.subject.name == "保":
+                pe_assignments.append(assignment)
+                pe_classes.append(assignment.class_ref)
+        
+        # 2クラス以上が同時に保健体育を実施している場合
+        if len(pe_classes) > 1:
+            # 合同体育セッションかチェック
+            if not self._is_joint_pe_session(pe_classes):
+                # 合同体育でない場合のみ違反
+                for assignment in pe_assignments:
+                    violation = ConstraintViolation(
+                        description=f"体育館使用制約違反: {time_slot}に{len(pe_classes)}クラスが同時に保健体育を実施 "
+                                   f"(合同体育グループではない) - {', '.join(str(c) for c in pe_classes)}",
+                        time_slot=time_slot,
+                        assignment=assignment,
+                        severity="ERROR"
+                    )
+                    violations.append(violation)
+            else:
+                # 合同体育の場合はログに記録（違反ではない）
+                self.logger.info(
+                    f"{time_slot}: 合同体育セッション検出 - "
+                    f"{', '.join(str(c) for c in pe_classes)}"
+                )
+        
+        return violations
 
 
 # Alias for backward compatibility
-GymUsageConstraint = GymUsageConstraintRefactored
\ No newline at end of file
+GymUsageConstraint = GymUsageConstraintRefactored
\ No newline at end of file
@@ -1,7 +1,7 @@
 """教科妥当性制約"""
 from typing import List
 
-from .base import HardConstraint, ConstraintResult, ConstraintPriority
+from .base import HardConstraint, ConstraintResult, ConstraintPriority, ConstraintScope
 from ..entities.schedule import Schedule
 from ..entities.school import School
 from ..value_objects.time_slot import TimeSlot
@@ -11,6 +11,8 @@ from ..value_objects.assignment import ConstraintViolation
 class SubjectValidityConstraint(HardConstraint):
     """教科妥当性制約：クラスに適さない教科の配置を防ぐ"""
     
+    scope = ConstraintScope.TIME_SLOT
+    
     def __init__(self):
         super().__init__(
             priority=ConstraintPriority.CRITICAL,
@@ -21,22 +23,29 @@ class SubjectValidityConstraint(HardConstraint):
     def validate(self, schedule: Schedule, school: School) -> ConstraintResult:
         violations = []
         
-        for time_slot, assignment in schedule.get_all_assignments():
-            # 教科がクラスに適切でない場合
-            if not assignment.subject.is_valid_for_class(assignment.class_ref):
-                violation = ConstraintViolation(
-                    description=f"クラス{assignment.class_ref}に不適切な教科{assignment.subject}が配置されています",
-                    time_slot=time_slot,
-                    assignment=assignment,
-                    severity="ERROR"
-                )
-                violations.append(violation)
+        for time_slot in self.iterate_all_time_slots():
+            violations.extend(self.validate_scope(schedule, school, time_slot))
         
         return ConstraintResult(
             constraint_name=self.__class__.__name__,
             violations=violations,
             message=f"教科妥当性チェック完了: {len(violations)}件の違反"
         )
+    
+    def validate_scope(self, schedule: Schedule, school: School,
+                       time_slot: TimeSlot) -> List[ConstraintViolation]:
+        """1つの時間枠の教科がクラスに適切か検証"""
+        violations = []
+        for assignment in schedule.get_assignments_by_time_slot(time_slot):
+            # 教科がクラスに適切でない場合
+            if not assignment.subject.is_valid_for_class(assignment.class_ref):
+                violations.append(ConstraintViolation(
+                    description=f"クラス{assignment.class_ref}に不適切な教科{assignment.subject}が配置されています",
+                    time_slot=time_slot,
+                    assignment=assignment,
+                    severity="ERROR"
+                ))
+        return violations
 
 
 class SpecialNeedsDuplicateConstraint(HardConstraint):
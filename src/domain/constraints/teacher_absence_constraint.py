@@ -3,7 +3,7 @@
 ConstraintValidatorを使用して教師不在チェックロジックを統一
 """
 from typing import Dict, List, Optional, Set
-from .base import HardConstraint, ConstraintPriority, ConstraintResult, ConstraintViolation
+from .base import HardConstraint, ConstraintPriority, ConstraintResult, ConstraintScope, ConstraintViolation
 from ..entities.school import School
 from ..entities.schedule import Schedule
 from ..value_objects.time_slot import TimeSlot
@@ -18,6 +18,8 @@ class TeacherAbsenceConstraintRefactored(HardConstraint):
     ConstraintValidatorに委譲することで、教師不在チェックロジックを統一
     """
     
+    scope = ConstraintScope.TIME_SLOT
+    
     def __init__(self, absence_loader=None):
         super().__init__(
             priority=ConstraintPriority.CRITICAL,
@@ -44,37 +46,34 @@ class TeacherAbsenceConstraintRefactored(HardConstraint):
     def validate(self, schedule: Schedule, school: School) -> ConstraintResult:
         """スケジュール全体の教師不在制約を検証
         
-        ConstraintValidatorの検証結果を使用
+        ConstraintValidatorの教師不在情報を使用
         """
         violations = []
-        
-        # ConstraintValidatorから全体の違反を取得
-        all_violations = self.constraint_validator.validate_all_constraints(schedule, school)
-        
-        # 教師不在違反のみを抽出
-        teacher_absence_violations = [v for v in all_violations if v['type'] == 'teacher_absence']
-        
-        # ConstraintViolationオブジェクトに変換
-        for violation_info in teacher_absence_violations:
-            time_slot = violation_info['time_slot']
-            class_ref = violation_info['class_ref']
-            
-            # 該当する割り当てを取得
-            assignment = schedule.get_assignment(time_slot, class_ref)
-            
-            if assignment:
-                violation = ConstraintViolation(
-                    description=violation_info['message'],
-                    time_slot=time_slot,
-                    assignment=assignment,
-                    severity="ERROR"
-                )
-                violations.append(violation)
+        for time_slot in self.iterate_all_time_slots():
+            violations.extend(self.validate_scope(schedule, school, time_slot))
         
         return ConstraintResult(
             constraint_name=self.name,
             violations=violations
         )
+    
+    def validate_scope(self, schedule: Schedule, school: School,
+                       time_slot: TimeSlot) -> List[ConstraintViolation]:
+        """1つの時間枠で不在の教師に授業が割り当てられていないか検証
+        
+        判定とメッセージはConstraintValidatorのものを使用
+        """
+        return [
+            ConstraintViolation(
+                description=self.constraint_validator.teacher_absence_message(assignment, time_slot, class_ref),
+                time_slot=time_slot,
+                assignment=assignment,
+                severity="ERROR"
+            )
+            for class_ref, assignment in self.constraint_validator.find_absent_teacher_assignments(
+                schedule, school, time_slot
+            )
+        ]
 
 # Alias for backward compatibility
 TeacherAbsenceConstraint = TeacherAbsenceConstraintRefactored
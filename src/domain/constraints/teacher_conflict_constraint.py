@@ -6,7 +6,7 @@ ConstraintValidatorを使用して教師重複チェックロジックを統一
 from typing import List, Optional, Set, Dict, Tuple
 import json
 import os
-from .base import HardConstraint, ConstraintPriority, ConstraintResult, ConstraintViolation
+from .base import HardConstraint, ConstraintPriority, ConstraintResult, ConstraintScope, ConstraintViolation
 from ..entities.school import School
 from ..entities.schedule import Schedule
 from ..value_objects.time_slot import TimeSlot
@@ -23,6 +23,8 @@ class TeacherConflictConstraintRefactoredV2(HardConstraint):
     5組の合同授業、テスト期間の巡回監督、交流学級の自立活動重複などを正常パターンとして処理
     """
     
+    scope = ConstraintScope.TIME_SLOT
+    
     def __init__(self):
         super().__init__(
             priority=ConstraintPriority.CRITICAL,
@@ -155,55 +157,50 @@ class TeacherConflictConstraintRefactoredV2(HardConstraint):
     def validate(self, schedule: Schedule, school: School) -> ConstraintResult:
         """スケジュール全体の教師重複制約を検証"""
         violations = []
-        checked_combinations = set()  # 重複チェックを避けるため
-        
-        # 全ての時間枠を生成
-        days = ["月", "火", "水", "木", "金"]
-        periods = [1, 2, 3, 4, 5, 6]
-        
-        for day in days:
-            for period in periods:
-                time_slot = TimeSlot(day, period)
-                
-                # 各時間枠で教師ごとにクラスを収集
-                teacher_classes = {}
-                for class_ref in school.get_all_classes():
-                    assignment = schedule.get_assignment(time_slot, class_ref)
-                    if assignment and assignment.teacher:
-                        teacher_name = assignment.teacher.name
-                        if teacher_name not in teacher_classes:
-                            teacher_classes[teacher_name] = []
-                        teacher_classes[teacher_name].append((class_ref, assignment))
-                
-                # 複数クラスを担当している教師をチェック
-                for teacher_name, classes in teacher_classes.items():
-                    if len(classes) > 1:
-                        # 除外ルールに該当するかチェック
-                        if self._should_exclude_conflict(teacher_name, classes, time_slot, schedule, school):
-                            continue
-                        
-                        # 除外されない場合は違反として記録
-                        # 1つの重複につき1つの違反を生成
-                        class_refs = [c for c, a in classes]
-                        classes_str = ", ".join(str(c) for c in class_refs)
-                        
-                        # 違反のキー（教師、時間）が既に処理済みかチェック
-                        check_key = (time_slot, teacher_name)
-                        if check_key not in checked_combinations:
-                            checked_combinations.add(check_key)
-                            
-                            violation = ConstraintViolation(
-                                description=f"教師重複違反: {teacher_name}先生が{time_slot}に{classes_str}を同時に担当",
-                                time_slot=time_slot,
-                                assignment=classes[0][1],  # 代表として最初の割り当てを使用
-                                severity="ERROR"
-                            )
-                            violations.append(violation)
+        for time_slot in self.iterate_all_time_slots():
+            violations.extend(self.validate_scope(schedule, school, time_slot))
         
         return ConstraintResult(
             constraint_name=self.name,
             violations=violations
         )
+    
+    def validate_scope(self, schedule: Schedule, school: School,
+                       time_slot: TimeSlot) -> List[ConstraintViolation]:
+        """1つの時間枠の教師重複を検証"""
+        violations = []
+        
+        # 時間枠で教師ごとにクラスを収集
+        teacher_classes = {}
+        for class_ref in school.get_all_classes():
+            assignment = schedule.get_assignment(time_slot, class_ref)
+            if assignment and assignment.teacher:
+                teacher_name = assignment.teacher.name
+                if teacher_name not in teacher_classes:
+                    teacher_classes[teacher_name] = []
+                teacher_classes[teacher_name].append((class_ref, assignment))
+        
+        # 複数クラスを担当している教師をチェック
+        for teacher_name, classes in teacher_classes.items():
+            if len(classes) > 1:
+                # 除外ルールに該当するかチェック
+                if self._should_exclude_conflict(teacher_name, classes, time_slot, schedule, school):
+                    continue
+                
+                # 除外されない場合は違反として記録
+                # 1つの重複につき1つの違反を生成
+                class_refs = [c for c, a in classes]
+                classes_str = ", ".join(str(c) for c in class_refs)
+                
+                violation = ConstraintViolation(
+                    description=f"教師重複違反: {teacher_name}先生が{time_slot}に{classes_str}を同時に担当",
+                    time_slot=time_slot,
+                    assignment=classes[0][1],  # 代表として最初の割り当てを使用
+                    severity="ERROR"
+                )
+                violations.append(violation)
+        
+        return violations
 
 
 # Alias for backward compatibility
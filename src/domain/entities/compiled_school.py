@@ -0,0 +1,113 @@
+"""学校データのコンパイル済み索引
+
+Schoolの読み込み後に一度だけ作る不変の索引。クラス・教員・教科に連番IDを振り、
+クラス×教科の担当教員ID行列、教員ごとの担当(教科, クラス)一覧、教員ごとの不在コマの
+ビットマスク（30コマ）、交流学級と親学級の対応を持つ。
+
+生成処理の内側のループで呼ばれる get_all_classes / is_teacher_unavailable /
+get_teacher_class_assignments などは、毎回のソートや全件走査の代わりにこの索引を引く。
+Schoolが変更されると索引は破棄され、次に参照された時に作り直される。
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+from ..constants import PERIOD_COUNT, WEEKDAYS
+from ..value_objects.time_slot import ClassReference, Subject, Teacher
+from ...shared.mixins.validation_mixin import ValidationError
+
+if TYPE_CHECKING:
+    from .school import School
+
+NO_TEACHER = -1
+
+# (曜日, 校時) → 不在ビットマスクのビット位置（「月曜」などの表記も含む）
+ABSENCE_SLOTS: Dict[Tuple[str, int], int] = {}
+for _day_number, _day in enumerate(WEEKDAYS):
+    for _period in range(1, PERIOD_COUNT + 1):
+        ABSENCE_SLOTS[(_day, _period)] = _day_number * PERIOD_COUNT + _period - 1
+        ABSENCE_SLOTS[(_day + "曜", _period)] = ABSENCE_SLOTS[(_day, _period)]
+
+
+def absence_slot(day: str, period: int) -> Optional[int]:
+    """曜日・校時を不在ビットマスクのビット位置に変換（30コマの外ならNone）"""
+    return ABSENCE_SLOTS.get((day, period))
+
+
+@dataclass(frozen=True)
+class CompiledSchool:
+    """Schoolから作る不変の索引"""
+    
+    classes: Tuple[ClassReference, ...]
+    teachers: Tuple[Teacher, ...]
+    subjects: Tuple[Subject, ...]
+    class_ids: Dict[ClassReference, int]
+    teacher_ids: Dict[Teacher, int]
+    subject_ids: Dict[Subject, int]
+    # クラスID × 教科ID → 担当教員ID（未割り当てはNO_TEACHER）
+    assigned_teacher_ids: Tuple[Tuple[int, ...], ...]
+    # 教員 → 担当している(教科, クラス)
+    teacher_assignments: Dict[Teacher, Tuple[Tuple[Subject, ClassReference], ...]]
+    # 教員 → 不在コマのビットマスク（ビット位置は曜日番号×6 + 校時-1）
+    absence_masks: Dict[Teacher, int]
+    # 交流学級 → 親学級、親学級 → 交流学級
+    exchange_parents: Dict[ClassReference, ClassReference]
+    exchange_children: Dict[ClassReference, Tuple[ClassReference, ...]]
+    
+    @classmethod
+    def build(cls, school: 'School') -> 'CompiledSchool':
+        """Schoolの現在の内容から索引を作る"""
+        classes = tuple(sorted(school._classes, key=lambda c: (c.grade, c.class_number)))
+        teachers = tuple(sorted(school._teachers, key=lambda t: t.name))
+        subjects = tuple(sorted(
+            set(school._subject_teachers) | {subject for subject, _ in school._teacher_assignments},
+            key=lambda s: s.name
+        ))
+        class_ids = {class_ref: i for i, class_ref in enumerate(classes)}
+        teacher_ids = {teacher: i for i, teacher in enumerate(teachers)}
+        subject_ids = {subject: i for i, subject in enumerate(subjects)}
+        
+        matrix = [[NO_TEACHER] * len(subjects) for _ in classes]
+        teacher_assignments: Dict[Teacher, list] = {}
+        for (subject, class_ref), teacher in school._teacher_assignments.items():
+            teacher_assignments.setdefault(teacher, []).append((subject, class_ref))
+            class_id = class_ids.get(class_ref)
+            if class_id is not None and teacher in teacher_ids:
+                matrix[class_id][subject_ids[subject]] = teacher_ids[teacher]
+        
+        absence_masks: Dict[Teacher, int] = {}
+        for (day, period), absent_teachers in school._teacher_unavailable.items():
+            slot = absence_slot(day, period)
+            if slot is None:
+                continue
+            for teacher in absent_teachers:
+                absence_masks[teacher] = absence_masks.get(teacher, 0) | 1 << slot
+        
+        exchange_parents: Dict[ClassReference, ClassReference] = {}
+        exchange_children: Dict[ClassReference, list] = {}
+        for class_ref in classes:
+            if not class_ref.is_exchange_class():
+                continue
+            try:
+                parent = class_ref.get_parent_class()
+            except ValidationError:
+                continue
+            exchange_parents[class_ref] = parent
+            exchange_children.setdefault(parent, []).append(class_ref)
+        
+        return cls(
+            classes=classes,
+            teachers=teachers,
+            subjects=subjects,
+            class_ids=class_ids,
+            teacher_ids=teacher_ids,
+            subject_ids=subject_ids,
+            assigned_teacher_ids=tuple(tuple(row) for row in matrix),
+            teacher_assignments={t: tuple(pairs) for t, pairs in teacher_assignments.items()},
+            absence_masks=absence_masks,
+            exchange_parents=exchange_parents,
+            exchange_children={p: tuple(children) for p, children in exchange_children.items()},
+        )
+    
+    def is_teacher_absent(self, teacher: Teacher, slot: int) -> bool:
+        """教員が指定スロット（0〜29）に不在かどうか"""
+        return bool(self.absence_masks.get(teacher, 0) >> slot & 1)
@@ -55,6 +55,16 @@ class Grade5Unit(ValidationMixin):
     def set_teacher_absence_checker(self, checker_func: Callable[[str, str, int], bool]) -> None:
         """教師不在チェック関数を設定"""
         self._is_teacher_absent_func = checker_func
+
+    def fork(self) -> 'Grade5Unit':
+        """割り当てとロック状態を独立させた複製を作成（設定・不在チェック関数は共有）"""
+        new_unit = Grade5Unit.__new__(Grade5Unit)
+        new_unit.__dict__.update(self.__dict__)
+        new_unit._assignments = self._assignments.copy()
+        new_unit._locked_slots = self._locked_slots.copy()
+        if hasattr(self, '_hour_assignments'):
+            new_unit._hour_assignments = self._hour_assignments.copy()
+        return new_unit
     
     def assign(self, time_slot: TimeSlot, subject: Subject, teacher: Optional[Teacher] = None) -> None:
         """5組全体に同じ教科・教員を割り当て"""
@@ -116,6 +126,26 @@ class Grade5Unit(ValidationMixin):
                     f"5組ユニット: {time_slot}に{subject}({teacher})を割り当て"
                 )
     
+    def get_slot_state(self, time_slot: TimeSlot) -> tuple:
+        """時間枠の割り当て状態を取得（restore_slot_state() で復元する）"""
+        hour_assignments = getattr(self, '_hour_assignments', None)
+        return (self._assignments.get(time_slot),
+                hour_assignments.get(time_slot) if hour_assignments is not None else None)
+    
+    def restore_slot_state(self, time_slot: TimeSlot, state: tuple) -> None:
+        """get_slot_state() で取得した状態に戻す（ロック・不在チェックは行わない）"""
+        assignment, hour_assignment = state
+        if assignment is None:
+            self._assignments.pop(time_slot, None)
+        else:
+            self._assignments[time_slot] = assignment
+        hour_assignments = getattr(self, '_hour_assignments', None)
+        if hour_assignments is not None:
+            if hour_assignment is None:
+                hour_assignments.pop(time_slot, None)
+            else:
+                hour_assignments[time_slot] = hour_assignment
+    
     def remove_assignment(self, time_slot: TimeSlot) -> None:
         """割り当てを削除"""
         if time_slot in self._assignments:
@@ -270,4 +300,4 @@ class Grade5Unit(ValidationMixin):
         
         # 偏りがある場合は調整
         if self.detailed_logging:
-            self.logger.info(f"5組時数配分: {hour_counts}")
\ No newline at end of file
+            self.logger.info(f"5組時数配分: {hour_counts}")
\ No newline at end of file
@@ -1,10 +1,11 @@
 """スケジュールエンティティ"""
-from typing import Dict, List, Optional, Set
-from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
 
 from ..value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
 from ..value_objects.assignment import Assignment, ConstraintViolation
 from .grade5_unit import Grade5Unit
+from .schedule_grid import ScheduleGrid, ALL_TIME_SLOTS, slot_index, day_index
+from ..constants import PERIOD_COUNT
 from ..exceptions import (
     SubjectAssignmentException,
     FixedSubjectModificationException,
@@ -13,15 +14,27 @@ from ..exceptions import (
 
 
 class Schedule:
-    """時間割を管理するエンティティ"""
+    """時間割を管理するエンティティ
+    
+    割り当てとロックは配列ベースのScheduleGridに保持し、教員の占有状況や
+    日内の教科数はグリッドのインデックスからO(1)で参照する。
+
+    教員の占有インデックスは assign / remove_assignment の中で更新されるため、
+    生成戦略は独自の教員トラッカーを持たず、is_teacher_free /
+    get_teacher_daily_load / get_teacher_conflicts で参照する。
+
+    begin() から commit() までの間はセルの変更を取り消しログに記録し、
+    savepoint() で取得した位置まで rollback_to() で巻き戻せる（入れ子可）。
+    バックトラッキングで試した配置を、ポリシーチェックをやり直さずに取り消す用途向け。
+    """
     
     def __init__(self):
-        self._assignments: Dict[TimeSlot, Dict[ClassReference, Assignment]] = defaultdict(dict)
-        self._locked_cells: Set[tuple[TimeSlot, ClassReference]] = set()
+        self._grid = ScheduleGrid()
         self._violations: List[ConstraintViolation] = []
         # 5組ユニット
         self._grade5_unit = Grade5Unit()
         self._grade5_classes = [ClassReference(1, 5), ClassReference(2, 5), ClassReference(3, 5)]
+        self._grade5_class_set = frozenset(self._grade5_classes)
         # 固定科目保護ポリシー
         from ..policies.fixed_subject_protection_policy import FixedSubjectProtectionPolicy
         self._fixed_subject_policy = FixedSubjectProtectionPolicy()
@@ -30,6 +43,12 @@ class Schedule:
         self._grade5_sync_enabled = True
         # テスト期間情報を格納 (day -> [periods])
         self.test_periods: Dict[str, List[int]] = {}
+        # セル変更の通知先（差分評価器など）
+        self._change_listeners: List[Callable[[TimeSlot, ClassReference], None]] = []
+        # 取り消しログ（トランザクション外はNone）
+        # 要素は (スロット, クラス, 変更前の割り当て)。クラスがNoneの要素は5組ユニットの変更前の状態
+        self._journal: Optional[List[tuple]] = None
+        self._transaction_depth = 0
     
     @property
     def grade5_unit(self) -> Grade5Unit:
@@ -38,6 +57,7 @@ class Schedule:
     
     def assign(self, time_slot: TimeSlot, assignment: Assignment) -> None:
         """指定された時間枠にクラスの割り当てを設定"""
+        slot = slot_index(time_slot)
         if self.is_locked(time_slot, assignment.class_ref):
             raise InvalidAssignmentException(f"セルがロックされています: {time_slot} - {assignment.class_ref}")
         
@@ -73,7 +93,7 @@ class Schedule:
                     )
         
         # 5組の場合は特別処理（5組同期が有効な場合のみ）
-        if self._grade5_sync_enabled and assignment.class_ref in self._grade5_classes:
+        if self._grade5_sync_enabled and assignment.class_ref in self._grade5_class_set:
             # 5組全体に同じ教科・教員を割り当て
             # ただし、ロックされているセルはスキップ
             can_assign_to_unit = True
@@ -85,16 +105,17 @@ class Schedule:
             
             if can_assign_to_unit:
                 # 全ての5組セルがロックされていない場合のみユニットに割り当て
+                self._record_grade5_unit(slot, time_slot)
                 self._grade5_unit.assign(time_slot, assignment.subject, assignment.teacher)
                 # 通常の割り当ても行う（互換性のため）
                 for grade5_class in self._grade5_classes:
-                    self._assignments[time_slot][grade5_class] = Assignment(
+                    self._write_cell(slot, grade5_class, Assignment(
                         grade5_class, assignment.subject, assignment.teacher
-                    )
+                    ))
             else:
                 # 一部がロックされている場合は、個別に割り当て（同期は崩れる可能性がある）
                 if not self.is_locked(time_slot, assignment.class_ref):
-                    self._assignments[time_slot][assignment.class_ref] = assignment
+                    self._write_cell(slot, assignment.class_ref, assignment)
                 else:
                     # ロックされている場合はエラー（既にチェック済みだが念のため）
                     raise InvalidAssignmentException(
@@ -103,26 +124,32 @@ class Schedule:
                     )
         else:
             # 5組同期が無効の場合、または5組以外の場合は通常の割り当て
-            self._assignments[time_slot][assignment.class_ref] = assignment
+            previous = self._grid.set_cell(slot, assignment.class_ref, assignment)
+            if self._journal is not None and previous is not assignment:
+                self._journal.append((slot, assignment.class_ref, previous))
+        
+        if self._change_listeners:
+            self._notify_change(time_slot, assignment.class_ref)
     
     def get_assignment(self, time_slot: TimeSlot, class_ref: ClassReference) -> Optional[Assignment]:
         """指定された時間枠・クラスの割り当てを取得"""
         # 5組の場合は特別処理
-        if class_ref in self._grade5_classes:
+        if class_ref in self._grade5_class_set:
             # Grade5Unitから取得を試みる
             unit_assignment = self._grade5_unit.get_assignment(time_slot, class_ref)
             if unit_assignment:
                 return unit_assignment
             
             # Grade5Unitに無い場合は、通常の_assignmentsから取得（CSV読み込み時のデータ）
-            direct_assignment = self._assignments[time_slot].get(class_ref)
+            slot = slot_index(time_slot)
+            direct_assignment = self._grid.get_cell(slot, class_ref)
             if direct_assignment:
                 # Grade5Unitに同期（5組同期が有効な場合のみ）
                 if self._grade5_sync_enabled:
                     # 他の5組クラスも同じ教科を持っているか確認
                     all_have_same = True
                     for other_class in self._grade5_classes:
-                        other_assignment = self._assignments[time_slot].get(other_class)
+                        other_assignment = self._grid.get_cell(slot, other_class)
                         if not other_assignment or other_assignment.subject != direct_assignment.subject:
                             all_have_same = False
                             break
@@ -130,6 +157,7 @@ class Schedule:
                     # 全ての5組が同じ教科を持っている場合のみGrade5Unitに同期
                     if all_have_same:
                         try:
+                            self._record_grade5_unit(slot, time_slot)
                             self._grade5_unit.assign(time_slot, direct_assignment.subject, direct_assignment.teacher)
                         except Exception:
                             # ロックされている場合などは無視
@@ -138,7 +166,7 @@ class Schedule:
                 return direct_assignment
             
             return None
-        return self._assignments[time_slot].get(class_ref)
+        return self._grid.get_cell(slot_index(time_slot), class_ref)
     
     def remove_assignment(self, time_slot: TimeSlot, class_ref: ClassReference) -> None:
         """指定された時間枠・クラスの割り当てを削除"""
@@ -159,44 +187,126 @@ class Schedule:
                     )
         
         # 5組の場合は特別処理
-        if class_ref in self._grade5_classes:
+        slot = slot_index(time_slot)
+        if class_ref in self._grade5_class_set:
             # 5組全体から削除
+            self._record_grade5_unit(slot, time_slot)
             self._grade5_unit.remove_assignment(time_slot)
             # 通常の割り当ても削除（互換性のため）
             for grade5_class in self._grade5_classes:
-                if time_slot in self._assignments and grade5_class in self._assignments[time_slot]:
-                    del self._assignments[time_slot][grade5_class]
+                self._write_cell(slot, grade5_class, None)
         else:
-            if time_slot in self._assignments and class_ref in self._assignments[time_slot]:
-                del self._assignments[time_slot][class_ref]
+            previous = self._grid.set_cell(slot, class_ref, None)
+            if self._journal is not None and previous is not None:
+                self._journal.append((slot, class_ref, previous))
+        
+        if self._change_listeners:
+            self._notify_change(time_slot, class_ref)
+    
+    def _write_cell(self, slot: int, class_ref: ClassReference, assignment: Optional[Assignment]) -> None:
+        """グリッドのセルを書き換え、トランザクション中なら変更前の値を記録"""
+        previous = self._grid.set_cell(slot, class_ref, assignment)
+        if self._journal is not None and previous is not assignment:
+            self._journal.append((slot, class_ref, previous))
+    
+    def _record_grade5_unit(self, slot: int, time_slot: TimeSlot) -> None:
+        """トランザクション中なら5組ユニットの変更前の状態を記録"""
+        if self._journal is not None:
+            self._journal.append((slot, None, self._grade5_unit.get_slot_state(time_slot)))
+    
+    # ========== トランザクション ==========
+    
+    def begin(self) -> None:
+        """トランザクションを開始（入れ子にできる。commit() と対で呼ぶ）"""
+        if self._journal is None:
+            self._journal = []
+        self._transaction_depth += 1
+    
+    def savepoint(self) -> int:
+        """現在の位置を返す（rollback_to() に渡す）"""
+        if self._journal is None:
+            raise RuntimeError("トランザクションが開始されていません（begin() を先に呼んでください）")
+        return len(self._journal)
+    
+    def rollback_to(self, savepoint: int) -> None:
+        """savepoint() の時点までセルの変更を取り消す
+
+        変更1件ごとに取り消しログから1件取り出して元の値を書き戻すだけで、
+        ロック・テスト期間・固定科目のチェックは行わない。ロック状態は巻き戻さない。
+        """
+        journal = self._journal
+        if journal is None:
+            raise RuntimeError("トランザクションが開始されていません（begin() を先に呼んでください）")
+        grid = self._grid
+        listeners = self._change_listeners
+        while len(journal) > savepoint:
+            slot, class_ref, previous = journal.pop()
+            if class_ref is None:
+                self._grade5_unit.restore_slot_state(ALL_TIME_SLOTS[slot], previous)
+                continue
+            grid.set_cell(slot, class_ref, previous)
+            if listeners:
+                for listener in list(listeners):
+                    listener(ALL_TIME_SLOTS[slot], class_ref)
+    
+    def commit(self) -> None:
+        """トランザクションを終了（最も外側の commit() で取り消しログを破棄）"""
+        if self._transaction_depth == 0:
+            raise RuntimeError("トランザクションが開始されていません（begin() を先に呼んでください）")
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self._journal = None
+    
+    def add_change_listener(self, listener: Callable[[TimeSlot, ClassReference], None]) -> None:
+        """セル変更の通知先を登録
+        
+        assign / remove_assignment の後に、変更された可能性のあるセルごとに
+        listener(time_slot, class_ref) が呼ばれる（5組は3クラス分）。
+        fork() した複製には引き継がれない。
+        """
+        self._change_listeners.append(listener)
+    
+    def remove_change_listener(self, listener: Callable[[TimeSlot, ClassReference], None]) -> None:
+        """セル変更の通知先を解除"""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+    
+    def _notify_change(self, time_slot: TimeSlot, class_ref: ClassReference) -> None:
+        # 5組はユニット経由で3クラスの表示が変わり得るため全クラス分を通知
+        changed = self._grade5_classes if class_ref in self._grade5_class_set else (class_ref,)
+        for listener in list(self._change_listeners):
+            for changed_class in changed:
+                listener(time_slot, changed_class)
     
     def lock_cell(self, time_slot: TimeSlot, class_ref: ClassReference) -> None:
         """セルをロック（変更禁止）"""
         # 5組の場合は全5組をロック（5組同期が有効な場合のみ）
-        if self._grade5_sync_enabled and class_ref in self._grade5_classes:
+        slot = slot_index(time_slot)
+        if self._grade5_sync_enabled and class_ref in self._grade5_class_set:
             self._grade5_unit.lock_slot(time_slot)
             for grade5_class in self._grade5_classes:
-                self._locked_cells.add((time_slot, grade5_class))
+                self._grid.lock(slot, grade5_class)
         else:
             # 5組同期が無効の場合、または5組以外の場合は個別にロック
-            self._locked_cells.add((time_slot, class_ref))
+            self._grid.lock(slot, class_ref)
     
     def unlock_cell(self, time_slot: TimeSlot, class_ref: ClassReference) -> None:
         """セルのロックを解除"""
         # 5組の場合は全5組のロックを解除
-        if class_ref in self._grade5_classes:
+        slot = slot_index(time_slot)
+        if class_ref in self._grade5_class_set:
             self._grade5_unit.unlock_slot(time_slot)
             for grade5_class in self._grade5_classes:
-                self._locked_cells.discard((time_slot, grade5_class))
+                self._grid.unlock(slot, grade5_class)
         else:
-            self._locked_cells.discard((time_slot, class_ref))
+            self._grid.unlock(slot, class_ref)
     
     def is_locked(self, time_slot: TimeSlot, class_ref: ClassReference) -> bool:
         """セルがロックされているかどうか判定"""
         # 5組の場合は特別処理（5組同期が有効な場合のみ）
-        if self._grade5_sync_enabled and class_ref in self._grade5_classes:
+        if self._grade5_sync_enabled and class_ref in self._grade5_class_set:
             return self._grade5_unit.is_locked(time_slot)
-        return (time_slot, class_ref) in self._locked_cells
+        return self._grid.is_locked(slot_index(time_slot), class_ref)
     
     def disable_fixed_subject_protection(self) -> None:
         """固定科目保護を一時的に無効化"""
@@ -218,11 +328,10 @@ class Schedule:
         """全ての割り当てを取得"""
         result = []
         # 5組以外の通常の割り当て
-        for time_slot, class_assignments in self._assignments.items():
-            for class_ref, assignment in class_assignments.items():
-                # 5組は後で追加するのでスキップ
-                if class_ref not in self._grade5_classes:
-                    result.append((time_slot, assignment))
+        for slot, class_ref, assignment in self._grid.iter_cells():
+            # 5組は後で追加するのでスキップ
+            if class_ref not in self._grade5_class_set:
+                result.append((ALL_TIME_SLOTS[slot], assignment))
         
         # 5組の割り当てを追加
         for time_slot, class_ref, assignment in self._grade5_unit.get_all_assignments():
@@ -248,8 +357,8 @@ class Schedule:
         """指定された時間枠の全ての割り当てを取得"""
         result = []
         # 5組以外の通常の割り当て
-        for class_ref, assignment in self._assignments[time_slot].items():
-            if class_ref not in self._grade5_classes:
+        for class_ref, assignment in self._grid.iter_slot(slot_index(time_slot)):
+            if class_ref not in self._grade5_class_set:
                 result.append(assignment)
         
         # 5組の割り当てを追加
@@ -265,40 +374,36 @@ class Schedule:
         result = []
         
         # 5組の場合は特別処理
-        if class_ref in self._grade5_classes:
+        if class_ref in self._grade5_class_set:
             for time_slot, unit_class_ref, assignment in self._grade5_unit.get_all_assignments():
                 if unit_class_ref == class_ref:
                     result.append((time_slot, assignment))
         else:
             # 通常の処理
-            for time_slot, class_assignments in self._assignments.items():
-                if class_ref in class_assignments:
-                    result.append((time_slot, class_assignments[class_ref]))
+            row = self._grid.get_row(class_ref)
+            if row is not None:
+                for slot, assignment in enumerate(row):
+                    if assignment is not None:
+                        result.append((ALL_TIME_SLOTS[slot], assignment))
         
         return result
     
     def get_assignments_by_teacher(self, teacher: Teacher) -> List[tuple[TimeSlot, Assignment]]:
         """指定された教員の全ての割り当てを取得"""
-        result = []
-        for time_slot, class_assignments in self._assignments.items():
-            for assignment in class_assignments.values():
-                if assignment.involves_teacher(teacher):
-                    result.append((time_slot, assignment))
-        return result
+        return [(ALL_TIME_SLOTS[slot], assignment)
+                for slot, assignment in self._grid.iter_teacher(teacher)]
     
     def get_teacher_at_time(self, time_slot: TimeSlot, teacher: Teacher) -> List[Assignment]:
         """指定された時間枠で指定された教員が担当している割り当てを取得"""
-        assignments = self.get_assignments_by_time_slot(time_slot)
-        result = [a for a in assignments if a.involves_teacher(teacher)]
+        # 5組以外の割り当ては教員インデックスから取得
+        result = [a for a in self._grid.teacher_assignments_at(slot_index(time_slot), teacher)
+                  if a.class_ref not in self._grade5_class_set]
         
         # 5組の場合、1つの教員が3クラスを同時に担当していることを正しく反映
-        grade5_assignments = [a for a in result if a.class_ref in self._grade5_classes]
-        if len(grade5_assignments) > 1:
-            # 5組の授業は1つとしてカウント（実際には3クラス同時指導）
-            # 最初の1つだけを残す
-            result = [a for a in result if a.class_ref not in self._grade5_classes]
-            if grade5_assignments:
-                result.append(grade5_assignments[0])
+        # 5組の授業は1つとしてカウント（実際には3クラス同時指導）
+        unit_assignment = self._grade5_unit.get_assignment(time_slot, self._grade5_classes[0])
+        if unit_assignment and unit_assignment.involves_teacher(teacher):
+            result.append(unit_assignment)
         
         return result
     
@@ -307,58 +412,104 @@ class Schedule:
         if not teacher:
             return True
 
-        assignments = self.get_assignments_by_time_slot(time_slot)
-        teacher_assignments = [a for a in assignments if a.involves_teacher(teacher)]
+        # 5組の合同授業を考慮
+        # 5組同士の重複は許可し、5組以外のクラスを担当している場合のみ不可
+        for class_id in self._grid.teacher_class_ids(slot_index(time_slot), teacher):
+            if self._grid.symbols.classes.value(class_id) not in self._grade5_class_set:
+                return False
+        return True
 
-        if not teacher_assignments:
+    def _teaching_unit(self, class_ref: ClassReference, subject: Optional[Subject]) -> Hashable:
+        """教員が同時に担当してよい授業のまとまり
+
+        5組の合同授業は3クラスで1つ、交流学級の自立活動は同じ組番号の学級
+        （例: 1年6組・2年6組・3年6組）で1つのチームティーチングとして扱う。
+        """
+        if class_ref in self._grade5_class_set:
+            return "5組"
+        if subject is not None and subject.name == "自立" and class_ref.is_exchange_class():
+            return ("自立", class_ref.class_number)
+        return class_ref
+
+    def is_teacher_free(self, time_slot: TimeSlot, teacher: Optional[Teacher],
+                        class_ref: Optional[ClassReference] = None,
+                        subject: Optional[Subject] = None) -> bool:
+        """教員が指定された時間枠に授業を持っていないかどうか
+
+        class_ref（と subject）を指定した場合は、その授業と同じ合同授業・
+        チームティーチングのまとまりに属する担当は重複とみなさない。
+        """
+        if not teacher:
+            return True
+        assignments = self._grid.teacher_assignments_at(slot_index(time_slot), teacher)
+        if not assignments:
             return True
+        if class_ref is None:
+            return False
+        unit = self._teaching_unit(class_ref, subject)
+        return all(
+            a.class_ref == class_ref or self._teaching_unit(a.class_ref, a.subject) == unit
+            for a in assignments
+        )
 
-        # 5組の合同授業を考慮
-        is_grade5_class = any(a.class_ref in self._grade5_classes for a in teacher_assignments)
-        if is_grade5_class:
-            # 5組の授業を担当している場合、他の5組以外のクラスとの重複は許されない
-            non_grade5_assignments = [a for a in teacher_assignments if a.class_ref not in self._grade5_classes]
-            if non_grade5_assignments:
-                return False # 5組と通常クラスの重複
-            return True # 5組同士の重複は許可
+    def get_teacher_daily_load(self, teacher: Teacher, day: str) -> int:
+        """教員がその曜日に授業を持っているコマ数（合同授業は1コマ）"""
+        return self._grid.teacher_day_load(teacher, day_index(day))
 
-        # 通常のクラスで重複がある場合は許されない
-        return len(teacher_assignments) == 0
+    def get_teacher_conflicts(self) -> List[Tuple[TimeSlot, Teacher, List[ClassReference]]]:
+        """教員の重複を (時間枠, 教員, 担当クラス) で列挙
+
+        合同授業・チームティーチングのまとまりを除いて、同じ時間に2つ以上の
+        授業を担当しているものだけを返す。重複候補のインデックスを引くため、
+        計算量は重複候補の数に比例する。
+        """
+        conflicts = []
+        for slot, teacher, _ in self._grid.iter_teacher_overlaps():
+            assignments = self._grid.teacher_assignments_at(slot, teacher)
+            units = {self._teaching_unit(a.class_ref, a.subject) for a in assignments}
+            if len(units) > 1:
+                conflicts.append((ALL_TIME_SLOTS[slot], teacher, [a.class_ref for a in assignments]))
+        return conflicts
     
     def get_empty_slots(self, class_ref: ClassReference) -> List[TimeSlot]:
         """指定されたクラスの空いている時間枠を取得"""
-        all_time_slots = [
-            TimeSlot(day, period) 
-            for day in ["月", "火", "水", "木", "金"] 
-            for period in range(1, 7)
-        ]
-        
         # 5組の場合は特別処理
-        if class_ref in self._grade5_classes:
+        if class_ref in self._grade5_class_set:
             return self._grade5_unit.get_empty_slots()
         
-        assigned_slots = {ts for ts, _ in self.get_assignments_by_class(class_ref)}
-        # ロックされているセルも除外
-        locked_slots = {ts for ts in all_time_slots if self.is_locked(ts, class_ref)}
-        return [ts for ts in all_time_slots if ts not in assigned_slots and ts not in locked_slots]
+        # 割り当て済み・ロック済みのセルを除外
+        row = self._grid.get_row(class_ref)
+        return [
+            time_slot for slot, time_slot in enumerate(ALL_TIME_SLOTS)
+            if (row is None or row[slot] is None) and not self._grid.is_locked(slot, class_ref)
+        ]
     
     def count_subject_hours(self, class_ref: ClassReference, subject: Subject) -> int:
         """指定されたクラス・教科の週当たり時数をカウント"""
-        assignments = self.get_assignments_by_class(class_ref)
-        return sum(1 for _, assignment in assignments if assignment.subject == subject)
+        if class_ref in self._grade5_class_set:
+            return self._grade5_unit.count_subject_hours(subject)
+        return self._grid.weekly_subject_count(class_ref, subject)
+    
+    def count_daily_subject(self, class_ref: ClassReference, day: str, subject: Subject) -> int:
+        """指定されたクラス・曜日に配置されている教科のコマ数をカウント"""
+        if class_ref in self._grade5_class_set:
+            return sum(1 for s in self.get_daily_subjects(class_ref, day) if s == subject)
+        return self._grid.daily_subject_count(class_ref, day_index(day), subject)
     
     def get_daily_subjects(self, class_ref: ClassReference, day: str) -> List[Subject]:
         """指定されたクラス・曜日の教科一覧を取得"""
         subjects = []
-        for period in range(1, 7):
-            time_slot = TimeSlot(day, period)
-            assignment = self.get_assignment(time_slot, class_ref)
+        base = day_index(day) * PERIOD_COUNT
+        for slot in range(base, base + PERIOD_COUNT):
+            assignment = self.get_assignment(ALL_TIME_SLOTS[slot], class_ref)
             if assignment:
                 subjects.append(assignment.subject)
         return subjects
     
     def has_daily_duplicate(self, class_ref: ClassReference, day: str) -> bool:
         """指定されたクラス・曜日に同じ教科が重複しているかどうか判定"""
+        if class_ref not in self._grade5_class_set:
+            return self._grid.has_daily_excess(class_ref, day_index(day))
         subjects = self.get_daily_subjects(class_ref, day)
         return len(subjects) != len(set(subjects))
     
@@ -378,21 +529,53 @@ class Schedule:
         """制約違反があるかどうか判定"""
         return len(self._violations) > 0
     
-    def clone(self) -> 'Schedule':
-        """スケジュールの複製を作成"""
-        new_schedule = Schedule()
-        new_schedule._assignments = {
-            ts: dict(assignments) for ts, assignments in self._assignments.items()
-        }
-        new_schedule._locked_cells = self._locked_cells.copy()
+    def fork(self) -> 'Schedule':
+        """構造を共有した複製を作成
+
+        グリッドはコピーオンライトで共有するため、複製のコストは変更量に比例する。
+        近傍解の生成など、複製してから数セルだけ変更する用途向け。
+        ロック・テスト期間・各種フラグも引き継ぐ。
+        """
+        new_schedule = Schedule.__new__(Schedule)
+        new_schedule.__dict__.update(self.__dict__)
+        new_schedule._grid = self._grid.fork()
         new_schedule._violations = self._violations.copy()
-        # Grade5Unitも複製
-        new_schedule._grade5_unit = Grade5Unit()
-        for time_slot, assignment in self._grade5_unit._assignments.items():
-            new_schedule._grade5_unit._assignments[time_slot] = assignment
-        new_schedule._grade5_unit._locked_slots = self._grade5_unit._locked_slots.copy()
+        new_schedule._grade5_unit = self._grade5_unit.fork()
+        new_schedule.test_periods = {day: list(periods) for day, periods in self.test_periods.items()}
+        new_schedule._change_listeners = []
+        new_schedule._journal = None
+        new_schedule._transaction_depth = 0
         return new_schedule
     
+    def clone(self) -> 'Schedule':
+        """スケジュールの複製を作成"""
+        return self.fork()
+    
+    def to_tensor(self, classes: List[ClassReference]) -> 'ScheduleTensor':
+        """時間枠×クラスのテンソル表現を作成
+        
+        内容は get_assignment() と同じ（5組はGrade5Unitの割り当てを優先）。
+        """
+        from .schedule_tensor import ScheduleTensor
+        cells = []
+        for class_ref in classes:
+            if class_ref in self._grade5_class_set:
+                cells.append([self.get_assignment(time_slot, class_ref) for time_slot in ALL_TIME_SLOTS])
+            else:
+                row = self._grid.get_row(class_ref)
+                cells.append(row if row is not None else [None] * len(ALL_TIME_SLOTS))
+        return ScheduleTensor.from_cells(classes, cells)
+    
+    def to_bytes(self) -> bytes:
+        """コンパクトなバイナリ形式に変換（プロセス間通信・キャッシュ用）"""
+        from .schedule_codec import ScheduleCodec
+        return ScheduleCodec.encode(self)
+    
+    @classmethod
+    def from_bytes(cls, data) -> 'Schedule':
+        """to_bytes() のバイト列（またはmemoryview）から復元"""
+        from .schedule_codec import ScheduleCodec
+        return ScheduleCodec.decode(data)
+    
     def __str__(self) -> str:
-        total_assignments = sum(len(assignments) for assignments in self._assignments.values())
-        return f"Schedule(assignments={total_assignments}, violations={len(self._violations)})"
\ No newline at end of file
+        return f"Schedule(assignments={len(self._grid)}, violations={len(self._violations)})"
@@ -0,0 +1,214 @@
+"""時間割のコンパクトなバイナリ形式
+
+プロセス間通信・キャッシュ・チェックポイント用に、Scheduleの状態をバージョン付きの
+バイト列に変換する。pickleと違い教科名・教員名は文字列表に1回だけ格納し、
+セルは固定長の整数配列で保持するため、1つの時間割が数KBに収まる。
+
+形式（リトルエンディアン）:
+    ヘッダー       マジック b"TTSC", バージョン, フラグ, クラス数, 教科数, 教員数,
+                   テスト期間・5組ユニットの割り当て・5組ユニットのロックの各ビットマスク
+    クラス表       (学年, 組) × クラス数 の uint8
+    文字列表       教科名・教員名を NUL 区切りの UTF-8 で（長さ uint32 を前置）
+    セル           教科ID・教員IDの uint16 配列 (クラス × 30コマ)。空きは 0xFFFF
+    ロック         クラスごとのロック済みコマのビットマスク uint32
+    5組ユニット    30コマ分の教科ID・教員ID
+
+復元はScheduleGridに直接書き込むため、assign() のロック・テスト期間・固定科目・
+5組同期のチェックは通らず、fork() と同じ状態（違反リスト・変更通知先を除く）になる。
+"""
+import struct
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional, Union, TYPE_CHECKING
+
+from .schedule_grid import ALL_TIME_SLOTS, SLOT_COUNT
+from ..exceptions import DataLoadingError
+from ..value_objects.assignment import Assignment
+from ..value_objects.time_slot import ClassReference, Subject, Teacher
+
+if TYPE_CHECKING:
+    from .schedule import Schedule
+
+MAGIC = b"TTSC"
+FORMAT_VERSION = 1
+
+EMPTY_ID = 0xFFFF
+
+_HEADER = struct.Struct('<4sBBHHHIII')
+_LENGTH = struct.Struct('<I')
+
+# ヘッダーのフラグ
+_FLAG_GRADE5_SYNC = 0x01
+_FLAG_FIXED_SUBJECT_PROTECTION = 0x02
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+@lru_cache(maxsize=None)
+def _subject(name: str) -> Subject:
+    return Subject(name)
+
+
+@lru_cache(maxsize=None)
+def _teacher(name: str) -> Teacher:
+    return Teacher(name)
+
+
+@lru_cache(maxsize=None)
+def _class_ref(grade: int, class_number: int) -> ClassReference:
+    return ClassReference(grade, class_number)
+
+
+def _uint16_view(buffer: memoryview, offset: int, count: int):
+    """uint16配列として参照（リトルエンディアン環境ではコピーしない）"""
+    view = buffer[offset:offset + 2 * count]
+    if _LITTLE_ENDIAN:
+        return view.cast('H')
+    from array import array
+    values = array('H', view)
+    values.byteswap()
+    return values
+
+
+def _uint32_view(buffer: memoryview, offset: int, count: int):
+    """uint32配列として参照（リトルエンディアン環境ではコピーしない）"""
+    view = buffer[offset:offset + 4 * count]
+    if _LITTLE_ENDIAN:
+        return view.cast('I')
+    from array import array
+    values = array('I', view)
+    values.byteswap()
+    return values
+
+
+class ScheduleCodec:
+    """Scheduleとバイナリ形式の相互変換"""
+
+    @staticmethod
+    def encode(schedule: 'Schedule') -> bytes:
+        """スケジュールをバイト列に変換"""
+        grid = schedule._grid
+        unit = schedule.grade5_unit
+        class_refs = list(grid.symbols.classes)[:len(grid._rows)]
+
+        subject_ids: Dict[str, int] = {}
+        teacher_ids: Dict[str, int] = {}
+
+        def ids(assignment: Optional[Assignment]):
+            if assignment is None:
+                return EMPTY_ID, EMPTY_ID
+            subject_id = subject_ids.setdefault(assignment.subject.name, len(subject_ids))
+            if assignment.teacher is None:
+                return subject_id, EMPTY_ID
+            return subject_id, teacher_ids.setdefault(assignment.teacher.name, len(teacher_ids))
+
+        cells: List[int] = []
+        for row in grid._rows:
+            for assignment in row:
+                cells.extend(ids(assignment))
+
+        unit_cells: List[int] = []
+        unit_mask = 0
+        unit_lock_mask = 0
+        test_mask = 0
+        for slot, time_slot in enumerate(ALL_TIME_SLOTS):
+            common = unit.get_common_assignment(time_slot)
+            unit_cells.extend(ids(common))
+            if common is not None:
+                unit_mask |= 1 << slot
+            if unit.is_locked(time_slot):
+                unit_lock_mask |= 1 << slot
+            if schedule.is_test_period(time_slot):
+                test_mask |= 1 << slot
+
+        flags = 0
+        if schedule._grade5_sync_enabled:
+            flags |= _FLAG_GRADE5_SYNC
+        if schedule._fixed_subject_protection_enabled:
+            flags |= _FLAG_FIXED_SUBJECT_PROTECTION
+
+        strings = '\0'.join(list(subject_ids) + list(teacher_ids)).encode('utf-8')
+        n_cells = len(cells) + len(unit_cells)
+        return b''.join([
+            _HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(class_refs),
+                         len(subject_ids), len(teacher_ids),
+                         test_mask, unit_mask, unit_lock_mask),
+            bytes(value for c in class_refs for value in (c.grade, c.class_number)),
+            _LENGTH.pack(len(strings)),
+            strings,
+            struct.pack(f'<{n_cells}H', *cells, *unit_cells),
+            struct.pack(f'<{len(class_refs)}I', *grid._lock_masks[:len(class_refs)]),
+        ])
+
+    @staticmethod
+    def decode(data: Union[bytes, bytearray, memoryview]) -> 'Schedule':
+        """バイト列からスケジュールを復元
+
+        memoryviewを渡した場合もセル配列はコピーせずに読み取る。
+        """
+        from .schedule import Schedule
+
+        buffer = memoryview(data)
+        if buffer.format != 'B' or buffer.ndim != 1:
+            buffer = buffer.cast('B')
+        if len(buffer) < _HEADER.size:
+            raise DataLoadingError("時間割データが短すぎます")
+        (magic, version, flags, n_classes, n_subjects, n_teachers,
+         test_mask, unit_mask, unit_lock_mask) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise DataLoadingError("時間割データの形式が不正です")
+        if version != FORMAT_VERSION:
+            raise DataLoadingError(f"未対応の時間割データのバージョンです: {version}")
+
+        offset = _HEADER.size
+        class_table = buffer[offset:offset + 2 * n_classes]
+        class_refs = [_class_ref(class_table[2 * i], class_table[2 * i + 1]) for i in range(n_classes)]
+        offset += 2 * n_classes
+        (strings_size,) = _LENGTH.unpack_from(buffer, offset)
+        offset += _LENGTH.size
+        names = str(buffer[offset:offset + strings_size], 'utf-8').split('\0')
+        offset += strings_size
+        subjects = [_subject(name) for name in names[:n_subjects]]
+        teachers = [_teacher(name) for name in names[n_subjects:n_subjects + n_teachers]]
+
+        n_cells = 2 * SLOT_COUNT * (n_classes + 1)
+        if offset + 2 * n_cells + 4 * n_classes != len(buffer):
+            raise DataLoadingError("時間割データの長さが不正です")
+        cells = _uint16_view(buffer, offset, n_cells)
+        offset += 2 * n_cells
+        lock_masks = _uint32_view(buffer, offset, n_classes)
+
+        schedule = Schedule()
+        grid = schedule._grid
+        for index, class_ref in enumerate(class_refs):
+            # 同じクラス・教科・教員の割り当ては1つのAssignmentを共有する
+            assignments: Dict[int, Assignment] = {}
+            row: List[Optional[Assignment]] = [None] * SLOT_COUNT
+            base = 2 * SLOT_COUNT * index
+            class_cells = cells[base:base + 2 * SLOT_COUNT].tolist()
+            for slot, (subject_id, teacher_id) in enumerate(zip(class_cells[::2], class_cells[1::2])):
+                if subject_id == EMPTY_ID:
+                    continue
+                key = subject_id << 16 | teacher_id
+                assignment = assignments.get(key)
+                if assignment is None:
+                    teacher = teachers[teacher_id] if teacher_id != EMPTY_ID else None
+                    assignment = assignments[key] = Assignment(class_ref, subjects[subject_id], teacher)
+                row[slot] = assignment
+            grid.load_row(class_ref, row, lock_masks[index])
+
+        unit = schedule.grade5_unit
+        base = 2 * SLOT_COUNT * n_classes
+        for slot, time_slot in enumerate(ALL_TIME_SLOTS):
+            if unit_mask >> slot & 1:
+                teacher_id = cells[base + 2 * slot + 1]
+                unit.assign(time_slot, subjects[cells[base + 2 * slot]],
+                            teachers[teacher_id] if teacher_id != EMPTY_ID else None)
+            if unit_lock_mask >> slot & 1:
+                unit.lock_slot(time_slot)
+            if test_mask >> slot & 1:
+                schedule.test_periods.setdefault(time_slot.day, []).append(time_slot.period)
+
+        schedule._grade5_sync_enabled = bool(flags & _FLAG_GRADE5_SYNC)
+        schedule._fixed_subject_protection_enabled = bool(flags & _FLAG_FIXED_SUBJECT_PROTECTION)
+        return schedule
@@ -0,0 +1,442 @@
+"""スケジュールの配列ベース内部表現
+
+Scheduleエンティティの内部ストレージ。クラス・教科・教員を整数IDに変換（インターン）し、
+クラス×30コマのセル行列と、以下のインデックスを割り当て変更のたびに更新する。
+
+- 教員×コマの占有インデックス（その時間に教員が担当しているクラスID）
+- 教員が同じコマに複数クラスを担当しているセルの集合（重複候補）
+- クラス×曜日の教科カウント（日内重複・週当たり時数の判定用）
+
+これにより、セル参照・教員の空き判定・日内重複判定がO(1)、教員重複の列挙が
+O(重複数)で行える。
+"""
+from typing import Dict, Generic, Hashable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from ..constants import WEEKDAYS, PERIOD_COUNT
+from ..value_objects.time_slot import TimeSlot, ClassReference
+from ..value_objects.assignment import Assignment
+
+
+DAY_COUNT = len(WEEKDAYS)
+SLOT_COUNT = DAY_COUNT * PERIOD_COUNT
+
+_DAY_INDEX: Dict[str, int] = {day: i for i, day in enumerate(WEEKDAYS)}
+
+# 全コマのTimeSlotを事前生成（スロット番号 → TimeSlot）
+ALL_TIME_SLOTS: Tuple[TimeSlot, ...] = tuple(
+    TimeSlot(day, period) for day in WEEKDAYS for period in range(1, PERIOD_COUNT + 1)
+)
+
+T = TypeVar("T", bound=Hashable)
+
+
+def slot_index(time_slot: TimeSlot) -> int:
+    """TimeSlotをスロット番号（0〜29）に変換"""
+    return _DAY_INDEX[time_slot.day] * PERIOD_COUNT + time_slot.period - 1
+
+
+def day_index(day: str) -> int:
+    """曜日を曜日番号（0〜4）に変換"""
+    index = _DAY_INDEX.get(day)
+    if index is None:
+        # 「月曜」などの表記はTimeSlot側の正規化・検証に任せる
+        index = _DAY_INDEX[TimeSlot(day, 1).day]
+    return index
+
+
+class SymbolTable(Generic[T]):
+    """値オブジェクトを連番の整数IDに変換するテーブル
+
+    追記専用のため、複数のスケジュール（クローン）間で安全に共有できる。
+    """
+
+    def __init__(self):
+        self._ids: Dict[T, int] = {}
+        self._values: List[T] = []
+
+    def intern(self, value: T) -> int:
+        """値のIDを取得（未登録なら登録）"""
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = len(self._values)
+            self._ids[value] = value_id
+            self._values.append(value)
+        return value_id
+
+    def lookup(self, value: T) -> Optional[int]:
+        """値のIDを取得（未登録ならNone）"""
+        return self._ids.get(value)
+
+    def value(self, value_id: int) -> T:
+        """IDから値を取得"""
+        return self._values[value_id]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._values)
+
+
+class ScheduleSymbols:
+    """クラス・教科・教員のシンボルテーブル一式"""
+
+    def __init__(self):
+        self.classes: SymbolTable[ClassReference] = SymbolTable()
+        self.subjects: SymbolTable = SymbolTable()
+        self.teachers: SymbolTable = SymbolTable()
+
+
+class ScheduleGrid:
+    """クラス×コマのセル行列と付随インデックス
+
+    セルにはAssignmentをそのまま保持し、教科・教員はIDに変換してインデックスに登録する。
+    インデックスは全て set_cell() の中で更新されるため、常にセル行列と整合している。
+
+    fork() で作成した複製とは、クラス行・教員行・曜日別カウントの各チャンクを
+    コピーオンライトで共有する。複製のコストはチャンクへの参照のコピーだけで、
+    以降の変更は書き込んだチャンクだけを複製する。
+    """
+
+    def __init__(self, symbols: Optional[ScheduleSymbols] = None):
+        self.symbols = symbols or ScheduleSymbols()
+        # クラスID → 30コマ分のセル
+        self._rows: List[List[Optional[Assignment]]] = []
+        # クラスID → ロック済みコマのビットマスク
+        self._lock_masks: List[int] = []
+        # 教員ID → 30コマ分の担当クラスIDタプル（担当なしの教員はNone）
+        self._teacher_rows: List[Optional[List[Tuple[int, ...]]]] = []
+        # 担当クラスが2つ以上ある (教員ID * SLOT_COUNT + コマ)
+        self._overlaps: Set[int] = set()
+        # (クラスID * DAY_COUNT + 曜日) → {教科ID: その日のコマ数}
+        self._day_subject_counts: List[Dict[int, int]] = []
+        # (クラスID * DAY_COUNT + 曜日) → 日内重複の超過数
+        self._day_excess: List[int] = []
+        self._filled = 0
+        # このグリッドが専有している（他の複製と共有していない）チャンク
+        self._owned_rows: Set[int] = set()
+        self._owned_teacher_rows: Set[int] = set()
+        self._owned_day_counts: Set[int] = set()
+
+    # ========== セル操作 ==========
+
+    def class_id(self, class_ref: ClassReference) -> int:
+        """クラスIDを取得（未登録なら登録し、行を確保）"""
+        class_id = self.symbols.classes._ids.get(class_ref)
+        if class_id is None:
+            class_id = self.symbols.classes.intern(class_ref)
+        if class_id >= len(self._rows):
+            self._ensure_row(class_id)
+        return class_id
+
+    def _ensure_row(self, class_id: int) -> None:
+        while len(self._rows) <= class_id:
+            self._owned_rows.add(len(self._rows))
+            self._rows.append([None] * SLOT_COUNT)
+            self._lock_masks.append(0)
+            for _ in range(DAY_COUNT):
+                self._owned_day_counts.add(len(self._day_subject_counts))
+                self._day_subject_counts.append({})
+                self._day_excess.append(0)
+
+    def _writable_row(self, class_id: int) -> List[Optional[Assignment]]:
+        row = self._rows[class_id]
+        if class_id not in self._owned_rows:
+            row = row[:]
+            self._rows[class_id] = row
+            self._owned_rows.add(class_id)
+        return row
+
+    def _writable_teacher_row(self, teacher_id: int) -> List[Tuple[int, ...]]:
+        teacher_rows = self._teacher_rows
+        if teacher_id >= len(teacher_rows):
+            teacher_rows.extend([None] * (teacher_id + 1 - len(teacher_rows)))
+        row = teacher_rows[teacher_id]
+        if row is None:
+            row = [()] * SLOT_COUNT
+            teacher_rows[teacher_id] = row
+            self._owned_teacher_rows.add(teacher_id)
+        elif teacher_id not in self._owned_teacher_rows:
+            row = row[:]
+            teacher_rows[teacher_id] = row
+            self._owned_teacher_rows.add(teacher_id)
+        return row
+
+    def _writable_day_counts(self, day_key: int) -> Dict[int, int]:
+        counts = self._day_subject_counts[day_key]
+        if day_key not in self._owned_day_counts:
+            counts = counts.copy()
+            self._day_subject_counts[day_key] = counts
+            self._owned_day_counts.add(day_key)
+        return counts
+
+    def get_cell(self, slot: int, class_ref: ClassReference) -> Optional[Assignment]:
+        """セルの割り当てを取得"""
+        class_id = self.symbols.classes._ids.get(class_ref)
+        if class_id is None or class_id >= len(self._rows):
+            return None
+        return self._rows[class_id][slot]
+
+    def get_row(self, class_ref: ClassReference) -> Optional[List[Optional[Assignment]]]:
+        """クラスの30コマ分のセルを取得（読み取り専用として扱うこと）"""
+        class_id = self.symbols.classes._ids.get(class_ref)
+        if class_id is None or class_id >= len(self._rows):
+            return None
+        return self._rows[class_id]
+
+    def set_cell(self, slot: int, class_ref: ClassReference,
+                 assignment: Optional[Assignment]) -> Optional[Assignment]:
+        """セルを設定（Noneで削除）し、インデックスを更新する
+
+        Returns:
+            変更前の割り当て
+        """
+        class_id = self.symbols.classes._ids.get(class_ref)
+        if class_id is None or class_id >= len(self._rows):
+            class_id = self.class_id(class_ref)
+        previous = self._rows[class_id][slot]
+        if previous is assignment:
+            return previous
+        row = self._writable_row(class_id)
+        if previous is not None:
+            self._unindex(slot, class_id, previous)
+            self._filled -= 1
+        row[slot] = assignment
+        if assignment is not None:
+            self._index(slot, class_id, assignment)
+            self._filled += 1
+        return previous
+
+    def load_row(self, class_ref: ClassReference, cells: List[Optional[Assignment]],
+                 lock_mask: int = 0) -> None:
+        """空の行に30コマ分のセルとロックをまとめて書き込む（復元用）
+
+        set_cell() を繰り返すのと同じ結果になるが、呼び出しのオーバーヘッドを省く。
+        """
+        class_id = self.class_id(class_ref)
+        row = self._writable_row(class_id)
+        if any(cell is not None for cell in row):
+            raise ValueError(f"空でない行には読み込めません: {class_ref}")
+
+        symbols = self.symbols
+        day_excess = self._day_excess
+        # 割り当て（同一オブジェクト）ごとの (教員の行, 教科ID)
+        resolved: Dict[int, Tuple[Optional[List[Tuple[int, ...]]], int]] = {}
+        filled = 0
+        for day in range(DAY_COUNT):
+            day_key = class_id * DAY_COUNT + day
+            day_counts = None
+            for slot in range(day * PERIOD_COUNT, (day + 1) * PERIOD_COUNT):
+                assignment = cells[slot]
+                if assignment is None:
+                    continue
+                row[slot] = assignment
+                filled += 1
+
+                entry = resolved.get(id(assignment))
+                if entry is None:
+                    teacher_id = teacher_row = None
+                    if assignment.teacher is not None:
+                        teacher_id = symbols.teachers.intern(assignment.teacher)
+                        teacher_row = self._writable_teacher_row(teacher_id)
+                    entry = resolved[id(assignment)] = (
+                        teacher_id, teacher_row, symbols.subjects.intern(assignment.subject)
+                    )
+                teacher_id, teacher_row, subject_id = entry
+                if teacher_row is not None:
+                    class_ids = teacher_row[slot] = teacher_row[slot] + (class_id,)
+                    if len(class_ids) > 1:
+                        self._overlaps.add(teacher_id * SLOT_COUNT + slot)
+
+                if day_counts is None:
+                    day_counts = self._writable_day_counts(day_key)
+                count = day_counts.get(subject_id, 0)
+                if count:
+                    day_excess[day_key] += 1
+                day_counts[subject_id] = count + 1
+
+        self._filled += filled
+        self._lock_masks[class_id] = lock_mask
+
+    def _index(self, slot: int, class_id: int, assignment: Assignment) -> None:
+        symbols = self.symbols
+        teacher = assignment.teacher
+        if teacher is not None:
+            teacher_id = symbols.teachers._ids.get(teacher)
+            if teacher_id is None:
+                teacher_id = symbols.teachers.intern(teacher)
+            teacher_row = self._writable_teacher_row(teacher_id)
+            class_ids = teacher_row[slot] = teacher_row[slot] + (class_id,)
+            if len(class_ids) > 1:
+                self._overlaps.add(teacher_id * SLOT_COUNT + slot)
+
+        subject_id = symbols.subjects._ids.get(assignment.subject)
+        if subject_id is None:
+            subject_id = symbols.subjects.intern(assignment.subject)
+        day_key = class_id * DAY_COUNT + slot // PERIOD_COUNT
+        day_counts = self._writable_day_counts(day_key)
+        count = day_counts.get(subject_id, 0)
+        if count:
+            self._day_excess[day_key] += 1
+        day_counts[subject_id] = count + 1
+
+    def _unindex(self, slot: int, class_id: int, assignment: Assignment) -> None:
+        symbols = self.symbols
+        if assignment.teacher is not None:
+            teacher_id = symbols.teachers._ids[assignment.teacher]
+            teacher_row = self._writable_teacher_row(teacher_id)
+            class_ids = teacher_row[slot] = tuple(c for c in teacher_row[slot] if c != class_id)
+            if len(class_ids) < 2:
+                self._overlaps.discard(teacher_id * SLOT_COUNT + slot)
+
+        subject_id = symbols.subjects._ids[assignment.subject]
+        day_key = class_id * DAY_COUNT + slot // PERIOD_COUNT
+        day_counts = self._writable_day_counts(day_key)
+        count = day_counts[subject_id]
+        if count > 1:
+            self._day_excess[day_key] -= 1
+            day_counts[subject_id] = count - 1
+        else:
+            del day_counts[subject_id]
+
+    # ========== ロック ==========
+
+    def lock(self, slot: int, class_ref: ClassReference) -> None:
+        class_id = self.class_id(class_ref)
+        self._lock_masks[class_id] |= 1 << slot
+
+    def unlock(self, slot: int, class_ref: ClassReference) -> None:
+        class_id = self.symbols.classes._ids.get(class_ref)
+        if class_id is not None and class_id < len(self._lock_masks):
+            self._lock_masks[class_id] &= ~(1 << slot)
+
+    def is_locked(self, slot: int, class_ref: ClassReference) -> bool:
+        class_id = self.symbols.classes._ids.get(class_ref)
+        if class_id is None or class_id >= len(self._lock_masks):
+            return False
+        return bool(self._lock_masks[class_id] >> slot & 1)
+
+    def iter_locked(self) -> Iterator[Tuple[int, ClassReference]]:
+        """ロック済みセルを (スロット, クラス) で列挙"""
+        for class_id, mask in enumerate(self._lock_masks):
+            if not mask:
+                continue
+            class_ref = self.symbols.classes.value(class_id)
+            for slot in range(SLOT_COUNT):
+                if mask >> slot & 1:
+                    yield slot, class_ref
+
+    # ========== インデックス参照 ==========
+
+    def teacher_class_ids(self, slot: int, teacher) -> Tuple[int, ...]:
+        """指定コマで教員が担当しているクラスIDを取得"""
+        teacher_id = self.symbols.teachers._ids.get(teacher)
+        if teacher_id is None or teacher_id >= len(self._teacher_rows):
+            return ()
+        teacher_row = self._teacher_rows[teacher_id]
+        return teacher_row[slot] if teacher_row is not None else ()
+
+    def teacher_assignments_at(self, slot: int, teacher) -> List[Assignment]:
+        """指定コマで教員が担当している割り当てを取得"""
+        return [self._rows[class_id][slot] for class_id in self.teacher_class_ids(slot, teacher)]
+
+    def teacher_day_load(self, teacher, day: int) -> int:
+        """教員がその曜日に授業を持っているコマ数（同じコマの複数クラスは1コマ）"""
+        teacher_id = self.symbols.teachers._ids.get(teacher)
+        if teacher_id is None or teacher_id >= len(self._teacher_rows):
+            return 0
+        teacher_row = self._teacher_rows[teacher_id]
+        if teacher_row is None:
+            return 0
+        start = day * PERIOD_COUNT
+        return sum(1 for class_ids in teacher_row[start:start + PERIOD_COUNT] if class_ids)
+
+    def iter_teacher_overlaps(self) -> Iterator[Tuple[int, object, Tuple[int, ...]]]:
+        """同じコマに複数クラスを担当している教員を (スロット, 教員, クラスID) で列挙"""
+        teachers = self.symbols.teachers
+        for key in sorted(self._overlaps):
+            teacher_id, slot = divmod(key, SLOT_COUNT)
+            yield slot, teachers.value(teacher_id), self._teacher_rows[teacher_id][slot]
+
+    def daily_subject_count(self, class_ref: ClassReference, day: int, subject) -> int:
+        """クラス・曜日の教科コマ数を取得"""
+        class_id = self.symbols.classes._ids.get(class_ref)
+        subject_id = self.symbols.subjects._ids.get(subject)
+        if class_id is None or subject_id is None or class_id >= len(self._rows):
+            return 0
+        return self._day_subject_counts[class_id * DAY_COUNT + day].get(subject_id, 0)
+
+    def has_daily_excess(self, class_ref: ClassReference, day: int) -> bool:
+        """クラス・曜日に日内重複があるかどうか"""
+        class_id = self.symbols.classes._ids.get(class_ref)
+        if class_id is None or class_id >= len(self._rows):
+            return False
+        return self._day_excess[class_id * DAY_COUNT + day] > 0
+
+    def weekly_subject_count(self, class_ref: ClassReference, subject) -> int:
+        """クラス・教科の週当たりコマ数を取得"""
+        class_id = self.symbols.classes._ids.get(class_ref)
+        subject_id = self.symbols.subjects._ids.get(subject)
+        if class_id is None or subject_id is None or class_id >= len(self._rows):
+            return 0
+        base = class_id * DAY_COUNT
+        return sum(self._day_subject_counts[base + day].get(subject_id, 0) for day in range(DAY_COUNT))
+
+    # ========== 列挙 ==========
+
+    def iter_cells(self) -> Iterator[Tuple[int, ClassReference, Assignment]]:
+        """割り当て済みセルを (スロット, クラス, 割り当て) でスロット順に列挙"""
+        classes = self.symbols.classes
+        rows = self._rows
+        for slot in range(SLOT_COUNT):
+            for class_id, row in enumerate(rows):
+                if row[slot] is not None:
+                    yield slot, classes.value(class_id), row[slot]
+
+    def iter_slot(self, slot: int) -> Iterator[Tuple[ClassReference, Assignment]]:
+        """指定コマの割り当て済みセルを列挙"""
+        classes = self.symbols.classes
+        for class_id, row in enumerate(self._rows):
+            if row[slot] is not None:
+                yield classes.value(class_id), row[slot]
+
+    def iter_teacher(self, teacher) -> Iterator[Tuple[int, Assignment]]:
+        """教員の担当セルを (スロット, 割り当て) で列挙"""
+        teacher_id = self.symbols.teachers._ids.get(teacher)
+        if teacher_id is None or teacher_id >= len(self._teacher_rows):
+            return
+        teacher_row = self._teacher_rows[teacher_id]
+        if teacher_row is None:
+            return
+        for slot, class_ids in enumerate(teacher_row):
+            for class_id in class_ids:
+                yield slot, self._rows[class_id][slot]
+
+    def __len__(self) -> int:
+        return self._filled
+
+    # ========== 複製 ==========
+
+    def fork(self) -> 'ScheduleGrid':
+        """構造を共有した複製を作成
+
+        チャンクへの参照だけをコピーし、以降はどちらのグリッドも
+        書き込み時に該当チャンクを複製する（コピーオンライト）。
+        """
+        new_grid = ScheduleGrid.__new__(ScheduleGrid)
+        new_grid.symbols = self.symbols
+        new_grid._rows = self._rows[:]
+        new_grid._lock_masks = self._lock_masks[:]
+        new_grid._teacher_rows = self._teacher_rows[:]
+        new_grid._overlaps = set(self._overlaps)
+        new_grid._day_subject_counts = self._day_subject_counts[:]
+        new_grid._day_excess = self._day_excess[:]
+        new_grid._filled = self._filled
+        new_grid._owned_rows = set()
+        new_grid._owned_teacher_rows = set()
+        new_grid._owned_day_counts = set()
+        # 共有したチャンクは元のグリッドも専有していない扱いにする
+        self._owned_rows = set()
+        self._owned_teacher_rows = set()
+        self._owned_day_counts = set()
+        return new_grid
@@ -0,0 +1,92 @@
+"""時間割のテンソル表現
+
+時間枠×クラスの行列として教科ID・教員IDを保持し、制約をNumPyの配列演算で
+まとめて評価できるようにする。内容は Schedule.get_assignment() で見える割り当て
+（5組はGrade5Unitの共通割り当て）と一致する。
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .schedule_grid import SLOT_COUNT
+from ..value_objects.assignment import Assignment
+from ..value_objects.time_slot import ClassReference
+
+EMPTY = -1
+
+
+@dataclass
+class ScheduleTensor:
+    """時間枠×クラスの教科ID・教員ID行列
+
+    Attributes:
+        classes: 列の順序（クラス）
+        subject_ids: (SLOT_COUNT, クラス数) の教科ID。空きは EMPTY
+        teacher_ids: (SLOT_COUNT, クラス数) の教員ID。空き・教員なしは EMPTY
+        subject_names: 教科ID → 教科名
+        teacher_names: 教員ID → 教員名
+        assignments: クラス列ごとの30コマ分の割り当て（違反の生成用）
+    """
+    classes: List[ClassReference]
+    subject_ids: np.ndarray
+    teacher_ids: np.ndarray
+    subject_names: List[str]
+    teacher_names: List[str]
+    assignments: List[List[Optional[Assignment]]]
+
+    @classmethod
+    def from_cells(cls, classes: Sequence[ClassReference],
+                   cells: Sequence[Sequence[Optional[Assignment]]]) -> 'ScheduleTensor':
+        """クラスごとの30コマ分の割り当てから作成"""
+        subject_index: Dict[str, int] = {}
+        teacher_index: Dict[str, int] = {}
+        subject_ids = np.full((len(classes), SLOT_COUNT), EMPTY, dtype=np.int32)
+        teacher_ids = np.full((len(classes), SLOT_COUNT), EMPTY, dtype=np.int32)
+
+        for column, row in enumerate(cells):
+            for slot, assignment in enumerate(row):
+                if assignment is None:
+                    continue
+                subject_name = assignment.subject.name
+                subject_id = subject_index.get(subject_name)
+                if subject_id is None:
+                    subject_id = subject_index[subject_name] = len(subject_index)
+                subject_ids[column, slot] = subject_id
+                if assignment.teacher is not None:
+                    teacher_name = assignment.teacher.name
+                    teacher_id = teacher_index.get(teacher_name)
+                    if teacher_id is None:
+                        teacher_id = teacher_index[teacher_name] = len(teacher_index)
+                    teacher_ids[column, slot] = teacher_id
+
+        return cls(
+            classes=list(classes),
+            subject_ids=np.ascontiguousarray(subject_ids.T),
+            teacher_ids=np.ascontiguousarray(teacher_ids.T),
+            subject_names=list(subject_index),
+            teacher_names=list(teacher_index),
+            assignments=[list(row) for row in cells],
+        )
+
+    @property
+    def class_count(self) -> int:
+        return len(self.classes)
+
+    def subject_id(self, subject_name: str) -> int:
+        """教科名のID（時間割に無い教科は EMPTY）"""
+        try:
+            return self.subject_names.index(subject_name)
+        except ValueError:
+            return EMPTY
+
+    def subject_mask(self, subject_names) -> np.ndarray:
+        """教科IDごとの所属判定（subject_ids を添字にして使う）"""
+        return np.array([name in subject_names for name in self.subject_names], dtype=bool)
+
+    def column(self, class_ref: ClassReference) -> int:
+        """クラスの列番号（含まれない場合は EMPTY）"""
+        try:
+            return self.classes.index(class_ref)
+        except ValueError:
+            return EMPTY
@@ -1,7 +1,8 @@
 """学校エンティティ"""
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 from collections import defaultdict
 
+from .compiled_school import ABSENCE_SLOTS, CompiledSchool
 from ..value_objects.time_slot import ClassReference, Subject, Teacher
 from ..value_objects.assignment import StandardHours
 from ...shared.mixins.validation_mixin import ValidationMixin, ValidationError
@@ -18,15 +19,27 @@ class School(ValidationMixin):
         self._teacher_assignments: Dict[tuple[Subject, ClassReference], Teacher] = {}
         self._standard_hours: Dict[tuple[ClassReference, Subject], float] = {}
         self._teacher_unavailable: Dict[tuple[str, int], Set[Teacher]] = defaultdict(set)
+        self._compiled: Optional[CompiledSchool] = None
+    
+    # コンパイル済み索引
+    def compile(self) -> CompiledSchool:
+        """索引を作成して返す（変更がなければ前回の索引をそのまま返す）"""
+        if self._compiled is None:
+            self._compiled = CompiledSchool.build(self)
+        return self._compiled
+    
+    def _invalidate(self) -> None:
+        self._compiled = None
     
     # クラス管理
     def add_class(self, class_ref: ClassReference) -> None:
         """クラスを追加"""
         self._classes.add(class_ref)
+        self._invalidate()
     
     def get_all_classes(self) -> List[ClassReference]:
         """全てのクラスを取得"""
-        return sorted(list(self._classes), key=lambda c: (c.grade, c.class_number))
+        return list((self._compiled or self.compile()).classes)
     
     def get_classes_by_type(self, regular: bool = None, special_needs: bool = None, 
                            exchange: bool = None) -> List[ClassReference]:
@@ -46,16 +59,18 @@ class School(ValidationMixin):
     def add_teacher(self, teacher: Teacher) -> None:
         """教員を追加"""
         self._teachers.add(teacher)
+        self._invalidate()
     
     def get_all_teachers(self) -> List[Teacher]:
         """全ての教員を取得"""
-        return sorted(list(self._teachers), key=lambda t: t.name)
+        return list(self.compile().teachers)
     
     def assign_teacher_subject(self, teacher: Teacher, subject: Subject) -> None:
         """教員の担当教科を設定"""
         self.add_teacher(teacher)
         self._teacher_subjects[teacher].add(subject)
         self._subject_teachers[subject].add(teacher)
+        self._invalidate()
     
     def get_teacher_subjects(self, teacher: Teacher) -> Set[Subject]:
         """教員の担当教科を取得"""
@@ -76,6 +91,7 @@ class School(ValidationMixin):
             raise ValidationError(f"{teacher} cannot teach {subject}")
         
         self._teacher_assignments[(subject, class_ref)] = teacher
+        self._invalidate()
     
     def get_assigned_teacher(self, subject: Subject, class_ref: ClassReference) -> Teacher:
         """指定されたクラス・教科の担当教員を取得"""
@@ -83,8 +99,15 @@ class School(ValidationMixin):
     
     def get_teacher_class_assignments(self, teacher: Teacher) -> List[tuple[Subject, ClassReference]]:
         """教員の担当クラス・教科一覧を取得"""
-        return [(subject, class_ref) for (subject, class_ref), t in self._teacher_assignments.items() 
-                if t == teacher]
+        return list(self.compile().teacher_assignments.get(teacher, ()))
+    
+    def get_exchange_parent(self, class_ref: ClassReference) -> Optional[ClassReference]:
+        """交流学級の親学級を取得（交流学級でなければNone）"""
+        return self.compile().exchange_parents.get(class_ref)
+    
+    def get_exchange_classes(self, parent_class: ClassReference) -> List[ClassReference]:
+        """親学級に対応する交流学級を取得"""
+        return list(self.compile().exchange_children.get(parent_class, ()))
     
     # 標準時数管理
     def set_standard_hours(self, class_ref: ClassReference, subject: Subject, hours: float) -> None:
@@ -120,10 +143,21 @@ class School(ValidationMixin):
     def set_teacher_unavailable(self, day: str, period: int, teacher: Teacher) -> None:
         """教員の利用不可時間を設定"""
         self._teacher_unavailable[(day, period)].add(teacher)
+        self._invalidate()
     
     def is_teacher_unavailable(self, day: str, period: int, teacher: Teacher) -> bool:
         """教員が指定された時間に利用不可かどうか判定"""
-        return teacher in self._teacher_unavailable[(day, period)]
+        mask = (self._compiled or self.compile()).absence_masks.get(teacher, 0)
+        slot = ABSENCE_SLOTS.get((day, period))
+        if slot is None:
+            # 30コマの外の時間は索引に含まれないため元のデータを見る
+            unavailable = self._teacher_unavailable.get((day, period))
+            return unavailable is not None and teacher in unavailable
+        return bool(mask >> slot & 1)
+    
+    def get_teacher_absence_mask(self, teacher: Teacher) -> int:
+        """教員の不在コマのビットマスクを取得（ビット位置は曜日番号×6 + 校時-1）"""
+        return self.compile().absence_masks.get(teacher, 0)
     
     def get_unavailable_teachers(self, day: str, period: int) -> Set[Teacher]:
         """指定された時間に利用不可の教員一覧を取得"""
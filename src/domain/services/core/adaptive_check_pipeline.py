@@ -0,0 +1,125 @@
+"""適応的な事前チェックパイプライン
+
+配置前の制約チェックを順に実行し、最初に不可となったチェックで打ち切る。
+各チェックの呼び出し回数・不可回数・累計処理時間を実行時に記録し、
+一定回数ごとに「平均コスト / 不可率」の昇順に並べ替える。安くてよく不可を返す
+チェックほど先に実行され、打ち切りまでの期待コストが小さくなる。
+
+チェックの結果（可/不可）は実行順序に依存しないため、並べ替えても判定は変わらない。
+変わるのは、複数のチェックが不可となる場合にどのチェックの結果が返るかだけ。
+"""
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# チェック関数は可なら None、不可なら理由（None以外の値）を返す
+CheckFunction = Callable[..., Any]
+
+
+class AdaptiveCheckPipeline:
+    """実行時の統計で順序を最適化するチェックの列
+
+    Attributes:
+        reorder_interval: 並べ替えを行う間隔（run / run_all の呼び出し回数）
+    """
+
+    def __init__(self, checks: Iterable[Tuple[str, CheckFunction]], reorder_interval: int = 256) -> None:
+        """AdaptiveCheckPipelineを初期化
+
+        Args:
+            checks: (名前, チェック関数) の列。初期順序はこの順
+            reorder_interval: 並べ替えの間隔
+        """
+        self.reorder_interval = reorder_interval
+        self._names: List[str] = []
+        self._functions: List[CheckFunction] = []
+        for name, function in checks:
+            # 同名のチェックは統計が混ざらないよう番号を付けて区別する
+            unique_name = name
+            suffix = 2
+            while unique_name in self._names:
+                unique_name = f"{name}#{suffix}"
+                suffix += 1
+            self._names.append(unique_name)
+            self._functions.append(function)
+
+        count = len(self._functions)
+        self._calls = [0] * count
+        self._rejections = [0] * count
+        self._elapsed = [0.0] * count
+        self._order: List[int] = list(range(count))
+        self._runs = 0
+        self._reorders = 0
+
+    def __len__(self) -> int:
+        return len(self._functions)
+
+    def run(self, *args: Any) -> Optional[Any]:
+        """現在の順序でチェックし、最初の不可の理由を返す（全て可ならNone）"""
+        self._runs += 1
+        if self._runs % self.reorder_interval == 0:
+            self._reorder()
+
+        functions = self._functions
+        for index in self._order:
+            start = perf_counter()
+            reason = functions[index](*args)
+            self._elapsed[index] += perf_counter() - start
+            self._calls[index] += 1
+            if reason is not None:
+                self._rejections[index] += 1
+                return reason
+        return None
+
+    def run_all(self, *args: Any) -> List[Tuple[str, Any]]:
+        """打ち切らずに全てのチェックを実行し、不可となった (名前, 理由) を登録順に返す"""
+        self._runs += 1
+        rejections = []
+        for index, function in enumerate(self._functions):
+            start = perf_counter()
+            reason = function(*args)
+            self._elapsed[index] += perf_counter() - start
+            self._calls[index] += 1
+            if reason is not None:
+                self._rejections[index] += 1
+                rejections.append((self._names[index], reason))
+        return rejections
+
+    def _reorder(self) -> None:
+        """平均コスト / 不可率 の昇順に並べ替える
+
+        不可率は (不可回数 + 1) / (呼び出し回数 + 2) で平滑化する。まだ呼ばれていない
+        チェックはコスト0として先頭に置き、次の区間で計測されるようにする。
+        """
+        def expected_cost_per_rejection(index: int) -> float:
+            calls = self._calls[index]
+            if calls == 0:
+                return 0.0
+            mean_cost = self._elapsed[index] / calls
+            rejection_rate = (self._rejections[index] + 1) / (calls + 2)
+            return mean_cost / rejection_rate
+
+        self._order.sort(key=expected_cost_per_rejection)
+        self._reorders += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """チェックごとのカウンタと現在の実行順序を取得
+
+        Returns:
+            runs: 実行回数、reorders: 並べ替え回数、order: 現在の実行順序（名前）、
+            checks: 名前 → {calls, rejections, rejection_rate, mean_cost_us}
+        """
+        checks = {}
+        for index, name in enumerate(self._names):
+            calls = self._calls[index]
+            checks[name] = {
+                'calls': calls,
+                'rejections': self._rejections[index],
+                'rejection_rate': self._rejections[index] / calls if calls else 0.0,
+                'mean_cost_us': self._elapsed[index] / calls * 1e6 if calls else 0.0,
+            }
+        return {
+            'runs': self._runs,
+            'reorders': self._reorders,
+            'order': [self._names[index] for index in self._order],
+            'checks': checks,
+        }
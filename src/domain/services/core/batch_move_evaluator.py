@@ -0,0 +1,329 @@
+"""移動・スワップ候補の一括評価
+
+局所探索の候補（セルの移動・スワップ）を配列で受け取り、スケジュールを変更せずに
+全候補のハード違反の増減とソフトスコアの増減をまとめて計算する。
+
+評価モデル:
+    ハード: 教員の重複（5組合同授業は1授業として数える。交流学級の担任の自立活動が
+            同じ時限に2つ以上あれば、教師重複制約と同じくその教員の重複を数えない）
+            日内の教科重複（固定教科を除く）
+            不在教員への割り当て
+    ソフト: 標準時数からの乖離（|実時数 - 標準時数| の合計）
+
+5組の3クラスは1列（ユニット）として扱い、Schedule.assign の5組同期と同じく
+3クラス同時に変わるものとして評価する（日内重複・時数は3クラス分の重みを持つ）。
+
+使用例:
+    evaluator = BatchMoveEvaluator(schedule, school)
+    cells_a = evaluator.encode_cells([(time_slot1, class1), ...])
+    cells_b = evaluator.encode_cells([(time_slot2, class2), ...])
+    scores = evaluator.score_swaps(cells_a, cells_b)
+    for index in scores.ranking()[:10]:
+        ...
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from ....shared.mixins.logging_mixin import LoggingMixin
+from ...constants import FIXED_SUBJECTS, PERIOD_COUNT
+from ...entities.schedule_grid import ALL_TIME_SLOTS, DAY_COUNT, SLOT_COUNT, slot_index
+from ...entities.schedule_tensor import EMPTY
+from ...value_objects.time_slot import ClassReference, Subject, TimeSlot
+
+if TYPE_CHECKING:
+    from ...entities.schedule import Schedule
+    from ...entities.school import School
+
+
+@dataclass
+class MoveScores:
+    """候補ごとの評価結果（配列の添字は候補の順序）
+
+    Attributes:
+        hard_delta: ハード違反数の増減（負なら改善）
+        soft_delta: ソフトスコアの増減（負なら改善）
+        feasible: 実行可能か（ロック・テスト期間・空セルの移動などは不可）
+    """
+    hard_delta: np.ndarray
+    soft_delta: np.ndarray
+    feasible: np.ndarray
+
+    def ranking(self) -> np.ndarray:
+        """実行可能な候補の添字を (ハード増減, ソフト増減) の昇順で返す"""
+        candidates = np.flatnonzero(self.feasible)
+        order = np.lexsort((self.soft_delta[candidates], self.hard_delta[candidates]))
+        return candidates[order]
+
+
+class BatchMoveEvaluator(LoggingMixin):
+    """移動・スワップ候補の一括評価器
+
+    作成時点のスケジュールから集計表を作るため、スケジュールを変更した後は
+    作り直すこと。候補のセルは encode_cells() で (スロット番号, 列番号) に変換する。
+    """
+
+    # 教師重複制約で除外される仮想教員
+    VIRTUAL_TEACHERS = frozenset({"欠課先生", "未定先生", "TBA"})
+    # 教師重複制約で自立活動の重複が許容される交流学級の担任
+    JIRITSU_TEACHERS = frozenset({"財津", "智田"})
+
+    def __init__(self, schedule: 'Schedule', school: 'School',
+                 teacher_absences: Optional[Dict[str, Set[Tuple[str, int]]]] = None):
+        """
+        Args:
+            schedule: 評価の基準となるスケジュール（変更しない）
+            school: 学校情報
+            teacher_absences: 教員名 → {(曜日, 時限)} の不在情報
+        """
+        super().__init__()
+        all_classes = school.get_all_classes()
+        grade5_classes = [c for c in all_classes if c in set(schedule.grade5_unit.classes)]
+        classes = [c for c in all_classes if c not in grade5_classes] + grade5_classes[:1]
+
+        self.classes = classes
+        self._column: Dict[ClassReference, int] = {c: i for i, c in enumerate(classes)}
+        for class_ref in grade5_classes:
+            self._column[class_ref] = len(classes) - 1
+        weights = np.ones(len(classes), dtype=np.int64)
+        if grade5_classes:
+            weights[-1] = len(grade5_classes)
+
+        tensor = schedule.to_tensor(classes)
+        self._subjects = tensor.subject_ids
+        teachers = tensor.teacher_ids.copy()
+        virtual = np.array([name in self.VIRTUAL_TEACHERS for name in tensor.teacher_names], dtype=bool)
+        if virtual.any():
+            teachers[(teachers != EMPTY) & virtual[np.maximum(teachers, 0)]] = EMPTY
+        self._teachers = teachers
+
+        n_subjects = max(len(tensor.subject_names), 1)
+        n_teachers = max(len(tensor.teacher_names), 1)
+        self._n_subjects = n_subjects
+        self._n_teachers = n_teachers
+        self._jiritsu_teachers = np.zeros(n_teachers, dtype=bool)
+        self._jiritsu_teachers[:len(tensor.teacher_names)] = [
+            name in self.JIRITSU_TEACHERS for name in tensor.teacher_names
+        ]
+        self._jiritsu_subjects = np.zeros(n_subjects, dtype=bool)
+        self._jiritsu_subjects[:len(tensor.subject_names)] = [name == "自立" for name in tensor.subject_names]
+        self._daily_checked = np.zeros(n_subjects, dtype=bool)
+        self._daily_checked[:len(tensor.subject_names)] = ~tensor.subject_mask(FIXED_SUBJECTS)
+
+        slots = np.broadcast_to(np.arange(SLOT_COUNT)[:, None], self._subjects.shape)
+        columns = np.broadcast_to(np.arange(len(classes))[None, :], self._subjects.shape)
+
+        # 集計表（交流学級の担任の自立活動は別に数える）
+        teacher_keys = self._teacher_keys(slots, teachers).ravel()
+        jiritsu = self._is_jiritsu(self._subjects, teachers).ravel()
+        self._teacher_counts = np.bincount(teacher_keys[(teacher_keys >= 0) & ~jiritsu],
+                                           minlength=SLOT_COUNT * n_teachers)
+        self._jiritsu_counts = np.bincount(teacher_keys[(teacher_keys >= 0) & jiritsu],
+                                           minlength=SLOT_COUNT * n_teachers)
+        daily_keys = self._daily_keys(slots, columns, self._subjects).ravel()
+        self._daily_counts = np.bincount(daily_keys[daily_keys >= 0],
+                                         minlength=len(classes) * DAY_COUNT * n_subjects)
+        self._daily_weights = np.repeat(weights, DAY_COUNT * n_subjects)
+        hour_keys = self._hour_keys(columns, self._subjects).ravel()
+        self._hour_counts = np.bincount(hour_keys[hour_keys >= 0],
+                                        minlength=len(classes) * n_subjects)
+        self._hour_weights = np.repeat(weights, n_subjects)
+        self._standard_hours = self._load_standard_hours(school, classes, tensor.subject_names)
+
+        self._absent = np.zeros((n_teachers, SLOT_COUNT), dtype=bool)
+        for teacher_id, teacher_name in enumerate(tensor.teacher_names):
+            for day, period in (teacher_absences or {}).get(teacher_name, ()):
+                self._absent[teacher_id, slot_index(TimeSlot(day, period))] = True
+
+        # 変更できないセル（ロック・テスト期間）
+        frozen = np.zeros((SLOT_COUNT, len(classes)), dtype=bool)
+        for class_ref in all_classes:
+            column = self._column[class_ref]
+            for slot, time_slot in enumerate(ALL_TIME_SLOTS):
+                if schedule.is_locked(time_slot, class_ref) or schedule.is_test_period(time_slot):
+                    frozen[slot, column] = True
+        self._frozen = frozen
+
+    def totals(self) -> Tuple[int, float]:
+        """基準スケジュールの (ハード違反数, ソフトスコア)"""
+        hard = int(self._teacher_penalty(self._teacher_counts, self._jiritsu_counts).sum())
+        hard += int((np.maximum(self._daily_counts - 1, 0) * self._daily_weights).sum())
+        slots = np.broadcast_to(np.arange(SLOT_COUNT)[:, None], self._teachers.shape)
+        hard += int((self._absent[np.maximum(self._teachers, 0), slots] & (self._teachers != EMPTY)).sum())
+        deviation = np.nan_to_num(np.abs(self._hour_counts - self._standard_hours), nan=0.0)
+        return hard, float((deviation * self._hour_weights).sum())
+
+    def _load_standard_hours(self, school: 'School', classes: List[ClassReference],
+                             subject_names: List[str]) -> np.ndarray:
+        """(列, 教科) の標準時数。標準時数の無い教科は NaN（時数評価の対象外）"""
+        hours = np.full(len(classes) * self._n_subjects, np.nan)
+        for column, class_ref in enumerate(classes):
+            for subject, value in school.get_all_standard_hours(class_ref).items():
+                if subject.name in subject_names:
+                    hours[column * self._n_subjects + subject_names.index(subject.name)] = value
+        return hours
+
+    # ========== キー ==========
+
+    def _teacher_keys(self, slots: np.ndarray, teachers: np.ndarray) -> np.ndarray:
+        return np.where(teachers != EMPTY, slots * self._n_teachers + teachers, EMPTY)
+
+    def _is_jiritsu(self, subjects: np.ndarray, teachers: np.ndarray) -> np.ndarray:
+        """交流学級の担任による自立活動のセル"""
+        return ((teachers != EMPTY) & self._jiritsu_teachers[np.maximum(teachers, 0)]
+                & (subjects != EMPTY) & self._jiritsu_subjects[np.maximum(subjects, 0)])
+
+    def _daily_keys(self, slots: np.ndarray, columns: np.ndarray, subjects: np.ndarray) -> np.ndarray:
+        checked = (subjects != EMPTY) & self._daily_checked[np.maximum(subjects, 0)]
+        keys = (columns * DAY_COUNT + slots // PERIOD_COUNT) * self._n_subjects + subjects
+        return np.where(checked, keys, EMPTY)
+
+    def _hour_keys(self, columns: np.ndarray, subjects: np.ndarray) -> np.ndarray:
+        return np.where(subjects != EMPTY, columns * self._n_subjects + subjects, EMPTY)
+
+    # ========== 候補 ==========
+
+    def encode_cells(self, cells: Iterable[Tuple[TimeSlot, ClassReference]]) -> np.ndarray:
+        """(時間枠, クラス) の並びを (スロット番号, 列番号) の配列に変換"""
+        encoded = [(slot_index(time_slot), self._column[class_ref]) for time_slot, class_ref in cells]
+        return np.array(encoded, dtype=np.int64).reshape(-1, 2)
+
+    def decode_cell(self, cell: np.ndarray) -> Tuple[TimeSlot, ClassReference]:
+        """(スロット番号, 列番号) を (時間枠, クラス) に戻す（5組は代表クラス）"""
+        return ALL_TIME_SLOTS[int(cell[0])], self.classes[int(cell[1])]
+
+    def score_swaps(self, cells_a: np.ndarray, cells_b: np.ndarray) -> MoveScores:
+        """セルAとセルBの割り当てを入れ替えた場合の増減を一括計算"""
+        slot_a, col_a = cells_a[:, 0], cells_a[:, 1]
+        slot_b, col_b = cells_b[:, 0], cells_b[:, 1]
+        subject_a, teacher_a = self._subjects[slot_a, col_a], self._teachers[slot_a, col_a]
+        subject_b, teacher_b = self._subjects[slot_b, col_b], self._teachers[slot_b, col_b]
+
+        feasible = (
+            ~self._frozen[slot_a, col_a] & ~self._frozen[slot_b, col_b]
+            & ((slot_a != slot_b) | (col_a != col_b))
+            & ((subject_a != EMPTY) | (subject_b != EMPTY))
+        )
+        return self._score(
+            slots=np.stack([slot_a, slot_b], axis=1),
+            columns=np.stack([col_a, col_b], axis=1),
+            old_subjects=np.stack([subject_a, subject_b], axis=1),
+            old_teachers=np.stack([teacher_a, teacher_b], axis=1),
+            new_subjects=np.stack([subject_b, subject_a], axis=1),
+            new_teachers=np.stack([teacher_b, teacher_a], axis=1),
+            feasible=feasible,
+        )
+
+    def score_moves(self, sources: np.ndarray, targets: np.ndarray) -> MoveScores:
+        """移動元の割り当てを移動先に移し、移動元を空きにした場合の増減を一括計算
+
+        移動先に既存の割り当てがある場合は上書きされる。
+        """
+        slot_s, col_s = sources[:, 0], sources[:, 1]
+        slot_t, col_t = targets[:, 0], targets[:, 1]
+        subject_s, teacher_s = self._subjects[slot_s, col_s], self._teachers[slot_s, col_s]
+        subject_t, teacher_t = self._subjects[slot_t, col_t], self._teachers[slot_t, col_t]
+        empty = np.full_like(subject_s, EMPTY)
+
+        feasible = (
+            ~self._frozen[slot_s, col_s] & ~self._frozen[slot_t, col_t]
+            & ((slot_s != slot_t) | (col_s != col_t))
+            & (subject_s != EMPTY)
+        )
+        return self._score(
+            slots=np.stack([slot_t, slot_s], axis=1),
+            columns=np.stack([col_t, col_s], axis=1),
+            old_subjects=np.stack([subject_t, subject_s], axis=1),
+            old_teachers=np.stack([teacher_t, teacher_s], axis=1),
+            new_subjects=np.stack([subject_s, empty], axis=1),
+            new_teachers=np.stack([teacher_s, empty], axis=1),
+            feasible=feasible,
+        )
+
+    # ========== 評価 ==========
+
+    def _score(self, slots, columns, old_subjects, old_teachers,
+               new_subjects, new_teachers, feasible) -> MoveScores:
+        """セル書き込み（候補ごとに2つ）の増減を計算"""
+        def removed_then_added(old_keys, new_keys):
+            keys = np.concatenate([old_keys, new_keys], axis=1)
+            deltas = np.concatenate([-np.ones_like(old_keys), np.ones_like(new_keys)], axis=1)
+            return keys, deltas
+
+        # 教員の重複: 同じ時間枠の同じ教員が2以上なら超過分が違反
+        keys, deltas = removed_then_added(self._teacher_keys(slots, old_teachers),
+                                          self._teacher_keys(slots, new_teachers))
+        jiritsu = np.concatenate([self._is_jiritsu(old_subjects, old_teachers),
+                                  self._is_jiritsu(new_subjects, new_teachers)], axis=1)
+        teacher_delta = self._teacher_delta(keys, deltas, jiritsu)
+
+        # 日内重複: 同じクラス・曜日の同じ教科が2以上なら超過分が違反（5組は3クラス分）
+        keys, deltas = removed_then_added(self._daily_keys(slots, columns, old_subjects),
+                                          self._daily_keys(slots, columns, new_subjects))
+        daily_delta = self._count_delta(
+            self._daily_counts, keys, deltas,
+            lambda counts, k: np.maximum(counts - 1, 0) * self._daily_weights[k]
+        )
+
+        # 教員不在: セル単位で加算
+        def absent(teachers):
+            hits = self._absent[np.maximum(teachers, 0), slots] & (teachers != EMPTY)
+            return hits.sum(axis=1)
+        absence_delta = absent(new_teachers) - absent(old_teachers)
+
+        # 標準時数からの乖離
+        keys, deltas = removed_then_added(self._hour_keys(columns, old_subjects),
+                                          self._hour_keys(columns, new_subjects))
+        hour_delta = self._count_delta(
+            self._hour_counts, keys, deltas,
+            lambda counts, k: np.nan_to_num(
+                np.abs(counts - self._standard_hours[k]), nan=0.0
+            ) * self._hour_weights[k]
+        )
+
+        return MoveScores(
+            hard_delta=(teacher_delta + daily_delta + absence_delta).astype(np.int64),
+            soft_delta=hour_delta.astype(np.float64),
+            feasible=feasible,
+        )
+
+    @staticmethod
+    def _teacher_penalty(counts: np.ndarray, jiritsu_counts: np.ndarray) -> np.ndarray:
+        """教員の重複数（自立活動が2つ以上の時限は教師重複制約と同じく除外）"""
+        return np.where(jiritsu_counts >= 2, 0, np.maximum(counts + jiritsu_counts - 1, 0))
+
+    def _teacher_delta(self, keys: np.ndarray, deltas: np.ndarray, jiritsu: np.ndarray) -> np.ndarray:
+        """教員の重複の変化量（自立活動とそれ以外の授業を別の集計表で増減させる）"""
+        same, first = self._key_groups(keys)
+        net = (same * (deltas * ~jiritsu)[:, None, :]).sum(axis=2)
+        net_jiritsu = (same * (deltas * jiritsu)[:, None, :]).sum(axis=2)
+
+        safe_keys = np.maximum(keys, 0)
+        base, base_jiritsu = self._teacher_counts[safe_keys], self._jiritsu_counts[safe_keys]
+        change = (self._teacher_penalty(base + net, base_jiritsu + net_jiritsu)
+                  - self._teacher_penalty(base, base_jiritsu))
+        return np.where(first, change, 0).sum(axis=1)
+
+    @staticmethod
+    def _key_groups(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """候補内で同じキーの組と、各キーが最初に現れる位置"""
+        width = keys.shape[1]
+        same = keys[:, :, None] == keys[:, None, :]
+        earlier = np.tri(width, k=-1, dtype=bool)
+        first = (keys != EMPTY) & ~(same & earlier).any(axis=2)
+        return same, first
+
+    @classmethod
+    def _count_delta(cls, counts: np.ndarray, keys: np.ndarray, deltas: np.ndarray, penalty) -> np.ndarray:
+        """集計表の複数キーを同時に増減させた時のペナルティの変化量
+
+        同じ候補内で同じキーが複数回現れる場合は、増減を合算して1回だけ評価する。
+        """
+        same, first = cls._key_groups(keys)
+        net = (same * deltas[:, None, :]).sum(axis=2)
+
+        safe_keys = np.maximum(keys, 0)
+        base = counts[safe_keys]
+        change = penalty(base + net, safe_keys) - penalty(base, safe_keys)
+        return np.where(first, change, 0).sum(axis=1)
@@ -0,0 +1,209 @@
+"""差分制約評価エンジン
+
+Scheduleのセル変更通知を購読し、変更されたセルが属するスコープだけを再検証する。
+違反はスコープ単位で保持し、違反一覧とスコアを常に最新の状態で提供する。
+
+使用例:
+    evaluator = constraint_system.create_incremental_evaluator(school)
+    evaluator.attach(schedule)
+    schedule.assign(time_slot, assignment)
+    evaluator.score  # 変更されたスコープだけ再検証した結果
+    added, resolved = evaluator.refresh_changes()  # 直前の変更で増えた違反・解消した違反
+"""
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from ....shared.mixins.logging_mixin import LoggingMixin
+from ...constraints.base import ConstraintPriority, ConstraintScope
+from ...constants import WEEKDAYS
+from ...value_objects.time_slot import TimeSlot, ClassReference
+
+if TYPE_CHECKING:
+    from ...entities.schedule import Schedule
+    from ...entities.school import School
+    from ...constraints.base import Constraint, ConstraintViolation
+
+# (制約, 優先度, 違反) のリスト
+ViolationChanges = List[Tuple['Constraint', ConstraintPriority, 'ConstraintViolation']]
+
+
+class IncrementalConstraintEvaluator(LoggingMixin):
+    """差分制約評価エンジン
+
+    各制約の scope（ConstraintScope）に従って違反をスコープキーごとに保持する。
+    セルが変更されると、そのセルを含むスコープを「要再検証」にし、
+    違反一覧・スコアが参照された時点でまとめて validate_scope() を実行する。
+    スワップのように複数セルを続けて変更しても、再検証は各スコープ1回で済む。
+
+    スコアは違反1件につき登録時の優先度の値（ConstraintPriority.value）を加算した合計。
+    """
+
+    def __init__(self, constraints: List[Tuple['Constraint', ConstraintPriority]], school: 'School'):
+        """
+        Args:
+            constraints: (制約, 優先度) のリスト
+            school: 学校情報
+        """
+        self.school = school
+        self._constraints = list(constraints)
+        self._schedule: Optional['Schedule'] = None
+        # 制約ごとの {スコープキー: 違反リスト}
+        self._buckets: List[Dict[Hashable, List['ConstraintViolation']]] = [
+            {} for _ in self._constraints
+        ]
+        self._dirty: Set[Tuple[int, Hashable]] = set()
+        self._violation_count = 0
+        self._score = 0
+        # 統計
+        self._change_events = 0
+        self._scope_checks = 0
+
+    # ========== 購読 ==========
+
+    def attach(self, schedule: 'Schedule') -> None:
+        """スケジュールを全体検証し、以降の変更を購読する"""
+        if self._schedule is not None:
+            self.detach()
+        self._schedule = schedule
+        for buckets in self._buckets:
+            buckets.clear()
+        self._dirty.clear()
+        self._violation_count = 0
+        self._score = 0
+
+        for index, (constraint, _) in enumerate(self._constraints):
+            for scope_key in self._all_scope_keys(constraint.scope):
+                self._dirty.add((index, scope_key))
+        self.refresh()
+
+        schedule.add_change_listener(self._on_change)
+
+    def detach(self) -> None:
+        """購読を解除"""
+        if self._schedule is not None:
+            self._schedule.remove_change_listener(self._on_change)
+            self._schedule = None
+
+    def _on_change(self, time_slot: TimeSlot, class_ref: ClassReference) -> None:
+        self._change_events += 1
+        for index, (constraint, _) in enumerate(self._constraints):
+            self._dirty.add((index, self._scope_key_for(constraint.scope, time_slot, class_ref)))
+
+    # ========== スコープ ==========
+
+    @staticmethod
+    def _scope_key_for(scope: ConstraintScope, time_slot: TimeSlot,
+                       class_ref: ClassReference) -> Hashable:
+        """変更されたセルを含むスコープのキー"""
+        if scope is ConstraintScope.TIME_SLOT:
+            return time_slot
+        if scope is ConstraintScope.CLASS_DAY:
+            return (class_ref, time_slot.day)
+        if scope is ConstraintScope.CLASS:
+            return class_ref
+        return None
+
+    def _all_scope_keys(self, scope: ConstraintScope) -> List[Hashable]:
+        """スコープの全キー（全体検証用）"""
+        if scope is ConstraintScope.TIME_SLOT:
+            from ...entities.schedule_grid import ALL_TIME_SLOTS
+            return list(ALL_TIME_SLOTS)
+        if scope is ConstraintScope.CLASS_DAY:
+            return [(class_ref, day) for class_ref in self.school.get_all_classes() for day in WEEKDAYS]
+        if scope is ConstraintScope.CLASS:
+            return list(self.school.get_all_classes())
+        return [None]
+
+    # ========== 再検証 ==========
+
+    def refresh(self) -> None:
+        """要再検証のスコープを検証し直す"""
+        self._revalidate(None, None)
+
+    def refresh_changes(self) -> Tuple[ViolationChanges, ViolationChanges]:
+        """要再検証のスコープを検証し直し、(増えた違反, 解消した違反) を返す
+
+        前回の再検証以降の変更による差分。内容の変わった違反（同じ時間枠の違反で
+        クラスや回数が変わったものなど）は、解消と増加の両方に含まれる。
+        """
+        added: ViolationChanges = []
+        resolved: ViolationChanges = []
+        self._revalidate(added, resolved)
+        return added, resolved
+
+    def _revalidate(self, added: Optional[ViolationChanges], resolved: Optional[ViolationChanges]) -> None:
+        if not self._dirty or self._schedule is None:
+            return
+        dirty = self._dirty
+        self._dirty = set()
+        for index, scope_key in dirty:
+            constraint, priority = self._constraints[index]
+            self._scope_checks += 1
+            try:
+                violations = constraint.validate_scope(self._schedule, self.school, scope_key)
+            except Exception as e:
+                self.logger.error(f"制約検証エラー ({constraint.name}): {e}")
+                violations = []
+
+            buckets = self._buckets[index]
+            previous = buckets.pop(scope_key, ())
+            if violations:
+                buckets[scope_key] = violations
+            if added is not None:
+                remaining = list(previous)
+                for violation in violations:
+                    if violation in remaining:
+                        remaining.remove(violation)
+                    else:
+                        added.append((constraint, priority, violation))
+                resolved.extend((constraint, priority, violation) for violation in remaining)
+            delta = len(violations) - len(previous)
+            self._violation_count += delta
+            self._score += delta * priority.value
+
+    @property
+    def score(self) -> int:
+        """現在の違反スコア（小さいほど良い）"""
+        self.refresh()
+        return self._score
+
+    @property
+    def violation_count(self) -> int:
+        """現在の違反数"""
+        self.refresh()
+        return self._violation_count
+
+    def get_violations(self) -> List['ConstraintViolation']:
+        """現在の違反一覧（優先度の高い制約から順に、各制約内は全体検証と同じ順序）"""
+        return [violation for _, _, violation in self.get_violation_entries()]
+
+    def get_violation_entries(self) -> ViolationChanges:
+        """現在の違反を (制約, 優先度, 違反) で返す（順序は get_violations と同じ）"""
+        self.refresh()
+        order = sorted(range(len(self._constraints)),
+                       key=lambda i: self._constraints[i][1].value, reverse=True)
+        entries = []
+        for index in order:
+            constraint, priority = self._constraints[index]
+            buckets = self._buckets[index]
+            for scope_key in self._all_scope_keys(constraint.scope):
+                entries.extend((constraint, priority, violation) for violation in buckets.get(scope_key, ()))
+        return entries
+
+    def get_violation_count_by_priority(self) -> Dict[ConstraintPriority, int]:
+        """優先度別の違反数"""
+        self.refresh()
+        counts = {p: 0 for p in ConstraintPriority}
+        for (_, priority), buckets in zip(self._constraints, self._buckets):
+            counts[priority] += sum(len(v) for v in buckets.values())
+        return counts
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """評価統計を取得"""
+        return {
+            'constraints': len(self._constraints),
+            'change_events': self._change_events,
+            'scope_checks': self._scope_checks,
+            'pending_scopes': len(self._dirty),
+            'violation_count': self._violation_count,
+            'score': self._score,
+        }
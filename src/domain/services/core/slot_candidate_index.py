@@ -0,0 +1,205 @@
+"""セルごとの配置候補インデックス
+
+(コマ, クラス) のセルごとに、現在配置可能な (教科, 教員) の組を保持する。
+
+- 静的な部分（教員の不在・セルごとの配置禁止教科）は学校のコンパイル済み索引から一度だけ作る
+- 動的な部分（教員がそのコマに空いているか）はScheduleのセル変更通知を購読して更新する
+
+セルが変更されると、変更前後の教員を候補に含む同じコマのセルだけを「要再計算」にし、
+候補が参照された時点で再計算する。セルが空いているか・ロック・テスト期間は参照時に判定する。
+日内重複はチェックレベルによって許容回数が変わるため、ここでは扱わない
+（Schedule.count_daily_subject で判定する）。
+
+使用例:
+    index = SlotCandidateIndex(school)
+    index.attach(schedule)
+    for subject, teacher in index.candidates(time_slot, class_ref):
+        ...
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from ....shared.mixins.logging_mixin import LoggingMixin
+from ...entities.schedule_grid import ALL_TIME_SLOTS, slot_index
+from ...utils.schedule_utils import ScheduleUtils
+from ...value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+
+if TYPE_CHECKING:
+    from ...entities.schedule import Schedule
+    from ...entities.school import School
+
+Candidate = Tuple[Subject, Teacher]
+Cell = Tuple[int, ClassReference]
+
+
+class SlotCandidateIndex(LoggingMixin):
+    """セルごとの配置可能な (教科, 教員) の組を保持するインデックス
+
+    クラスの候補は標準時数のある固定科目以外の教科と、その担当教員（クラスの担当教員を先頭に、
+    続いて教科の担当教員を名前順）の組。
+    """
+
+    def __init__(self, school: 'School',
+                 forbidden_cells: Optional[Dict[Tuple[TimeSlot, ClassReference], Set[str]]] = None):
+        """
+        Args:
+            school: 学校情報
+            forbidden_cells: (時間枠, クラス) → 配置禁止の教科名
+        """
+        super().__init__()
+        self.school = school
+        compiled = school.compile()
+        self._forbidden: Dict[Cell, Set[str]] = {
+            (slot_index(time_slot), class_ref): names
+            for (time_slot, class_ref), names in (forbidden_cells or {}).items()
+        }
+
+        self._static: Dict[Cell, Tuple[Candidate, ...]] = {}
+        self._classes_by_teacher: Dict[Teacher, Set[ClassReference]] = {}
+        for class_ref in compiled.classes:
+            pairs = self._class_candidates(school, class_ref)
+            for _, teacher in pairs:
+                self._classes_by_teacher.setdefault(teacher, set()).add(class_ref)
+            for slot in range(len(ALL_TIME_SLOTS)):
+                names = self._forbidden.get((slot, class_ref), ())
+                self._static[(slot, class_ref)] = tuple(
+                    (subject, teacher) for subject, teacher in pairs
+                    if subject.name not in names and not compiled.is_teacher_absent(teacher, slot)
+                )
+
+        self._schedule: Optional['Schedule'] = None
+        self._feasible: Dict[Cell, Tuple[Candidate, ...]] = {}
+        self._dirty: Set[Cell] = set()
+        # セル → 現在の担当教員（変更通知で変更前の教員を知るための写し）
+        self._cell_teachers: Dict[Cell, Optional[Teacher]] = {}
+        # 統計
+        self._change_events = 0
+        self._cell_updates = 0
+        self._lookups = 0
+
+    @staticmethod
+    def _class_candidates(school: 'School', class_ref: ClassReference) -> List[Candidate]:
+        """クラスの全候補（セルによらない）"""
+        pairs = []
+        for subject in sorted(school.get_all_standard_hours(class_ref), key=lambda s: s.name):
+            if ScheduleUtils.is_fixed_subject(subject.name):
+                continue
+            assigned = school.get_assigned_teacher(subject, class_ref)
+            if assigned:
+                pairs.append((subject, assigned))
+            for teacher in sorted(school.get_subject_teachers(subject), key=lambda t: t.name):
+                if teacher != assigned:
+                    pairs.append((subject, teacher))
+        return pairs
+
+    # ========== 購読 ==========
+
+    def attach(self, schedule: 'Schedule') -> None:
+        """スケジュールの現在の状態から候補を作り、以降の変更を購読する"""
+        if self._schedule is not None:
+            self.detach()
+        self._schedule = schedule
+        self._feasible.clear()
+        self._cell_teachers.clear()
+        self._dirty = set(self._static)
+        for slot, class_ref in self._static:
+            assignment = schedule.get_assignment(ALL_TIME_SLOTS[slot], class_ref)
+            self._cell_teachers[(slot, class_ref)] = assignment.teacher if assignment else None
+        schedule.add_change_listener(self._on_change)
+
+    def detach(self) -> None:
+        """購読を解除"""
+        if self._schedule is not None:
+            self._schedule.remove_change_listener(self._on_change)
+            self._schedule = None
+
+    @property
+    def schedule(self) -> Optional['Schedule']:
+        """購読中のスケジュール"""
+        return self._schedule
+
+    def _on_change(self, time_slot: TimeSlot, class_ref: ClassReference) -> None:
+        self._change_events += 1
+        slot = slot_index(time_slot)
+        cell = (slot, class_ref)
+        assignment = self._schedule.get_assignment(time_slot, class_ref)
+        teacher = assignment.teacher if assignment else None
+        previous = self._cell_teachers.get(cell)
+        if teacher == previous:
+            return
+        self._cell_teachers[cell] = teacher
+        # 変更前後の教員を候補に持つ、同じコマのセルだけ再計算が必要
+        for changed in (previous, teacher):
+            if changed is not None:
+                for affected in self._classes_by_teacher.get(changed, ()):
+                    self._dirty.add((slot, affected))
+
+    # ========== 参照 ==========
+
+    def is_open(self, time_slot: TimeSlot, class_ref: ClassReference) -> bool:
+        """セルが空いていて、ロック・テスト期間でないかどうか"""
+        schedule = self._schedule
+        return (schedule.get_assignment(time_slot, class_ref) is None
+                and not schedule.is_locked(time_slot, class_ref)
+                and not schedule.is_test_period(time_slot))
+
+    def candidates(self, time_slot: TimeSlot, class_ref: ClassReference) -> Tuple[Candidate, ...]:
+        """セルに現在配置可能な (教科, 教員) の組（セルが埋まっていれば空）"""
+        self._lookups += 1
+        if not self.is_open(time_slot, class_ref):
+            return ()
+        return self._cell_candidates((slot_index(time_slot), class_ref))
+
+    def subjects(self, time_slot: TimeSlot, class_ref: ClassReference) -> Set[Subject]:
+        """セルに現在配置可能な教科"""
+        return {subject for subject, _ in self.candidates(time_slot, class_ref)}
+
+    def is_feasible(self, time_slot: TimeSlot, class_ref: ClassReference,
+                    subject: Subject, teacher: Optional[Teacher]) -> bool:
+        """(教科, 教員) をセルに配置できるかどうか
+
+        クラスの候補に含まれない組（代替教員など）も、同じ基準でその場で判定する。
+        """
+        self._lookups += 1
+        if not self.is_open(time_slot, class_ref):
+            return False
+        cell = (slot_index(time_slot), class_ref)
+        pair = (subject, teacher)
+        if pair in self._cell_candidates(cell):
+            return True
+        if pair in self._static.get(cell, ()):
+            return False  # 候補には含まれるが教員が空いていない
+        if subject.name in self._forbidden.get(cell, ()):
+            return False
+        if teacher is None:
+            return True
+        return (not self.school.is_teacher_unavailable(time_slot.day, time_slot.period, teacher)
+                and self._schedule.is_teacher_free(time_slot, teacher, class_ref, subject))
+
+    def open_slots(self, class_ref: ClassReference, subject: Subject,
+                   teacher: Teacher) -> List[TimeSlot]:
+        """(教科, 教員) を配置できる時間枠（時間割順）"""
+        return [time_slot for time_slot in ALL_TIME_SLOTS
+                if self.is_feasible(time_slot, class_ref, subject, teacher)]
+
+    def _cell_candidates(self, cell: Cell) -> Tuple[Candidate, ...]:
+        if cell in self._dirty:
+            self._dirty.discard(cell)
+            self._cell_updates += 1
+            slot, class_ref = cell
+            time_slot = ALL_TIME_SLOTS[slot]
+            is_teacher_free = self._schedule.is_teacher_free
+            self._feasible[cell] = tuple(
+                (subject, teacher) for subject, teacher in self._static[cell]
+                if is_teacher_free(time_slot, teacher, class_ref, subject)
+            )
+        return self._feasible.get(cell, ())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """インデックスの統計を取得"""
+        return {
+            'cells': len(self._static),
+            'change_events': self._change_events,
+            'cell_updates': self._cell_updates,
+            'lookups': self._lookups,
+            'pending_cells': len(self._dirty),
+        }
@@ -17,6 +17,7 @@ from ...value_objects.assignment import Assignment
 from ..synchronizers.exchange_class_service import ExchangeClassService
 from ..validators.unified_constraint_validator import UnifiedConstraintValidator
 from ..validators.daily_duplicate_preventer import DailyDuplicatePreventer
+from .slot_candidate_index import SlotCandidateIndex
 # NOTE: These imports violate Clean Architecture - fill strategies are in application layer
 from ...interfaces.fill_strategy import FillStrategy
 from ....application.services.generators.fill_strategies import (
@@ -84,6 +85,8 @@ class SmartEmptySlotFiller(LoggingMixin):
         self.stats = defaultdict(int)        
         # 未配置スロットの詳細記録
         self.unfilled_slots = {}
+        # セルごとの配置候補（埋める対象のスケジュールに購読させる）
+        self._candidate_index: Optional[SlotCandidateIndex] = None
     
     def fill_empty_slots_smartly(self, schedule: Schedule, school: School, max_passes: int = 5) -> int:
         """戦略パターンを使用して空きスロットを段階的に埋める"""
@@ -117,6 +120,9 @@ class SmartEmptySlotFiller(LoggingMixin):
             if filled == 0 and pass_num < max_passes:
                 self.logger.info("進捗なし - 次の戦略へ移行")
         
+        if self._candidate_index is not None:
+            self._candidate_index.detach()
+        
         self._log_statistics()
         return total_filled
     
@@ -219,7 +225,7 @@ class SmartEmptySlotFiller(LoggingMixin):
         if wed4_slot in slots_by_time:
             self.logger.info("=== 5組の水曜4限を優先的に処理 ===")
             # ensure_grade5_syncを使って確実に同期
-            from .grade5_synchronizer_refactored import RefactoredGrade5Synchronizer
+            from ..synchronizers.grade5_synchronizer_refactored import RefactoredGrade5Synchronizer
             synchronizer = RefactoredGrade5Synchronizer(self.constraint_validator.unified_system)
             if synchronizer.ensure_grade5_sync(schedule, school, wed4_slot):
                 # 成功した場合、該当スロットの数だけfilled増加
@@ -290,9 +296,23 @@ class SmartEmptySlotFiller(LoggingMixin):
         check_level: str
     ) -> bool:
         """単一の空きスロットを戦略に従って埋める"""
+        index = self._get_candidate_index(schedule, school)
+        
         # 不足科目を取得
         shortage_subjects = self._get_shortage_subjects_prioritized(schedule, school, class_ref)
         
+        # 教科の担当教員から選ぶ戦略では、このセルに配置できる教科だけに絞る
+        # （柔軟戦略は担当外の緊急教員も探すため絞らない）
+        if not isinstance(strategy, FlexibleFillingStrategy):
+            placeable_subjects = index.subjects(time_slot, class_ref)
+            if not placeable_subjects:
+                self.stats['no_candidates'] += 1
+                return False
+            shortage_subjects = {
+                subject: score for subject, score in shortage_subjects.items()
+                if subject in placeable_subjects
+            }
+        
         # 教師負担を計算
         teacher_loads = self._calculate_teacher_loads(schedule, school)
         
@@ -303,6 +323,11 @@ class SmartEmptySlotFiller(LoggingMixin):
         
         # 各候補を試す
         for subject, teacher in candidates:
+            # 教員の不在・重複は候補インデックスで除外
+            if not index.is_feasible(time_slot, class_ref, subject, teacher):
+                self.stats['blocked_by_candidate_index'] += 1
+                continue
+            
             # Daily duplicate pre-check
             can_place_no_dup, dup_reason = self.duplicate_preventer.can_place_subject(
                 schedule, time_slot, class_ref, subject, check_level
@@ -365,8 +390,7 @@ class SmartEmptySlotFiller(LoggingMixin):
         safe_subjects_for_grade5 = []
         
         # Check each Grade 5 class to ensure the subject won't cause duplicates
-        for class_name in self.grade5_classes:
-            class_ref = ClassReference.from_string(class_name)
+        for class_ref in self.grade5_classes:
             safe_subjects = self.duplicate_preventer.find_safe_subjects_for_slot(
                 schedule, school, time_slot, class_ref, check_level
             )
@@ -532,16 +556,6 @@ class SmartEmptySlotFiller(LoggingMixin):
         """優先度を考慮した科目を取得（標準時数を超えても配置可能）"""
         base_hours = school.get_all_standard_hours(class_ref)
         
-        # 現在の割り当て数をカウント
-        current_hours = defaultdict(int)
-        days = ["月", "火", "水", "木", "金"]
-        for day in days:
-            for period in range(1, 7):
-                time_slot = TimeSlot(day, period)
-                assignment = schedule.get_assignment(time_slot, class_ref)
-                if assignment and assignment.subject:
-                    current_hours[assignment.subject] += 1
-        
         # 全ての教科を標準時数順（多い順）でソート
         all_subjects = {}
         for subject, required in sorted(base_hours.items(), key=lambda x: x[1], reverse=True):
@@ -550,7 +564,7 @@ class SmartEmptySlotFiller(LoggingMixin):
                 continue
             
             # 標準時数を基準に優先度を設定（不足していなくても含める）
-            current = current_hours.get(subject, 0)
+            current = schedule.count_subject_hours(class_ref, subject)
             # 優先度スコア = 標準時数 - 現在の配置数（負の値でも含める）
             priority_score = required - current
             all_subjects[subject] = priority_score
@@ -571,6 +585,17 @@ class SmartEmptySlotFiller(LoggingMixin):
         
         return prioritized
     
+    def _get_candidate_index(self, schedule: Schedule, school: School) -> SlotCandidateIndex:
+        """スケジュールに購読させた配置候補インデックスを取得"""
+        index = self._candidate_index
+        if index is None or index.school is not school:
+            if index is not None:
+                index.detach()
+            index = self._candidate_index = SlotCandidateIndex(school)
+        if index.schedule is not schedule:
+            index.attach(schedule)
+        return index
+    
     def _get_shortage_subjects(
         self,
         schedule: Schedule,
@@ -605,12 +630,13 @@ class SmartEmptySlotFiller(LoggingMixin):
     def _calculate_teacher_loads(self, schedule: Schedule, school: School) -> Dict[str, int]:
         """各教師の現在の負担を計算"""
         loads = defaultdict(int)
+        classes = school.get_all_classes()
         
         days = ["月", "火", "水", "木", "金"]
         for day in days:
             for period in range(1, 7):
                 time_slot = TimeSlot(day, period)
-                for class_ref in school.get_all_classes():
+                for class_ref in classes:
                     assignment = schedule.get_assignment(time_slot, class_ref)
                     if assignment:
                         loads[assignment.teacher.name] += 1
@@ -368,11 +368,15 @@ class SmartHourBalancer(LoggingMixin):
         if teacher.name in unavailable_teachers:
             return False
         
-        # 教師の重複チェック
-        for other_class in school.get_all_classes():
+        # 教師の重複チェック（5組以外は教員インデックスで同じ時間の担当を引き、
+        # 5組は合同授業がまとめて返るため3クラスのセルを直接見る）
+        for other_assignment in schedule.get_teacher_at_time(time_slot, teacher):
+            if (other_assignment.class_ref != class_ref and
+                    other_assignment.class_ref not in self.grade5_classes):
+                return False
+        for other_class in self.grade5_classes:
             if other_class == class_ref:
                 continue
-            
             other_assignment = schedule.get_assignment(time_slot, other_class)
             if (other_assignment and 
                 other_assignment.teacher and 
@@ -1,36 +1,26 @@
 """教師スケジュール追跡サービス
 
 教師の配置状況を詳細に追跡し、重複を防止する。
+配置状況はScheduleの教員インデックス（assign / remove_assignment で更新される）を
+参照し、このサービスは学習ルールと統計を上乗せする。
 """
-import logging
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 from ....shared.mixins.logging_mixin import LoggingMixin
 
 from ...entities.schedule import Schedule
 from ...entities.school import School
 from ...value_objects.time_slot import TimeSlot, ClassReference, Teacher
-from ...value_objects.assignment import Assignment
 
 
 class TeacherScheduleTracker(LoggingMixin):
     """教師スケジュール追跡サービス"""
     
-    def __init__(self):
+    def __init__(self, schedule: Optional[Schedule] = None):
         super().__init__()
         
-        # 教師ごとのスケジュール
-        # teacher_name -> {time_slot: List[ClassReference]}
-        self.teacher_schedules: Dict[str, Dict[TimeSlot, List[ClassReference]]] = defaultdict(
-            lambda: defaultdict(list)
-        )
-        
-        # 5組クラスのセット
-        self.grade5_classes = {
-            ClassReference(1, 5),
-            ClassReference(2, 5),
-            ClassReference(3, 5)
-        }
+        # 配置状況を参照するスケジュール
+        self.schedule = schedule
         
         # 学習ルール（特定の教師の制限）
         self.teacher_time_limits = {
@@ -40,33 +30,23 @@ class TeacherScheduleTracker(LoggingMixin):
         
         # 統計情報
         self.stats = {
-            'total_assignments': 0,
-            'grade5_joint_classes': 0,
             'conflicts_prevented': 0,
             'rule_violations_prevented': 0
         }
     
     def initialize_from_schedule(self, schedule: Schedule, school: School):
         """既存のスケジュールから初期化"""
-        self.logger.info("教師スケジュールを初期化中...")
-        self.teacher_schedules.clear()
-        
-        for class_ref in school.get_all_classes():
-            for day in ["月", "火", "水", "木", "金"]:
-                for period in range(1, 7):
-                    time_slot = TimeSlot(day, period)
-                    assignment = schedule.get_assignment(time_slot, class_ref)
-                    
-                    if assignment and assignment.teacher:
-                        self._register_assignment(
-                            assignment.teacher.name, time_slot, class_ref
-                        )
-        
+        self.schedule = schedule
         self.logger.info(
-            f"初期化完了: {len(self.teacher_schedules)}人の教師、"
-            f"{self.stats['total_assignments']}件の割り当て"
+            f"初期化完了: {len(schedule.get_all_assignments())}件の割り当てを参照"
         )
     
+    def _classes_at(self, teacher: Teacher, time_slot: TimeSlot) -> List[ClassReference]:
+        """教師が指定時間に担当しているクラス"""
+        if self.schedule is None:
+            return []
+        return [a.class_ref for a in self.schedule.get_teacher_at_time(time_slot, teacher)]
+    
     def can_assign_teacher(self, teacher: Teacher, time_slot: TimeSlot,
                          class_ref: ClassReference) -> Tuple[bool, Optional[str]]:
         """教師を割り当て可能かチェック
@@ -74,7 +54,7 @@ class TeacherScheduleTracker(LoggingMixin):
         Returns:
             (可能か, エラーメッセージ)
         """
-        if not teacher:
+        if not teacher or self.schedule is None:
             return True, None
         
         teacher_name = teacher.name
@@ -84,7 +64,7 @@ class TeacherScheduleTracker(LoggingMixin):
             time_key = (time_slot.day, time_slot.period)
             if time_key in self.teacher_time_limits[teacher_name]:
                 max_classes = self.teacher_time_limits[teacher_name][time_key]
-                current_classes = self.teacher_schedules[teacher_name].get(time_slot, [])
+                current_classes = self._classes_at(teacher, time_slot)
                 
                 if len(current_classes) >= max_classes:
                     self.stats['rule_violations_prevented'] += 1
@@ -93,58 +73,27 @@ class TeacherScheduleTracker(LoggingMixin):
                         f"（現在{len(current_classes)}クラス）"
                     )
         
-        # 2. 既存の割り当てをチェック
-        current_classes = self.teacher_schedules[teacher_name].get(time_slot, [])
-        
-        if not current_classes:
+        # 2. 既存の割り当てをチェック（5組の合同授業・チームティーチングは許可）
+        if self.schedule.is_teacher_free(time_slot, teacher, class_ref):
             return True, None
         
-        # 3. 5組の合同授業チェック
-        if class_ref in self.grade5_classes:
-            # 既存の割り当てが全て5組なら、この5組も追加可能
-            if all(c in self.grade5_classes for c in current_classes):
-                return True, None
-        
-        # 4. 通常の重複チェック
-        if current_classes:
-            self.stats['conflicts_prevented'] += 1
-            classes_str = ", ".join(str(c) for c in current_classes)
-            return False, f"{teacher_name}先生は既に{time_slot}に{classes_str}を担当"
-        
-        return True, None
+        self.stats['conflicts_prevented'] += 1
+        classes_str = ", ".join(str(c) for c in self._classes_at(teacher, time_slot))
+        return False, f"{teacher_name}先生は既に{time_slot}に{classes_str}を担当"
     
     def register_assignment(self, teacher: Teacher, time_slot: TimeSlot,
                           class_ref: ClassReference):
-        """教師の割り当てを登録"""
-        if teacher:
-            self._register_assignment(teacher.name, time_slot, class_ref)
-    
-    def _register_assignment(self, teacher_name: str, time_slot: TimeSlot,
-                           class_ref: ClassReference):
-        """内部的な割り当て登録"""
-        self.teacher_schedules[teacher_name][time_slot].append(class_ref)
-        self.stats['total_assignments'] += 1
-        
-        # 5組の合同授業かチェック
-        classes = self.teacher_schedules[teacher_name][time_slot]
-        if len(classes) > 1 and all(c in self.grade5_classes for c in classes):
-            self.stats['grade5_joint_classes'] += 1
+        """教師の割り当てを登録
+
+        Scheduleへの割り当てで教員インデックスが更新されるため、何もしない（互換用）。
+        """
     
     def unregister_assignment(self, teacher: Teacher, time_slot: TimeSlot,
                             class_ref: ClassReference):
-        """教師の割り当てを解除"""
-        if not teacher:
-            return
-        
-        teacher_name = teacher.name
-        if time_slot in self.teacher_schedules[teacher_name]:
-            if class_ref in self.teacher_schedules[teacher_name][time_slot]:
-                self.teacher_schedules[teacher_name][time_slot].remove(class_ref)
-                self.stats['total_assignments'] -= 1
-                
-                # リストが空になったら削除
-                if not self.teacher_schedules[teacher_name][time_slot]:
-                    del self.teacher_schedules[teacher_name][time_slot]
+        """教師の割り当てを解除
+
+        Scheduleからの削除で教員インデックスが更新されるため、何もしない（互換用）。
+        """
     
     def get_teacher_load(self, teacher_name: str) -> Dict[str, int]:
         """教師の負荷情報を取得"""
@@ -155,22 +104,28 @@ class TeacherScheduleTracker(LoggingMixin):
             'conflict_slots': []
         }
         
-        if teacher_name not in self.teacher_schedules:
+        if self.schedule is None:
             return load_info
         
-        for time_slot, classes in self.teacher_schedules[teacher_name].items():
-            num_classes = len(classes)
+        teacher = Teacher(teacher_name)
+        slot_classes: Dict[TimeSlot, int] = defaultdict(int)
+        for time_slot, _ in self.schedule.get_assignments_by_teacher(teacher):
+            slot_classes[time_slot] += 1
+        
+        for time_slot, num_classes in slot_classes.items():
             load_info['total_classes'] += num_classes
-            load_info['by_day'][time_slot.day] += 1
-            
-            if num_classes > 1:
-                # 5組の合同授業でない場合は競合
-                if not all(c in self.grade5_classes for c in classes):
-                    load_info['conflict_slots'].append(time_slot)
-            
             load_info['max_classes_per_slot'] = max(
                 load_info['max_classes_per_slot'], num_classes
             )
+        for day in ["月", "火", "水", "木", "金"]:
+            daily_load = self.schedule.get_teacher_daily_load(teacher, day)
+            if daily_load:
+                load_info['by_day'][day] = daily_load
+        
+        load_info['conflict_slots'] = [
+            time_slot for time_slot, conflict_teacher, _ in self.schedule.get_teacher_conflicts()
+            if conflict_teacher == teacher
+        ]
         
         return load_info
     
@@ -188,20 +143,18 @@ class TeacherScheduleTracker(LoggingMixin):
     
     def find_conflicts(self) -> List[Dict]:
         """現在の教師重複を検出"""
-        conflicts = []
+        if self.schedule is None:
+            return []
         
-        for teacher_name, schedule in self.teacher_schedules.items():
-            for time_slot, classes in schedule.items():
-                if len(classes) > 1:
-                    # 5組の合同授業は除外
-                    grade5_count = sum(1 for c in classes if c in self.grade5_classes)
-                    if grade5_count < len(classes):
-                        conflicts.append({
-                            'teacher': teacher_name,
-                            'time_slot': time_slot,
-                            'classes': classes,
-                            'is_mixed': 0 < grade5_count < len(classes)
-                        })
+        conflicts = []
+        for time_slot, teacher, classes in self.schedule.get_teacher_conflicts():
+            grade5_count = sum(1 for c in classes if c.class_number == 5)
+            conflicts.append({
+                'teacher': teacher.name,
+                'time_slot': time_slot,
+                'classes': classes,
+                'is_mixed': 0 < grade5_count < len(classes)
+            })
         
         return conflicts
     
@@ -243,16 +196,28 @@ class TeacherScheduleTracker(LoggingMixin):
     def get_statistics(self) -> Dict:
         """統計情報を取得"""
         stats = self.stats.copy()
+        if self.schedule is None:
+            stats['top_loaded_teachers'] = []
+            return stats
         
         # 教師別の統計も追加
-        teacher_stats = []
-        for teacher_name in self.teacher_schedules:
-            load_info = self.get_teacher_load(teacher_name)
-            teacher_stats.append({
-                'name': teacher_name,
-                'total_classes': load_info['total_classes'],
-                'conflicts': len(load_info['conflict_slots'])
-            })
+        teacher_totals: Dict[Teacher, int] = defaultdict(int)
+        for _, assignment in self.schedule.get_all_assignments():
+            if assignment.teacher:
+                teacher_totals[assignment.teacher] += 1
+        conflict_counts: Dict[Teacher, int] = defaultdict(int)
+        for _, teacher, _ in self.schedule.get_teacher_conflicts():
+            conflict_counts[teacher] += 1
+        
+        stats['total_assignments'] = sum(teacher_totals.values())
+        teacher_stats = [
+            {
+                'name': teacher.name,
+                'total_classes': total,
+                'conflicts': conflict_counts[teacher]
+            }
+            for teacher, total in teacher_totals.items()
+        ]
         
         # 負荷順にソート
         teacher_stats.sort(key=lambda x: x['total_classes'], reverse=True)
@@ -4,7 +4,7 @@
 優先度別に制約を管理し、効率的なチェックとキャッシングを提供します。
 """
 import logging
-from typing import List, Dict, Optional, Tuple, TYPE_CHECKING, Set, Any
+from typing import Callable, List, Dict, Optional, Tuple, TYPE_CHECKING, Set, Any
 from dataclasses import dataclass
 from ....shared.mixins.logging_mixin import LoggingMixin
 
@@ -14,9 +14,11 @@ if TYPE_CHECKING:
     from ...constraints.base import Constraint, ConstraintViolation
     from ...value_objects.time_slot import TimeSlot
     from ...value_objects.assignment import Assignment
+    from .incremental_constraint_evaluator import IncrementalConstraintEvaluator
 
 # Import ConstraintPriority from base module instead of redefining
 from ...constraints.base import ConstraintPriority
+from .adaptive_check_pipeline import AdaptiveCheckPipeline
 
 @dataclass
 class AssignmentContext(LoggingMixin):
@@ -98,6 +100,9 @@ class UnifiedConstraintSystem(LoggingMixin):
         self._teacher_availability_cache: Dict[str, bool] = {}  # 教師可用性キャッシュ
         self._fixed_slot_cache: Dict[str, bool] = {}  # 固定スロットキャッシュ
         self._class_relation_cache: Dict[str, Optional[str]] = {}  # クラス関係キャッシュ
+        
+        # 優先度別の事前チェックパイプライン（制約の登録時に作り直す）
+        self._check_pipelines: Optional[List[Tuple[ConstraintPriority, AdaptiveCheckPipeline]]] = None
     
     def check_assignment(self, schedule: 'Schedule', school: 'School', time_slot: 'TimeSlot', assignment: 'Assignment') -> bool:
         """配置前に全ての制約をチェック（ConstraintValidatorとの互換性のため）
@@ -129,6 +134,7 @@ class UnifiedConstraintSystem(LoggingMixin):
             priority: 優先度
         """
         self.constraints[priority].append(constraint)
+        self._check_pipelines = None
         self.logger.info(f"制約を登録: {constraint.name} (優先度: {priority.name})")
     
     def check_before_assignment(self, context: AssignmentContext) -> Tuple[bool, List[str]]:
@@ -151,66 +157,67 @@ class UnifiedConstraintSystem(LoggingMixin):
         self._cache_misses += 1
         
         # 制約チェック（優先度順）
+        # CRITICAL制約は最初の違反で打ち切るため、実行時の統計で安く違反を見つけやすい
+        # 制約から順に実行する。それ以外の優先度は全ての違反理由を集める。
         reasons = []
-        
-        # Sort priorities by value (descending) to check critical first
-        for priority in sorted(ConstraintPriority, key=lambda p: p.value, reverse=True):
-            for constraint in self.constraints[priority]:
-                try:
-                    # check_before_assignmentメソッドがある場合はそれを使用（booleanを返す）
-                    if hasattr(constraint, 'check_before_assignment'):
-                        if not constraint.check_before_assignment(
-                            context.schedule, 
-                            context.school, 
-                            context.time_slot, 
-                            context.assignment
-                        ):
-                            reason = f"{constraint.name}違反"
-                            reasons.append(reason)
-                            
-                            # CRITICAL制約の場合は即座に失敗
-                            if priority == ConstraintPriority.CRITICAL:
-                                result = (False, reasons)
-                                self._check_cache[cache_key] = result
-                                return result
-                    # checkメソッドしかない場合
-                    elif hasattr(constraint, 'check'):
-                        check_result = constraint.check(
-                            context.schedule, 
-                            context.school, 
-                            context.time_slot, 
-                            context.assignment
-                        )
-                        
-                        # checkメソッドがboolを返す場合
-                        if isinstance(check_result, bool):
-                            if not check_result:
-                                reason = f"{constraint.name}違反"
-                                reasons.append(reason)
-                                
-                                # CRITICAL制約の場合は即座に失敗
-                                if priority == ConstraintPriority.CRITICAL:
-                                    result = (False, reasons)
-                                    self._check_cache[cache_key] = result
-                                    return result
-                        # checkメソッドがリストを返す場合
-                        elif check_result:  # リストが空でない場合
-                            reason = f"{constraint.name}違反"
-                            reasons.append(reason)
-                            
-                            # CRITICAL制約の場合は即座に失敗
-                            if priority == ConstraintPriority.CRITICAL:
-                                result = (False, reasons)
-                                self._check_cache[cache_key] = result
-                                return result
-                except Exception as e:
-                    self.logger.error(f"制約チェックエラー ({constraint.name}): {e}")
-                    reasons.append(f"{constraint.name}エラー: {str(e)}")
+        args = (context.schedule, context.school, context.time_slot, context.assignment)
+        for priority, pipeline in self._get_check_pipelines():
+            if priority == ConstraintPriority.CRITICAL:
+                reason = pipeline.run(*args)
+                if reason is not None:
+                    reasons.append(reason)
+                    result = (False, reasons)
+                    self._check_cache[cache_key] = result
+                    return result
+            else:
+                reasons.extend(reason for _, reason in pipeline.run_all(*args))
         
         result = (len(reasons) == 0, reasons)
         self._check_cache[cache_key] = result
         return result
     
+    def _get_check_pipelines(self) -> List[Tuple[ConstraintPriority, AdaptiveCheckPipeline]]:
+        """優先度の高い順に、各優先度の制約の事前チェックパイプラインを返す"""
+        if self._check_pipelines is None:
+            self._check_pipelines = [
+                (priority, AdaptiveCheckPipeline(
+                    (constraint.name, self._make_precheck(constraint))
+                    for constraint in self.constraints[priority]
+                    if hasattr(constraint, 'check_before_assignment') or hasattr(constraint, 'check')
+                ))
+                for priority in sorted(ConstraintPriority, key=lambda p: p.value, reverse=True)
+            ]
+        return self._check_pipelines
+    
+    def _make_precheck(self, constraint: 'Constraint') -> Callable[..., Optional[str]]:
+        """制約の事前チェックを、違反なら理由・可ならNoneを返す関数にする
+        
+        check_before_assignmentはboolを返す。checkしかない制約はboolか違反のリストを返す。
+        例外はログに出して理由として扱う。
+        """
+        violation = f"{constraint.name}違反"
+        if hasattr(constraint, 'check_before_assignment'):
+            method = constraint.check_before_assignment
+            
+            def is_violated(*args) -> bool:
+                return not method(*args)
+        else:
+            method = constraint.check
+            
+            def is_violated(*args) -> bool:
+                check_result = method(*args)
+                if isinstance(check_result, bool):
+                    return not check_result
+                return bool(check_result)  # リストが空でない場合
+        
+        def precheck(*args) -> Optional[str]:
+            try:
+                return violation if is_violated(*args) else None
+            except Exception as e:
+                self.logger.error(f"制約チェックエラー ({constraint.name}): {e}")
+                return f"{constraint.name}エラー: {str(e)}"
+        return precheck
+    
     def validate_schedule(self, schedule: 'Schedule', school: 'School') -> ValidationResult:
         """スケジュール全体の事後検証
         
@@ -257,6 +264,27 @@ class UnifiedConstraintSystem(LoggingMixin):
             violation_count_by_priority=violation_count_by_priority
         )
     
+    def create_incremental_evaluator(self, school: 'School') -> 'IncrementalConstraintEvaluator':
+        """登録済みの制約で差分評価器を作成
+        
+        validate_schedule() を繰り返す代わりに、attach() したスケジュールの
+        変更箇所だけを再検証して違反とスコアを保持する。
+        
+        Args:
+            school: 学校情報
+            
+        Returns:
+            IncrementalConstraintEvaluator: 未接続の差分評価器
+        """
+        from .incremental_constraint_evaluator import IncrementalConstraintEvaluator
+        
+        constraints = [
+            (constraint, priority)
+            for priority in sorted(ConstraintPriority, key=lambda p: p.value, reverse=True)
+            for constraint in self.constraints[priority]
+        ]
+        return IncrementalConstraintEvaluator(constraints, school)
+    
     def get_constraint_summary(self) -> Dict[str, Any]:
         """制約の概要を取得
         
@@ -297,6 +325,23 @@ class UnifiedConstraintSystem(LoggingMixin):
             'cache_size': len(self._check_cache)
         }
     
+    def get_statistics(self) -> Dict[str, Any]:
+        """統計情報を取得
+        
+        Returns:
+            cache: キャッシュ統計、
+            constraints: 優先度名 → 事前チェックパイプラインの統計
+            （制約ごとの呼び出し回数・違反回数・平均コスト・現在の実行順序）
+        """
+        return {
+            'cache': self.get_cache_statistics(),
+            'constraints': {
+                priority.name: pipeline.get_statistics()
+                for priority, pipeline in self._get_check_pipelines()
+                if len(pipeline)
+            },
+        }
+    
     def clear_cache(self) -> None:
         """キャッシュをクリア"""
         self._check_cache.clear()
@@ -333,4 +378,14 @@ class UnifiedConstraintSystem(LoggingMixin):
         self.logger.info(f"キャッシュヒット率: {cache_stats['hit_rate']:.2%}")
         self.logger.info(f"  ヒット: {cache_stats['cache_hits']}")
         self.logger.info(f"  ミス: {cache_stats['cache_misses']}")
-        self.logger.info(f"  サイズ: {cache_stats['cache_size']}")
\ No newline at end of file
+        self.logger.info(f"  サイズ: {cache_stats['cache_size']}")
+        
+        # 事前チェックの統計
+        for priority_name, stats in self.get_statistics()['constraints'].items():
+            self.logger.info(f"事前チェック {priority_name} (実行{stats['runs']}回):")
+            for name in stats['order']:
+                check = stats['checks'][name]
+                self.logger.info(
+                    f"    - {name}: {check['calls']}回, 違反率 {check['rejection_rate']:.1%}, "
+                    f"平均 {check['mean_cost_us']:.1f}µs"
+                )
\ No newline at end of file
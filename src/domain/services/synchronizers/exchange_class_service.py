@@ -359,35 +359,55 @@ class ExchangeClassService(LoggingMixin):
         for exchange_class, parent_class in self._exchange_parent_map.items():
             for day in ["月", "火", "水", "木", "金"]:
                 for period in range(1, 7):
-                    time_slot = TimeSlot(day, period)
-                    
-                    exchange_assignment = schedule.get_assignment(time_slot, exchange_class)
-                    parent_assignment = schedule.get_assignment(time_slot, parent_class)
-                    
-                    # 自立活動の制約をチェック
-                    valid, error_msg = self.validate_jiritsu_placement(
-                        exchange_assignment, parent_assignment, time_slot
-                    )
-                    if not valid:
-                        violations.append({
-                            'type': 'jiritsu_constraint',
-                            'exchange_class': exchange_class,
-                            'parent_class': parent_class,
-                            'time_slot': time_slot,
-                            'message': error_msg
-                        })
-                    
-                    # 通常の同期をチェック
-                    valid, error_msg = self.validate_exchange_sync(
-                        exchange_assignment, parent_assignment, time_slot
-                    )
-                    if not valid:
-                        violations.append({
-                            'type': 'sync_violation',
-                            'exchange_class': exchange_class,
-                            'parent_class': parent_class,
-                            'time_slot': time_slot,
-                            'message': error_msg
-                        })
+                    violations.extend(self._get_pair_violations(
+                        schedule, exchange_class, parent_class, TimeSlot(day, period)
+                    ))
+        
+        return violations
+    
+    def get_exchange_violations_at(self, schedule: Schedule, time_slot: TimeSlot) -> List[Dict]:
+        """1つの時間枠の交流学級同期違反を検出（差分検証用）"""
+        violations = []
+        for exchange_class, parent_class in self._exchange_parent_map.items():
+            violations.extend(self._get_pair_violations(schedule, exchange_class, parent_class, time_slot))
+        return violations
+    
+    def _get_pair_violations(
+        self,
+        schedule: Schedule,
+        exchange_class: ClassReference,
+        parent_class: ClassReference,
+        time_slot: TimeSlot
+    ) -> List[Dict]:
+        """交流学級と親学級の1つの時間枠の違反"""
+        violations = []
+        exchange_assignment = schedule.get_assignment(time_slot, exchange_class)
+        parent_assignment = schedule.get_assignment(time_slot, parent_class)
+        
+        # 自立活動の制約をチェック
+        valid, error_msg = self.validate_jiritsu_placement(
+            exchange_assignment, parent_assignment, time_slot
+        )
+        if not valid:
+            violations.append({
+                'type': 'jiritsu_constraint',
+                'exchange_class': exchange_class,
+                'parent_class': parent_class,
+                'time_slot': time_slot,
+                'message': error_msg
+            })
+        
+        # 通常の同期をチェック
+        valid, error_msg = self.validate_exchange_sync(
+            exchange_assignment, parent_assignment, time_slot
+        )
+        if not valid:
+            violations.append({
+                'type': 'sync_violation',
+                'exchange_class': exchange_class,
+                'parent_class': parent_class,
+                'time_slot': time_slot,
+                'message': error_msg
+            })
         
         return violations
\ No newline at end of file
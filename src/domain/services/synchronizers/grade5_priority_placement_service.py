@@ -10,6 +10,7 @@ from ...value_objects.time_slot import TimeSlot, Subject, Teacher
 from ...value_objects.assignment import Assignment
 from ...constraints.base import ConstraintPriority
 from ...utils import parse_class_reference
+from ..core.slot_candidate_index import SlotCandidateIndex
 from .grade5_teacher_selector import Grade5TeacherSelector
 
 
@@ -19,10 +20,13 @@ class Grade5PriorityPlacementService(LoggingMixin):
     def __init__(self, preferred_teachers=None, teacher_ratios=None):
         super().__init__()
         self.grade5_classes = ['1年5組', '2年5組', '3年5組']
+        self.grade5_class_refs = [parse_class_reference(name) for name in self.grade5_classes]
         # 5組優先教師（QA.txtから読み込み）
         self.preferred_teachers = preferred_teachers or []
         # 5組教師選択サービス（教師比率を注入）
         self.teacher_selector = Grade5TeacherSelector(teacher_ratios)
+        # セルごとの配置候補（配置中のスケジュールに購読させる）
+        self._candidate_index: Optional[SlotCandidateIndex] = None
         
     def place_grade5_first(self, schedule: Schedule, school: School) -> bool:
         """5組を最初に配置する"""
@@ -35,12 +39,17 @@ class Grade5PriorityPlacementService(LoggingMixin):
         required_subjects = self._calculate_required_subjects(school)
         
         # 3. 利用可能なスロットを評価
+        self._candidate_index = SlotCandidateIndex(school)
+        self._candidate_index.attach(schedule)
         available_slots = self._evaluate_available_slots(schedule, fixed_slots)
         
         # 4. 科目を優先順位付けして配置
-        placement_success = self._place_subjects_by_priority(
-            schedule, school, required_subjects, available_slots
-        )
+        try:
+            placement_success = self._place_subjects_by_priority(
+                schedule, school, required_subjects, available_slots
+            )
+        finally:
+            self._candidate_index.detach()
         
         if placement_success:
             self.logger.info("5組の優先配置が完了しました")
@@ -110,14 +119,8 @@ class Grade5PriorityPlacementService(LoggingMixin):
                 score = self._calculate_slot_score(time_slot, schedule)
                 
                 # 全5組クラスが空いているか確認
-                all_empty = True
-                for class_name in self.grade5_classes:
-                    assignment = schedule.get_assignment(time_slot, class_name)
-                    if assignment and assignment.subject:
-                        all_empty = False
-                        break
-                
-                if all_empty:
+                if all(self._candidate_index.is_open(time_slot, class_ref)
+                       for class_ref in self.grade5_class_refs):
                     available_slots.append((time_slot, score))
         
         # スコアの高い順にソート
@@ -206,6 +209,13 @@ class Grade5PriorityPlacementService(LoggingMixin):
             if self._has_subject_on_day(schedule, time_slot.day, subject_name):
                 continue
             
+            # 先に配置した科目で埋まったスロットや、教師が不在・他クラスで授業中のスロットは除く
+            # （5組は3クラス合同なので代表クラスで判定する）
+            if not self._candidate_index.is_feasible(
+                time_slot, self.grade5_class_refs[0], subject, teacher
+            ):
+                continue
+            
             # 全5組クラスに同時配置を試みる
             success = True
             assignments = []
@@ -18,6 +18,8 @@ from .smart_backtracking import (
     NoGood
 )
 
+from .nogood_store import NoGoodStore
+
 from .heuristics import (
     AdvancedHeuristics,
     HeuristicScore
@@ -46,6 +48,7 @@ __all__ = [
     'SmartBacktracking',
     'AssignmentNode',
     'NoGood',
+    'NoGoodStore',
     
     # ヒューリスティクス
     'AdvancedHeuristics',
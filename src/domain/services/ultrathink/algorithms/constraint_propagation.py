@@ -3,9 +3,12 @@
 
 AC-3、PC-2、およびその他の制約伝播技術を実装。
 探索空間を効率的に削減し、高速な制約充足を実現。
+
+ドメインは (科目, 教師) の値をビット位置にインターンした整数ビットマスクで保持し、
+アークの修正はビット演算（AND・popcount）で行う。
 """
 import logging
-from typing import Dict, List, Set, Tuple, Optional, Any
+from typing import Dict, Iterable, List, Set, Tuple, Optional, Any
 from collections import deque, defaultdict
 from dataclasses import dataclass
 import time
@@ -17,6 +20,11 @@ from ....value_objects.assignment import Assignment
 from .....shared.mixins.logging_mixin import LoggingMixin
 
 
+def popcount(mask: int) -> int:
+    """ビットマスクの立っているビット数（int.bit_count は Python 3.10 以降のため使わない）"""
+    return bin(mask).count("1")
+
+
 @dataclass
 class Variable:
     """CSP変数（時間スロット＋クラス）"""
@@ -32,23 +40,96 @@ class Variable:
                 self.class_ref == other.class_ref)
 
 
-@dataclass
+class ValueTable:
+    """ドメインの値 (subject, teacher) とビット位置の対応表
+    
+    同じ制約グラフのドメインは1つの対応表を共有し、科目・教師ごとに
+    その値が立っているビットマスクを保持する。
+    """
+    
+    def __init__(self):
+        self._values: List[Tuple[str, Optional[str]]] = []
+        self._bits: Dict[Tuple[str, Optional[str]], int] = {}
+        self.subject_masks: Dict[str, int] = {}
+        self.teacher_masks: Dict[str, int] = {}  # 教師なしの値は含まない
+    
+    def bit(self, value: Tuple[str, Optional[str]]) -> int:
+        """値のビット（未登録なら登録する）"""
+        position = self._bits.get(value)
+        if position is None:
+            position = self._bits[value] = len(self._values)
+            self._values.append(value)
+            subject, teacher = value
+            self.subject_masks[subject] = self.subject_masks.get(subject, 0) | (1 << position)
+            if teacher:
+                self.teacher_masks[teacher] = self.teacher_masks.get(teacher, 0) | (1 << position)
+        return 1 << position
+    
+    def find_bit(self, value: Tuple[str, Optional[str]]) -> int:
+        """値のビット（未登録なら0）"""
+        position = self._bits.get(value)
+        return 0 if position is None else 1 << position
+    
+    def encode(self, values: Iterable[Tuple[str, Optional[str]]]) -> int:
+        """値の集合をビットマスクに変換"""
+        mask = 0
+        for value in values:
+            mask |= self.bit(value)
+        return mask
+    
+    def decode(self, mask: int) -> Set[Tuple[str, Optional[str]]]:
+        """ビットマスクを値の集合に変換"""
+        values = set()
+        while mask:
+            lowest = mask & -mask
+            values.add(self._values[lowest.bit_length() - 1])
+            mask ^= lowest
+        return values
+    
+    def lowest_value(self, mask: int) -> Tuple[str, Optional[str]]:
+        """ビットマスクの最下位ビットの値"""
+        return self._values[(mask & -mask).bit_length() - 1]
+
+
 class Domain:
-    """変数のドメイン（可能な割り当て）"""
-    variable: Variable
-    values: Set[Tuple[str, Optional[str]]]  # (subject, teacher)
+    """変数のドメイン（可能な割り当て）
+    
+    値の集合はビットマスク（mask）で保持する。values は集合として
+    読み書きでき、代入するとビットマスクに変換される。
+    """
+    
+    def __init__(
+        self,
+        variable: Variable,
+        values: Iterable[Tuple[str, Optional[str]]] = (),
+        table: Optional[ValueTable] = None
+    ):
+        self.variable = variable
+        self.table = table if table is not None else ValueTable()
+        self.mask = self.table.encode(values)
+    
+    @property
+    def values(self) -> Set[Tuple[str, Optional[str]]]:  # (subject, teacher)
+        return self.table.decode(self.mask)
+    
+    @values.setter
+    def values(self, values: Iterable[Tuple[str, Optional[str]]]):
+        self.mask = self.table.encode(values)
     
     def remove_value(self, value: Tuple[str, Optional[str]]):
         """値をドメインから削除"""
-        self.values.discard(value)
+        self.mask &= ~self.table.find_bit(value)
     
     def is_empty(self) -> bool:
         """ドメインが空かチェック"""
-        return len(self.values) == 0
+        return self.mask == 0
     
     def size(self) -> int:
         """ドメインサイズ"""
-        return len(self.values)
+        return popcount(self.mask)
+    
+    def __repr__(self) -> str:
+        return f"Domain(variable={self.variable!r}, values={self.values!r})"
 
 
 class Arc:
@@ -57,9 +138,11 @@ class Arc:
         self.var1 = var1
         self.var2 = var2
         self.constraint_type = constraint_type
+        # キューの重複判定で頻繁に使うため事前計算
+        self._hash = hash((var1, var2, constraint_type))
     
     def __hash__(self):
-        return hash((self.var1, self.var2, self.constraint_type))
+        return self._hash
     
     def __eq__(self, other):
         return (self.var1 == other.var1 and 
@@ -80,12 +163,20 @@ class ConstraintPropagation(LoggingMixin):
         self.domains: Dict[Variable, Domain] = {}
         self.arcs: Set[Arc] = set()
         self.constraints: Dict[str, List[Arc]] = defaultdict(list)
+        self.value_table = ValueTable()
+        
+        # 索引（時間枠ごと・クラス×曜日ごとの変数、変数に入るアーク）
+        self._slot_variables: Dict[TimeSlot, List[Variable]] = defaultdict(list)
+        self._day_variables: Dict[Tuple[ClassReference, str], List[Variable]] = defaultdict(list)
+        self._arcs_into: Dict[Variable, List[Arc]] = defaultdict(list)
         
         # 統計情報
         self.stats = {
             'propagations': 0,
             'domain_reductions': 0,
             'arc_revisions': 0,
+            'revise_calls': 0,
+            'propagation_time': 0.0,
             'cache_hits': 0
         }
     
@@ -103,7 +194,10 @@ class ConstraintPropagation(LoggingMixin):
                 for period in range(1, 7):
                     time_slot = TimeSlot(day, period)
                     var = Variable(time_slot, class_ref)
-                    self.variables.add(var)
+                    if var not in self.variables:
+                        self.variables.add(var)
+                        self._slot_variables[time_slot].append(var)
+                        self._day_variables[(class_ref, day)].append(var)
                     
                     # 既存の割り当てがある場合
                     existing = schedule.get_assignment(time_slot, class_ref)
@@ -113,7 +207,8 @@ class ConstraintPropagation(LoggingMixin):
                             self.domains[var] = Domain(
                                 var, 
                                 {(existing.subject.name, 
-                                  existing.teacher.name if existing.teacher else None)}
+                                  existing.teacher.name if existing.teacher else None)},
+                                self.value_table
                             )
                         else:
                             # 初期ドメインの作成
@@ -131,6 +226,54 @@ class ConstraintPropagation(LoggingMixin):
             f"アーク数={len(self.arcs)}"
         )
     
+    def initialize_neighborhood(
+        self,
+        schedule: Schedule,
+        cells: Iterable[Tuple[TimeSlot, ClassReference]]
+    ):
+        """近傍のセルだけを変数にして制約グラフを初期化
+        
+        近傍の外の割り当ては定数として扱い、同じ時間に授業のある教師・
+        同じ日に既にある科目・不在の教師の値をドメインから除く。
+        """
+        cells = set(cells)
+        busy_teachers: Dict[TimeSlot, Set[str]] = defaultdict(set)
+        day_subjects: Dict[Tuple[ClassReference, str], Set[str]] = defaultdict(set)
+        for time_slot, assignment in schedule.get_all_assignments():
+            if (time_slot, assignment.class_ref) in cells:
+                continue
+            if assignment.teacher:
+                busy_teachers[time_slot].add(assignment.teacher.name)
+            day_subjects[(assignment.class_ref, time_slot.day)].add(assignment.subject.name)
+        
+        for time_slot, class_ref in cells:
+            var = Variable(time_slot, class_ref)
+            if var in self.variables:
+                continue
+            self.variables.add(var)
+            self._slot_variables[time_slot].append(var)
+            self._day_variables[(class_ref, time_slot.day)].append(var)
+            
+            values = self._create_initial_domain(var).values
+            self.domains[var] = Domain(var, {
+                (subject, teacher) for subject, teacher in values
+                if subject not in day_subjects[(class_ref, time_slot.day)]
+                and not (teacher and (
+                    teacher in busy_teachers[time_slot]
+                    or self.school.is_teacher_unavailable(
+                        time_slot.day, time_slot.period, Teacher(teacher)
+                    )
+                ))
+            }, self.value_table)
+        
+        self._create_arcs()
+        
+        self.logger.debug(
+            f"近傍の制約グラフ初期化完了: "
+            f"変数数={len(self.variables)}, "
+            f"アーク数={len(self.arcs)}"
+        )
+    
     def ac3(self) -> bool:
         """
         AC-3アルゴリズムによる制約伝播
@@ -143,9 +286,12 @@ class ConstraintPropagation(LoggingMixin):
         
         # 初期キュー（全てのアーク）
         queue = deque(self.arcs)
+        queued = set(self.arcs)
+        consistent = True
         
         while queue:
             arc = queue.popleft()
+            queued.discard(arc)
             
             # アークの整合性チェック
             if self._revise(arc):
@@ -156,20 +302,23 @@ class ConstraintPropagation(LoggingMixin):
                     self.logger.debug(
                         f"AC-3: 変数 {arc.var1} のドメインが空になりました"
                     )
-                    return False
+                    consistent = False
+                    break
                 
                 # var1のドメインが変更されたので、関連アークを再チェック
                 for neighbor_arc in self._get_neighbor_arcs(arc.var1, arc):
-                    queue.append(neighbor_arc)
+                    if neighbor_arc not in queued:
+                        queue.append(neighbor_arc)
+                        queued.add(neighbor_arc)
         
-        execution_time = time.time() - start_time
+        execution_time = self._record_propagation(start_time)
         self.logger.debug(
             f"AC-3完了: "
             f"時間={execution_time:.3f}秒, "
             f"アーク修正={self.stats['arc_revisions']}"
         )
         
-        return True
+        return consistent
     
     def pc2(self) -> bool:
         """
@@ -214,46 +363,10 @@ class ConstraintPropagation(LoggingMixin):
         Returns:
             影響を受ける変数とその削除される値のマップ
         """
-        affected = {}
-        
-        # 教師の重複チェック
-        if value[1]:  # 教師がいる場合
-            teacher_name = value[1]
-            
-            # 同じ時間の他のクラス
-            for other_var in self.variables:
-                if (other_var.time_slot == variable.time_slot and 
-                    other_var != variable):
-                    
-                    # この教師を使う値を削除
-                    removed_values = set()
-                    for domain_value in self.domains[other_var].values:
-                        if domain_value[1] == teacher_name:
-                            removed_values.add(domain_value)
-                    
-                    if removed_values:
-                        affected[other_var] = removed_values
-        
-        # 日内重複チェック
-        subject_name = value[0]
-        for other_var in self.variables:
-            if (other_var.class_ref == variable.class_ref and
-                other_var.time_slot.day == variable.time_slot.day and
-                other_var != variable):
-                
-                # 同じ科目を削除
-                removed_values = set()
-                for domain_value in self.domains[other_var].values:
-                    if domain_value[0] == subject_name:
-                        removed_values.add(domain_value)
-                
-                if removed_values:
-                    if other_var in affected:
-                        affected[other_var].update(removed_values)
-                    else:
-                        affected[other_var] = removed_values
-        
-        return affected
+        return {
+            var: self.value_table.decode(removed)
+            for var, removed in self._forward_checking_masks(variable, value).items()
+        }
     
     def maintain_arc_consistency(
         self,
@@ -265,40 +378,54 @@ class ConstraintPropagation(LoggingMixin):
         
         変数に値を割り当てた後、関連する制約の整合性を維持
         """
+        start_time = time.time()
+        
         # 前方チェックで影響を受ける変数を取得
-        affected = self.forward_checking(variable, value)
+        affected = self._forward_checking_masks(variable, value)
         
         # 影響を受ける変数のドメインを一時的に縮小
-        original_domains = {}
-        for var, values_to_remove in affected.items():
-            original_domains[var] = self.domains[var].values.copy()
-            self.domains[var].values -= values_to_remove
+        original_masks: Dict[Variable, int] = {}
+        for var, removed in affected.items():
+            domain = self.domains[var]
+            original_masks[var] = domain.mask
+            domain.mask &= ~removed
         
         # 影響を受けた変数から制約伝播
         queue = deque()
+        queued = set()
         for var in affected:
             # この変数に関連するアークをキューに追加
-            for arc in self.arcs:
-                if arc.var2 == var:
-                    queue.append(arc)
+            for arc in self._arcs_into.get(var, ()):
+                queue.append(arc)
+                queued.add(arc)
         
         # AC-3の実行
+        consistent = True
         while queue:
             arc = queue.popleft()
+            queued.discard(arc)
             
+            domain = self.domains[arc.var1]
+            mask_before = domain.mask
             if self._revise(arc):
-                if self.domains[arc.var1].is_empty():
-                    # 矛盾が発生したので、ドメインを復元
-                    for var, original in original_domains.items():
-                        self.domains[var].values = original
-                    return False
+                self.stats['arc_revisions'] += 1
+                original_masks.setdefault(arc.var1, mask_before)
+                
+                if domain.is_empty():
+                    # 矛盾が発生したので、伝播で縮小した分も含めてドメインを復元
+                    for var, original in original_masks.items():
+                        self.domains[var].mask = original
+                    consistent = False
+                    break
                 
                 # 更に伝播
                 for neighbor_arc in self._get_neighbor_arcs(arc.var1, arc):
-                    if neighbor_arc not in queue:
+                    if neighbor_arc not in queued:
                         queue.append(neighbor_arc)
+                        queued.add(neighbor_arc)
         
-        return True
+        self._record_propagation(start_time)
+        return consistent
     
     def get_inference_assignments(
         self
@@ -313,7 +440,7 @@ class ConstraintPropagation(LoggingMixin):
         
         for var, domain in self.domains.items():
             if domain.size() == 1:
-                value = next(iter(domain.values))
+                value = self.value_table.lowest_value(domain.mask)
                 inferences.append((var, value))
         
         return inferences
@@ -335,35 +462,33 @@ class ConstraintPropagation(LoggingMixin):
                 else:
                     values.add((subject.name, None))
         
-        return Domain(variable, values)
+        return Domain(variable, values, self.value_table)
     
     def _create_arcs(self):
         """制約アークを作成"""
-        variables_list = list(self.variables)
-        
-        # 教師重複制約のアーク
-        for i, var1 in enumerate(variables_list):
-            for var2 in variables_list[i+1:]:
-                if var1.time_slot == var2.time_slot:
-                    arc = Arc(var1, var2, "teacher_conflict")
-                    self.arcs.add(arc)
-                    self.constraints["teacher_conflict"].append(arc)
+        # 教師重複制約のアーク（同じ時間の変数同士）
+        for slot_variables in self._slot_variables.values():
+            for i, var1 in enumerate(slot_variables):
+                for var2 in slot_variables[i+1:]:
+                    self._add_arc(Arc(var1, var2, "teacher_conflict"))
                     
                     # 逆方向のアークも追加
-                    arc_rev = Arc(var2, var1, "teacher_conflict")
-                    self.arcs.add(arc_rev)
-                    self.constraints["teacher_conflict"].append(arc_rev)
-        
-        # 日内重複制約のアーク
-        for var1 in self.variables:
-            for var2 in self.variables:
-                if (var1.class_ref == var2.class_ref and
-                    var1.time_slot.day == var2.time_slot.day and
-                    var1.time_slot.period != var2.time_slot.period):
+                    self._add_arc(Arc(var2, var1, "teacher_conflict"))
+        
+        # 日内重複制約のアーク（同じクラス・同じ曜日の変数同士）
+        for day_variables in self._day_variables.values():
+            for var1 in day_variables:
+                for var2 in day_variables:
+                    if var1.time_slot.period != var2.time_slot.period:
+                        self._add_arc(Arc(var1, var2, "daily_duplicate"))
                     
-                    arc = Arc(var1, var2, "daily_duplicate")
-                    self.arcs.add(arc)
-                    self.constraints["daily_duplicate"].append(arc)
+    def _add_arc(self, arc: Arc):
+        """アークを制約グラフと索引に追加"""
+        if arc in self.arcs:
+            return
+        self.arcs.add(arc)
+        self.constraints[arc.constraint_type].append(arc)
+        self._arcs_into[arc.var2].append(arc)
     
     def _revise(self, arc: Arc) -> bool:
         """
@@ -372,31 +497,39 @@ class ConstraintPropagation(LoggingMixin):
         Returns:
             True if ドメインが変更された
         """
-        revised = False
+        self.stats['revise_calls'] += 1
         domain1 = self.domains[arc.var1]
-        domain2 = self.domains[arc.var2]
-        
-        values_to_remove = []
         
-        for value1 in domain1.values:
-            # value1に対して整合する値がdomain2にあるかチェック
-            has_support = False
-            
-            for value2 in domain2.values:
-                if self._is_consistent(arc, value1, value2):
-                    has_support = True
-                    break
-            
-            if not has_support:
-                values_to_remove.append(value1)
-                revised = True
+        removed = domain1.mask & self._unsupported_mask(arc, self.domains[arc.var2].mask)
+        if not removed:
+            return False
         
         # 値を削除
-        for value in values_to_remove:
-            domain1.remove_value(value)
-            self.stats['domain_reductions'] += 1
+        domain1.mask &= ~removed
+        self.stats['domain_reductions'] += popcount(removed)
+        
+        return True
+    
+    def _unsupported_mask(self, arc: Arc, mask2: int) -> int:
+        """var2のドメインに整合する値が1つもない、var1側の値のビットマスク
+        
+        どちらの制約も「同じ教師（科目）同士」が不整合なので、var2の値が全て
+        同じ教師（科目）の時だけ、その教師（科目）の値が支持を失う。
+        """
+        if not mask2:
+            return -1  # var2のドメインが空なら全ての値が支持を失う
+        
+        subject, teacher = self.value_table.lowest_value(mask2)
+        if arc.constraint_type == "teacher_conflict":
+            if not teacher:
+                return 0
+            conflicting = self.value_table.teacher_masks[teacher]
+        elif arc.constraint_type == "daily_duplicate":
+            conflicting = self.value_table.subject_masks[subject]
+        else:
+            return 0
         
-        return revised
+        return conflicting if not mask2 & ~conflicting else 0
     
     def _is_consistent(
         self, 
@@ -417,15 +550,41 @@ class ConstraintPropagation(LoggingMixin):
         
         return True
     
+    def _forward_checking_masks(
+        self,
+        variable: Variable,
+        value: Tuple[str, Optional[str]]
+    ) -> Dict[Variable, int]:
+        """前方チェックで削除される値を変数ごとのビットマスクで返す"""
+        subject_name, teacher_name = value
+        affected: Dict[Variable, int] = {}
+        
+        # 教師の重複チェック（同じ時間の他のクラスから、この教師を使う値を削除）
+        if teacher_name:
+            teacher_mask = self.value_table.teacher_masks.get(teacher_name, 0)
+            for other_var in self._slot_variables.get(variable.time_slot, ()):
+                if other_var != variable:
+                    removed = self.domains[other_var].mask & teacher_mask
+                    if removed:
+                        affected[other_var] = removed
+        
+        # 日内重複チェック（同じクラス・同じ曜日から、同じ科目を削除）
+        subject_mask = self.value_table.subject_masks.get(subject_name, 0)
+        day_key = (variable.class_ref, variable.time_slot.day)
+        for other_var in self._day_variables.get(day_key, ()):
+            if other_var != variable:
+                removed = self.domains[other_var].mask & subject_mask
+                if removed:
+                    affected[other_var] = affected.get(other_var, 0) | removed
+        
+        return affected
+    
     def _get_neighbor_arcs(self, variable: Variable, exclude_arc: Arc) -> List[Arc]:
         """変数に関連するアーク（除外アーク以外）を取得"""
-        neighbors = []
-        
-        for arc in self.arcs:
-            if arc.var2 == variable and arc != exclude_arc:
-                neighbors.append(arc)
-        
-        return neighbors
+        return [
+            arc for arc in self._arcs_into.get(variable, ())
+            if arc != exclude_arc
+        ]
     
     def _check_path_consistency(
         self, 
@@ -438,18 +597,31 @@ class ConstraintPropagation(LoggingMixin):
         # 実際には、より洗練された実装が必要
         return False
     
+    def _record_propagation(self, start_time: float) -> float:
+        """伝播1回分の統計を記録し、所要時間を返す"""
+        execution_time = time.time() - start_time
+        self.stats['propagations'] += 1
+        self.stats['propagation_time'] += execution_time
+        return execution_time
+    
     def get_statistics(self) -> Dict[str, Any]:
         """統計情報を取得"""
         total_domain_size = sum(d.size() for d in self.domains.values())
         avg_domain_size = total_domain_size / len(self.domains) if self.domains else 0
+        propagations = self.stats['propagations']
         
         return {
             'variables': len(self.variables),
             'arcs': len(self.arcs),
             'total_domain_size': total_domain_size,
             'average_domain_size': avg_domain_size,
-            'propagations': self.stats['propagations'],
+            'propagations': propagations,
             'domain_reductions': self.stats['domain_reductions'],
             'arc_revisions': self.stats['arc_revisions'],
+            'revise_calls': self.stats['revise_calls'],
+            'propagation_time': self.stats['propagation_time'],
+            'average_propagation_time': (
+                self.stats['propagation_time'] / propagations if propagations else 0.0
+            ),
             'cache_hits': self.stats['cache_hits']
         }
\ No newline at end of file
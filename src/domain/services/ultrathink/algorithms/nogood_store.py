@@ -0,0 +1,208 @@
+"""
+no-goodデータベース
+
+探索で学習したno-good（同時に成立し得ない割り当ての組）を保持する。
+リテラル（変数, 値）ごとの索引で違反チェックを高速化し、
+件数上限を超えたらLRUで削除する。
+
+学校データのハッシュと一緒にファイルへ保存でき、ハッシュが一致する
+後続の実行で読み込んで再利用できる（非常勤教員の不在や5組同期による
+同じ行き止まりを毎回探索し直さないため）。
+"""
+import hashlib
+import json
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .constraint_propagation import Variable
+from ....entities.school import School
+from ....value_objects.time_slot import TimeSlot, ClassReference
+from .....shared.mixins.logging_mixin import LoggingMixin
+
+Value = Tuple[str, Optional[str]]
+Literal = Tuple[Variable, Value]
+
+FORMAT_VERSION = 1
+
+
+class NoGoodStore(LoggingMixin):
+    """no-goodデータベース（LRU・件数上限つき）"""
+    
+    def __init__(self, max_size: int = 1000):
+        super().__init__()
+        self.max_size = max_size
+        
+        # no-good（リテラルのfrozenset）→ 過去の実行から読み込んだか
+        self._entries: 'OrderedDict[frozenset, bool]' = OrderedDict()
+        self._literal_index: Dict[Literal, Set[frozenset]] = defaultdict(set)
+        
+        # 統計情報
+        self.stats = {
+            'added': 0,
+            'loaded': 0,
+            'evicted': 0,
+            'checks': 0,
+            'hits': 0,
+            'reused_hits': 0
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, literals: frozenset) -> bool:
+        return literals in self._entries
+    
+    def __iter__(self) -> Iterator[frozenset]:
+        return iter(self._entries)
+    
+    def add(self, literals: Set[Literal], reused: bool = False) -> bool:
+        """no-goodを追加（登録済みならFalse）"""
+        key = frozenset(literals)
+        if not key or key in self._entries:
+            return False
+        
+        self._entries[key] = reused
+        for literal in key:
+            self._literal_index[literal].add(key)
+        if not reused:
+            self.stats['added'] += 1
+        
+        # 上限を超えたら最も使われていないものから削除
+        while len(self._entries) > self.max_size:
+            self._evict(next(iter(self._entries)))
+        
+        return True
+    
+    def find_violation(
+        self,
+        assignments: Dict[Variable, Value],
+        variable: Variable,
+        value: Value
+    ) -> Optional[frozenset]:
+        """variable=value を加えた割り当てが完全に含むno-goodを探す
+        
+        (variable, value) を含むno-goodだけを調べる。見つかったno-goodは
+        最近使ったものとしてLRUの末尾に移す。
+        """
+        self.stats['checks'] += 1
+        for key in self._literal_index.get((variable, value), ()):
+            if all(
+                (var, val) == (variable, value) or assignments.get(var) == val
+                for var, val in key
+            ):
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                if self._entries[key]:
+                    self.stats['reused_hits'] += 1
+                return key
+        return None
+    
+    def is_reused(self, literals: frozenset) -> bool:
+        """過去の実行から読み込んだno-goodか"""
+        return self._entries.get(literals, False)
+    
+    def clear(self):
+        """全てのno-goodを削除"""
+        self._entries.clear()
+        self._literal_index.clear()
+    
+    def _evict(self, key: frozenset):
+        """no-goodを索引ごと削除"""
+        del self._entries[key]
+        for literal in key:
+            watchers = self._literal_index.get(literal)
+            if watchers is not None:
+                watchers.discard(key)
+                if not watchers:
+                    del self._literal_index[literal]
+        self.stats['evicted'] += 1
+    
+    # ========== 永続化 ==========
+    
+    @staticmethod
+    def compute_school_hash(school: School) -> str:
+        """no-goodの再利用可否を判定するための学校データのハッシュ
+        
+        クラス・標準時数・担当教員・教員の不在をもとに計算する。
+        """
+        data = []
+        for class_ref in sorted(school.get_all_classes(), key=lambda c: (c.grade, c.class_number)):
+            hours = []
+            for subject, value in school.get_all_standard_hours(class_ref).items():
+                teacher = school.get_assigned_teacher(subject, class_ref)
+                hours.append([subject.name, value, teacher.name if teacher else None])
+            data.append([class_ref.grade, class_ref.class_number, sorted(hours, key=str)])
+        
+        unavailable = []
+        for day in ["月", "火", "水", "木", "金"]:
+            for period in range(1, 7):
+                names = sorted(t.name for t in school.get_unavailable_teachers(day, period))
+                if names:
+                    unavailable.append([day, period, names])
+        
+        payload = json.dumps([data, unavailable], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def save(self, filepath: str, school_hash: str):
+        """no-goodをファイルに保存（LRU順）"""
+        data = {
+            'version': FORMAT_VERSION,
+            'school_hash': school_hash,
+            'nogoods': [
+                [
+                    [var.time_slot.day, var.time_slot.period,
+                     var.class_ref.grade, var.class_ref.class_number,
+                     value[0], value[1]]
+                    for var, value in sorted(key, key=str)
+                ]
+                for key in self._entries
+            ]
+        }
+        
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        
+        self.logger.info(f"no-goodを保存しました: {len(self._entries)}件 ({filepath})")
+    
+    def load(self, filepath: str, school_hash: str) -> int:
+        """ハッシュが一致する場合だけno-goodを読み込み、読み込んだ件数を返す"""
+        path = Path(filepath)
+        if not path.exists():
+            return 0
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            if data.get('version') != FORMAT_VERSION or data.get('school_hash') != school_hash:
+                self.logger.info("学校データが変わったため、保存済みのno-goodは使用しません")
+                return 0
+            
+            loaded = 0
+            for literals in data.get('nogoods', []):
+                nogood: List[Literal] = [
+                    (Variable(TimeSlot(day, period), ClassReference(grade, class_number)),
+                     (subject, teacher))
+                    for day, period, grade, class_number, subject, teacher in literals
+                ]
+                if self.add(set(nogood), reused=True):
+                    loaded += 1
+        
+        except Exception as e:
+            self.logger.error(f"no-goodのロードに失敗: {e}")
+            return 0
+        
+        self.stats['loaded'] += loaded
+        self.logger.info(f"no-goodをロードしました: {loaded}件")
+        return loaded
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """統計情報を取得"""
+        return {
+            'size': len(self._entries),
+            'reused_size': sum(1 for reused in self._entries.values() if reused),
+            **self.stats
+        }
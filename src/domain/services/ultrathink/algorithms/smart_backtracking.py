@@ -11,6 +11,7 @@ from collections import defaultdict, deque
 import time
 
 from .constraint_propagation import Variable, Domain, ConstraintPropagation
+from .nogood_store import NoGoodStore
 from ....entities.schedule import Schedule
 from ....entities.school import School
 from ....value_objects.time_slot import TimeSlot, ClassReference
@@ -80,7 +81,8 @@ class SmartBacktracking(LoggingMixin):
         school: School,
         constraint_propagation: ConstraintPropagation,
         enable_learning: bool = True,
-        max_nogoods: int = 1000
+        max_nogoods: int = 1000,
+        nogood_store: Optional[NoGoodStore] = None
     ):
         super().__init__()
         self.school = school
@@ -93,9 +95,8 @@ class SmartBacktracking(LoggingMixin):
         self.search_tree_root: Optional[AssignmentNode] = None
         self.current_node: Optional[AssignmentNode] = None
         
-        # 学習
-        self.nogoods: Set[NoGood] = set()
-        self.nogood_index: Dict[Variable, Set[NoGood]] = defaultdict(set)
+        # 学習（実行をまたいで共有・保存できるno-goodデータベース）
+        self.nogood_store = nogood_store if nogood_store is not None else NoGoodStore(max_nogoods)
         
         # 統計
         self.stats = {
@@ -103,9 +104,16 @@ class SmartBacktracking(LoggingMixin):
             'backjumps': 0,
             'nogoods_learned': 0,
             'conflicts_detected': 0,
-            'nodes_explored': 0
+            'nodes_explored': 0,
+            'nodes_pruned': 0,
+            'nodes_pruned_by_reused': 0
         }
     
+    @property
+    def nogoods(self) -> Set[NoGood]:
+        """学習済みのno-good"""
+        return {NoGood(set(literals)) for literals in self.nogood_store}
+    
     def search(
         self,
         initial_assignments: Dict[Variable, Tuple[str, Optional[str]]] = None,
@@ -344,51 +352,62 @@ class SmartBacktracking(LoggingMixin):
         if not self.enable_learning:
             return False
         
-        # この変数に関連するno-goodをチェック
-        for nogood in self.nogood_index[variable]:
-            # 現在の割り当て＋新しい割り当てを作成
-            test_assignments = self.assignments.copy()
-            test_assignments[variable] = value
-            
-            if nogood.is_violated_by(test_assignments):
-                return True
+        # この割り当てを含むno-goodだけをチェック
+        violated = self.nogood_store.find_violation(self.assignments, variable, value)
+        if violated is None:
+            return False
         
-        return False
+        self.stats['nodes_pruned'] += 1
+        if self.nogood_store.is_reused(violated):
+            self.stats['nodes_pruned_by_reused'] += 1
+        return True
     
     def _analyze_conflict(self, node: AssignmentNode):
         """競合分析と学習"""
         if not self.enable_learning:
             return
         
-        # 競合セットの構築
-        conflict_vars = set()
-        
-        # 現在の割り当てで競合している変数を特定
-        for var, val in self.assignments.items():
-            if self._violates_constraints(node.variable, node.value):
-                conflict_vars.add(var)
+        # 競合セットの構築（この割り当てと直接競合している変数）
+        conflict_vars = self._find_conflicting_variables(node.variable, node.value)
         
         node.conflict_set = conflict_vars
         
-        # no-goodの学習
-        if len(conflict_vars) > 0 and len(self.nogoods) < self.max_nogoods:
+        # no-goodの学習（上限を超えた分はLRUで削除される）
+        if len(conflict_vars) > 0:
             # 最小競合セットを作成
             nogood_assignments = set()
             nogood_assignments.add((node.variable, node.value))
             
             for var in conflict_vars:
-                if var in self.assignments:
-                    nogood_assignments.add((var, self.assignments[var]))
+                nogood_assignments.add((var, self.assignments[var]))
             
-            nogood = NoGood(nogood_assignments)
-            
-            if nogood not in self.nogoods:
-                self.nogoods.add(nogood)
+            if self.nogood_store.add(nogood_assignments):
                 self.stats['nogoods_learned'] += 1
-                
-                # インデックスに追加
-                for var, _ in nogood.assignments:
-                    self.nogood_index[var].add(nogood)
+    
+    def _find_conflicting_variables(
+        self,
+        variable: Variable,
+        value: Tuple[str, Optional[str]]
+    ) -> Set[Variable]:
+        """現在の割り当てのうち、variable=value と直接競合する変数"""
+        conflicts = set()
+        
+        for other_var, other_val in self.assignments.items():
+            if other_var == variable:
+                continue
+            
+            # 教師重複
+            if (value[1] and other_var.time_slot == variable.time_slot and
+                other_val[1] == value[1]):
+                conflicts.add(other_var)
+            
+            # 日内重複
+            elif (other_var.class_ref == variable.class_ref and
+                  other_var.time_slot.day == variable.time_slot.day and
+                  other_val[0] == value[0]):
+                conflicts.add(other_var)
+        
+        return conflicts
     
     def _backjump_to_depth(self, target_depth: int):
         """指定された深さまでバックジャンプ"""
@@ -419,6 +438,9 @@ class SmartBacktracking(LoggingMixin):
                 if self.stats['backtracks'] + self.stats['backjumps'] > 0 else 0
             ),
             'nogoods_learned': self.stats['nogoods_learned'],
+            'nodes_pruned': self.stats['nodes_pruned'],
+            'nodes_pruned_by_reused': self.stats['nodes_pruned_by_reused'],
+            'nogood_store': self.nogood_store.get_statistics(),
             'conflicts_detected': self.stats['conflicts_detected'],
             'current_depth': len(self.assignments),
             'total_variables': len(self.constraint_prop.variables)
@@ -18,6 +18,7 @@ from ....value_objects.assignment import Assignment
 from ..algorithms import (
     ConstraintPropagation, Variable, Domain,
     SmartBacktracking,
+    NoGoodStore,
     AdvancedHeuristics,
     ConstraintGraphOptimizer,
     PreprocessingEngine
@@ -55,7 +56,8 @@ class AdvancedPlacementEngine(LoggingMixin):
         parallel_engine: Optional[ParallelEngine] = None,
         enable_preprocessing: bool = True,
         enable_learning: bool = True,
-        enable_performance_optimization: bool = True
+        enable_performance_optimization: bool = True,
+        nogood_store_path: Optional[str] = None
     ):
         super().__init__()
         self.cache = cache
@@ -64,6 +66,12 @@ class AdvancedPlacementEngine(LoggingMixin):
         self.enable_learning = enable_learning
         self.enable_performance_optimization = enable_performance_optimization
         
+        # 学習したno-good（学校データが同じ間は配置をまたいで再利用し、
+        # nogood_store_pathが指定されていればファイルに保存して次回の実行でも使う）
+        self.nogood_store_path = nogood_store_path
+        self.nogood_store = NoGoodStore()
+        self._nogood_school_hash: Optional[str] = None
+        
         # アルゴリズムコンポーネント
         self.constraint_propagation = None
         self.smart_backtracking = None
@@ -163,6 +171,7 @@ class AdvancedPlacementEngine(LoggingMixin):
             time_limit
         )
         self.stats['search_time'] += time.time() - search_start
+        self._save_nogoods()
         
         # 結果の作成
         execution_time = time.time() - start_time
@@ -231,11 +240,21 @@ class AdvancedPlacementEngine(LoggingMixin):
         # 制約伝播
         self.constraint_propagation = ConstraintPropagation(school, self.cache)
         
+        # no-goodデータベース（学校データが変わったら学習結果を破棄）
+        if self.enable_learning:
+            school_hash = NoGoodStore.compute_school_hash(school)
+            if school_hash != self._nogood_school_hash:
+                self.nogood_store.clear()
+                if self.nogood_store_path:
+                    self.nogood_store.load(self.nogood_store_path, school_hash)
+                self._nogood_school_hash = school_hash
+        
         # スマートバックトラッキング
         self.smart_backtracking = SmartBacktracking(
             school,
             self.constraint_propagation,
-            enable_learning=self.enable_learning
+            enable_learning=self.enable_learning,
+            nogood_store=self.nogood_store
         )
         
         # ヒューリスティクス
@@ -248,6 +267,15 @@ class AdvancedPlacementEngine(LoggingMixin):
         if self.enable_preprocessing:
             self.preprocessing_engine = PreprocessingEngine(school)
     
+    def _save_nogoods(self):
+        """学習したno-goodをファイルに保存"""
+        if not (self.enable_learning and self.nogood_store_path and self._nogood_school_hash):
+            return
+        try:
+            self.nogood_store.save(self.nogood_store_path, self._nogood_school_hash)
+        except OSError as e:
+            self.logger.warning(f"no-goodの保存に失敗: {e}")
+    
     def _get_fixed_assignments(
         self,
         schedule: Schedule,
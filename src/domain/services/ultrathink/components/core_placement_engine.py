@@ -14,6 +14,7 @@ from ....entities.schedule import Schedule
 from ....entities.school import School, Teacher, Subject
 from ....value_objects.time_slot import TimeSlot, ClassReference
 from ....value_objects.assignment import Assignment
+from ...core.slot_candidate_index import SlotCandidateIndex
 from .....shared.mixins.logging_mixin import LoggingMixin
 
 
@@ -88,6 +89,9 @@ class CorePlacementEngine(LoggingMixin):
             ClassReference(3, 6): ClassReference(3, 3),
             ClassReference(3, 7): ClassReference(3, 2)
         }
+        
+        # セルごとの配置候補（配置対象のスケジュールに購読させて使い回す）
+        self._candidate_index: Optional[SlotCandidateIndex] = None
     
     def place_assignments(
         self,
@@ -375,7 +379,7 @@ class CorePlacementEngine(LoggingMixin):
                 if not teacher:
                     continue
                 
-                # 配置可能なスロットを探す（効率的に）
+                # 配置可能なスロットを候補インデックスから引く
                 available_slots = self._get_available_slots(
                     schedule, school, class_ref, subject_name, teacher
                 )
@@ -649,6 +653,17 @@ class CorePlacementEngine(LoggingMixin):
         
         return True
     
+    def _get_candidate_index(self, schedule: Schedule, school: School) -> SlotCandidateIndex:
+        """スケジュールに購読させた配置候補インデックスを取得"""
+        index = self._candidate_index
+        if index is None or index.school is not school:
+            if index is not None:
+                index.detach()
+            index = self._candidate_index = SlotCandidateIndex(school)
+        if index.schedule is not schedule:
+            index.attach(schedule)
+        return index
+    
     def _get_available_slots(
         self,
         schedule: Schedule,
@@ -658,25 +673,14 @@ class CorePlacementEngine(LoggingMixin):
         teacher: Teacher
     ) -> List[TimeSlot]:
         """利用可能なスロットを取得"""
-        available = []
+        subject = Subject(subject_name)
+        index = self._get_candidate_index(schedule, school)
         
-        for day in ["月", "火", "水", "木", "金"]:
-            # 同じ日に同じ科目がある場合はスキップ
-            if self._has_subject_on_day(schedule, class_ref, day, subject_name):
-                continue
-            
-            for period in range(1, 7):
-                time_slot = TimeSlot(day, period)
-                
-                # スロットが空いているか
-                if schedule.get_assignment(time_slot, class_ref):
-                    continue
-                
-                # 教師が利用可能か
-                if not self._is_teacher_available(schedule, school, teacher, time_slot):
-                    continue
-                
-                available.append(time_slot)
+        # 同じ日に同じ科目がある日は除く
+        available = [
+            time_slot for time_slot in index.open_slots(class_ref, subject, teacher)
+            if schedule.count_daily_subject(class_ref, time_slot.day, subject) == 0
+        ]
         
         # スコアでソート（より良いスロットを優先）
         available.sort(
@@ -686,4 +690,4 @@ class CorePlacementEngine(LoggingMixin):
             reverse=True
         )
         
-        return available
\ No newline at end of file
+        return available
@@ -0,0 +1,433 @@
+"""
+大近傍探索（LNS）
+
+時間割の一部（近傍）だけを壊して再最適化することを繰り返す最適化戦略。
+全体を解き直すより、違反のある少数のセルの周辺だけを解く方が速い。
+
+近傍の種類:
+- teacher_week: 1人の教師の1週間の授業
+- grade_day: 1学年の1日（全クラス）
+- violation_cluster: ViolationGraphでつながった違反のまとまり（関係するクラスのその日）
+
+近傍の再最適化は厳密解法のソルバー（exact_solver、近傍のセルだけを変数にする）で行い、
+ソルバーがインストールされていなければスマートバックトラッキングで埋め直す。
+評価関数が改善した場合だけ採用する。近傍の種類ごとに1秒あたりの改善量を記録し、
+改善の多い種類を優先して選ぶ（ε-greedy）。
+"""
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Set, Any, Callable
+
+from ....entities.schedule import Schedule
+from ....entities.school import School, Teacher, Subject
+from ....value_objects.time_slot import TimeSlot, ClassReference
+from ....value_objects.assignment import Assignment
+from ..algorithms.constraint_propagation import ConstraintPropagation
+from ..algorithms.smart_backtracking import SmartBacktracking
+from .optimization_strategy_pool import OptimizationStrategy
+from .....shared.mixins.logging_mixin import LoggingMixin
+
+
+NEIGHBORHOOD_TYPES = ('teacher_week', 'grade_day', 'violation_cluster')
+
+DAYS = ["月", "火", "水", "木", "金"]
+PERIODS = range(1, 7)
+
+Cell = Tuple[TimeSlot, ClassReference]
+
+
+@dataclass
+class Neighborhood:
+    """壊して再最適化するセルの集合"""
+    kind: str
+    label: str
+    cells: Set[Cell]
+
+
+@dataclass
+class CellViolation:
+    """セルの違反（ViolationGraphに入れられる形）"""
+    type: str
+    time_slot: TimeSlot
+    class_refs: List[ClassReference]
+    teacher: Optional[Teacher] = None
+    subject: Optional[Subject] = None
+    severity: float = 1.0
+
+
+@dataclass
+class NeighborhoodStats:
+    """近傍の種類ごとの実績"""
+    attempts: int = 0
+    accepted: int = 0
+    improvement: float = 0.0
+    elapsed: float = 0.0
+    
+    @property
+    def improvement_per_second(self) -> float:
+        """1秒あたりの改善量"""
+        return self.improvement / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class LargeNeighborhoodSearchStrategy(OptimizationStrategy, LoggingMixin):
+    """大近傍探索戦略"""
+    
+    def __init__(
+        self,
+        backend: str = 'auto',
+        repair_time_limit: float = 5.0,
+        max_cells: int = 60,
+        exploration_rate: float = 0.2,
+        seed: Optional[int] = None,
+        forbidden_cells: Optional[Dict[Cell, Set[str]]] = None
+    ):
+        """
+        Args:
+            backend: 近傍を解くソルバー（'auto' / 'cp-sat' / 'pulp-cbc'）
+            repair_time_limit: 1つの近傍の再最適化にかける時間（秒）
+            max_cells: 近傍の最大セル数
+            exploration_rate: 実績に関係なく近傍の種類をランダムに選ぶ確率
+            seed: 乱数シード
+            forbidden_cells: (時間枠, クラス) → 配置禁止の教科名（ソルバーのモデルに渡す）
+        """
+        super().__init__()
+        self.backend = backend
+        self.repair_time_limit = repair_time_limit
+        self.max_cells = max_cells
+        self.exploration_rate = exploration_rate
+        self.random = random.Random(seed)
+        self.forbidden_cells = forbidden_cells
+        
+        # 実行をまたいで近傍の種類ごとの実績を持ち越す
+        self.neighborhood_stats: Dict[str, NeighborhoodStats] = {
+            kind: NeighborhoodStats() for kind in NEIGHBORHOOD_TYPES
+        }
+        self._disabled_kinds: Set[str] = set()
+        self._solver = None
+        self._solver_checked = False
+    
+    def get_name(self) -> str:
+        return "LNS"
+    
+    def optimize(
+        self,
+        initial_schedule: Schedule,
+        school: School,
+        evaluate_func: Callable[[Schedule], Tuple[float, int, int]],
+        time_limit: float,
+        **kwargs
+    ) -> Schedule:
+        """制限時間まで近傍の破壊と再最適化を繰り返す"""
+        start_time = time.time()
+        current = initial_schedule.fork()
+        current_cost = self._cost(*evaluate_func(current))
+        initial_cost = current_cost
+        iterations = 0
+        
+        while time.time() - start_time < time_limit:
+            remaining = time_limit - (time.time() - start_time)
+            neighborhood = self._next_neighborhood(current, school)
+            if neighborhood is None:
+                break
+            
+            iterations += 1
+            iteration_start = time.time()
+            candidate = current.fork()
+            repaired = self.repair(
+                candidate, school, neighborhood.cells,
+                min(self.repair_time_limit, remaining)
+            )
+            
+            improvement = 0.0
+            if repaired:
+                candidate_cost = self._cost(*evaluate_func(candidate))
+                if candidate_cost < current_cost:
+                    improvement = current_cost - candidate_cost
+                    current = candidate
+                    current_cost = candidate_cost
+            
+            stats = self.neighborhood_stats[neighborhood.kind]
+            stats.attempts += 1
+            stats.elapsed += time.time() - iteration_start
+            if improvement > 0:
+                stats.accepted += 1
+                stats.improvement += improvement
+                self.logger.debug(
+                    f"LNS {neighborhood.kind}({neighborhood.label}): "
+                    f"{len(neighborhood.cells)}セル, 改善={improvement:.1f}"
+                )
+        
+        self.logger.info(
+            f"LNS完了: 反復={iterations}, 改善={initial_cost - current_cost:.1f}, "
+            + ", ".join(
+                f"{kind}={stats.improvement_per_second:.2f}/秒"
+                for kind, stats in self.neighborhood_stats.items()
+            )
+        )
+        return current
+    
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """近傍の種類ごとの実績"""
+        return {
+            kind: {
+                'attempts': stats.attempts,
+                'accepted': stats.accepted,
+                'improvement': stats.improvement,
+                'elapsed': stats.elapsed,
+                'improvement_per_second': stats.improvement_per_second
+            }
+            for kind, stats in self.neighborhood_stats.items()
+        }
+    
+    def _cost(self, score: float, violations: int, conflicts: int) -> float:
+        """小さいほど良いコスト（シミュレーテッドアニーリングのエネルギーと同じ）"""
+        return (violations + conflicts) * 100 - score
+    
+    # ------------------------------------------------------------------
+    # 近傍の選択
+    # ------------------------------------------------------------------
+    
+    def _next_neighborhood(self, schedule: Schedule, school: School) -> Optional[Neighborhood]:
+        """近傍の種類を選び、近傍を作る（作れない種類は他の種類で代える）"""
+        kinds = [kind for kind in NEIGHBORHOOD_TYPES if kind not in self._disabled_kinds]
+        while kinds:
+            kind = self._select_kind(kinds)
+            neighborhood = self._build_neighborhood(kind, schedule, school)
+            if neighborhood is not None and neighborhood.cells:
+                return neighborhood
+            kinds.remove(kind)
+        return None
+    
+    def _select_kind(self, kinds: List[str]) -> str:
+        """ε-greedyで近傍の種類を選ぶ（未試行の種類を先に試す）"""
+        untried = [kind for kind in kinds if self.neighborhood_stats[kind].attempts == 0]
+        if untried:
+            return untried[0]
+        if self.random.random() < self.exploration_rate:
+            return self.random.choice(kinds)
+        return max(kinds, key=lambda kind: self.neighborhood_stats[kind].improvement_per_second)
+    
+    def _build_neighborhood(
+        self,
+        kind: str,
+        schedule: Schedule,
+        school: School
+    ) -> Optional[Neighborhood]:
+        if kind == 'teacher_week':
+            neighborhood = self._teacher_week(schedule)
+        elif kind == 'grade_day':
+            neighborhood = self._grade_day(schedule, school)
+        else:
+            neighborhood = self._violation_cluster(schedule, school)
+        
+        if neighborhood is not None:
+            neighborhood.cells = {
+                cell for cell in neighborhood.cells if not schedule.is_locked(*cell)
+            }
+        return neighborhood
+    
+    def _teacher_week(self, schedule: Schedule) -> Optional[Neighborhood]:
+        """1人の教師の1週間（教師重複のある教師を優先）"""
+        conflicts = schedule.get_teacher_conflicts()
+        teacher_cells: Dict[str, Set[Cell]] = {}
+        for time_slot, assignment in schedule.get_all_assignments():
+            if assignment.teacher:
+                teacher_cells.setdefault(assignment.teacher.name, set()).add(
+                    (time_slot, assignment.class_ref)
+                )
+        if not teacher_cells:
+            return None
+        
+        candidates = sorted({teacher.name for _, teacher, _ in conflicts} & set(teacher_cells))
+        teacher = self.random.choice(candidates or sorted(teacher_cells))
+        cells = sorted(teacher_cells[teacher], key=self._cell_key)[:self.max_cells]
+        return Neighborhood('teacher_week', teacher, set(cells))
+    
+    def _grade_day(self, schedule: Schedule, school: School) -> Optional[Neighborhood]:
+        """1学年の1日（違反のある学年・曜日を優先）"""
+        grades = sorted({class_ref.grade for class_ref in school.get_all_classes()})
+        if not grades:
+            return None
+        
+        violated = sorted({
+            (class_ref.grade, time_slot.day)
+            for violation in self._find_violations(schedule, school)
+            for time_slot, class_ref in self._violation_cells(violation)
+        })
+        grade, day = self.random.choice(violated) if violated else (
+            self.random.choice(grades), self.random.choice(DAYS)
+        )
+        cells = {
+            (TimeSlot(day, period), class_ref)
+            for class_ref in school.get_all_classes() if class_ref.grade == grade
+            for period in PERIODS
+        }
+        return Neighborhood('grade_day', f"{grade}年{day}曜", cells)
+    
+    def _violation_cluster(self, schedule: Schedule, school: School) -> Optional[Neighborhood]:
+        """ViolationGraphでつながった違反のまとまり"""
+        try:
+            from .....application.services.ultrathink.optimizer.violation_graph import ViolationGraph
+        except ImportError as e:
+            self.logger.warning(f"ViolationGraphを読み込めないため違反クラスタ近傍を使いません: {e}")
+            self._disabled_kinds.add('violation_cluster')
+            return None
+        
+        violations = self._find_violations(schedule, school)
+        if not violations:
+            return None
+        
+        # 同じ時間、または同じクラスの同じ日の違反同士をつなぐ
+        graph = ViolationGraph()
+        vids = [graph.add_violation(violation) for violation in violations]
+        for i, vid1 in enumerate(vids):
+            for vid2 in vids[i + 1:]:
+                if self._are_related(graph.violations[vid1], graph.violations[vid2]):
+                    graph.add_dependency(vid1, vid2)
+                    graph.add_dependency(vid2, vid1)
+        
+        root = self.random.choice(sorted(graph.violations))
+        cells: Set[Cell] = set()
+        for vid in graph.get_impact_chain(root):
+            violation = graph.violations[vid]
+            day_cells = {
+                (TimeSlot(violation.time_slot.day, period), class_ref)
+                for class_ref in violation.class_refs
+                for period in PERIODS
+            }
+            if cells and len(cells | day_cells) > self.max_cells:
+                break
+            cells |= day_cells
+        return Neighborhood('violation_cluster', root, cells)
+    
+    def _find_violations(self, schedule: Schedule, school: School) -> List[CellViolation]:
+        """教師重複と日内重複を列挙"""
+        violations = []
+        for time_slot, teacher, class_refs in schedule.get_teacher_conflicts():
+            violations.append(CellViolation('teacher_conflict', time_slot, class_refs, teacher))
+        
+        for class_ref in school.get_all_classes():
+            for day in DAYS:
+                if not schedule.has_daily_duplicate(class_ref, day):
+                    continue
+                seen: Dict[Subject, TimeSlot] = {}
+                for period in PERIODS:
+                    time_slot = TimeSlot(day, period)
+                    assignment = schedule.get_assignment(time_slot, class_ref)
+                    if not assignment:
+                        continue
+                    if assignment.subject in seen:
+                        violations.append(CellViolation(
+                            'daily_duplicate', time_slot, [class_ref], subject=assignment.subject
+                        ))
+                    else:
+                        seen[assignment.subject] = time_slot
+        return violations
+    
+    def _violation_cells(self, violation: CellViolation) -> List[Cell]:
+        return [(violation.time_slot, class_ref) for class_ref in violation.class_refs]
+    
+    def _are_related(self, violation1: CellViolation, violation2: CellViolation) -> bool:
+        if violation1.time_slot == violation2.time_slot:
+            return True
+        return (violation1.time_slot.day == violation2.time_slot.day
+                and bool(set(violation1.class_refs) & set(violation2.class_refs)))
+    
+    def _cell_key(self, cell: Cell) -> Tuple:
+        time_slot, class_ref = cell
+        return (DAYS.index(time_slot.day), time_slot.period, class_ref.grade, class_ref.class_number)
+    
+    # ------------------------------------------------------------------
+    # 近傍の再最適化
+    # ------------------------------------------------------------------
+    
+    def repair(
+        self,
+        schedule: Schedule,
+        school: School,
+        cells: Set[Cell],
+        time_limit: float
+    ) -> bool:
+        """近傍のセルを再最適化してスケジュールに書き込む
+        
+        近傍の外のセルは変えない。LNSの反復の外からも、指定したセルだけを
+        解き直すのに使える。
+        
+        Returns:
+            スケジュールを書き換えたか
+        """
+        solver = self._get_solver()
+        if solver is not None:
+            return self._repair_with_solver(solver, schedule, school, cells, time_limit)
+        return self._repair_with_backtracking(schedule, school, cells, time_limit)
+    
+    def _get_solver(self):
+        """厳密解法のソルバー（インストールされていなければNone）"""
+        if not self._solver_checked:
+            self._solver_checked = True
+            try:
+                from .....application.services.exact_solver import get_backend
+                self._solver = get_backend(self.backend)
+            except (ImportError, RuntimeError) as e:
+                self.logger.info(f"ソルバーが使えないためスマートバックトラッキングで再最適化します: {e}")
+        return self._solver
+    
+    def _repair_with_solver(
+        self,
+        solver,
+        schedule: Schedule,
+        school: School,
+        cells: Set[Cell],
+        time_limit: float
+    ) -> bool:
+        from .....application.services.exact_solver import TimetableModelBuilder
+        
+        test_periods = {
+            (day, period) for day, periods in schedule.test_periods.items() for period in periods
+        }
+        builder = TimetableModelBuilder(
+            school, forbidden_cells=self.forbidden_cells, test_periods=test_periods
+        )
+        model = builder.build(schedule, free_cells=cells)
+        if not model.cells:
+            return False
+        
+        result = solver.solve(model, time_limit)
+        if not result.has_solution:
+            return False
+        return builder.apply(schedule, model, result.values) > 0
+    
+    def _repair_with_backtracking(
+        self,
+        schedule: Schedule,
+        school: School,
+        cells: Set[Cell],
+        time_limit: float
+    ) -> bool:
+        """近傍を空けてスマートバックトラッキングで埋め直す
+        
+        5組の同期と合同授業はこの探索の制約に無いため、5組のセルは近傍から除く。
+        """
+        cells = {(time_slot, class_ref) for time_slot, class_ref in cells
+                 if class_ref.class_number != 5}
+        if not cells:
+            return False
+        
+        propagation = ConstraintPropagation(school)
+        propagation.initialize_neighborhood(schedule, cells)
+        backtracking = SmartBacktracking(school, propagation, enable_learning=False)
+        result = backtracking.search(time_limit=time_limit)
+        if result is None:
+            return False
+        
+        for var, (subject_name, teacher_name) in result.items():
+            if (var.time_slot, var.class_ref) not in cells:
+                continue
+            schedule.remove_assignment(var.time_slot, var.class_ref)
+            schedule.assign(var.time_slot, Assignment(
+                var.class_ref,
+                Subject(subject_name),
+                Teacher(teacher_name) if teacher_name else None
+            ))
+        return True
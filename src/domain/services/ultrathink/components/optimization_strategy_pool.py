@@ -3,6 +3,7 @@
 
 様々な最適化戦略を管理し、状況に応じて適切な戦略を選択・実行。
 ビームサーチ、局所探索、シミュレーテッドアニーリングなどを含む。
+大近傍探索（LNS）は large_neighborhood_search モジュールにある。
 """
 import logging
 import random
@@ -18,6 +19,7 @@ from ....entities.schedule import Schedule
 from ....entities.school import School, Teacher, Subject
 from ....value_objects.time_slot import TimeSlot, ClassReference
 from ....value_objects.assignment import Assignment
+from ...core.batch_move_evaluator import BatchMoveEvaluator
 from .....shared.mixins.logging_mixin import LoggingMixin
 
 
@@ -59,6 +61,9 @@ class OptimizationStrategy(ABC):
 class BeamSearchStrategy(OptimizationStrategy, LoggingMixin):
     """ビームサーチ戦略"""
     
+    # 1回の近傍生成で一括評価するスワップ候補数
+    SWAP_CANDIDATES = 200
+    
     def __init__(self, beam_width: int = 10):
         super().__init__()
         self.beam_width = beam_width
@@ -162,12 +167,17 @@ class BeamSearchStrategy(OptimizationStrategy, LoggingMixin):
         schedule: Schedule,
         school: School
     ) -> List[Schedule]:
-        """スワップによる近傍生成"""
+        """スワップによる近傍生成
+        
+        ランダムなスワップ候補をまとめて評価し、違反の増減が小さい順に
+        上位10個だけを実際に適用する。
+        """
         neighbors = []
         classes = list(school.get_all_classes())
         
-        # ランダムに10個のスワップを試す
-        for _ in range(10):
+        # ランダムにスワップ候補を作る
+        candidates = []
+        for _ in range(self.SWAP_CANDIDATES):
             # ランダムに2つのスロットを選択
             class1 = random.choice(classes)
             class2 = random.choice(classes)
@@ -179,10 +189,21 @@ class BeamSearchStrategy(OptimizationStrategy, LoggingMixin):
             period1 = random.randint(1, 5)
             period2 = random.randint(1, 5)
             
-            time_slot1 = TimeSlot(day, period1)
-            time_slot2 = TimeSlot(day, period2)
-            
-            # スワップを試みる
+            candidates.append((TimeSlot(day, period1), class1, TimeSlot(day, period2), class2))
+        
+        if not candidates:
+            return neighbors
+        
+        # 全候補を一括評価（スケジュールは変更しない）
+        evaluator = BatchMoveEvaluator(schedule, school)
+        scores = evaluator.score_swaps(
+            evaluator.encode_cells([(ts1, c1) for ts1, c1, _, _ in candidates]),
+            evaluator.encode_cells([(ts2, c2) for _, _, ts2, c2 in candidates])
+        )
+        
+        # 評価の良い順にスワップを試みる
+        for index in scores.ranking()[:10]:
+            time_slot1, class1, time_slot2, class2 = candidates[index]
             new_schedule = self._copy_schedule(schedule)
             if self._try_swap(new_schedule, time_slot1, class1, time_slot2, class2):
                 neighbors.append(new_schedule)
@@ -229,11 +250,8 @@ class BeamSearchStrategy(OptimizationStrategy, LoggingMixin):
         return neighbors
     
     def _copy_schedule(self, schedule: Schedule) -> Schedule:
-        """スケジュールのコピー"""
-        new_schedule = Schedule()
-        for time_slot, assignment in schedule.get_all_assignments():
-            new_schedule.assign(time_slot, assignment)
-        return new_schedule
+        """スケジュールのコピー（コピーオンライトで構造を共有）"""
+        return schedule.fork()
     
     def _try_swap(
         self,
@@ -620,11 +638,8 @@ class LocalSearchStrategy(OptimizationStrategy, LoggingMixin):
         return neighbors
     
     def _copy_schedule(self, schedule: Schedule) -> Schedule:
-        """スケジュールのコピー"""
-        new_schedule = Schedule()
-        for time_slot, assignment in schedule.get_all_assignments():
-            new_schedule.assign(time_slot, assignment)
-        return new_schedule
+        """スケジュールのコピー（コピーオンライトで構造を共有）"""
+        return schedule.fork()
     
     def _distribute_subject(
         self,
@@ -793,11 +808,8 @@ class SimulatedAnnealingStrategy(OptimizationStrategy, LoggingMixin):
         pass
     
     def _copy_schedule(self, schedule: Schedule) -> Schedule:
-        """スケジュールのコピー"""
-        new_schedule = Schedule()
-        for time_slot, assignment in schedule.get_all_assignments():
-            new_schedule.assign(time_slot, assignment)
-        return new_schedule
+        """スケジュールのコピー（コピーオンライトで構造を共有）"""
+        return schedule.fork()
     
     def _try_swap(
         self,
@@ -844,7 +856,8 @@ class OptimizationStrategyPool(LoggingMixin):
     def __init__(
         self,
         beam_search_enabled: bool = True,
-        beam_width: int = 10
+        beam_width: int = 10,
+        lns_enabled: bool = True
     ):
         super().__init__()
         self.strategies = {}
@@ -856,6 +869,11 @@ class OptimizationStrategyPool(LoggingMixin):
         self.register_strategy(LocalSearchStrategy())
         self.register_strategy(SimulatedAnnealingStrategy())
         
+        if lns_enabled:
+            # LNSはこのモジュールの OptimizationStrategy を継承するため、ここで読み込む
+            from .large_neighborhood_search import LargeNeighborhoodSearchStrategy
+            self.register_strategy(LargeNeighborhoodSearchStrategy())
+        
         # 実行統計
         self.execution_stats = defaultdict(lambda: {
             'executions': 0,
@@ -873,12 +891,20 @@ class OptimizationStrategyPool(LoggingMixin):
         self,
         context: Dict[str, Any]
     ) -> OptimizationStrategy:
-        """コンテキストに基づいて戦略を選択"""
+        """コンテキストに基づいて戦略を選択
+
+        LNS は optimization_level が 'lns' のときだけ選ぶ（generate --use-ultra-optimized
+        --ultra-optimization-level lns で指定）。
+        """
         violations = context.get('violations', 0)
         conflicts = context.get('teacher_conflicts', 0)
         time_limit = context.get('time_limit', 300)
         optimization_level = context.get('optimization_level', 'balanced')
         
+        # LNSモードの場合は大近傍探索（違反の周辺だけを解き直す）
+        if optimization_level == 'lns' and 'LNS' in self.strategies:
+            return self.strategies['LNS']
+        
         # 違反が多い場合は局所探索
         if violations + conflicts > 20:
             return self.strategies.get('LocalSearch', self.strategies['BeamSearch'])
@@ -954,4 +980,4 @@ class OptimizationStrategyPool(LoggingMixin):
     
     def get_statistics(self) -> Dict[str, Any]:
         """実行統計を取得"""
-        return dict(self.execution_stats)
\ No newline at end of file
+        return dict(self.execution_stats)
\ No newline at end of file
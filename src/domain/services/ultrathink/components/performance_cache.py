@@ -425,34 +425,12 @@ class PerformanceCache(LoggingMixin):
         return f"func_{hashlib.md5(key_str.encode()).hexdigest()}"
     
     def _serialize_schedule(self, schedule: Schedule) -> bytes:
-        """スケジュールをシリアライズ"""
-        # 簡易実装：割り当てをタプルのリストに変換
-        assignments = []
-        for time_slot, assignment in schedule.get_all_assignments():
-            assignments.append((
-                (time_slot.day, time_slot.period),
-                (assignment.class_ref.grade, assignment.class_ref.class_number),
-                assignment.subject.name,
-                assignment.teacher.name if assignment.teacher else None
-            ))
-        
-        return pickle.dumps(assignments)
+        """スケジュールをシリアライズ（ロック・5組・テスト期間を含むバイナリ形式）"""
+        return schedule.to_bytes()
     
     def _deserialize_schedule(self, data: bytes) -> Schedule:
         """スケジュールをデシリアライズ"""
-        assignments = pickle.loads(data)
-        schedule = Schedule()
-        
-        for (day, period), (grade, class_num), subject_name, teacher_name in assignments:
-            time_slot = TimeSlot(day, period)
-            class_ref = ClassReference(grade, class_num)
-            subject = Subject(subject_name)
-            teacher = Teacher(teacher_name) if teacher_name else None
-            
-            assignment = Assignment(class_ref, subject, teacher)
-            schedule.assign(time_slot, assignment)
-        
-        return schedule
+        return Schedule.from_bytes(data)
     
     def get_hit_rate(self) -> float:
         """キャッシュヒット率を取得"""
@@ -363,7 +363,7 @@ class PipelineOrchestrator(LoggingMixin):
         )
         
         # CRITICAL FIX: Keep a copy of the original schedule
-        original_schedule = context.schedule.copy()
+        original_schedule = context.schedule.clone()
         
         # 最適化コンテキスト作成
         opt_context = {
@@ -262,6 +262,25 @@ class ConstraintValidatorImproved(LoggingMixin):
             return (time_slot.day, time_slot.period) not in absences
         return True
     
+    def find_absent_teacher_assignments(
+        self,
+        schedule: Schedule,
+        school: School,
+        time_slot: TimeSlot
+    ) -> List[Tuple[ClassReference, Assignment]]:
+        """指定された時間枠で不在の教師が担当している (クラス, 割り当て)"""
+        absent = []
+        for class_ref in school.get_all_classes():
+            assignment = schedule.get_assignment(time_slot, class_ref)
+            if assignment and not self.check_teacher_availability(assignment.teacher, time_slot):
+                absent.append((class_ref, assignment))
+        return absent
+    
+    @staticmethod
+    def teacher_absence_message(assignment: Assignment, time_slot: TimeSlot, class_ref: ClassReference) -> str:
+        """教師不在違反のメッセージ（制約・一括検証で共通）"""
+        return f"{assignment.teacher.name}先生が不在の{time_slot}に{class_ref}で授業が配置されています"
+    
     def check_teacher_conflict_with_rules(
         self, 
         schedule: Schedule, 
@@ -530,16 +549,14 @@ class ConstraintValidatorImproved(LoggingMixin):
             for period in range(1, 7):
                 time_slot = TimeSlot(day, period)
                 
-                for class_ref in school.get_all_classes():
-                    assignment = schedule.get_assignment(time_slot, class_ref)
-                    if assignment and not self.check_teacher_availability(assignment.teacher, time_slot):
-                        violations.append({
-                            'type': 'teacher_absence',
-                            'class_ref': class_ref,
-                            'time_slot': time_slot,
-                            'teacher': assignment.teacher.name,
-                            'message': f"{assignment.teacher.name}先生が不在の{time_slot}に{class_ref}で授業が配置されています"
-                        })
+                for class_ref, assignment in self.find_absent_teacher_assignments(schedule, school, time_slot):
+                    violations.append({
+                        'type': 'teacher_absence',
+                        'class_ref': class_ref,
+                        'time_slot': time_slot,
+                        'teacher': assignment.teacher.name,
+                        'message': self.teacher_absence_message(assignment, time_slot, class_ref)
+                    })
         
         return violations
 
@@ -20,7 +20,7 @@ class DailyDuplicatePreventer:
     
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.grade5_classes = {"1年5組", "2年5組", "3年5組"}
+        self.grade5_classes = {ClassReference(1, 5), ClassReference(2, 5), ClassReference(3, 5)}
         
         # Cache for daily subject counts
         self._daily_counts_cache = {}
@@ -68,13 +68,12 @@ class DailyDuplicatePreventer:
             return False, f"{subject.name}は{time_slot.day}曜日に既に{current_count}回配置されています（最大{max_allowed}回）"
         
         # Additional check for Grade 5 synchronization
-        if class_ref.full_name in self.grade5_classes:
+        if class_ref in self.grade5_classes:
             # Check all Grade 5 classes
             for grade5_class in self.grade5_classes:
-                if grade5_class != class_ref.full_name:
-                    other_ref = ClassReference.from_string(grade5_class)
+                if grade5_class != class_ref:
                     other_count = self.get_subject_count_for_day(
-                        schedule, other_ref, time_slot.day, subject
+                        schedule, grade5_class, time_slot.day, subject
                     )
                     if other_count >= max_allowed:
                         return False, f"5組同期制約: {grade5_class}が{time_slot.day}曜日に{subject.name}を{other_count}回持っています"
@@ -132,7 +131,7 @@ class DailyDuplicatePreventer:
         """Find subjects that can be safely placed without causing duplicates"""
         safe_subjects = []
         
-        for subject in school.subjects.values():
+        for subject in school.get_all_subjects():
             if subject.name in FIXED_SUBJECTS:
                 continue
                 
@@ -14,6 +14,7 @@ from ...value_objects.time_slot import TimeSlot, ClassReference
 from ...value_objects.assignment import Assignment
 from ..synchronizers.exchange_class_service import ExchangeClassService
 from ..core.unified_constraint_system import UnifiedConstraintSystem, AssignmentContext
+from ..core.adaptive_check_pipeline import AdaptiveCheckPipeline
 from ...utils.schedule_utils import ScheduleUtils
 from ....shared.mixins.logging_mixin import LoggingMixin
 
@@ -67,6 +68,9 @@ class UnifiedConstraintValidator(LoggingMixin):
         
         # 学習ルール（QandAシステムから）
         self._learned_rules = self._load_learned_rules()
+        
+        # 配置前チェックのパイプライン
+        self._precheck_pipeline = self._build_precheck_pipeline()
     
     def _load_grade5_classes(self) -> None:
         """5組クラスを読み込む"""
@@ -157,23 +161,12 @@ class UnifiedConstraintValidator(LoggingMixin):
         
         self._stats['cache_misses'] += 1
         
-        # 基本的なチェック
-        basic_check = self._check_basic_constraints(schedule, school, time_slot, assignment)
-        if not basic_check[0]:
-            self._cache_validation_results[cache_key] = basic_check
-            return basic_check
-        
-        # 学習ルールの適用
-        learned_check = self._check_learned_rules(schedule, school, time_slot, assignment)
-        if not learned_check[0]:
-            self._cache_validation_results[cache_key] = learned_check
-            return learned_check
-        
-        # レベル別制約チェック
-        level_check = self._check_level_constraints(schedule, school, time_slot, assignment, check_level)
-        if not level_check[0]:
-            self._cache_validation_results[cache_key] = level_check
-            return level_check
+        # 基本・学習ルール・レベル別のチェック（実行時の統計で順序を最適化）
+        reason = self._precheck_pipeline.run(schedule, school, time_slot, assignment, check_level)
+        if reason is not None:
+            result = (False, reason)
+            self._cache_validation_results[cache_key] = result
+            return result
         
         # 統一制約システムでのチェック（設定されている場合）
         if self.unified_system:
@@ -191,81 +184,107 @@ class UnifiedConstraintValidator(LoggingMixin):
         self._cache_validation_results[cache_key] = (True, None)
         return True, None
     
-    def _check_basic_constraints(
-        self,
-        schedule: Schedule,
-        school: School,
-        time_slot: TimeSlot,
-        assignment: Assignment
-    ) -> Tuple[bool, Optional[str]]:
-        """基本的な制約をチェック"""
-        # ロックチェック
-        if schedule.is_locked(time_slot, assignment.class_ref):
-            return False, "このスロットはロックされています"
+    def _build_precheck_pipeline(self) -> AdaptiveCheckPipeline:
+        """配置前チェックのパイプラインを作成
         
-        # 既存割り当てチェック
-        existing = schedule.get_assignment(time_slot, assignment.class_ref)
-        if existing:
-            return False, "既に割り当てがあります"
-        
-        # テスト期間チェック
+        各チェックは (schedule, school, time_slot, assignment, check_level) を受け取り、
+        配置不可ならエラーメッセージ、可ならNoneを返す。初期順序は
+        基本チェック → 学習ルール → レベル別チェック。
+        """
+        return AdaptiveCheckPipeline([
+            ('locked', self._precheck_locked),
+            ('occupied', self._precheck_occupied),
+            ('test_period', self._precheck_test_period),
+            ('teacher_absence', self._precheck_teacher_absence),
+            ('teacher_conflict', self._precheck_teacher_conflict),
+            ('learned_rules', self._precheck_learned_rules),
+            ('daily_duplicate', self._precheck_daily_duplicate),
+            ('gym', self._precheck_gym),
+            ('exchange_class', self._precheck_exchange_class),
+            ('parent_class', self._precheck_parent_class),
+            ('grade5_sync', self._precheck_grade5_sync),
+        ])
+    
+    # --- 基本的な制約 ---
+    
+    def _precheck_locked(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """ロックチェック"""
+        if schedule.is_locked(time_slot, assignment.class_ref):
+            return "このスロットはロックされています"
+        return None
+    
+    def _precheck_occupied(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """既存割り当てチェック"""
+        if schedule.get_assignment(time_slot, assignment.class_ref):
+            return "既に割り当てがあります"
+        return None
+    
+    def _precheck_test_period(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """テスト期間チェック"""
         if self.is_test_period(time_slot):
-            return False, "テスト期間です"
-        
-        # 教師不在チェック（キャッシュ付き）
+            return "テスト期間です"
+        return None
+    
+    def _precheck_teacher_absence(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """教師不在チェック（キャッシュ付き）"""
         if assignment.teacher and not self._check_teacher_availability_cached(assignment.teacher, time_slot):
-            return False, f"{assignment.teacher.name}先生は不在です"
-        
-        # 教師重複チェック
+            return f"{assignment.teacher.name}先生は不在です"
+        return None
+    
+    def _precheck_teacher_conflict(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """教師重複チェック"""
         conflict_class = self.check_teacher_conflict(schedule, school, time_slot, assignment)
         if conflict_class:
-            return False, f"{assignment.teacher.name}先生は{conflict_class}で授業があります"
-        
-        return True, None
+            return f"{assignment.teacher.name}先生は{conflict_class}で授業があります"
+        return None
     
-    def _check_level_constraints(
-        self,
-        schedule: Schedule,
-        school: School,
-        time_slot: TimeSlot,
-        assignment: Assignment,
-        check_level: str
-    ) -> Tuple[bool, Optional[str]]:
-        """チェックレベルに応じた制約をチェック"""
-        # 日内重複チェック
+    def _precheck_learned_rules(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """学習ルールの適用"""
+        can_place, message = self._check_learned_rules(schedule, school, time_slot, assignment)
+        return None if can_place else message
+    
+    # --- チェックレベル別の制約 ---
+    
+    def _precheck_daily_duplicate(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """日内重複チェック（strict / normal のみ）"""
         if check_level in ['strict', 'normal']:
             duplicate_count = self._get_daily_subject_count_cached(schedule, assignment.class_ref, time_slot.day, assignment.subject)
             max_allowed = self.get_max_daily_occurrences(assignment.subject, check_level)
             if duplicate_count >= max_allowed:
-                return False, f"{assignment.subject.name}は既に{duplicate_count}回配置されています"
-        
-        # 体育館使用チェック
+                return f"{assignment.subject.name}は既に{duplicate_count}回配置されています"
+        return None
+    
+    def _precheck_gym(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """体育館使用チェック"""
         if assignment.subject.name == "保":
             gym_class = self.check_gym_conflict(schedule, school, time_slot, assignment.class_ref)
             if gym_class:
-                return False, f"体育館は{gym_class}が使用中です"
-        
-        # 交流学級制約チェック
+                return f"体育館は{gym_class}が使用中です"
+        return None
+    
+    def _precheck_exchange_class(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """交流学級制約チェック"""
         if self.exchange_service.is_exchange_class(assignment.class_ref):
             if not self.exchange_service.can_place_subject_for_exchange_class(
                 schedule, time_slot, assignment.class_ref, assignment.subject
             ):
-                return False, "交流学級の制約に違反します"
-        
-        # 親学級制約チェック
+                return "交流学級の制約に違反します"
+        return None
+    
+    def _precheck_parent_class(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """親学級制約チェック"""
         if self.exchange_service.is_parent_class(assignment.class_ref):
             if not self.exchange_service.can_place_subject_for_parent_class(
                 schedule, time_slot, assignment.class_ref, assignment.subject
             ):
-                return False, "親学級の制約に違反します（交流学級が自立活動中）"
-        
-        # 5組同期チェック
+                return "親学級の制約に違反します（交流学級が自立活動中）"
+        return None
+    
+    def _precheck_grade5_sync(self, schedule, school, time_slot, assignment, check_level) -> Optional[str]:
+        """5組同期チェック"""
         if assignment.class_ref in self.grade5_classes:
-            sync_error = self.check_grade5_sync(schedule, time_slot, assignment)
-            if sync_error:
-                return False, sync_error
-        
-        return True, None
+            return self.check_grade5_sync(schedule, time_slot, assignment)
+        return None
     
     def _check_learned_rules(
         self,
@@ -469,7 +488,8 @@ class UnifiedConstraintValidator(LoggingMixin):
             'cache_misses': self._stats['cache_misses'],
             'cache_hit_rate': hit_rate,
             'total_checks': self._stats['total_checks'],
-            'learned_rules_applied': self._stats['learned_rules_applied']
+            'learned_rules_applied': self._stats['learned_rules_applied'],
+            'prechecks': self._precheck_pipeline.get_statistics()
         }
     
     def validate_all_constraints(
@@ -0,0 +1,225 @@
+"""ベクトル化制約検証
+
+スケジュールをテンソル（時間枠×クラス）に変換し、標準制約の違反候補を
+NumPyの配列演算でまとめて検出する。
+
+違反の文言・順序は制約オブジェクトの validate() と同一にするため、
+スコープを持つ制約は「配列演算で違反の可能性があるスコープを絞り込み、
+そのスコープだけ validate_scope() で確定する」方式を取る。
+対応していない制約は従来どおり validate() で検証する。
+"""
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from ....shared.mixins.logging_mixin import LoggingMixin
+from ...constants import FIXED_SUBJECTS
+from ...constraints.base import ConstraintPriority
+from ...constraints.daily_duplicate_constraint import DailyDuplicateConstraintRefactored
+from ...constraints.exchange_class_sync_constraint import ExchangeClassSyncConstraintRefactored
+from ...constraints.grade5_same_subject_constraint import Grade5SameSubjectConstraint
+from ...constraints.gym_usage_constraint import GymUsageConstraintRefactored
+from ...constraints.teacher_absence_constraint import TeacherAbsenceConstraintRefactored
+from ...constraints.teacher_conflict_constraint import TeacherConflictConstraintRefactoredV2
+from ...entities.schedule_grid import ALL_TIME_SLOTS, DAY_COUNT
+from ...entities.schedule_tensor import EMPTY, ScheduleTensor
+from ...value_objects.assignment import ConstraintViolation
+from ...value_objects.time_slot import Teacher
+from ..core.unified_constraint_system import ValidationResult
+
+if TYPE_CHECKING:
+    from ...constraints.base import Constraint
+    from ...entities.schedule import Schedule
+    from ...entities.school import School
+    from ..core.unified_constraint_system import UnifiedConstraintSystem
+
+
+class VectorizedConstraintValidator(LoggingMixin):
+    """UnifiedConstraintSystemに登録された制約をベクトル化して検証する
+
+    validate_schedule() は UnifiedConstraintSystem.validate_schedule() と同じ
+    ValidationResult（違反の内容・順序とも同一）を返す。
+    """
+
+    def __init__(self, constraint_system: 'UnifiedConstraintSystem'):
+        super().__init__()
+        self.constraint_system = constraint_system
+        self._kernels: Dict[type, Callable] = {
+            TeacherConflictConstraintRefactoredV2: self._teacher_conflict,
+            DailyDuplicateConstraintRefactored: self._daily_duplicate,
+            GymUsageConstraintRefactored: self._gym_usage,
+            Grade5SameSubjectConstraint: self._grade5_same_subject,
+            ExchangeClassSyncConstraintRefactored: self._exchange_class_sync,
+            TeacherAbsenceConstraintRefactored: self._teacher_absence,
+        }
+        self._vectorized_runs = 0
+        self._fallback_runs = 0
+
+    def supports(self, constraint: 'Constraint') -> bool:
+        """ベクトル化に対応した制約か（サブクラスは挙動が異なり得るため対象外）"""
+        return type(constraint) in self._kernels
+
+    def validate_schedule(self, schedule: 'Schedule', school: 'School') -> ValidationResult:
+        """スケジュール全体を検証"""
+        tensor = schedule.to_tensor(school.get_all_classes())
+        all_violations = []
+        violation_count_by_priority = {p: 0 for p in ConstraintPriority}
+
+        # 優先度順に検証
+        for priority in sorted(ConstraintPriority, key=lambda p: p.value, reverse=True):
+            for constraint in self.constraint_system.constraints[priority]:
+                try:
+                    kernel = self._kernels.get(type(constraint))
+                    if kernel is not None:
+                        violations = kernel(constraint, tensor, schedule, school)
+                        self._vectorized_runs += 1
+                    else:
+                        violations = constraint.validate(schedule, school).violations
+                        self._fallback_runs += 1
+
+                    if violations:
+                        all_violations.extend(violations)
+                        violation_count_by_priority[priority] += len(violations)
+
+                        self.logger.debug(
+                            f"{constraint.name}: {len(violations)}件の違反"
+                        )
+                except Exception as e:
+                    self.logger.error(f"制約検証エラー ({constraint.name}): {e}")
+
+        return ValidationResult(
+            is_valid=len(all_violations) == 0,
+            violations=all_violations,
+            violation_count_by_priority=violation_count_by_priority
+        )
+
+    def get_statistics(self) -> Dict[str, int]:
+        """ベクトル化／従来方式の実行回数"""
+        return {
+            'vectorized_runs': self._vectorized_runs,
+            'fallback_runs': self._fallback_runs,
+        }
+
+    # ========== カーネル ==========
+
+    def _teacher_conflict(self, constraint, tensor: ScheduleTensor, schedule, school) -> List[ConstraintViolation]:
+        """同じ時間枠に同じ教員が2クラス以上ある時間枠だけを検証"""
+        teachers = np.sort(tensor.teacher_ids, axis=1)
+        duplicated = (teachers[:, 1:] == teachers[:, :-1]) & (teachers[:, 1:] != EMPTY)
+        violations = []
+        for slot in np.flatnonzero(duplicated.any(axis=1)):
+            violations.extend(constraint.validate_scope(schedule, school, ALL_TIME_SLOTS[slot]))
+        return violations
+
+    def _daily_duplicate(self, constraint, tensor: ScheduleTensor, schedule, school) -> List[ConstraintViolation]:
+        """同じ日に上限を超える教科があるクラス・曜日だけを検証"""
+        subjects = tensor.subject_ids.reshape(DAY_COUNT, -1, tensor.class_count)
+        checked = (subjects != EMPTY) & ~self._lookup(tensor.subject_mask(FIXED_SUBJECTS), subjects)
+        max_allowed = np.array(
+            [constraint._get_max_allowed(name) for name in tensor.subject_names], dtype=np.int32
+        )
+
+        # (曜日, 時限, 時限, クラス) の一致から各コマの教科の日内回数を求める
+        same = (subjects[:, :, None, :] == subjects[:, None, :, :]) & checked[:, None, :, :]
+        counts = same.sum(axis=2)
+        exceeded = checked & (counts > self._lookup(max_allowed, subjects))
+
+        violations = []
+        # 全体検証と同じ クラス→曜日 の順に確定する
+        for column, day in np.argwhere(exceeded.any(axis=1).T):
+            scope_key = (tensor.classes[column], ALL_TIME_SLOTS[day * subjects.shape[1]].day)
+            violations.extend(constraint.validate_scope(schedule, school, scope_key))
+        return violations
+
+    def _gym_usage(self, constraint, tensor: ScheduleTensor, schedule, school) -> List[ConstraintViolation]:
+        """保健体育が2クラス以上ある時間枠だけを検証"""
+        pe_id = tensor.subject_id("保")
+        if pe_id == EMPTY:
+            return []
+        violations = []
+        for slot in np.flatnonzero((tensor.subject_ids == pe_id).sum(axis=1) > 1):
+            violations.extend(constraint.validate_scope(schedule, school, ALL_TIME_SLOTS[slot]))
+        return violations
+
+    def _grade5_same_subject(self, constraint, tensor: ScheduleTensor, schedule, school) -> List[ConstraintViolation]:
+        """5組の教科が揃っていない時間枠だけを検証"""
+        columns = [tensor.column(class_ref) for class_ref in constraint.grade5_classes]
+        if not columns or EMPTY in columns:
+            return constraint.validate(schedule, school).violations
+        subjects = tensor.subject_ids[:, columns]
+        violations = []
+        for slot in np.flatnonzero((subjects != subjects[:, :1]).any(axis=1)):
+            violations.extend(constraint.validate_scope(schedule, school, ALL_TIME_SLOTS[slot]))
+        return violations
+
+    def _exchange_class_sync(self, constraint, tensor: ScheduleTensor, schedule, school) -> List[ConstraintViolation]:
+        """交流学級と親学級の組ごとに、同期が崩れている可能性のあるコマだけを検証"""
+        service = constraint.exchange_service
+        pairs = list(service._exchange_parent_map.items())
+        columns = [(tensor.column(exchange), tensor.column(parent)) for exchange, parent in pairs]
+        if any(EMPTY in pair for pair in columns):
+            return constraint.validate(schedule, school).violations
+
+        jiritsu = tensor.subject_mask(service.JIRITSU_SUBJECTS)
+        violations = []
+        for (exchange_class, parent_class), (exchange_col, parent_col) in zip(pairs, columns):
+            exchange = tensor.subject_ids[:, exchange_col]
+            parent = tensor.subject_ids[:, parent_col]
+            # 自立活動・片方だけ空き・教科不一致のいずれかのコマだけが違反になり得る
+            candidates = (self._lookup(jiritsu, exchange) & (exchange != EMPTY)) | (exchange != parent)
+            for slot in np.flatnonzero(candidates):
+                time_slot = ALL_TIME_SLOTS[slot]
+                exchange_assignment = tensor.assignments[exchange_col][slot]
+                parent_assignment = tensor.assignments[parent_col][slot]
+                for check in (service.validate_jiritsu_placement, service.validate_exchange_sync):
+                    valid, error_msg = check(exchange_assignment, parent_assignment, time_slot)
+                    if not valid:
+                        violations.append(ConstraintViolation(
+                            description=error_msg,
+                            time_slot=time_slot,
+                            assignment=exchange_assignment,
+                            severity="ERROR"
+                        ))
+        return violations
+
+    def _teacher_absence(self, constraint, tensor: ScheduleTensor, schedule, school) -> List[ConstraintViolation]:
+        """不在の教員が担当しているセルを一括で検出
+
+        不在の判定とメッセージは制約と同じConstraintValidatorのものを使い、
+        教員×時間枠の表にしてから全セルを一度に引く。
+        """
+        validator = constraint.constraint_validator
+        if not validator.teacher_absences or not tensor.teacher_names:
+            return []
+
+        absent = np.zeros((len(tensor.teacher_names), len(ALL_TIME_SLOTS)), dtype=bool)
+        for teacher_id, teacher_name in enumerate(tensor.teacher_names):
+            if teacher_name not in validator.teacher_absences:
+                continue
+            teacher = Teacher(teacher_name)
+            for slot, time_slot in enumerate(ALL_TIME_SLOTS):
+                absent[teacher_id, slot] = not validator.check_teacher_availability(teacher, time_slot)
+
+        teacher_ids = tensor.teacher_ids
+        slots = np.broadcast_to(np.arange(len(ALL_TIME_SLOTS))[:, None], teacher_ids.shape)
+        hits = (teacher_ids != EMPTY) & absent[np.maximum(teacher_ids, 0), slots]
+
+        violations = []
+        for slot, column in np.argwhere(hits):
+            time_slot = ALL_TIME_SLOTS[slot]
+            class_ref = tensor.classes[column]
+            assignment = tensor.assignments[column][slot]
+            violations.append(ConstraintViolation(
+                description=validator.teacher_absence_message(assignment, time_slot, class_ref),
+                time_slot=time_slot,
+                assignment=assignment,
+                severity="ERROR"
+            ))
+        return violations
+
+    @staticmethod
+    def _lookup(table: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """ID配列で表を引く（EMPTYの位置は表の先頭を引くので、呼び出し側でマスクすること）"""
+        if table.size == 0:
+            return np.zeros(ids.shape, dtype=table.dtype)
+        return table[np.maximum(ids, 0)]
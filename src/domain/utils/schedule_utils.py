@@ -1,7 +1,20 @@
-"""時間割操作の共通ユーティリティ"""
+"""時間割操作の共通ユーティリティ
 
-import pandas as pd
-from typing import Optional, List, Tuple
+pandas はDataFrameを扱う関数が呼ばれるまでインポートしない（起動を速くするため）。
+"""
+
+from typing import Optional, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _isna(value) -> bool:
+    """pandas.isna（文字列ならpandasを読み込まずにFalse）"""
+    if isinstance(value, str):
+        return False
+    import pandas as pd
+    return pd.isna(value)
 
 
 class ScheduleUtils:
@@ -17,7 +30,7 @@ class ScheduleUtils:
     JIRITSU_SUBJECTS = ["自立", "日生", "生単", "作業"]
     
     @staticmethod
-    def get_cell(df: pd.DataFrame, day: str, period: str) -> Optional[int]:
+    def get_cell(df: 'pd.DataFrame', day: str, period: str) -> Optional[int]:
         """指定された曜日と時限のセル位置（列番号）を取得
         
         Args:
@@ -37,7 +50,7 @@ class ScheduleUtils:
         return None
     
     @staticmethod
-    def get_class_row(df: pd.DataFrame, class_name: str) -> Optional[int]:
+    def get_class_row(df: 'pd.DataFrame', class_name: str) -> Optional[int]:
         """指定されたクラスの行番号を取得
         
         Args:
@@ -62,7 +75,7 @@ class ScheduleUtils:
         Returns:
             固定科目の場合True
         """
-        if pd.isna(subject):
+        if _isna(subject):
             return True
         return subject in ScheduleUtils.FIXED_SUBJECTS
     
@@ -76,7 +89,7 @@ class ScheduleUtils:
         Returns:
             自立活動関連科目の場合True
         """
-        if pd.isna(subject):
+        if _isna(subject):
             return False
         return subject in ScheduleUtils.JIRITSU_SUBJECTS
     
@@ -105,7 +118,7 @@ class ScheduleUtils:
         return "5組" in class_name
     
     @staticmethod
-    def get_day_subjects(df: pd.DataFrame, class_name: str, day: str) -> List[str]:
+    def get_day_subjects(df: 'pd.DataFrame', class_name: str, day: str) -> List[str]:
         """指定クラスの指定曜日の科目リストを取得
         
         Args:
@@ -125,13 +138,13 @@ class ScheduleUtils:
             col = ScheduleUtils.get_cell(df, day, str(period))
             if col:
                 subject = df.iloc[class_row, col]
-                if pd.notna(subject) and subject != "" and not ScheduleUtils.is_fixed_subject(subject):
+                if not _isna(subject) and subject != "" and not ScheduleUtils.is_fixed_subject(subject):
                     subjects.append(subject)
         
         return subjects
     
     @staticmethod
-    def would_cause_daily_duplicate(df: pd.DataFrame, class_name: str, subject: str, day: str) -> bool:
+    def would_cause_daily_duplicate(df: 'pd.DataFrame', class_name: str, subject: str, day: str) -> bool:
         """日内重複が発生するかチェック
         
         Args:
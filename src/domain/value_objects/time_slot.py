@@ -1,4 +1,9 @@
-"""時間枠を表す値オブジェクト"""
+"""時間枠を表す値オブジェクト
+
+TimeSlot・Subject・Teacher・ClassReferenceはフライウェイトとして扱い、同じ値のインスタンスは
+プロセス内で1つだけ作る。コンストラクタ引数をキーにした辞書から既存のインスタンスを返すため、
+__post_init__ の検証・正規化は値ごとに最初の1回だけ実行され、等価比較もまず同一性で判定できる。
+"""
 from dataclasses import dataclass
 from typing import Literal
 from .subject_validator import SubjectValidator
@@ -10,8 +15,48 @@ DayOfWeek = Literal["月", "火", "水", "木", "金"]
 Period = Literal[1, 2, 3, 4, 5, 6]
 
 
-@dataclass(frozen=True)
-class TimeSlot:
+class _InternedMeta(type):
+    """同じ値のインスタンスを1つだけ作るメタクラス"""
+    
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._instances = {}
+    
+    def __call__(cls, *args, **kwargs):
+        instances = cls._instances
+        if not kwargs:
+            try:
+                return instances[args]
+            except KeyError:
+                pass
+            except TypeError:
+                # ハッシュできない引数はそのまま検証に回す
+                return super().__call__(*args)
+        
+        instance = super().__call__(*args, **kwargs)
+        # 正規化後の値（"月曜" → "月" など）が同じなら既存のインスタンスを使う
+        instance = instances.setdefault(instance._intern_key(), instance)
+        if not kwargs:
+            instances[args] = instance
+        return instance
+
+
+class _InternedValue(metaclass=_InternedMeta):
+    """インターンされる値オブジェクトの基底クラス"""
+    
+    def _intern_key(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__dataclass_fields__)
+    
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._intern_key() == other._intern_key()
+
+
+@dataclass(frozen=True, eq=False)
+class TimeSlot(_InternedValue):
     """時間枠（曜日・校時）を表す不変オブジェクト"""
     
     day: DayOfWeek
@@ -29,6 +74,15 @@ class TimeSlot:
             raise ValidationError(f"Invalid day: {self.day}")
         if not ValidationUtils.is_valid_period(self.period):
             raise ValidationError(f"Invalid period: {self.period}")
+        # 辞書キーとして頻繁に使われるためハッシュ値を事前計算
+        object.__setattr__(self, '_hash', hash((self.day, self.period)))
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __reduce__(self):
+        # ハッシュ値はプロセスごとに異なるため、復元時に再計算させる
+        return (TimeSlot, (self.day, self.period))
     
     def __str__(self) -> str:
         return f"{self.day}曜{self.period}校時"
@@ -54,8 +108,8 @@ class TimeSlot:
         return str(self)
 
 
-@dataclass(frozen=True)
-class Subject:
+@dataclass(frozen=True, eq=False)
+class Subject(_InternedValue):
     """教科を表す値オブジェクト"""
     
     name: str
@@ -69,6 +123,13 @@ class Subject:
         validator = SubjectValidator()
         if not validator.is_valid_subject(self.name):
             raise ValidationError(f"Invalid subject: {self.name}")
+        object.__setattr__(self, '_hash', hash((self.name,)))
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __reduce__(self):
+        return (Subject, (self.name,))
     
     def __str__(self) -> str:
         return self.name
@@ -109,8 +170,8 @@ class Subject:
         return str(self)
 
 
-@dataclass(frozen=True)
-class Teacher:
+@dataclass(frozen=True, eq=False)
+class Teacher(_InternedValue):
     """教員を表す値オブジェクト"""
     
     name: str
@@ -118,6 +179,13 @@ class Teacher:
     def __post_init__(self):
         if not ValidationUtils.validate_teacher_name(self.name):
             raise ValidationError(f"Invalid teacher name: {self.name}")
+        object.__setattr__(self, '_hash', hash((self.name,)))
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __reduce__(self):
+        return (Teacher, (self.name,))
     
     def __str__(self) -> str:
         return self.name
@@ -127,8 +195,8 @@ class Teacher:
         return str(self)
 
 
-@dataclass(frozen=True)
-class ClassReference:
+@dataclass(frozen=True, eq=False)
+class ClassReference(_InternedValue):
     """クラス参照を表す値オブジェクト"""
     
     grade: int
@@ -137,6 +205,13 @@ class ClassReference:
     def __post_init__(self):
         if not ValidationUtils.is_valid_class_reference(self.grade, self.class_number):
             raise ValidationError(f"Invalid class reference: {self.grade}年{self.class_number}組")
+        object.__setattr__(self, '_hash', hash((self.grade, self.class_number)))
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __reduce__(self):
+        return (ClassReference, (self.grade, self.class_number))
     
     @property
     def full_name(self) -> str:
@@ -176,4 +251,14 @@ class ClassReference:
         if parent_info is None:
             raise ValidationError(f"Parent class not found for {self.full_name}")
         parent_grade, parent_class = parent_info[0]
-        return ClassReference(parent_grade, parent_class)
\ No newline at end of file
+        return ClassReference(parent_grade, parent_class)
+
+
+# 30コマと全クラスは最初に作っておく
+for _day in ValidationUtils.VALID_DAYS:
+    for _period in ValidationUtils.VALID_PERIODS:
+        TimeSlot(_day, _period)
+for _grade in range(1, 4):
+    for _class_number in range(1, 8):
+        if ValidationUtils.is_valid_class_reference(_grade, _class_number):
+            ClassReference(_grade, _class_number)
\ No newline at end of file
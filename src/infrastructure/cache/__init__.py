@@ -0,0 +1,8 @@
+"""解析結果のキャッシュ"""
+
+from .artifact_cache import ArtifactCache, get_artifact_cache
+
+__all__ = [
+    'ArtifactCache',
+    'get_artifact_cache'
+]
@@ -0,0 +1,182 @@
+"""起動時に作る解析結果のディスクキャッシュ
+
+ドキュメント（CLAUDE.md など）やQandAの解析結果を、元になったファイルの
+指紋とともに保存し、次回の起動ではファイルが変わっていなければ解析を省略します。
+
+- 指紋は (更新時刻, サイズ, SHA-256)。更新時刻とサイズが同じなら読み直さない
+- 更新時刻だけが変わった場合（チェックアウトやコピー）は内容のハッシュで判定する
+- ディレクトリを指定した場合は配下のすべてのファイルを元ファイルとして扱う
+"""
+import hashlib
+import logging
+import os
+import pickle
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...domain.interfaces.path_configuration import IPathConfiguration
+
+T = TypeVar('T')
+
+# (更新時刻ns, サイズ, SHA-256)。ファイルがなければ None
+Fingerprint = Optional[Tuple[int, int, str]]
+
+
+class ArtifactCache:
+    """元ファイルの指紋で無効化される解析結果のキャッシュ"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_path_config(cls, path_config: 'IPathConfiguration') -> 'ArtifactCache':
+        """パス設定からデータディレクトリ配下のcacheに保存するキャッシュを作成"""
+        return cls(path_config.data_dir / 'cache')
+
+    def get_or_build(
+        self,
+        name: str,
+        sources: Iterable[Path],
+        builder: Callable[[], T],
+        key: Optional[str] = None
+    ) -> T:
+        """元ファイルが変わっていなければ保存済みの結果を、変わっていれば builder() の結果を返す
+
+        Args:
+            name: キャッシュの名前（保存先のファイル名になる）
+            sources: 結果の元になるファイル・ディレクトリ
+            builder: 結果を作る関数（戻り値はpickleできること）
+            key: ファイル以外の入力（設定の内容ハッシュなど）。保存時と異なれば作り直す
+        """
+        paths = self._expand(sources)
+        entry = self._load(name)
+        if entry is not None and entry.get('key') == key:
+            fingerprints = self._revalidate(entry['sources'], paths)
+            if fingerprints is not None:
+                self.hits += 1
+                if fingerprints != entry['sources']:
+                    # 更新時刻だけが変わっていたので、次回はハッシュを計算しないよう更新
+                    self._save(name, fingerprints, entry['value'], key)
+                return entry['value']
+
+        self.misses += 1
+        value = builder()
+        self._save(name, {str(path): _fingerprint(path) for path in paths}, value, key)
+        return value
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """キャッシュを削除（name を省略するとすべて）"""
+        targets = [self._path(name)] if name else self.cache_dir.glob('*.pickle')
+        for path in targets:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _revalidate(
+        self,
+        stored: Dict[str, Fingerprint],
+        paths: List[Path]
+    ) -> Optional[Dict[str, Fingerprint]]:
+        """元ファイルが変わっていなければ最新の指紋を、変わっていればNoneを返す"""
+        if set(stored) != {str(path) for path in paths}:
+            return None
+        fingerprints = {}
+        for path in paths:
+            previous = stored[str(path)]
+            try:
+                stat = path.stat()
+            except OSError:
+                if previous is not None:
+                    return None
+                fingerprints[str(path)] = None
+                continue
+            if previous is None or previous[1] != stat.st_size:
+                return None
+            if previous[0] == stat.st_mtime_ns:
+                fingerprints[str(path)] = previous
+                continue
+            digest = _sha256(path)
+            if digest != previous[2]:
+                return None
+            fingerprints[str(path)] = (stat.st_mtime_ns, stat.st_size, digest)
+        return fingerprints
+
+    def _expand(self, sources: Iterable[Path]) -> List[Path]:
+        paths = []
+        for source in sources:
+            source = Path(source)
+            if source.is_dir():
+                paths.extend(sorted(path for path in source.rglob('*') if path.is_file()))
+            else:
+                paths.append(source)
+        return paths
+
+    def _load(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(name), 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # 壊れたファイルや、クラスの変更で読み込めなくなったキャッシュは作り直す
+            self.logger.debug(f"キャッシュを読み込めません ({name}): {e}")
+            return None
+        if not isinstance(entry, dict) or entry.get('version') != self.FORMAT_VERSION:
+            return None
+        return entry
+
+    def _save(
+        self,
+        name: str,
+        fingerprints: Dict[str, Fingerprint],
+        value: Any,
+        key: Optional[str] = None
+    ) -> None:
+        """結果を保存（書き込み途中で中断しても既存のファイルは壊れない）"""
+        path = self._path(name)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(
+                    {'version': self.FORMAT_VERSION, 'sources': fingerprints, 'key': key, 'value': value},
+                    f, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            self.logger.warning(f"キャッシュの保存に失敗しました ({name}): {e}")
+
+    def _path(self, name: str) -> Path:
+        return self.cache_dir / f"{re.sub(r'[^0-9A-Za-z_.-]', '_', name)}.pickle"
+
+
+def _fingerprint(path: Path) -> Fingerprint:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, _sha256(path)
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+_artifact_cache: Optional[ArtifactCache] = None
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """データディレクトリ配下の共有キャッシュを取得"""
+    global _artifact_cache
+    if _artifact_cache is None:
+        from ..config.path_config import path_config
+        _artifact_cache = ArtifactCache.from_path_config(path_config)
+    return _artifact_cache
@@ -0,0 +1,232 @@
+"""設定ディレクトリ（data/config）のスナップショット
+
+data/config 直下のCSV・JSONを一度だけ読み込んで解析し、読み取り専用の
+ConfigSnapshot にまとめます。解析結果は ArtifactCache に保存するため、
+設定ファイルが変わっていなければ次回以降の起動ではCSV・JSONを解析しません。
+
+各ローダーは ConfigFileReader を通して設定ファイルを読みます。スナップショットに
+含まれるファイルはメモリから返し、それ以外（別ディレクトリのファイルなど）は
+従来どおりファイルから読み込みます。
+"""
+import csv
+import hashlib
+import io
+import json
+import logging
+from dataclasses import dataclass, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from ..cache.artifact_cache import ArtifactCache
+from ...shared.utils.csv_operations import CSVOperations
+
+PathLike = Union[str, Path]
+
+# スナップショットに含める拡張子
+SNAPSHOT_SUFFIXES = ('.csv', '.json')
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """設定ファイルの解析結果（読み取り専用）
+
+    ArtifactCache やリーダー間で共有されるため、辞書は MappingProxyType、
+    JSONの配列はタプルに変換して保持します（呼び出し側には load_json がコピーを返す）。
+
+    Attributes:
+        config_dir: 設定ディレクトリ（絶対パス）
+        content_hash: すべての設定ファイルの内容から計算したハッシュ
+        stamps: 対象ファイル名 → (更新時刻ns, サイズ)。変更の検出に使う
+        tables: CSVファイル名 → 行（csv.reader と同じ形式）
+        documents: JSONファイル名 → 解析結果
+    """
+    config_dir: Path
+    content_hash: str
+    stamps: Mapping[str, Tuple[int, int]]
+    tables: Mapping[str, Tuple[Tuple[str, ...], ...]]
+    documents: Mapping[str, Any]
+
+    def __post_init__(self):
+        object.__setattr__(self, 'stamps', MappingProxyType(dict(self.stamps)))
+        object.__setattr__(self, 'tables', MappingProxyType(dict(self.tables)))
+        object.__setattr__(self, 'documents', MappingProxyType(
+            {name: _freeze(value) for name, value in self.documents.items()}
+        ))
+
+    def __reduce__(self):
+        # MappingProxyType はpickleできないため、通常の辞書に戻して保存する
+        return (self.__class__, (
+            self.config_dir,
+            self.content_hash,
+            dict(self.stamps),
+            dict(self.tables),
+            {name: _thaw(value) for name, value in self.documents.items()},
+        ))
+
+    @classmethod
+    def build(cls, config_dir: PathLike) -> 'ConfigSnapshot':
+        """設定ディレクトリ直下のCSV・JSONを読み込む
+
+        UTF-8として読めないファイルや壊れたJSONは解析結果に含めません（読み込み時に
+        従来どおりファイルから読んで、同じエラーになります）。変更の検出には含めます。
+        """
+        config_dir = Path(config_dir).resolve()
+        logger = logging.getLogger(__name__)
+        digest = hashlib.sha256()
+        stamps, tables, documents = {}, {}, {}
+        for path in _snapshot_files(config_dir):
+            data = path.read_bytes()
+            stat = path.stat()
+            stamps[path.name] = (stat.st_mtime_ns, stat.st_size)
+            digest.update(path.name.encode('utf-8') + b'\0' + hashlib.sha256(data).digest())
+            try:
+                text = data.decode('utf-8-sig')
+                if path.suffix == '.csv':
+                    tables[path.name] = tuple(tuple(row) for row in csv.reader(io.StringIO(text)))
+                else:
+                    documents[path.name] = json.loads(text)
+            except ValueError as e:
+                logger.debug(f"スナップショットに含めません ({path.name}): {e}")
+        return cls(config_dir, digest.hexdigest(), stamps, tables, documents)
+
+    def is_current(self) -> bool:
+        """設定ファイルが追加・削除・変更されていなければTrue"""
+        try:
+            return _current_stamps(self.config_dir) == self.stamps
+        except OSError:
+            return False
+
+    def name_of(self, path: PathLike) -> Optional[str]:
+        """スナップショットに含まれるファイルならファイル名を、そうでなければNoneを返す"""
+        path = Path(path)
+        if path.name not in self.tables and path.name not in self.documents:
+            return None
+        try:
+            if path.resolve().parent != self.config_dir:
+                return None
+        except OSError:
+            return None
+        return path.name
+
+    def read_csv_raw(self, name: str) -> List[List[str]]:
+        """CSVOperations.read_csv_raw と同じ形式の行のリスト"""
+        return [list(row) for row in self.tables[name]]
+
+    def read_csv(self, name: str, skip_empty_rows: bool = True, normalize_headers: bool = True) -> List[Dict[str, str]]:
+        """CSVOperations.read_csv と同じ形式の辞書のリスト"""
+        return CSVOperations.rows_to_dicts(
+            self.tables[name], skip_empty_rows=skip_empty_rows, normalize_headers=normalize_headers
+        )
+
+    def load_json(self, name: str) -> Any:
+        """JSONの解析結果（呼び出し側が変更してもよいようコピーを返す）"""
+        return _thaw(self.documents[name])
+
+
+def _freeze(value: Any) -> Any:
+    """JSONの解析結果を変更できない形（MappingProxyType・タプル）に変換"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """_freeze の逆変換（新しい辞書・リストを返す）"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _snapshot_files(config_dir: Path) -> List[Path]:
+    return sorted(
+        path for path in config_dir.iterdir()
+        if path.suffix in SNAPSHOT_SUFFIXES and path.is_file()
+    )
+
+
+def _current_stamps(config_dir: Path) -> Dict[str, Tuple[int, int]]:
+    stamps = {}
+    for path in _snapshot_files(config_dir):
+        stat = path.stat()
+        stamps[path.name] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+class ConfigFileReader:
+    """設定ファイルをスナップショット経由で読み込む
+
+    config_dir を省略した場合はスナップショットを使わず、常にファイルから読み込みます。
+    スナップショットは読み込みのたびに設定ファイルの更新時刻とサイズを確認し、
+    変わっていれば作り直します（長時間動くプロセスでも古い設定を使わない）。
+    """
+
+    CACHE_NAME = "config_snapshot"
+
+    def __init__(self, config_dir: Optional[PathLike] = None, cache: Optional[ArtifactCache] = None):
+        self.config_dir = Path(config_dir) if config_dir is not None else None
+        self.cache = cache
+        self.logger = logging.getLogger(__name__)
+        self._snapshot: Optional[ConfigSnapshot] = None
+
+    @property
+    def snapshot(self) -> Optional[ConfigSnapshot]:
+        """最新のスナップショット（設定ディレクトリがなければNone）"""
+        if self.config_dir is None or not self.config_dir.is_dir():
+            return None
+        if self._snapshot is None or not self._snapshot.is_current():
+            self._snapshot = self._load_snapshot()
+        return self._snapshot
+
+    def _load_snapshot(self) -> ConfigSnapshot:
+        if self.cache is None:
+            return ConfigSnapshot.build(self.config_dir)
+        snapshot = self.cache.get_or_build(
+            self.CACHE_NAME,
+            _snapshot_files(self.config_dir),
+            lambda: ConfigSnapshot.build(self.config_dir),
+            key=str(self.config_dir.resolve())
+        )
+        if not snapshot.is_current():
+            # 内容は同じで更新時刻だけが変わっていた（チェックアウトなど）
+            snapshot = replace(snapshot, stamps=_current_stamps(snapshot.config_dir))
+        self.logger.debug(f"設定スナップショット: {len(snapshot.stamps)}ファイル ({snapshot.content_hash[:12]})")
+        return snapshot
+
+    def _lookup(self, path: PathLike) -> Tuple[Optional[ConfigSnapshot], Optional[str]]:
+        snapshot = self.snapshot
+        name = snapshot.name_of(path) if snapshot is not None else None
+        return (snapshot, name) if name is not None else (None, None)
+
+    def exists(self, path: PathLike) -> bool:
+        snapshot, _ = self._lookup(path)
+        return snapshot is not None or Path(path).exists()
+
+    def read_csv(self, path: PathLike, skip_empty_rows: bool = True, normalize_headers: bool = True) -> List[Dict[str, str]]:
+        """CSVOperations.read_csv と同じ結果を返す"""
+        snapshot, name = self._lookup(path)
+        if snapshot is not None and name in snapshot.tables:
+            return snapshot.read_csv(name, skip_empty_rows, normalize_headers)
+        return CSVOperations.read_csv(str(path), skip_empty_rows=skip_empty_rows, normalize_headers=normalize_headers)
+
+    def read_csv_raw(self, path: PathLike) -> List[List[str]]:
+        """CSVOperations.read_csv_raw と同じ結果を返す"""
+        snapshot, name = self._lookup(path)
+        if snapshot is not None and name in snapshot.tables:
+            return snapshot.read_csv_raw(name)
+        return CSVOperations.read_csv_raw(str(path))
+
+    def read_records(self, path: PathLike) -> List[Dict[str, str]]:
+        """csv.DictReader と同じく、ヘッダーを加工せずに辞書のリストを返す"""
+        return self.read_csv(path, skip_empty_rows=False, normalize_headers=False)
+
+    def load_json(self, path: PathLike) -> Any:
+        snapshot, name = self._lookup(path)
+        if snapshot is not None and name in snapshot.documents:
+            return snapshot.load_json(name)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
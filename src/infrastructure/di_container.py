@@ -40,6 +40,8 @@ from .adapters.followup_parser_adapter import FollowUpParserAdapter
 from .config.system_config_loader import SystemConfigLoader
 from .config.path_manager import PathManager, get_path_manager
 from .config.config_loader import ConfigLoader
+from .config.config_snapshot import ConfigFileReader, ConfigSnapshot
+from .cache.artifact_cache import get_artifact_cache
 from .config.constraint_loader import ConstraintLoader
 from .parsers.input_preprocessor import InputPreprocessor
 
@@ -71,6 +73,13 @@ class DIContainer:
     def _register_default_bindings(self):
         """デフォルトのインターフェースと実装のバインディングを登録"""
         
+        # 設定ファイルのスナップショット（各ローダーで共有）
+        self.register(
+            ConfigFileReader,
+            lambda: ConfigFileReader(path_config.config_dir, get_artifact_cache()),
+            singleton=True
+        )
+        
         # リポジトリのバインディング
         self.register(
             IScheduleRepository,
@@ -80,7 +89,10 @@ class DIContainer:
         
         self.register(
             ISchoolRepository,
-            lambda: CSVSchoolRepository(base_path=path_config.config_dir),
+            lambda: CSVSchoolRepository(
+                base_path=path_config.config_dir,
+                config_files=self.resolve(ConfigFileReader)
+            ),
             singleton=True
         )
         
@@ -92,7 +104,10 @@ class DIContainer:
         
         self.register(
             ITeacherMappingRepository,
-            lambda: TeacherMappingRepository(base_path=path_config.config_dir),
+            lambda: TeacherMappingRepository(
+                base_path=path_config.config_dir,
+                config_files=self.resolve(ConfigFileReader)
+            ),
             singleton=True
         )
         
@@ -132,7 +147,10 @@ class DIContainer:
         # ConfigLoaderのバインディング
         self.register(
             ConfigLoader,
-            lambda: ConfigLoader(self.resolve(IPathConfiguration).config_dir),
+            lambda: ConfigLoader(
+                self.resolve(IPathConfiguration).config_dir,
+                config_files=self.resolve(ConfigFileReader)
+            ),
             singleton=True
         )
         
@@ -251,6 +269,16 @@ def get_path_manager() -> PathManager:
     return container.resolve(PathManager)
 
 
+def get_config_file_reader() -> ConfigFileReader:
+    """設定ファイルの読み込み（スナップショット経由）を取得"""
+    return container.resolve(ConfigFileReader)
+
+
+def get_config_snapshot() -> Optional[ConfigSnapshot]:
+    """data/config の最新のスナップショットを取得"""
+    return get_config_file_reader().snapshot
+
+
 def get_config_loader() -> ConfigLoader:
     """ConfigLoaderを取得"""
     return container.resolve(ConfigLoader)
@@ -23,6 +23,18 @@ class DocumentationAnalyzer:
         self.sequence_md_path = self.project_root / "sequence_diagram.md"
         self._architecture_info = None
         self._sequence_info = None
+        self._analyzed = False
+    
+    @property
+    def source_paths(self) -> List[Path]:
+        """解析対象のドキュメント"""
+        return [self.claude_md_path, self.sequence_md_path]
+    
+    def restore_analysis(self, doc_info: Dict[str, any]) -> None:
+        """保存済みの解析結果（analyze_documentation の戻り値）を読み込む"""
+        self._architecture_info = doc_info.get("architecture", {})
+        self._sequence_info = doc_info.get("sequence_flows", {})
+        self._analyzed = True
     
     def analyze_documentation(self) -> Dict[str, any]:
         """ドキュメントを解析して構造情報を取得"""
@@ -33,6 +45,7 @@ class DocumentationAnalyzer:
             "sequence_flows": self._analyze_sequence_diagram(),
             "analyzed": True
         }
+        self._analyzed = True
         
         self.logger.info("ドキュメント解析完了")
         return result
@@ -175,7 +188,7 @@ class DocumentationAnalyzer:
     
     def get_architecture_summary(self) -> str:
         """アーキテクチャ概要を取得"""
-        if not self._architecture_info:
+        if not self._analyzed:
             self.analyze_documentation()
         
         summary = "【システムアーキテクチャ概要】\n"
@@ -206,7 +219,7 @@ class DocumentationAnalyzer:
     
     def get_sequence_summary(self) -> str:
         """シーケンスフロー概要を取得"""
-        if not self._sequence_info:
+        if not self._analyzed:
             self.analyze_documentation()
         
         summary = "【処理フロー概要】\n"
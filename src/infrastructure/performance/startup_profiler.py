@@ -0,0 +1,104 @@
+"""起動時のインポート時間の計測
+
+--profile-startup 指定時に builtins.__import__ を差し替え、新しくモジュールを
+読み込んだインポートごとの自己時間（ネストしたインポートを除いた時間）を
+パッケージ単位（src配下は3階層、それ以外はトップレベル）で集計します。
+
+importlib.import_module による読み込みは呼び出し元の時間に含まれます。
+"""
+import builtins
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+
+class ImportTimeProfiler:
+    """パッケージごとのインポート時間を集計する"""
+
+    def __init__(self):
+        self.self_times: Dict[str, float] = defaultdict(float)
+        self.module_counts: Dict[str, int] = defaultdict(int)
+        self.started_at: Optional[float] = None
+        # インポート中の呼び出しごとの [ネストしたインポートの時間, 読み込んだモジュール数]
+        self._stack: List[List[float]] = []
+        self._original_import = None
+
+    @property
+    def is_installed(self) -> bool:
+        return self._original_import is not None
+
+    def install(self) -> None:
+        """計測を開始（インストール済みなら何もしない）"""
+        if self.is_installed:
+            return
+        self.started_at = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self) -> None:
+        """計測を終了"""
+        if self.is_installed:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        loaded = len(sys.modules)
+        self._stack.append([0.0, 0])
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            new_modules = len(sys.modules) - loaded
+            children_time, children_modules = self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += elapsed
+                self._stack[-1][1] += new_modules
+            if new_modules > 0:
+                group = self._group(self._resolve(name, globals, level))
+                self.self_times[group] += elapsed - children_time
+                self.module_counts[group] += new_modules - children_modules
+
+    @staticmethod
+    def _resolve(name: str, globals, level: int) -> str:
+        """相対インポートを絶対名にする"""
+        if level == 0 or not globals:
+            return name
+        package = globals.get('__package__') or globals.get('__name__', '').rpartition('.')[0]
+        base = package.rsplit('.', level - 1)[0] if level > 1 else package
+        return f"{base}.{name}" if name else base
+
+    @staticmethod
+    def _group(module_name: str) -> str:
+        parts = module_name.split('.')
+        return '.'.join(parts[:3]) if parts[0] == 'src' else parts[0]
+
+    def get_breakdown(self) -> List[Tuple[str, float, int]]:
+        """(パッケージ, 自己時間(秒), 読み込んだモジュール数) を時間の長い順に"""
+        return sorted(
+            ((group, seconds, self.module_counts[group]) for group, seconds in self.self_times.items()),
+            key=lambda item: item[1], reverse=True
+        )
+
+    def format_report(self, top: int = 15) -> str:
+        """インポート時間の内訳"""
+        breakdown = self.get_breakdown()
+        total = sum(seconds for _, seconds, _ in breakdown)
+        elapsed = time.perf_counter() - self.started_at if self.started_at is not None else 0.0
+        lines = [
+            "【起動時間の内訳（インポート）】",
+            f"計測開始からの経過: {elapsed * 1000:.0f}ms, うちインポート: {total * 1000:.0f}ms",
+            f"{'パッケージ':<44} {'時間(ms)':>9} {'割合':>6} {'モジュール数':>10}",
+        ]
+        for group, seconds, count in breakdown[:top]:
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f"{group:<44} {seconds * 1000:>9.1f} {share:>5.1f}% {count:>10}")
+        if len(breakdown) > top:
+            rest = sum(seconds for _, seconds, _ in breakdown[top:])
+            lines.append(f"{f'(他 {len(breakdown) - top} パッケージ)':<44} {rest * 1000:>9.1f}")
+        return "\n".join(lines)
+
+
+# グローバルインスタンス
+startup_profiler = ImportTimeProfiler()
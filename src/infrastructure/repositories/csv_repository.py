@@ -1,5 +1,6 @@
 """リファクタリング版CSVScheduleRepository - ファサードパターンで各責務を統合"""
 import csv
+import inspect
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
@@ -13,6 +14,7 @@ from ...domain.value_objects.special_support_hours import SpecialSupportHourMapp
 from ...domain.utils import parse_class_reference
 from ...domain.interfaces.repositories import IScheduleRepository, ISchoolRepository
 from ..config.path_config import path_config
+from ..config.config_snapshot import ConfigFileReader
 from .schedule_io.csv_reader import CSVScheduleReader
 from .schedule_io.csv_writer import CSVScheduleWriter
 from .schedule_io.csv_writer_improved import CSVScheduleWriterImproved
@@ -167,22 +169,26 @@ class CSVScheduleRepository(LoggingMixin, IScheduleRepository):
 class CSVSchoolRepository(LoggingMixin, ISchoolRepository):
     """学校データのCSV入出力を担当"""
     
-    def __init__(self, base_path: Path = Path(".")):
+    def __init__(self, base_path: Path = Path("."), config_files: Optional[ConfigFileReader] = None):
         super().__init__()
         self.base_path = Path(base_path)
-        self.teacher_mapping_repo = TeacherMappingRepository(self.base_path)
+        # 省略時はスナップショットを使わずファイルから読み込む
+        self.config_files = config_files or ConfigFileReader()
+        self.teacher_mapping_repo = TeacherMappingRepository(self.base_path, self.config_files)
     
-    def load_standard_hours(self, filename: str = "base_timetable.csv") -> Dict[tuple[ClassReference, Subject], float]:
-        """標準時数データをCSVから読み込み"""
+    def _standard_hours_path(self, filename: str) -> Path:
         # filenameがdata/で始まる場合は、base_pathとの重複を避ける
         if filename.startswith('data/'):
-            file_path = Path(filename)
-        else:
-            file_path = self.base_path / filename
+            return Path(filename)
+        return self.base_path / filename
+    
+    def load_standard_hours(self, filename: str = "base_timetable.csv") -> Dict[tuple[ClassReference, Subject], float]:
+        """標準時数データをCSVから読み込み"""
+        file_path = self._standard_hours_path(filename)
         standard_hours = {}
         
         try:
-            lines = CSVOperations.read_csv_raw(str(file_path))
+            lines = self.config_files.read_csv_raw(file_path)
             
             if len(lines) < 3:
                 raise ValueError("標準時数CSVファイルの形式が正しくありません")
@@ -229,7 +235,39 @@ class CSVSchoolRepository(LoggingMixin, ISchoolRepository):
             raise
     
     def load_school_data(self, base_timetable_file: str = "base_timetable.csv") -> School:
-        """学校の基本データを読み込んでSchoolエンティティを構築"""
+        """学校の基本データを読み込んでSchoolエンティティを構築
+        
+        設定ファイルのスナップショットとキャッシュが使える場合は、構築したSchoolを
+        設定の内容ハッシュをキーに保存し、設定（または構築するコード）が変わるまでは
+        保存済みのSchoolを読み込みます。呼び出しごとに別のオブジェクトを返します。
+        """
+        snapshot = self.config_files.snapshot
+        cache = self.config_files.cache
+        name = snapshot.name_of(self._standard_hours_path(base_timetable_file)) if snapshot else None
+        if name is None or cache is None:
+            school = self._build_school(base_timetable_file)
+        else:
+            misses = cache.misses
+            school = cache.get_or_build(
+                f"school_{name}",
+                self._school_code_sources(),
+                lambda: self._build_school(base_timetable_file),
+                key=snapshot.content_hash
+            )
+            if cache.misses == misses:
+                self.logger.info(f"学校データをキャッシュから読み込みました: {school}")
+        
+        # Schoolオブジェクトを保持（CSVWriter用）
+        self._loaded_school = school
+        
+        return school
+    
+    @staticmethod
+    def _school_code_sources() -> List[Path]:
+        """Schoolの構築方法を決めるコード（変更されたらキャッシュを作り直す）"""
+        return [Path(inspect.getfile(obj)) for obj in (CSVSchoolRepository, TeacherMappingRepository, School, Subject)]
+    
+    def _build_school(self, base_timetable_file: str) -> School:
         school = School()
         
         # 標準時数データから学校情報を構築
@@ -238,8 +276,9 @@ class CSVSchoolRepository(LoggingMixin, ISchoolRepository):
         # 教員マッピングを読み込み
         # self.base_pathが既にdata/configを指している場合は、configを重複させない
         # Always use just the filename since base_path already points to config
-        teacher_mapping_repo = TeacherMappingRepository(self.base_path)
+        teacher_mapping_repo = TeacherMappingRepository(self.base_path, self.config_files)
         teacher_mapping = teacher_mapping_repo.load_teacher_mapping("teacher_subject_mapping.csv")
+        teacher_index = teacher_mapping_repo.build_teacher_index(teacher_mapping)
         
         for (class_ref, subject), hours in standard_hours.items():
             # クラスを追加
@@ -262,12 +301,7 @@ class CSVSchoolRepository(LoggingMixin, ISchoolRepository):
                 # 自立の場合は通常通り教員マッピングから取得
             
             # 教員マッピングから全ての教員を取得（複数教師対応）
-            if hasattr(teacher_mapping_repo, 'get_all_teachers_for_subject_class'):
-                teachers = teacher_mapping_repo.get_all_teachers_for_subject_class(teacher_mapping, subject, class_ref)
-            else:
-                # 後方互換性のため
-                teacher = teacher_mapping_repo.get_teacher_for_subject_class(teacher_mapping, subject, class_ref)
-                teachers = [teacher] if teacher else []
+            teachers = teacher_index.get((subject, class_ref), [])
             
             # マッピングにない場合はスキップ（実在の教員のみを使用）
             if not teachers:
@@ -301,8 +335,8 @@ class CSVSchoolRepository(LoggingMixin, ISchoolRepository):
         
         self.logger.info(f"学校データを構築しました: {school}")
         
-        # Schoolオブジェクトを保持（CSVWriter用）
-        self._loaded_school = school
+        # 生成処理で引く索引を読み込み時に作っておく
+        school.compile()
         
         return school
     
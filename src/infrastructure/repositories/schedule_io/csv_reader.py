@@ -41,9 +41,11 @@ class CSVScheduleReader(LoggingMixin, ScheduleReader):
         # 教師マッピングリポジトリを初期化（遅延初期化）
         if self._teacher_mapping_repo is None:
             from ....infrastructure.config.path_config import path_config
-            self._teacher_mapping_repo = TeacherMappingRepository(path_config.data_dir)
+            from ....infrastructure.di_container import get_config_file_reader
+            self._teacher_mapping_repo = TeacherMappingRepository(path_config.data_dir, get_config_file_reader())
             # マッピングデータを読み込む
             self._teacher_mapping = self._teacher_mapping_repo.load_teacher_mapping("config/teacher_subject_mapping.csv")
+            self._teacher_index = self._teacher_mapping_repo.build_teacher_index(self._teacher_mapping)
         else:
             self._teacher_mapping = getattr(self, '_teacher_mapping', {})
         
@@ -266,14 +268,10 @@ class CSVScheduleReader(LoggingMixin, ScheduleReader):
     ) -> Teacher:
         """教員を取得"""
         # まず教師マッピングから取得を試みる
-        if self._teacher_mapping_repo and hasattr(self, '_teacher_mapping'):
-            teacher = self._teacher_mapping_repo.get_teacher_for_subject_class(
-                self._teacher_mapping,
-                subject,
-                class_ref
-            )
-            if teacher:
-                return teacher
+        if self._teacher_mapping_repo and hasattr(self, '_teacher_index'):
+            teachers = self._teacher_index.get((subject, class_ref))
+            if teachers:
+                return teachers[0]
         
         # 学校データから取得を試みる
         if school:
@@ -7,15 +7,17 @@ from collections import defaultdict
 
 from ...domain.value_objects.time_slot import Teacher, Subject, ClassReference
 from ...shared.mixins.logging_mixin import LoggingMixin
-from ...shared.utils.csv_operations import CSVOperations
+from ..config.config_snapshot import ConfigFileReader
 
 
 class TeacherMappingRepository(LoggingMixin):
     """教員マッピングCSVファイルからデータを読み込むリポジトリ"""
     
-    def __init__(self, base_path: Path = Path(".")):
+    def __init__(self, base_path: Path = Path("."), config_files: Optional[ConfigFileReader] = None):
         super().__init__()
         self.base_path = Path(base_path)
+        # 省略時はスナップショットを使わずファイルから読み込む
+        self.config_files = config_files or ConfigFileReader()
         self.permanent_absences = {}  # 恒久的な教師の休み情報
     
     def load_teacher_mapping(self, filename: str = "teacher_subject_mapping.csv") -> Dict[str, List[Tuple[Subject, List[ClassReference]]]]:
@@ -27,19 +29,19 @@ class TeacherMappingRepository(LoggingMixin):
         file_path = self.base_path / filename
         
         # ファイルが見つからない場合、dataディレクトリも探す
-        if not file_path.exists() and "data/" not in str(filename):
+        if not self.config_files.exists(file_path) and "data/" not in str(filename):
             alt_path = self.base_path / "data" / filename
-            if alt_path.exists():
+            if self.config_files.exists(alt_path):
                 file_path = alt_path
         
-        if not file_path.exists():
+        if not self.config_files.exists(file_path):
             self.logger.warning(f"教員マッピングファイルが見つかりません: {file_path}")
             return {}
         
         teacher_mapping = defaultdict(list)
         
         try:
-            rows = CSVOperations.read_csv(str(file_path))
+            rows = self.config_files.read_csv(file_path)
             
             for row in rows:
                 teacher_name = row['教員名'].strip()
@@ -71,9 +73,9 @@ class TeacherMappingRepository(LoggingMixin):
             
             # 実際の教員マッピングも追加で読み込む
             actual_mapping_path = self.base_path / "actual_teacher_mapping.csv"
-            if actual_mapping_path.exists():
+            if self.config_files.exists(actual_mapping_path):
                 self.logger.info("実際の教員マッピングを追加読み込み")
-                actual_rows = CSVOperations.read_csv(str(actual_mapping_path))
+                actual_rows = self.config_files.read_csv(actual_mapping_path)
                 
                 for row in actual_rows:
                     teacher_name = row['実際の教員名'].strip()
@@ -179,6 +181,22 @@ class TeacherMappingRepository(LoggingMixin):
                         teachers.append(teacher)
         return teachers
     
+    def build_teacher_index(self, mapping: Dict) -> Dict[Tuple[Subject, ClassReference], List[Teacher]]:
+        """(教科, クラス) → 担当教員のリストの索引を作成
+        
+        教員の並びは get_all_teachers_for_subject_class と同じで、先頭が
+        get_teacher_for_subject_class の返す教員です。
+        """
+        index: Dict[Tuple[Subject, ClassReference], List[Teacher]] = defaultdict(list)
+        for teacher_name, assignments in mapping.items():
+            teacher = Teacher(teacher_name)
+            for assigned_subject, assigned_classes in assignments:
+                for class_ref in assigned_classes:
+                    teachers = index[(assigned_subject, class_ref)]
+                    if teacher not in teachers:
+                        teachers.append(teacher)
+        return dict(index)
+    
     def get_all_teacher_names(self, mapping: Dict) -> Set[str]:
         """全教員名を取得"""
         names = set()
@@ -1,20 +1,18 @@
-"""CLIメインインターフェース"""
+"""CLIメインインターフェース
+
+起動を速くするため、サブコマンドごとに必要なモジュール（ユースケース・
+ドキュメント管理・QandAなど）はそのコマンドの処理の中でインポートします。
+"""
 import argparse
 import logging
 import sys
 from pathlib import Path
 import datetime
 
-from ...application.use_cases.request_models import (
-    GenerateScheduleRequest,
-    ValidateScheduleRequest
-)
 from ...application.use_cases.use_case_factory import UseCaseFactory
-from ...application.services.documentation_service import get_documentation_service
 from ...infrastructure.config.path_config import path_config
 from ...infrastructure.config.logging_config import LoggingConfig
 from ...shared.mixins.logging_mixin import LoggingMixin
-from .qanda_integration import QandAIntegration
 
 
 class TimetableCLI(LoggingMixin):
@@ -33,6 +31,12 @@ class TimetableCLI(LoggingMixin):
         """CLIメイン実行"""
         parser = self.create_parser()
         parsed_args = parser.parse_args(args)
+        if parsed_args.profile_startup:
+            from ...infrastructure.performance.startup_profiler import startup_profiler
+            startup_profiler.install()
+        if (parsed_args.command == "generate" and parsed_args.strategy is None
+                and not parsed_args.incremental):
+            parser.error("generate には --strategy が必要です（--incremental の場合を除く）")
         
         # ログレベル設定
         if parsed_args.verbose:
@@ -47,6 +51,8 @@ class TimetableCLI(LoggingMixin):
                 return self.handle_validate_command(parsed_args)
             elif parsed_args.command == "fix":
                 return self.handle_fix_command(parsed_args)
+            elif parsed_args.command == "whatif":
+                return self.handle_whatif_command(parsed_args)
             else:
                 parser.print_help()
                 return 1
@@ -57,6 +63,11 @@ class TimetableCLI(LoggingMixin):
                 import traceback
                 traceback.print_exc()
             return 1
+        
+        finally:
+            if parsed_args.profile_startup:
+                print()
+                print(startup_profiler.format_report())
     
     def create_parser(self):
         """コマンドライン引数パーサーを作成"""
@@ -77,6 +88,7 @@ class TimetableCLI(LoggingMixin):
   %(prog)s fix                               # 時間割の問題を自動修正
   %(prog)s fix --fix-tuesday                 # 火曜日の問題のみ修正
   %(prog)s fix --fix-daily-duplicates        # 日内重複のみ修正
+  %(prog)s whatif scenarios.yaml             # What-ifシナリオを一括評価
 
 詳細情報:
   - デフォルトでUltratrink Perfect Generatorが使用されます（完璧な時間割を最初から生成）
@@ -98,6 +110,11 @@ class TimetableCLI(LoggingMixin):
             action="store_true",
             help="警告以上のログのみ出力"
         )
+        parser.add_argument(
+            "--profile-startup",
+            action="store_true",
+            help="インポート時間の内訳を表示"
+        )
         parser.add_argument(
             "--data-dir",
             type=Path,
@@ -135,9 +152,8 @@ class TimetableCLI(LoggingMixin):
         )
         generate_parser.add_argument(
             "--strategy",
-            choices=["legacy", "advanced_csp", "improved_csp", "ultrathink", "grade5_priority", "unified_hybrid", "simple_v2"],
-            required=True,
-            help="使用する生成戦略を選択します。"
+            choices=["legacy", "advanced_csp", "improved_csp", "ultrathink", "grade5_priority", "unified_hybrid", "simple_v2", "portfolio", "exact"],
+            help="使用する生成戦略を選択します（--incremental 以外では必須）。"
         )
 
         generate_parser.add_argument(
@@ -227,6 +243,12 @@ class TimetableCLI(LoggingMixin):
             default=10,
             help="超最適化ジェネレーターのビーム幅（デフォルト: 10）"
         )
+        generate_parser.add_argument(
+            "--ultra-optimization-level",
+            choices=["fast", "balanced", "quality", "extreme", "lns"],
+            default="extreme",
+            help="超最適化ジェネレーターの最適化レベル（lns: 違反の周辺だけを解き直す大近傍探索、デフォルト: extreme）"
+        )
         generate_parser.add_argument(
             "--auto-optimization",
             action="store_true",
@@ -246,6 +268,23 @@ class TimetableCLI(LoggingMixin):
             help="人間的な柔軟性を有効化（教師代替、時数借用など）"
         )
 
+        generate_parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="前回の生成のチェックポイントから、入力が変わっていないフェーズを省略して再開（advanced_csp, improved_csp）"
+        )
+
+        generate_parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="前回の出力を土台に、Follow-up.csvの前回からの差分（新しい不在・会議）に当たるセルだけを解き直す"
+        )
+        generate_parser.add_argument(
+            "--base",
+            default=str(path_config.default_output_csv),
+            help="--incremental で土台にする前回の出力 (デフォルト: data/output/output.csv)"
+        )
+
         generate_parser.add_argument(
             "--use-simple-generator",
             action="store_true",
@@ -261,6 +300,11 @@ class TimetableCLI(LoggingMixin):
             "schedule_file",
             help="検証する時間割ファイル"
         )
+        validate_parser.add_argument(
+            "--no-vectorized",
+            action="store_true",
+            help="ベクトル化検証を使わず、制約ごとに従来方式で検証"
+        )
         
         # fixコマンド
         fix_parser = subparsers.add_parser(
@@ -303,10 +347,46 @@ class TimetableCLI(LoggingMixin):
             help="すべての問題を自動修正（デフォルト）"
         )
         
+        # whatifコマンド
+        whatif_parser = subparsers.add_parser(
+            "whatif",
+            help="What-ifシナリオ（不在・会議の移動・配置禁止）を前回の出力に対して一括評価"
+        )
+        whatif_parser.add_argument(
+            "scenarios_file",
+            help="シナリオファイル（YAMLまたはJSON）"
+        )
+        whatif_parser.add_argument(
+            "--base",
+            default=str(path_config.default_output_csv),
+            help="土台にする時間割 (デフォルト: data/output/output.csv)"
+        )
+        whatif_parser.add_argument(
+            "--followup-prompt",
+            default=str(path_config.followup_csv),
+            help="今週の週次要望ファイル (デフォルト: data/input/Follow-up.csv)"
+        )
+        whatif_parser.add_argument(
+            "--time-limit",
+            type=float,
+            default=10.0,
+            help="シナリオごとの解き直しの制限時間（秒） (デフォルト: 10)"
+        )
+        whatif_parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="並列に評価するワーカープロセス数 (デフォルト: CPU数)"
+        )
+        
         return parser
     
     def handle_generate_command(self, args):
         """時間割生成コマンドを処理"""
+        from ...application.services.documentation_service import get_documentation_service
+        from ...application.use_cases.request_models import GenerateScheduleRequest
+        from .qanda_integration import QandAIntegration
+        
         # ドキュメント管理サービスを初期化（ドキュメントを読み込んで構造を理解）
         doc_service = get_documentation_service()
         doc_service.initialize()
@@ -357,7 +437,7 @@ class TimetableCLI(LoggingMixin):
                 'enable_parallel': True,
                 'cache_size_mb': args.ultra_cache_size if hasattr(args, 'ultra_cache_size') else 100,
                 'beam_width': args.ultra_beam_width if hasattr(args, 'ultra_beam_width') else 10,
-                'optimization_level': 'extreme'  # 超最適化は最高レベル
+                'optimization_level': getattr(args, 'ultra_optimization_level', 'extreme')
             }
         
         if args.use_simple_generator:
@@ -388,6 +468,9 @@ class TimetableCLI(LoggingMixin):
             output_file=args.output,
             data_directory=args.data_dir,
             strategy=args.strategy,
+            resume=args.resume,
+            incremental=args.incremental,
+            base_schedule_file=args.base,
         )
         
         # 時間割生成実行前にモジュールチェック
@@ -423,19 +506,15 @@ class TimetableCLI(LoggingMixin):
         # 出力ファイル確認
         self.check_output_file(args.data_dir / args.output)
         
-        # QandAシステムによる違反分析（違反がある場合）
-        if result.violations_count > 0:
-            # 違反情報を取得するために検証を実行
+        # QandAシステムによる違反分析
+        # 書き出した時間割を validate コマンドと同じ制約・学校データでメモリ上で検証する（出力ファイルは
+        # 読み直さない）。生成時の最終検証は生成用の制約で数えるため件数が validate と異なる。
+        # 出力CSVには教員が無く validate は担当教員表から教員を補うため、担当教員表と違う教員を
+        # 割り当てたセル（5組など）の教員重複だけは validate の件数と異なることがある。
+        if result.school is not None:
             validate_use_case = UseCaseFactory.create_validate_schedule_use_case()
-            validate_request = ValidateScheduleRequest(
-                schedule_file=args.output,
-                data_directory=args.data_dir,
-                enable_soft_constraints=args.soft_constraints
-            )
-            validation_result = validate_use_case.execute(validate_request)
-            
-            if validation_result.violations:
-                qanda.post_generation_analysis(validation_result.violations)
+            validation_result = validate_use_case.validate(result.schedule, None, args.data_dir)
+            qanda.post_generation_analysis(validation_result.constraint_violations or validation_result.violations)
         else:
             qanda.post_generation_analysis([])
         
@@ -445,6 +524,8 @@ class TimetableCLI(LoggingMixin):
     
     def handle_validate_command(self, args):
         """時間割検証コマンドを処理"""
+        from ...application.use_cases.request_models import ValidateScheduleRequest
+        
         self.print_header("時間割検証システム")
         
         schedule_file = args.data_dir / args.schedule_file
@@ -458,7 +539,8 @@ class TimetableCLI(LoggingMixin):
         # リクエストオブジェクトを作成
         request = ValidateScheduleRequest(
             schedule_file=args.schedule_file,
-            data_directory=args.data_dir
+            data_directory=args.data_dir,
+            use_vectorized=not args.no_vectorized
         )
         result = use_case.execute(request)
         
@@ -566,6 +648,32 @@ class TimetableCLI(LoggingMixin):
         
         return 0 if final_count == 0 else 1
     
+    def handle_whatif_command(self, args):
+        """What-ifシナリオ一括評価コマンドを処理"""
+        from ...application.use_cases.request_models import WhatIfScenarioRequest
+        
+        self.print_header("What-ifシナリオ評価")
+        
+        request = WhatIfScenarioRequest(
+            scenarios_file=args.scenarios_file,
+            base_schedule_file=args.base,
+            followup_prompt_file=args.followup_prompt,
+            data_directory=args.data_dir,
+            time_limit=args.time_limit,
+            max_workers=args.workers
+        )
+        use_case = UseCaseFactory.create_whatif_scenario_use_case()
+        result = use_case.execute(request)
+        
+        if not result.success:
+            self.log_error(result.message)
+            return 1
+        
+        print("\n【シナリオ比較】")
+        print(result.table)
+        print(f"\n{result.message}")
+        return 0 if not any(r.error for r in result.results) else 1
+    
     def print_header(self, title="時間割自動生成システム (Ultrathink Perfect Generator)"):
         """ヘッダーを表示"""
         print("=" * 60)
@@ -4,11 +4,12 @@ QandAシステムのCLI統合
 """
 
 import logging
+from pathlib import Path
 from typing import List, Dict, Optional
 from colorama import Fore, Style, init
 
 from ...application.services.qanda_service import ImprovedQandAService as QandAService
-from ...application.services.constraint_violation_analyzer import ConstraintViolationAnalyzer
+from ...infrastructure.cache.artifact_cache import get_artifact_cache
 from ...shared.mixins.logging_mixin import LoggingMixin
 
 
@@ -18,8 +19,44 @@ class QandAIntegration(LoggingMixin):
     def __init__(self):
         super().__init__()
         init(autoreset=True)  # colorama初期化
-        self.qanda_service = QandAService()
-        self.violation_analyzer = ConstraintViolationAnalyzer(self.qanda_service)
+        self._qanda_service = None
+        self._violation_analyzer = None
+    
+    @property
+    def qanda_service(self) -> QandAService:
+        """QandAサービス（初回アクセス時に質問ファイルを読み込む）"""
+        if self._qanda_service is None:
+            self._qanda_service = QandAService()
+        return self._qanda_service
+    
+    @property
+    def violation_analyzer(self):
+        """制約違反分析サービス（違反の分析時まで読み込まない）"""
+        if self._violation_analyzer is None:
+            from ...application.services.constraint_violation_analyzer import ConstraintViolationAnalyzer
+            self._violation_analyzer = ConstraintViolationAnalyzer(self.qanda_service)
+        return self._violation_analyzer
+    
+    def _load_pre_generation_info(self) -> Dict[str, any]:
+        """未回答の質問と学習済みルール
+        
+        QA.txt・qa_metadata.json が前回から変わっていなければ保存済みの結果を使う。
+        """
+        def build() -> Dict[str, any]:
+            return {
+                'unanswered': [
+                    {
+                        'timestamp': q.created_at.strftime('%Y-%m-%d %H:%M') if q.created_at else '',
+                        'question': q.question,
+                        'context': q.context
+                    }
+                    for q in self.qanda_service.get_unanswered_questions()
+                ],
+                'learned_rules': self.qanda_service.apply_learned_rules()
+            }
+        
+        sources = [Path(QandAService.DEFAULT_QA_FILE), Path(QandAService.DEFAULT_METADATA_PATH)]
+        return get_artifact_cache().get_or_build("qanda_pre_generation", sources, build)
     
     def check_unanswered_questions(self) -> bool:
         """
@@ -28,7 +65,7 @@ class QandAIntegration(LoggingMixin):
         Returns:
             未回答の質問がある場合True
         """
-        unanswered = self.qanda_service.get_unanswered_questions()
+        unanswered = self._load_pre_generation_info()['unanswered']
         
         if unanswered:
             print(f"\n{Fore.YELLOW}━━━ 未回答の質問があります ━━━{Style.RESET_ALL}")
@@ -53,7 +90,7 @@ class QandAIntegration(LoggingMixin):
     
     def display_learned_rules(self) -> None:
         """学習済みのルールを表示"""
-        rules = self.qanda_service.apply_learned_rules()
+        rules = self._load_pre_generation_info()['learned_rules']
         
         total_rules = sum(len(r) for r in rules.values())
         if total_rules > 0:
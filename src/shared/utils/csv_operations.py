@@ -4,7 +4,7 @@
 """
 import csv
 import os
-from typing import List, Dict, Any, Optional, TextIO
+from typing import List, Dict, Any, Iterable, Optional, TextIO
 from pathlib import Path
 
 
@@ -36,32 +36,60 @@ class CSVOperations:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
         
-        rows = []
         with open(file_path, 'r', encoding=encoding) as f:
-            reader = csv.DictReader(f)
+            return CSVOperations.rows_to_dicts(
+                csv.reader(f),
+                skip_empty_rows=skip_empty_rows,
+                normalize_headers=normalize_headers
+            )
+    
+    @staticmethod
+    def rows_to_dicts(
+        rows: Iterable[List[str]],
+        skip_empty_rows: bool = True,
+        normalize_headers: bool = True
+    ) -> List[Dict[str, str]]:
+        """読み込み済みの行を read_csv と同じ形式の辞書のリストにする
+        
+        csv.DictReader と同じく最初の空でない行をヘッダーとし、空の行は読み飛ばします。
+        列が足りない行は None、多い行は余りを None キーのリストにします。
+        
+        Args:
+            rows: csv.reader が返す形式の行
+            skip_empty_rows: 値がすべて空の行をスキップするか
+            normalize_headers: ヘッダーを正規化するか
+        """
+        iterator = iter(rows)
+        fieldnames = next((row for row in iterator if row), None)
+        if fieldnames is None:
+            return []
+        if normalize_headers:
+            fieldnames = [CSVOperations._normalize_header(h) for h in fieldnames]
+        
+        result = []
+        for values in iterator:
+            if not values:
+                continue
+            row = dict(zip(fieldnames, values))
+            if len(values) > len(fieldnames):
+                row[None] = list(values[len(fieldnames):])
+            else:
+                for key in fieldnames[len(values):]:
+                    row[key] = None
             
-            # ヘッダーの正規化
-            if normalize_headers and reader.fieldnames:
-                reader.fieldnames = [
-                    CSVOperations._normalize_header(h) 
-                    for h in reader.fieldnames
-                ]
+            # 空行のスキップ
+            if skip_empty_rows and all(
+                not value.strip() for value in row.values()
+            ):
+                continue
             
-            for row in reader:
-                # 空行のスキップ
-                if skip_empty_rows and all(
-                    not value.strip() for value in row.values()
-                ):
-                    continue
-                
-                # 値の前後の空白を削除
-                normalized_row = {
-                    key: value.strip() if value else ''
-                    for key, value in row.items()
-                }
-                rows.append(normalized_row)
+            # 値の前後の空白を削除
+            result.append({
+                key: value.strip() if value else ''
+                for key, value in row.items()
+            })
         
-        return rows
+        return result
     
     @staticmethod
     def write_csv(
@@ -0,0 +1,111 @@
+"""適応的な事前チェックパイプラインのテスト
+
+統計に基づく並べ替え・同名チェックの区別・判定が順序に依存しないことと、
+ConstraintValidatorでの利用を確認します。
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.constraints.base import (
+    ConstraintPriority, ConstraintResult, ConstraintValidator, HardConstraint
+)
+from src.domain.services.core.adaptive_check_pipeline import AdaptiveCheckPipeline
+
+
+class _CountingConstraint(HardConstraint):
+    """checkの呼び出し回数を数えるテスト用制約"""
+
+    def __init__(self, name, rejects, priority=ConstraintPriority.HIGH):
+        super().__init__(priority, name, name)
+        self.rejects = rejects
+        self.calls = 0
+
+    def check(self, schedule, school, time_slot, assignment):
+        self.calls += 1
+        return not self.rejects(time_slot)
+
+    def validate(self, schedule, school):
+        return ConstraintResult(self.name, [])
+
+
+class TestAdaptiveCheckPipeline(unittest.TestCase):
+    """AdaptiveCheckPipelineのテスト"""
+
+    def test_rejecting_check_moves_to_front(self):
+        """よく不可を返すチェックが並べ替え後に先頭になる"""
+        pipeline = AdaptiveCheckPipeline([
+            ('never', lambda x: None),
+            ('odd', lambda x: 'odd' if x % 2 else None),
+        ], reorder_interval=8)
+
+        for x in range(32):
+            pipeline.run(x)
+
+        stats = pipeline.get_statistics()
+        self.assertEqual(stats['order'], ['odd', 'never'])
+        self.assertGreater(stats['reorders'], 0)
+        self.assertEqual(stats['checks']['odd']['rejections'], 16)
+        self.assertAlmostEqual(stats['checks']['odd']['rejection_rate'], 16 / stats['checks']['odd']['calls'])
+
+    def test_result_does_not_depend_on_order(self):
+        """並べ替えの前後で可/不可の判定が変わらない"""
+        pipeline = AdaptiveCheckPipeline([
+            ('multiple_of_3', lambda x: 'three' if x % 3 == 0 else None),
+            ('multiple_of_5', lambda x: 'five' if x % 5 == 0 else None),
+        ], reorder_interval=4)
+
+        for x in range(200):
+            expected = x % 3 == 0 or x % 5 == 0
+            self.assertEqual(pipeline.run(x) is not None, expected)
+
+    def test_run_all_reports_every_rejection(self):
+        """run_allは打ち切らず、不可となった全てのチェックを登録順に返す"""
+        pipeline = AdaptiveCheckPipeline([
+            ('a', lambda x: 'a'),
+            ('b', lambda x: None),
+            ('c', lambda x: 'c'),
+        ])
+        self.assertEqual(pipeline.run_all(0), [('a', 'a'), ('c', 'c')])
+        self.assertEqual(pipeline.get_statistics()['checks']['b']['calls'], 1)
+
+    def test_duplicate_names_are_kept_apart(self):
+        """同名のチェックは番号付きの別名で統計を持つ"""
+        pipeline = AdaptiveCheckPipeline([('same', lambda: None), ('same', lambda: None)])
+        self.assertEqual(pipeline.get_statistics()['order'], ['same', 'same#2'])
+
+
+class TestConstraintValidatorPipeline(unittest.TestCase):
+    """ConstraintValidator.check_assignmentのパイプライン利用のテスト"""
+
+    def test_statistics_and_short_circuit(self):
+        """不可を返す制約で打ち切られ、制約ごとの統計が取れる"""
+        always = _CountingConstraint("常に不可", lambda slot: True)
+        never = _CountingConstraint("常に可", lambda slot: False)
+        validator = ConstraintValidator([never, always])
+
+        for slot in range(300):
+            self.assertFalse(validator.check_assignment(None, None, slot, None))
+
+        stats = validator.get_statistics()
+        self.assertEqual(stats['order'][0], "常に不可")
+        self.assertEqual(stats['checks']["常に不可"]['calls'], 300)
+        # 並べ替え後は可を返す制約まで到達しない
+        self.assertLess(never.calls, 300)
+
+    def test_add_constraint_rebuilds_pipeline(self):
+        """制約を追加すると次のチェックから対象になる"""
+        validator = ConstraintValidator([_CountingConstraint("常に可", lambda slot: False)])
+        self.assertTrue(validator.check_assignment(None, None, 0, None))
+
+        validator.add_constraint(_CountingConstraint("常に不可", lambda slot: True))
+        self.assertFalse(validator.check_assignment(None, None, 0, None))
+        self.assertIn("常に不可", validator.get_statistics()['checks'])
+
+
+if __name__ == '__main__':
+    unittest.main()
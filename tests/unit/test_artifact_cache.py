@@ -0,0 +1,99 @@
+"""起動時の解析結果キャッシュ・インポート時間計測のテスト
+
+元ファイルが変わらなければ保存済みの結果を使い、内容が変わったときだけ作り直すこと、
+インポート時間がパッケージごとに集計されることを確認します。
+"""
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.cache.artifact_cache import ArtifactCache
+from src.infrastructure.performance.startup_profiler import ImportTimeProfiler
+
+
+class TestArtifactCache(unittest.TestCase):
+    """ArtifactCacheのテスト"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.source = self.root / 'CLAUDE.md'
+        self.source.write_text('# v1', encoding='utf-8')
+        self.cache = ArtifactCache(self.root / 'cache')
+        self.builds = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _get(self, sources=None):
+        def build():
+            self.builds += 1
+            return {'content': self.source.read_text(encoding='utf-8')}
+        return self.cache.get_or_build('doc', sources or [self.source], build)
+
+    def test_reuses_result_until_content_changes(self):
+        """内容が同じなら更新時刻が変わっても作り直さない"""
+        self.assertEqual(self._get(), {'content': '# v1'})
+        self.assertEqual(self._get(), {'content': '# v1'})
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self._get()
+        self.assertEqual(self.builds, 1)
+
+        self.source.write_text('# v2', encoding='utf-8')
+        self.assertEqual(self._get(), {'content': '# v2'})
+        self.assertEqual(self.builds, 2)
+
+    def test_missing_and_directory_sources(self):
+        """ファイルの追加・ディレクトリ配下の変更で作り直す"""
+        config_dir = self.root / 'config'
+        config_dir.mkdir()
+        missing = self.root / 'sequence_diagram.md'
+        sources = [missing, config_dir]
+        self._get(sources)
+        self._get(sources)
+        self.assertEqual(self.builds, 1)
+
+        (config_dir / 'teacher_subject_mapping.csv').write_text('a,b', encoding='utf-8')
+        self._get(sources)
+        missing.write_text('# seq', encoding='utf-8')
+        self._get(sources)
+        self.assertEqual(self.builds, 3)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+
+    def test_corrupt_cache_is_rebuilt(self):
+        self._get()
+        next(self.cache.cache_dir.glob('*.pickle')).write_bytes(b'broken')
+        self.assertEqual(self._get(), {'content': '# v1'})
+        self.assertEqual(self.builds, 2)
+
+
+class TestImportTimeProfiler(unittest.TestCase):
+    """ImportTimeProfilerのテスト"""
+
+    def test_new_imports_are_grouped_by_package(self):
+        profiler = ImportTimeProfiler()
+        sys.modules.pop('colorsys', None)
+        profiler.install()
+        try:
+            import colorsys  # noqa: F401
+        finally:
+            profiler.uninstall()
+
+        groups = {group: count for group, _, count in profiler.get_breakdown()}
+        self.assertEqual(groups.get('colorsys'), 1)
+        self.assertEqual(ImportTimeProfiler._group('src.application.services.qanda_service'),
+                         'src.application.services')
+        self.assertEqual(ImportTimeProfiler._resolve('qanda_service', {'__package__': 'src.application.services'}, 1),
+                         'src.application.services.qanda_service')
+        self.assertIn('colorsys', profiler.format_report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""移動・スワップ候補の一括評価のテスト
+
+一括評価の増減が、実際に適用したスケジュールで評価し直した値と一致することを確認します。
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.constraints.teacher_conflict_constraint import TeacherConflictConstraint
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.services.core.batch_move_evaluator import BatchMoveEvaluator
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+
+
+class TestBatchMoveEvaluator(unittest.TestCase):
+    """BatchMoveEvaluatorのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.class1 = ClassReference(1, 1)
+        self.class2 = ClassReference(1, 2)
+        self.school.add_class(self.class1)
+        self.school.add_class(self.class2)
+        self.math = Subject("数")
+        self.english = Subject("英")
+        self.school.set_standard_hours(self.class1, self.math, 2)
+        self.school.set_standard_hours(self.class1, self.english, 1)
+        self.inoue = Teacher("井上")
+        self.kaneko = Teacher("金子ひ")
+
+        self.schedule = Schedule()
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.class1, self.math, self.inoue))
+        self.schedule.assign(TimeSlot("月", 2), Assignment(self.class1, self.math, self.inoue))
+        self.schedule.assign(TimeSlot("月", 3), Assignment(self.class1, self.english, self.kaneko))
+        self.schedule.assign(TimeSlot("火", 1), Assignment(self.class2, self.english, self.inoue))
+        self.absences = {"金子ひ": {("火", 1)}}
+
+    def _apply_swap(self, schedule, time_slot1, class1, time_slot2, class2):
+        assignment1 = schedule.get_assignment(time_slot1, class1)
+        assignment2 = schedule.get_assignment(time_slot2, class2)
+        schedule.remove_assignment(time_slot1, class1)
+        schedule.remove_assignment(time_slot2, class2)
+        if assignment2:
+            schedule.assign(time_slot1, Assignment(class1, assignment2.subject, assignment2.teacher))
+        if assignment1:
+            schedule.assign(time_slot2, Assignment(class2, assignment1.subject, assignment1.teacher))
+
+    def test_swap_deltas_match_reevaluation(self):
+        """スワップの増減は適用後に評価し直した値と一致する"""
+        candidates = [
+            (TimeSlot("月", 2), self.class1, TimeSlot("火", 2), self.class1),  # 日内重複の解消
+            (TimeSlot("月", 3), self.class1, TimeSlot("火", 1), self.class2),  # 不在教員・教員重複
+            (TimeSlot("月", 1), self.class1, TimeSlot("月", 1), self.class2),  # 時数の移動
+            (TimeSlot("月", 1), self.class1, TimeSlot("月", 2), self.class1),  # 同じ内容の入れ替え
+        ]
+        evaluator = BatchMoveEvaluator(self.schedule, self.school, self.absences)
+        scores = evaluator.score_swaps(
+            evaluator.encode_cells([(ts1, c1) for ts1, c1, _, _ in candidates]),
+            evaluator.encode_cells([(ts2, c2) for _, _, ts2, c2 in candidates])
+        )
+        base_hard, base_soft = evaluator.totals()
+
+        for index, candidate in enumerate(candidates):
+            schedule = self.schedule.fork()
+            self._apply_swap(schedule, *candidate)
+            hard, soft = BatchMoveEvaluator(schedule, self.school, self.absences).totals()
+            self.assertEqual(scores.hard_delta[index], hard - base_hard)
+            self.assertAlmostEqual(scores.soft_delta[index], soft - base_soft)
+
+        self.assertEqual(scores.hard_delta[0], -1)
+        self.assertEqual(scores.ranking()[0], 0)
+
+    def test_move_deltas_match_reevaluation(self):
+        """移動の増減は適用後に評価し直した値と一致する"""
+        evaluator = BatchMoveEvaluator(self.schedule, self.school)
+        scores = evaluator.score_moves(
+            evaluator.encode_cells([(TimeSlot("月", 2), self.class1)]),
+            evaluator.encode_cells([(TimeSlot("水", 4), self.class1)])
+        )
+
+        schedule = self.schedule.fork()
+        schedule.remove_assignment(TimeSlot("月", 2), self.class1)
+        schedule.assign(TimeSlot("水", 4), Assignment(self.class1, self.math, self.inoue))
+        hard, soft = BatchMoveEvaluator(schedule, self.school).totals()
+        base_hard, base_soft = evaluator.totals()
+
+        self.assertEqual(scores.hard_delta[0], hard - base_hard)
+        self.assertAlmostEqual(scores.soft_delta[0], soft - base_soft)
+        self.assertTrue(scores.feasible[0])
+
+    def test_locked_and_empty_cells_are_infeasible(self):
+        """ロックされたセル・空きの移動元・空き同士のスワップは実行不可"""
+        self.schedule.lock_cell(TimeSlot("月", 1), self.class1)
+        evaluator = BatchMoveEvaluator(self.schedule, self.school)
+        cells_a = evaluator.encode_cells([
+            (TimeSlot("月", 1), self.class1),
+            (TimeSlot("水", 1), self.class1),
+            (TimeSlot("月", 2), self.class1),
+        ])
+        cells_b = evaluator.encode_cells([
+            (TimeSlot("火", 3), self.class1),
+            (TimeSlot("水", 2), self.class1),
+            (TimeSlot("火", 3), self.class1),
+        ])
+
+        self.assertEqual(evaluator.score_swaps(cells_a, cells_b).feasible.tolist(), [False, False, True])
+        self.assertEqual(evaluator.score_moves(cells_a, cells_b).feasible.tolist(), [False, False, True])
+        self.assertEqual(evaluator.score_swaps(cells_a, cells_b).ranking().tolist(), [2])
+
+    def test_empty_schedule(self):
+        """割り当てが無いスケジュールでも評価できる"""
+        self.assertEqual(BatchMoveEvaluator(Schedule(), self.school).totals(), (0, 0.0))
+
+
+class TestBatchMoveEvaluatorTeacherConflictParity(unittest.TestCase):
+    """交流学級の自立活動の重複は教師重複制約と同じく数えない"""
+
+    def setUp(self):
+        self.school = School()
+        self.class1, self.exchange1, self.exchange2 = ClassReference(1, 1), ClassReference(1, 6), ClassReference(2, 6)
+        for class_ref in (self.class1, self.exchange1, self.exchange2):
+            self.school.add_class(class_ref)
+        self.zaitsu = Teacher("財津")
+        self.constraint = TeacherConflictConstraint()
+        self.constraint.test_periods = set()
+
+        self.schedule = Schedule()
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.exchange1, Subject("自立"), self.zaitsu))
+        self.schedule.assign(TimeSlot("月", 2), Assignment(self.exchange2, Subject("自立"), self.zaitsu))
+        self.schedule.assign(TimeSlot("火", 1), Assignment(self.exchange1, Subject("自立"), self.zaitsu))
+        self.schedule.assign(TimeSlot("火", 1), Assignment(self.class1, Subject("保"), self.zaitsu))
+
+    def _conflicts(self, schedule):
+        hard, _ = BatchMoveEvaluator(schedule, self.school).totals()
+        self.assertEqual(hard, len(self.constraint.validate(schedule, self.school).violations))
+        return hard
+
+    def test_jiritsu_overlap_matches_constraint(self):
+        """自立活動2つの重複は除外、自立活動と他の授業の重複は違反"""
+        self.assertEqual(self._conflicts(self.schedule), 1)
+
+        evaluator = BatchMoveEvaluator(self.schedule, self.school)
+        candidates = [
+            (TimeSlot("月", 2), self.exchange2, TimeSlot("月", 1), self.exchange2),  # 自立活動を重ねる
+            (TimeSlot("火", 1), self.class1, TimeSlot("水", 1), self.class1),        # 保健を外す
+            (TimeSlot("火", 1), self.class1, TimeSlot("月", 1), self.class1),        # 保健を別の自立活動と重ねる
+        ]
+        scores = evaluator.score_swaps(
+            evaluator.encode_cells([(ts1, c1) for ts1, c1, _, _ in candidates]),
+            evaluator.encode_cells([(ts2, c2) for _, _, ts2, c2 in candidates])
+        )
+        base_hard, _ = evaluator.totals()
+        for index, (time_slot1, class1, time_slot2, class2) in enumerate(candidates):
+            schedule = self.schedule.fork()
+            assignment1 = schedule.get_assignment(time_slot1, class1)
+            assignment2 = schedule.get_assignment(time_slot2, class2)
+            schedule.remove_assignment(time_slot1, class1)
+            schedule.remove_assignment(time_slot2, class2)
+            if assignment2:
+                schedule.assign(time_slot1, Assignment(class1, assignment2.subject, assignment2.teacher))
+            if assignment1:
+                schedule.assign(time_slot2, Assignment(class2, assignment1.subject, assignment1.teacher))
+            self.assertEqual(scores.hard_delta[index], self._conflicts(schedule) - base_hard)
+
+        self.assertEqual(scores.hard_delta.tolist(), [0, -1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
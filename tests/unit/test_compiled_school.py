@@ -0,0 +1,88 @@
+"""学校データのコンパイル済み索引のテスト
+
+索引の内容（ID・担当行列・不在ビットマスク・交流学級の対応）と、
+Schoolを変更すると索引が作り直されることを確認します。
+"""
+import pickle
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.entities.compiled_school import NO_TEACHER
+from src.domain.entities.school import School
+from src.domain.value_objects.time_slot import ClassReference, Subject, Teacher
+
+
+class TestCompiledSchool(unittest.TestCase):
+    """CompiledSchoolのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.class11 = ClassReference(1, 1)
+        self.class16 = ClassReference(1, 6)
+        self.class21 = ClassReference(2, 1)
+        for class_ref in (self.class21, self.class16, self.class11):
+            self.school.add_class(class_ref)
+
+        self.math = Subject("数")
+        self.english = Subject("英")
+        self.kajinaga = Teacher("梶永")
+        self.inoue = Teacher("井上")
+        self.school.assign_teacher_subject(self.kajinaga, self.math)
+        self.school.assign_teacher_subject(self.inoue, self.english)
+        self.school.assign_teacher_to_class(self.kajinaga, self.math, self.class11)
+        self.school.assign_teacher_to_class(self.kajinaga, self.math, self.class21)
+        self.school.assign_teacher_to_class(self.inoue, self.english, self.class11)
+        self.school.set_teacher_unavailable("月", 1, self.kajinaga)
+        self.school.set_teacher_unavailable("金", 6, self.kajinaga)
+
+    def test_compiled_tables(self):
+        """ID・担当行列・教員ごとの担当・交流学級の対応"""
+        compiled = self.school.compile()
+
+        self.assertEqual(compiled.classes, (self.class11, self.class16, self.class21))
+        self.assertEqual(self.school.get_all_classes(), [self.class11, self.class16, self.class21])
+        row = compiled.assigned_teacher_ids[compiled.class_ids[self.class11]]
+        self.assertEqual(row[compiled.subject_ids[self.math]], compiled.teacher_ids[self.kajinaga])
+        row = compiled.assigned_teacher_ids[compiled.class_ids[self.class16]]
+        self.assertEqual(row[compiled.subject_ids[self.math]], NO_TEACHER)
+
+        self.assertEqual(sorted(self.school.get_teacher_class_assignments(self.kajinaga), key=str),
+                         [(self.math, self.class11), (self.math, self.class21)])
+        self.assertEqual(self.school.get_exchange_parent(self.class16), self.class11)
+        self.assertIsNone(self.school.get_exchange_parent(self.class11))
+        self.assertEqual(self.school.get_exchange_classes(self.class11), [self.class16])
+
+    def test_absence_bitmap(self):
+        """不在は教員ごとの30コマのビットマスクで引く"""
+        self.assertEqual(self.school.get_teacher_absence_mask(self.kajinaga), 1 | 1 << 29)
+        self.assertTrue(self.school.is_teacher_unavailable("月", 1, self.kajinaga))
+        self.assertTrue(self.school.is_teacher_unavailable("金", 6, self.kajinaga))
+        self.assertFalse(self.school.is_teacher_unavailable("月", 2, self.kajinaga))
+        self.assertFalse(self.school.is_teacher_unavailable("月", 1, self.inoue))
+
+    def test_changes_rebuild_index(self):
+        """Schoolを変更すると次の参照で索引が作り直される"""
+        compiled = self.school.compile()
+        self.assertIs(self.school.compile(), compiled)
+
+        self.school.set_teacher_unavailable("火", 3, self.inoue)
+        self.assertTrue(self.school.is_teacher_unavailable("火", 3, self.inoue))
+        self.school.add_class(ClassReference(3, 1))
+        self.assertIn(ClassReference(3, 1), self.school.get_all_classes())
+        self.assertIsNot(self.school.compile(), compiled)
+
+        # 返したリストを変更しても索引には影響しない
+        self.school.get_all_classes().clear()
+        self.assertEqual(len(self.school.get_all_classes()), 4)
+
+        restored = pickle.loads(pickle.dumps(self.school))
+        self.assertEqual(restored.get_all_classes(), self.school.get_all_classes())
+
+
+if __name__ == '__main__':
+    unittest.main()
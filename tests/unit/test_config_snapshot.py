@@ -0,0 +1,121 @@
+"""設定ファイルのスナップショットのテスト
+
+スナップショット経由の読み込みがファイルからの読み込みと同じ結果になること、
+設定ファイルが変わったときだけ作り直すこと、構築したSchoolを設定の内容ごとに
+キャッシュすることを確認します。
+"""
+import json
+import pickle
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.cache.artifact_cache import ArtifactCache
+from src.infrastructure.config.config_snapshot import ConfigFileReader, ConfigSnapshot
+from src.infrastructure.repositories.csv_repository import CSVSchoolRepository
+from src.infrastructure.repositories.teacher_mapping_repository import TeacherMappingRepository
+from src.domain.value_objects.time_slot import ClassReference, Subject, Teacher
+from src.shared.utils.csv_operations import CSVOperations
+
+BASE_TIMETABLE = "基本時数,,\nクラス,数,英\n1年1組,4,4\n1年2組,4,3\n"
+TEACHER_MAPPING = "教員名,教科,学年,組\n梶永,数,1,1\n梶永,数,1,2\n井上,英,1,1\n北,英,1,1\n北,英,1,2\n"
+
+
+class TestConfigSnapshot(unittest.TestCase):
+    """ConfigSnapshot・ConfigFileReaderのテスト"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.config_dir = self.root / 'config'
+        self.config_dir.mkdir()
+        (self.config_dir / 'base_timetable.csv').write_text(BASE_TIMETABLE, encoding='utf-8')
+        (self.config_dir / 'teacher_subject_mapping.csv').write_text(TEACHER_MAPPING, encoding='utf-8')
+        self.cache = ArtifactCache(self.root / 'cache')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reads_match_file_reads(self):
+        """BOM・空行・列の足りない行があってもファイルからの読み込みと同じ"""
+        path = self.config_dir / 'subject_master.csv'
+        path.write_text('﻿教科略号, 教科名\n数,数学\n\n,\n英\n', encoding='utf-8')
+        (self.config_dir / 'system_config.json').write_text(json.dumps({'days': ['月', '火']}), encoding='utf-8')
+        reader = ConfigFileReader(self.config_dir)
+
+        self.assertEqual(reader.read_csv(path), CSVOperations.read_csv(str(path)))
+        self.assertEqual(reader.read_csv_raw(path), CSVOperations.read_csv_raw(str(path)))
+        self.assertEqual(reader.read_records(path)[0], {'教科略号': '数', ' 教科名': '数学'})
+        settings = reader.load_json(self.config_dir / 'system_config.json')
+        settings['days'].append('水')
+        self.assertEqual(reader.load_json(self.config_dir / 'system_config.json'), {'days': ['月', '火']})
+
+        # スナップショットの外のファイルはファイルから読む
+        outside = self.root / 'subject_master.csv'
+        outside.write_text('教科略号\n国\n', encoding='utf-8')
+        self.assertEqual(reader.read_csv(outside), [{'教科略号': '国'}])
+        self.assertFalse(reader.exists(self.root / 'missing.csv'))
+
+    def test_persisted_and_invalidated_on_change(self):
+        """別プロセス相当の新しいReaderは保存済みのスナップショットを使い、変更後は作り直す"""
+        first = ConfigFileReader(self.config_dir, self.cache).snapshot
+        second = ConfigFileReader(self.config_dir, self.cache).snapshot
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(first.content_hash, second.content_hash)
+
+        reader = ConfigFileReader(self.config_dir, self.cache)
+        mapping_path = self.config_dir / 'teacher_subject_mapping.csv'
+        mapping_path.write_text(TEACHER_MAPPING + "塚本,数,1,1\n", encoding='utf-8')
+        self.assertIn(['塚本', '数', '1', '1'], reader.read_csv_raw(mapping_path))
+        self.assertNotEqual(reader.snapshot.content_hash, first.content_hash)
+        self.assertIsInstance(reader.snapshot, ConfigSnapshot)
+
+    def test_snapshot_is_read_only(self):
+        """共有されるスナップショットは変更できず、pickleしても同じ内容に戻る"""
+        (self.config_dir / 'system_config.json').write_text(
+            json.dumps({'days': ['月', '火'], 'limits': {'max': 6}}), encoding='utf-8'
+        )
+        snapshot = ConfigSnapshot.build(self.config_dir)
+        with self.assertRaises(TypeError):
+            snapshot.tables['base_timetable.csv'] = ()
+        with self.assertRaises(TypeError):
+            snapshot.documents['system_config.json']['limits']['max'] = 7
+        self.assertEqual(snapshot.documents['system_config.json']['days'], ('月', '火'))
+
+        restored = pickle.loads(pickle.dumps(snapshot))
+        self.assertEqual(restored, snapshot)
+        self.assertTrue(restored.is_current())
+        self.assertEqual(restored.load_json('system_config.json'), {'days': ['月', '火'], 'limits': {'max': 6}})
+
+    def test_teacher_index_matches_linear_lookup(self):
+        repo = TeacherMappingRepository(self.config_dir, ConfigFileReader(self.config_dir))
+        mapping = repo.load_teacher_mapping()
+        index = repo.build_teacher_index(mapping)
+        for subject, class_ref in [(Subject("英"), ClassReference(1, 1)), (Subject("数"), ClassReference(1, 2))]:
+            self.assertEqual(index[(subject, class_ref)],
+                             repo.get_all_teachers_for_subject_class(mapping, subject, class_ref))
+            self.assertEqual(index[(subject, class_ref)][0],
+                             repo.get_teacher_for_subject_class(mapping, subject, class_ref))
+        self.assertEqual(index[(Subject("英"), ClassReference(1, 1))], [Teacher("井上"), Teacher("北")])
+
+    def test_school_is_cached_by_config_content(self):
+        """設定が同じなら保存済みのSchool（呼び出しごとに別オブジェクト）を返す"""
+        repo = CSVSchoolRepository(self.config_dir, ConfigFileReader(self.config_dir, self.cache))
+        built = repo.load_school_data()
+        cached = repo.load_school_data()
+        self.assertIsNot(built, cached)
+        self.assertEqual(cached.get_standard_hours(ClassReference(1, 2), Subject("英")), 3)
+        self.assertEqual(cached.get_assigned_teacher(Subject("数"), ClassReference(1, 1)), Teacher("梶永"))
+
+        (self.config_dir / 'base_timetable.csv').write_text(BASE_TIMETABLE.replace("1年2組,4,3", "1年2組,4,5"),
+                                                            encoding='utf-8')
+        self.assertEqual(repo.load_school_data().get_standard_hours(ClassReference(1, 2), Subject("英")), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
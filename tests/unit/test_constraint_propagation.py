@@ -0,0 +1,125 @@
+"""制約伝播エンジンのテスト
+
+ビットマスクによるアーク修正が、値ごとの整合判定（_is_consistent）による
+素朴なAC-3と同じ結果になることを確認します。
+"""
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.value_objects.time_slot import ClassReference, Subject, Teacher
+from src.domain.services.ultrathink.algorithms.constraint_propagation import (
+    ConstraintPropagation, Domain, ValueTable, popcount
+)
+
+
+class TestConstraintPropagation(unittest.TestCase):
+    """ConstraintPropagationのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.classes = [ClassReference(1, 1), ClassReference(1, 2)]
+        teachers = {
+            "国": Teacher("井上"), "数": Teacher("梶永"), "英": Teacher("井上"),
+            "理": Teacher("塚本"), "社": Teacher("金子ひ"), "保": Teacher("梶永"), "音": None,
+        }
+        for class_ref in self.classes:
+            self.school.add_class(class_ref)
+            for subject_name, teacher in teachers.items():
+                subject = Subject(subject_name)
+                self.school.set_standard_hours(class_ref, subject, 3)
+                if teacher:
+                    self.school.assign_teacher_subject(teacher, subject)
+                    self.school.assign_teacher_to_class(teacher, subject, class_ref)
+
+        self.propagation = ConstraintPropagation(self.school)
+        self.propagation.initialize_from_schedule(Schedule())
+        self.variables = sorted(
+            self.propagation.variables,
+            key=lambda v: (v.class_ref.class_number, v.time_slot.day, v.time_slot.period)
+        )
+
+    def _naive_ac3(self, domains):
+        """値の集合と_is_consistentによる素朴なAC-3"""
+        changed = True
+        while changed:
+            changed = False
+            for arc in self.propagation.arcs:
+                unsupported = {
+                    value1 for value1 in domains[arc.var1]
+                    if not any(self.propagation._is_consistent(arc, value1, value2)
+                               for value2 in domains[arc.var2])
+                }
+                if unsupported:
+                    domains[arc.var1] -= unsupported
+                    changed = True
+                    if not domains[arc.var1]:
+                        return False
+        return True
+
+    def test_value_table_round_trip(self):
+        """値の集合とビットマスクは相互に変換できる"""
+        table = ValueTable()
+        values = {("国", "井上"), ("数", None), ("英", "井上")}
+        domain = Domain(self.variables[0], values, table)
+
+        self.assertEqual(domain.values, values)
+        self.assertEqual(domain.size(), 3)
+        self.assertEqual(popcount(table.teacher_masks["井上"]), 2)
+
+        domain.remove_value(("数", None))
+        domain.remove_value(("理", None))  # 未登録の値は無視される
+        self.assertEqual(domain.values, {("国", "井上"), ("英", "井上")})
+
+    def test_ac3_matches_naive_revision(self):
+        """ランダムに絞ったドメインでAC-3の結果が素朴な実装と一致する"""
+        all_values = sorted(self.propagation.value_table.decode(
+            self.propagation.domains[self.variables[0]].mask
+        ))
+
+        outcomes = set()
+        for seed in range(20):
+            rnd = random.Random(seed)
+            for variable in self.variables:
+                size = rnd.choice([1, 2, 3, 4, 5])
+                self.propagation.domains[variable].values = set(rnd.sample(all_values, size))
+            expected = {v: d.values for v, d in self.propagation.domains.items()}
+
+            expected_result = self._naive_ac3(expected)
+            result = self.propagation.ac3()
+
+            self.assertEqual(result, expected_result)
+            outcomes.add(result)
+            if result:
+                self.assertEqual(
+                    {v: d.values for v, d in self.propagation.domains.items()}, expected
+                )
+
+        # 矛盾あり・なしの両方を確認している
+        self.assertEqual(outcomes, {True, False})
+
+    def test_mac_restores_domains_on_failure(self):
+        """MACで矛盾が出た場合は伝播で縮小したドメインも元に戻る"""
+        first, second, third = self.variables[:3]  # 1年1組 同じ曜日の1〜3校時
+        self.propagation.domains[second].values = {("国", "井上"), ("数", "梶永")}
+        self.propagation.domains[third].values = {("数", "梶永")}
+        before = {v: d.mask for v, d in self.propagation.domains.items()}
+
+        # 1校時に国語 → 2校時は数学のみ → 3校時の数学と日内重複で矛盾
+        self.assertFalse(self.propagation.maintain_arc_consistency(first, ("国", "井上")))
+        self.assertEqual({v: d.mask for v, d in self.propagation.domains.items()}, before)
+
+        stats = self.propagation.get_statistics()
+        self.assertEqual(stats['propagations'], 1)
+        self.assertGreater(stats['revise_calls'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
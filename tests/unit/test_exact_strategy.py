@@ -0,0 +1,222 @@
+"""厳密解法（制約モデルとソルバーバックエンド）のテスト
+
+定数セル・不在教員・配置禁止教科がモデルに反映されることと、CP-SATで解いた結果が
+教員重複・5組の同期・交流学級のルール・標準時数を満たすことを確認します。
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.application.services.exact_solver import TimetableModelBuilder, get_backend
+from src.application.services.exact_solver.solver_backends import HAS_ORTOOLS, HAS_PULP
+from src.application.services.generation_strategies.exact_strategy import ExactStrategy
+from src.application.services.schedule_generation_service import ScheduleGenerationService
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.schedule_grid import ALL_TIME_SLOTS, slot_index
+from src.domain.entities.school import School
+from src.domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+from src.infrastructure.config.path_manager import get_path_manager
+
+
+class _ExactTestBase(unittest.TestCase):
+    """1年1組・1年2組（数は同じ教員）と5組・交流学級の小さな学校"""
+
+    def setUp(self):
+        self.school = School()
+        self.class1 = ClassReference(1, 1)
+        self.class2 = ClassReference(1, 2)
+        self.math = Subject("数")
+        self.english = Subject("英")
+        self.kajinaga = Teacher("梶永")
+        self.inoue = Teacher("井上")
+        self.suzuki = Teacher("鈴木")
+        self.school.add_teacher(self.kajinaga)
+        self.school.add_teacher(self.inoue)
+        self.school.add_teacher(self.suzuki)
+        self.school.assign_teacher_subject(self.kajinaga, self.math)
+        self.school.assign_teacher_subject(self.inoue, self.english)
+        self.school.assign_teacher_subject(self.suzuki, self.english)
+        for class_ref, english_teacher in ((self.class1, self.inoue), (self.class2, self.suzuki)):
+            self.school.add_class(class_ref)
+            self.school.set_standard_hours(class_ref, self.math, 4)
+            self.school.set_standard_hours(class_ref, self.english, 4)
+            self.school.assign_teacher_to_class(self.kajinaga, self.math, class_ref)
+            self.school.assign_teacher_to_class(english_teacher, self.english, class_ref)
+        self.school.set_teacher_unavailable("火", 2, self.inoue)
+        self.schedule = Schedule()
+
+    def _build(self, **kwargs):
+        return TimetableModelBuilder(self.school, **kwargs).build(self.schedule)
+
+
+class TestTimetableModelBuilder(_ExactTestBase):
+    """TimetableModelBuilderのテスト"""
+
+    def test_constant_cells_are_not_variables(self):
+        """ロック・固定科目・テスト期間のセルは変数にならない"""
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.class1, self.math, self.kajinaga))
+        self.schedule.lock_cell(TimeSlot("月", 1), self.class1)
+        self.schedule.assign(TimeSlot("月", 6), Assignment(self.class2, Subject("欠"), None))
+        model = self._build(test_periods={("水", 1)})
+
+        self.assertNotIn((slot_index(TimeSlot("月", 1)), self.class1), model.cells)
+        self.assertNotIn((slot_index(TimeSlot("月", 6)), self.class2), model.cells)
+        self.assertNotIn((slot_index(TimeSlot("水", 1)), self.class1), model.cells)
+        self.assertEqual(len(model.cells), len(ALL_TIME_SLOTS) * 2 - 4)
+        # 定数セルの教員は同じコマの他クラスの選択肢から外れる
+        options = [o for _, o in model.cells[(slot_index(TimeSlot("月", 1)), self.class2)].options]
+        self.assertNotIn((self.math, self.kajinaga), options)
+
+    def test_absent_teacher_and_forbidden_subject_are_not_options(self):
+        """不在教員・配置禁止教科の選択肢は作らない"""
+        model = self._build(forbidden_cells={(TimeSlot("月", 1), self.class1): {"数"}})
+
+        def options(time_slot, class_ref):
+            return {o for _, o in model.cells[(slot_index(time_slot), class_ref)].options}
+
+        self.assertEqual(options(TimeSlot("火", 2), self.class1), {(self.math, self.kajinaga)})
+        self.assertEqual(options(TimeSlot("月", 1), self.class1), {(self.english, self.inoue)})
+        self.assertEqual(options(TimeSlot("月", 1), self.class2),
+                         {(self.math, self.kajinaga), (self.english, self.suzuki)})
+
+    def test_current_assignments_become_hints(self):
+        """自由セルの現在の割り当てがヒントになる"""
+        self.schedule.assign(TimeSlot("月", 2), Assignment(self.class1, self.english, self.inoue))
+        model = self._build()
+        cell = model.cells[(slot_index(TimeSlot("月", 2)), self.class1)]
+        chosen = [var for var, option in cell.options if option == (self.english, self.inoue)]
+        self.assertEqual(model.hints[chosen[0]], 1)
+        self.assertEqual(model.hints[cell.empty], 0)
+
+
+@unittest.skipUnless(HAS_ORTOOLS, "ortoolsがインストールされていません")
+class TestCpSatSolve(_ExactTestBase):
+    """CP-SATで解いた結果のテスト"""
+
+    def _solve(self, **kwargs):
+        builder = TimetableModelBuilder(self.school, **kwargs)
+        model = builder.build(self.schedule)
+        result = get_backend('cp-sat').solve(model, time_limit=20)
+        self.assertTrue(result.has_solution)
+        builder.apply(self.schedule, model, result.values)
+        return result
+
+    def _subject_at(self, time_slot, class_ref):
+        assignment = self.schedule.get_assignment(time_slot, class_ref)
+        return assignment.subject.name if assignment else None
+
+    def test_no_teacher_conflict_and_standard_hours(self):
+        """共通の数学教員が重複せず、標準時数以上・日内重複なしで配置される
+
+        空きセルは時数の超過より重いペナルティなので、残りのコマも埋まる。
+        """
+        result = self._solve()
+
+        self.assertEqual(result.status, 'optimal')
+        self.assertEqual(self.schedule.get_teacher_conflicts(), [])
+        for class_ref in (self.class1, self.class2):
+            self.assertGreaterEqual(self.schedule.count_subject_hours(class_ref, self.math), 4)
+            self.assertGreaterEqual(self.schedule.count_subject_hours(class_ref, self.english), 4)
+            for day in "月火水木金":
+                self.assertFalse(self.schedule.has_daily_duplicate(class_ref, day))
+        # 井上先生は火曜2校時に不在
+        self.assertNotEqual(self._subject_at(TimeSlot("火", 2), self.class1), "英")
+
+    def test_grade5_and_exchange_class_rules(self):
+        """5組は3クラス同じ授業、交流学級は親学級と同じ教科か自立（親学級が数・英）"""
+        grade5 = [ClassReference(1, 5), ClassReference(2, 5), ClassReference(3, 5)]
+        exchange = ClassReference(1, 6)
+        jiritsu = Subject("自立")
+        self.school.add_teacher(Teacher("財津"))
+        self.school.assign_teacher_subject(Teacher("財津"), jiritsu)
+        for class_ref in grade5 + [exchange]:
+            self.school.add_class(class_ref)
+            self.school.set_standard_hours(class_ref, self.math, 2)
+            self.school.assign_teacher_to_class(self.kajinaga, self.math, class_ref)
+        self.school.set_standard_hours(exchange, self.english, 2)
+        self.school.assign_teacher_to_class(self.inoue, self.english, exchange)
+        self.school.set_standard_hours(exchange, jiritsu, 2)
+        self.school.assign_teacher_to_class(Teacher("財津"), jiritsu, exchange)
+
+        self._solve()
+
+        for time_slot in ALL_TIME_SLOTS:
+            self.assertEqual(len({self._subject_at(time_slot, c) for c in grade5}), 1)
+            child = self._subject_at(time_slot, exchange)
+            parent = self._subject_at(time_slot, self.class1)
+            if child == "自立":
+                self.assertIn(parent, ("数", "英"))
+            else:
+                self.assertEqual(child, parent)
+        self.assertGreaterEqual(self.schedule.count_subject_hours(exchange, jiritsu), 2)
+        self.assertEqual(self.schedule.get_teacher_conflicts(), [])
+
+
+@unittest.skipUnless(HAS_ORTOOLS and HAS_PULP, "ortools・pulpがインストールされていません")
+class TestPulpBackend(_ExactTestBase):
+    """PuLP/CBCバックエンドのテスト"""
+
+    def test_same_optimum_as_cp_sat(self):
+        """同じモデルでCP-SATと同じ最適値になる"""
+        model = self._build()
+        cp_sat = get_backend('cp-sat').solve(model, time_limit=20)
+        cbc = get_backend('pulp-cbc').solve(model, time_limit=20)
+        self.assertEqual((cbc.status, cbc.objective), ('optimal', cp_sat.objective))
+
+
+@unittest.skipUnless(HAS_ORTOOLS, "ortoolsがインストールされていません")
+class TestExactStrategy(_ExactTestBase):
+    """ExactStrategyのテスト"""
+
+    def test_generate_keeps_locked_cells(self):
+        """ロックされたセルを変えずに残りを埋め、入力のスケジュールは変更しない"""
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.class1, self.english, self.inoue))
+        self.schedule.lock_cell(TimeSlot("月", 1), self.class1)
+        strategy = ExactStrategy(UnifiedConstraintSystem(), time_limit=20)
+        strategy._load_test_periods = lambda schedule: set()
+
+        result = strategy.generate(self.school, self.schedule)
+
+        self.assertEqual(strategy.get_name(), "exact")
+        self.assertTrue(strategy.last_result.has_solution)
+        self.assertEqual(result.get_assignment(TimeSlot("月", 1), self.class1).subject, self.english)
+        self.assertGreaterEqual(result.count_subject_hours(self.class1, self.math), 4)
+        self.assertEqual(len(self.schedule.get_all_assignments()), 1)
+
+    def test_generate_schedule_keeps_solver_result(self):
+        """生成サービス経由でも、空きの5組のセルで後処理が失敗せずソルバーの結果が返る"""
+        grade5 = [ClassReference(1, 5), ClassReference(2, 5), ClassReference(3, 5)]
+        for class_ref in grade5:
+            self.school.add_class(class_ref)
+        constraint_system = UnifiedConstraintSystem()
+        service = ScheduleGenerationService(constraint_system, get_path_manager())
+        strategy = ExactStrategy(constraint_system, time_limit=20)
+        strategy._load_test_periods = lambda schedule: set()
+        service.strategies['exact'] = strategy
+
+        solved = []
+        generate = strategy.generate
+
+        def generate_and_keep(*args, **kwargs):
+            schedule = generate(*args, **kwargs)
+            solved.append(schedule.clone())
+            return schedule
+        strategy.generate = generate_and_keep
+
+        result = service.generate_schedule(self.school, self.schedule, strategy='exact')
+
+        self.assertTrue(strategy.last_result.has_solution)
+        self.assertEqual(service.generation_stats['algorithm_used'], "exact")
+        # 空きスロット埋めはソルバーが埋めたセルを変えない
+        for time_slot, assignment in solved[0].get_all_assignments():
+            self.assertEqual(result.get_assignment(time_slot, assignment.class_ref), assignment)
+
+
+if __name__ == '__main__':
+    unittest.main()
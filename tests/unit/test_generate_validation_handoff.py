@@ -0,0 +1,106 @@
+"""生成から検証・違反分析への受け渡しのテスト
+
+生成結果が学校データと最終検証の違反を持ち、出力ファイルを読み直さずに
+メモリ上の時間割を検証できることを確認します。
+"""
+import logging
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.application.services.qanda_service import ImprovedQandAService
+from src.application.use_cases.generate_schedule_use_case_refactored import GenerateScheduleUseCaseRefactored
+from src.application.use_cases.validate_schedule_use_case import ValidateScheduleUseCase
+from src.domain.constraints.base import ConstraintPriority
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.services.core.unified_constraint_system import ValidationResult
+from src.domain.value_objects.assignment import Assignment, ConstraintViolation
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.presentation.cli.qanda_integration import QandAIntegration
+
+
+class TestGenerateValidationHandoff(unittest.TestCase):
+    """生成結果の受け渡しのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.teacher = Teacher("梶永")
+        self.school.add_teacher(self.teacher)
+        self.schedule = Schedule()
+        for class_number in (1, 2):
+            class_ref = ClassReference(1, class_number)
+            self.school.add_class(class_ref)
+            self.school.set_standard_hours(class_ref, Subject("数"), 1)
+            self.school.assign_teacher_subject(self.teacher, Subject("数"))
+            self.school.assign_teacher_to_class(self.teacher, Subject("数"), class_ref)
+            # 同じ教員が同じ時限に2クラス（教員重複）
+            self.schedule.assign(TimeSlot("火", 2), Assignment(class_ref, Subject("数"), self.teacher))
+
+    def test_result_carries_school_and_final_violations(self):
+        assignment = self.schedule.get_assignment(TimeSlot("火", 2), ClassReference(1, 1))
+        violation = ConstraintViolation("教師重複", TimeSlot("火", 2), assignment)
+        validation_result = ValidationResult(False, [violation], {ConstraintPriority.CRITICAL: 1})
+        use_case = GenerateScheduleUseCaseRefactored.__new__(GenerateScheduleUseCaseRefactored)
+        use_case.logger = logging.getLogger(__name__)
+        optimization_results = {'meeting_improvements': 0, 'gym_improvements': 0, 'workload_improvements': 0}
+
+        result = use_case._create_success_result(
+            self.schedule, self.school, validation_result, 0.1, optimization_results
+        )
+        self.assertIs(result.school, self.school)
+        self.assertEqual(result.violations, [violation])
+        self.assertEqual(result.violations_count, 1)
+
+    def test_validate_in_memory_schedule(self):
+        """ファイルを読まずにメモリ上の時間割を検証する"""
+        with tempfile.TemporaryDirectory() as tmp:
+            result = ValidateScheduleUseCase().validate(self.schedule, self.school, Path(tmp))
+        # 火曜1-3校時に体育がない（メモリ上の時間割の内容で判定される）
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.violations_count, len(result.violations))
+        self.assertTrue(all(v['day'] == '火' for v in result.violations))
+        # 違反分析には辞書ではなく ConstraintViolation を渡せる
+        self.assertEqual(len(result.constraint_violations), result.violations_count)
+        self.assertTrue(all(isinstance(v, ConstraintViolation) for v in result.constraint_violations))
+
+    def test_reused_use_case_does_not_duplicate_violations(self):
+        """同じインスタンスで繰り返し検証しても制約が二重に登録されない"""
+        use_case = ValidateScheduleUseCase()
+        with tempfile.TemporaryDirectory() as tmp:
+            first = use_case.validate(self.schedule, self.school, Path(tmp))
+            second = use_case.validate(self.schedule, self.school, Path(tmp))
+        self.assertGreater(first.violations_count, 0)
+        self.assertEqual(second.violations_count, first.violations_count)
+
+    def test_post_generation_analysis_adds_questions(self):
+        """生成結果の違反（ConstraintViolation）から質問を作ってQA.txtに追加する"""
+        violations = []
+        for class_number in (1, 2, 3, 5):
+            class_ref = ClassReference(1, class_number)
+            assignment = Assignment(class_ref, Subject("数"), self.teacher)
+            violations.append(ConstraintViolation(f"教師重複: 梶永先生が火2限に{class_ref}", TimeSlot("火", 2), assignment))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            qanda = QandAIntegration()
+            qanda._qanda_service = ImprovedQandAService(
+                str(Path(tmp) / 'QA.txt'), str(Path(tmp) / 'qa_metadata.json')
+            )
+            qanda.post_generation_analysis(violations)
+            questions = qanda.qanda_service.get_unanswered_questions()
+            self.assertEqual(len(questions), 1)
+            self.assertIn("梶永先生が火2限", questions[0].question)
+            self.assertIn(questions[0].question, (Path(tmp) / 'QA.txt').read_text(encoding='utf-8'))
+
+            # 同じ違反で再生成しても同じ質問は増やさない
+            qanda.post_generation_analysis(violations)
+            self.assertEqual(len(qanda.qanda_service.get_unanswered_questions()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
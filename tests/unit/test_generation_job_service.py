@@ -0,0 +1,132 @@
+"""生成ジョブサービスのテスト
+
+ジョブがすぐに受け付けられ、進捗（違反数・最少違反数）が順にイベントとして届くこと、
+同じ入力のジョブには保存済みの結果をすぐに返すことを確認します。
+"""
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.application.services import generation_job_service
+from src.application.services.generation_job_service import GenerationJobService
+
+
+def _fake_generate(params, report):
+    """違反数が 5 → 3 → 4 と推移する生成"""
+    for step, violations in enumerate((5, 3, 4), 1):
+        report("スケジュール生成", {'step': step, 'total': 3, 'violations': violations})
+    return {'success': True, 'value': params['value']}
+
+
+def _generate_with_violations(params, report):
+    """違反が残ったまま完了する生成（実際の生成と同じく success は False）"""
+    report("スケジュール生成", {'step': 1, 'total': 1, 'violations': 150})
+    return {'success': False, 'violations_count': 150}
+
+
+def _writing_generate(params, report):
+    """出力ファイルを書く生成（実際の生成と同じく output_path / output_csv を返す）"""
+    output_path = Path(params['output'])
+    output_path.write_text('生成結果\n', encoding='utf-8')
+    return {'success': True, 'output_path': str(output_path), 'output_csv': '生成結果\n'}
+
+
+def _failing_generate(params, report):
+    raise RuntimeError("生成できません")
+
+
+class TestGenerationJobService(unittest.TestCase):
+    """GenerationJobServiceのテスト"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_csv = Path(self.tmp.name) / 'input.csv'
+        self.input_csv.write_text('基本時間割\n', encoding='utf-8')
+        # ワーカーは起動時に JOB_RUNNERS を引き継ぐため、サービスより先に差し替える
+        patcher = mock.patch.dict(generation_job_service.JOB_RUNNERS,
+                                  {'fake': _fake_generate, 'violating': _generate_with_violations,
+                                   'writing': _writing_generate, 'broken': _failing_generate})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.written = []
+        self.service = GenerationJobService(input_files=lambda kind, params: [self.input_csv],
+                                            on_output_written=self.written.append)
+        self.addCleanup(self.service.shutdown)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_progress_events_and_result(self):
+        job = self.service.submit('fake', {'value': 1})
+        events = list(self.service.iter_events(job.job_id))
+
+        self.assertEqual([e.event for e in events], ['queued', 'progress', 'progress', 'progress', 'done'])
+        self.assertEqual([e.seq for e in events], [1, 2, 3, 4, 5])
+        self.assertEqual([(e.data['violations'], e.data['best_violations']) for e in events[1:4]],
+                         [(5, 5), (3, 3), (4, 3)])
+        self.assertEqual(events[-1].data['result'], {'success': True, 'value': 1})
+        self.assertTrue(events[-1].to_sse().startswith('id: 5\nevent: done\ndata: '))
+        # 途中から再接続した場合は続きのイベントだけ返す
+        self.assertEqual([e.seq for e in self.service.iter_events(job.job_id, after=3)], [4, 5])
+
+        finished = self.service.get(job.job_id)
+        self.assertEqual(finished.status, 'done')
+        self.assertFalse(finished.cached)
+
+    def test_identical_input_returns_cached_result(self):
+        first = self.service.wait(self.service.submit('fake', {'value': 1}).job_id, timeout=30)
+        again = self.service.submit('fake', {'value': 1})
+        self.assertTrue(again.cached)
+        self.assertEqual(again.status, 'done')
+        self.assertEqual(again.result, first.result)
+
+        # 入力ファイルが変われば実行し直す
+        self.input_csv.write_text('基本時間割\n1年1組,数\n', encoding='utf-8')
+        changed = self.service.submit('fake', {'value': 1})
+        self.assertFalse(changed.cached)
+        self.assertEqual(self.service.wait(changed.job_id, timeout=30).status, 'done')
+
+    def test_result_with_violations_is_cached(self):
+        """違反が残ったまま完了した生成も、同じ入力なら保存済みの結果を返す"""
+        first = self.service.wait(self.service.submit('violating').job_id, timeout=30)
+        self.assertEqual(first.status, 'done')
+        again = self.service.submit('violating')
+        self.assertTrue(again.cached)
+        self.assertEqual(again.status, 'done')
+        self.assertEqual(again.result, {'success': False, 'violations_count': 150})
+
+    def test_output_written_is_notified_on_finish_and_restore(self):
+        """出力ファイルを書いたジョブの完了時と、保存済みの結果の復元時に通知する"""
+        output_csv = Path(self.tmp.name) / 'output.csv'
+        job = self.service.wait(self.service.submit('writing', {'output': str(output_csv)}).job_id, timeout=30)
+        self.assertEqual(job.status, 'done')
+        # 完了を受け取った時点で通知済み
+        self.assertEqual(self.written, [output_csv])
+
+        # 出力ファイルを編集した後に同じ入力で生成すると、保存済みの結果に戻して通知する
+        output_csv.write_text('手で編集\n', encoding='utf-8')
+        again = self.service.submit('writing', {'output': str(output_csv)})
+        self.assertTrue(again.cached)
+        self.assertEqual(output_csv.read_text(encoding='utf-8'), '生成結果\n')
+        self.assertEqual(self.written, [output_csv, output_csv])
+
+        # 出力ファイルを書かないジョブでは通知しない
+        self.service.wait(self.service.submit('fake', {'value': 1}).job_id, timeout=30)
+        self.assertEqual(len(self.written), 2)
+
+    def test_failed_job_is_not_cached(self):
+        job = self.service.wait(self.service.submit('broken').job_id, timeout=30)
+        self.assertEqual(job.status, 'failed')
+        self.assertIn("生成できません", job.error)
+        self.assertFalse(self.service.submit('broken').cached)
+
+        with self.assertRaises(ValueError):
+            self.service.submit('unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+"""差分制約評価エンジンのテスト
+
+セル変更後の違反一覧・スコアが、全体検証の結果と一致することを確認します。
+"""
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment, ConstraintViolation
+from src.domain.constraints.base import (
+    ConstraintPriority, ConstraintResult, ConstraintValidator, HardConstraint
+)
+from src.domain.constraints.basic_constraints import StandardHoursConstraint
+from src.domain.constraints.daily_duplicate_constraint import DailyDuplicateConstraint
+from src.domain.constraints.teacher_absence_constraint import TeacherAbsenceConstraint
+from src.application.services.optimizers.integrated_optimizer_improved import IntegratedOptimizerImproved
+
+
+class EmptyScheduleConstraint(HardConstraint):
+    """スコープ未対応（スケジュール全体）の制約: 割り当てが1つもなければ違反"""
+
+    def __init__(self):
+        super().__init__(priority=ConstraintPriority.LOW, name="空スケジュール禁止")
+
+    def validate(self, schedule, school):
+        violations = []
+        if not schedule.get_all_assignments():
+            violations.append(ConstraintViolation(
+                description="割り当てがありません", time_slot=TimeSlot("月", 1), assignment=None
+            ))
+        return ConstraintResult(constraint_name=self.name, violations=violations)
+
+
+class TestIncrementalConstraintEvaluator(unittest.TestCase):
+    """IncrementalConstraintEvaluatorのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.class_ref = ClassReference(1, 1)
+        self.school.add_class(self.class_ref)
+        self.school.add_class(ClassReference(1, 2))
+        self.math = Subject("数")
+        self.school.set_standard_hours(self.class_ref, self.math, 2)
+        self.teacher = Teacher("井上")
+
+        self.validator = ConstraintValidator([
+            DailyDuplicateConstraint(),
+            StandardHoursConstraint(),
+            EmptyScheduleConstraint(),
+        ])
+        self.schedule = Schedule()
+        self.evaluator = self.validator.create_incremental_evaluator(self.school)
+        self.evaluator.attach(self.schedule)
+
+    def _full_descriptions(self):
+        results = self.validator.validate_all(self.schedule, self.school)
+        return sorted(v.description for r in results for v in r.violations)
+
+    def _assert_matches_full_validation(self):
+        got = sorted(v.description for v in self.evaluator.get_violations())
+        self.assertEqual(got, self._full_descriptions())
+        self.assertEqual(self.evaluator.violation_count, len(got))
+
+    def test_tracks_assign_and_remove(self):
+        """割り当て・削除の後も全体検証と一致する"""
+        self._assert_matches_full_validation()
+        self.assertEqual(self.evaluator.violation_count, 1)
+
+        for period in (1, 3):
+            self.schedule.assign(TimeSlot("月", period), Assignment(self.class_ref, self.math, self.teacher))
+        self._assert_matches_full_validation()
+        self.assertEqual(self.evaluator.violation_count, 1)  # 日内重複のみ
+
+        self.schedule.remove_assignment(TimeSlot("月", 3), self.class_ref)
+        self._assert_matches_full_validation()
+        self.assertEqual(self.evaluator.violation_count, 1)  # 標準時数不足のみ
+
+    def test_only_affected_scopes_are_rechecked(self):
+        """変更を含むスコープだけが再検証される"""
+        self.evaluator.score
+        before = self.evaluator.get_statistics()['scope_checks']
+        self.schedule.assign(TimeSlot("火", 2), Assignment(self.class_ref, self.math, self.teacher))
+        self.schedule.assign(TimeSlot("火", 4), Assignment(self.class_ref, Subject("英"), self.teacher))
+        self.evaluator.score
+
+        # 日内重複(1クラス・火曜) + 標準時数(1クラス) + 全体制約
+        self.assertEqual(self.evaluator.get_statistics()['scope_checks'] - before, 3)
+
+    def test_score_weights_by_priority(self):
+        """スコアは違反数×優先度"""
+        weights = {c.name: c.priority.value for c in self.validator.constraints}
+        self.assertEqual(self.evaluator.score, weights["空スケジュール禁止"])
+
+    def test_detach_stops_updates(self):
+        """購読解除後は変更を追跡しない"""
+        self.evaluator.detach()
+        self.schedule.assign(TimeSlot("水", 1), Assignment(self.class_ref, self.math, self.teacher))
+        self.assertEqual(self.evaluator.get_statistics()['change_events'], 0)
+
+    def test_fork_is_not_tracked(self):
+        """fork() した複製の変更は通知されない"""
+        forked = self.schedule.fork()
+        forked.assign(TimeSlot("水", 1), Assignment(self.class_ref, self.math, self.teacher))
+        self.assertEqual(self.evaluator.get_statistics()['change_events'], 0)
+
+
+
+class TestIntegratedOptimizerIncremental(unittest.TestCase):
+    """統合最適化の標準時数の入れ替えを差分評価で検証するテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.class_ref = ClassReference(1, 1)
+        self.school.add_class(self.class_ref)
+        for subject_name, teacher_name, hours in (("数", "梶永", 1), ("英", "井上", 2)):
+            teacher = Teacher(teacher_name)
+            self.school.add_teacher(teacher)
+            self.school.set_standard_hours(self.class_ref, Subject(subject_name), hours)
+            self.school.assign_teacher_subject(teacher, Subject(subject_name))
+            self.school.assign_teacher_to_class(teacher, Subject(subject_name), self.class_ref)
+
+        # 数が1時間多く英が1時間足りない（空きコマはない）
+        self.schedule = Schedule()
+        placed = {("月", 1): ("数", "梶永"), ("火", 1): ("数", "梶永"), ("水", 1): ("英", "井上")}
+        for day in ["月", "火", "水", "木", "金"]:
+            for period in range(1, 7):
+                subject_name, teacher_name = placed.get((day, period), ("国", "塚本"))
+                self.schedule.assign(TimeSlot(day, period),
+                                     Assignment(self.class_ref, Subject(subject_name), Teacher(teacher_name)))
+
+        absence = TeacherAbsenceConstraint()
+        absence.constraint_validator.teacher_absences = {"井上": {("月", 1)}}
+        self.validator = ConstraintValidator([absence])
+        self.followup_parser = mock.Mock(parse_test_periods=mock.Mock(return_value=[]))
+
+    def test_swap_that_adds_violation_is_reverted(self):
+        """井上先生が不在の月1への入れ替えは取り消し、火1で入れ替える"""
+        optimizer = IntegratedOptimizerImproved(self.followup_parser, constraint_system=self.validator)
+        results = optimizer.optimize_schedule(self.schedule, self.school)
+
+        self.assertEqual(results['standard_hours_improved'], 1)
+        self.assertEqual(self.schedule.get_assignment(TimeSlot("月", 1), self.class_ref).subject, Subject("数"))
+        self.assertEqual(self.schedule.get_assignment(TimeSlot("火", 1), self.class_ref).subject, Subject("英"))
+        self.assertEqual((results['constraint_score_before'], results['constraint_score_after']), (0, 0))
+        self.assertEqual(self.schedule._change_listeners, [])
+
+    def test_without_constraint_system(self):
+        """制約システムがなければ従来どおり最初に見つかったコマで入れ替える"""
+        results = IntegratedOptimizerImproved(self.followup_parser).optimize_schedule(self.schedule, self.school)
+        self.assertEqual(results['standard_hours_improved'], 1)
+        self.assertEqual(self.schedule.get_assignment(TimeSlot("月", 1), self.class_ref).subject, Subject("英"))
+        self.assertNotIn('constraint_score_after', results)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Follow-upの差分による部分再生成のテスト
+
+Follow-upのスナップショットの差分と保存、新しい不在・会議に当たるセルだけが
+空けられて解き直され、それ以外のセルが変わらないことを確認します。
+"""
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.application.services.exact_solver.solver_backends import HAS_ORTOOLS
+from src.application.services.generation_helpers.followup_delta import (
+    FollowUpSnapshot, FollowUpSnapshotStore
+)
+from src.application.services.incremental_regeneration_service import IncrementalRegenerationService
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+from src.infrastructure.parsers import enhanced_followup_parser as followup
+
+
+class TestFollowUpSnapshot(unittest.TestCase):
+    """FollowUpSnapshot・FollowUpSnapshotStoreのテスト"""
+
+    def test_parse_result_is_expanded_to_periods(self):
+        """時限のない不在は終日、テスト期間は時限ごとに展開される"""
+        snapshot = FollowUpSnapshot.from_parse_result({
+            'teacher_absences': [followup.TeacherAbsence("北", "月", [], "振休"),
+                                 followup.TeacherAbsence("井上", "火", [5, 6], "研修")],
+            'meetings': [followup.MeetingSchedule("企画", "火", 1)],
+            'test_periods': [followup.TestPeriod("水", [1, 2], "テスト")],
+        })
+        self.assertEqual(len(snapshot.absences), 8)
+        self.assertIn(("井上", "火", 6), snapshot.absences)
+        self.assertEqual(snapshot.meetings, {("企画", "火", 1)})
+        self.assertEqual(snapshot.test_periods, {("水", 1), ("水", 2)})
+
+    def test_diff_and_store_round_trip(self):
+        """保存したスナップショットとの差分は増減した項目だけ"""
+        previous = FollowUpSnapshot(absences=frozenset({("北", "月", 1), ("井上", "火", 5)}))
+        current = FollowUpSnapshot(absences=frozenset({("北", "月", 1), ("梶永", "金", 2)}),
+                                   meetings=frozenset({("企画", "火", 1)}))
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FollowUpSnapshotStore(Path(tmp) / 'checkpoints' / 'followup_snapshot.json')
+            self.assertIsNone(store.load())
+            store.save(previous)
+            delta = current.diff(store.load())
+
+        self.assertEqual(delta.added_absences, {("梶永", "金", 2)})
+        self.assertEqual(delta.removed_absences, {("井上", "火", 5)})
+        self.assertEqual(delta.added_meetings, {("企画", "火", 1)})
+        self.assertTrue(current.diff(current).is_empty)
+        # 前回がなければ今回の全項目が追加
+        self.assertEqual(current.diff(None).added_absences, current.absences)
+
+
+class TestIncrementalRegenerationService(unittest.TestCase):
+    """IncrementalRegenerationServiceのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.class1 = ClassReference(1, 1)
+        self.class2 = ClassReference(1, 2)
+        self.teachers = {name: Teacher(name) for name in ("梶永", "井上", "鈴木", "塚本")}
+        for teacher in self.teachers.values():
+            self.school.add_teacher(teacher)
+        subjects = {"数": "梶永", "英": "井上", "理": "塚本"}
+        for class_ref in (self.class1, self.class2):
+            self.school.add_class(class_ref)
+            for subject_name, teacher_name in subjects.items():
+                if class_ref == self.class2 and subject_name == "英":
+                    teacher_name = "鈴木"
+                subject, teacher = Subject(subject_name), self.teachers[teacher_name]
+                self.school.set_standard_hours(class_ref, subject, 3)
+                self.school.assign_teacher_subject(teacher, subject)
+                self.school.assign_teacher_to_class(teacher, subject, class_ref)
+
+        self.base = Schedule()
+        for time_slot, class_ref, subject_name, teacher_name in (
+            (TimeSlot("月", 1), self.class1, "数", "梶永"),
+            (TimeSlot("月", 2), self.class1, "英", "井上"),
+            (TimeSlot("月", 1), self.class2, "英", "鈴木"),
+            (TimeSlot("火", 1), self.class2, "数", "梶永"),
+        ):
+            self.base.assign(time_slot, Assignment(class_ref, Subject(subject_name), self.teachers[teacher_name]))
+        self.service = IncrementalRegenerationService(
+            UnifiedConstraintSystem(), time_limit=5, fixed_subjects=set(),
+            meeting_members={"企画": ["梶永"]}
+        )
+        # 北先生の不在は先週から変わらない
+        self.previous = FollowUpSnapshot(absences=frozenset({("北", "月", 1)}))
+        self.current = FollowUpSnapshot(
+            absences=frozenset({("北", "月", 1), ("井上", "月", 2)}),
+            meetings=frozenset({("企画", "火", 1)})
+        )
+
+    def test_only_cells_of_new_absences_and_meetings_are_affected(self):
+        """新しい不在・会議の教員が担当しているセルだけを空ける"""
+        cells = self.service.find_affected_cells(
+            self.base, self.school, self.current.diff(self.previous)
+        )
+        self.assertEqual(cells, {(TimeSlot("月", 2), self.class1), (TimeSlot("火", 1), self.class2)})
+
+    def test_meeting_members_are_read_from_config(self):
+        """参加教員を省略すると meeting_members.csv の参加者（企画: 井上・蒲地など）を使う"""
+        service = IncrementalRegenerationService(UnifiedConstraintSystem(), time_limit=5, fixed_subjects=set())
+        self.assertIn("蒲地", service._get_meeting_members("企画"))
+
+        self.base.assign(TimeSlot("火", 1), Assignment(self.class1, Subject("英"), self.teachers["井上"]))
+        cells = service.find_affected_cells(
+            self.base, self.school, FollowUpSnapshot(meetings=frozenset({("企画", "火", 1)})).diff(None)
+        )
+        self.assertEqual(cells, {(TimeSlot("火", 1), self.class1)})
+
+    @unittest.skipUnless(HAS_ORTOOLS, "ortoolsがインストールされていません")
+    def test_regenerate_changes_only_affected_cells(self):
+        """空けたセルだけを解き直し、土台のスケジュールは変更しない"""
+        schedule, result = self.service.regenerate(
+            self.school, self.base, self.current, self.previous
+        )
+
+        self.assertEqual(len(result.invalidated_cells), 2)
+        self.assertTrue(result.repaired)
+        moved = schedule.get_assignment(TimeSlot("月", 2), self.class1)
+        self.assertNotEqual(moved.teacher, self.teachers["井上"])
+        blocked = schedule.get_assignment(TimeSlot("火", 1), self.class2)
+        self.assertTrue(blocked is None or blocked.teacher != self.teachers["梶永"])
+        for time_slot, class_ref in ((TimeSlot("月", 1), self.class1), (TimeSlot("月", 1), self.class2)):
+            self.assertEqual(schedule.get_assignment(time_slot, class_ref),
+                             self.base.get_assignment(time_slot, class_ref))
+        self.assertEqual(self.base.get_assignment(TimeSlot("月", 2), self.class1).teacher,
+                         self.teachers["井上"])
+        # 空きセルは埋めない（変更を最小にする）
+        self.assertIsNone(schedule.get_assignment(TimeSlot("水", 1), self.class1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+"""大近傍探索（LNS）のテスト
+
+近傍だけを変数にした制約グラフ、近傍の種類の適応的な選択、ソルバー・スマート
+バックトラッキングによる近傍の再最適化で教師重複が解消されることを確認します。
+"""
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.application.services.exact_solver.solver_backends import HAS_ORTOOLS
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+from src.domain.services.ultrathink.algorithms.constraint_propagation import (
+    ConstraintPropagation, Variable
+)
+from src.domain.services.ultrathink.components.large_neighborhood_search import (
+    LargeNeighborhoodSearchStrategy, NeighborhoodStats
+)
+from src.domain.services.ultrathink.components.optimization_strategy_pool import (
+    OptimizationStrategyPool
+)
+from src.domain.services.ultrathink.components.pipeline_orchestrator import (
+    PipelineContext, PipelineOrchestrator
+)
+
+
+def evaluate(schedule, school):
+    """教師重複と日内重複を数える評価関数"""
+    conflicts = len(schedule.get_teacher_conflicts())
+    duplicates = sum(
+        1 for class_ref in school.get_all_classes() for day in "月火水木金"
+        if schedule.has_daily_duplicate(class_ref, day)
+    )
+    return 100.0 - 10 * (conflicts + duplicates), duplicates, conflicts
+
+
+class _LnsTestBase(unittest.TestCase):
+    """1年1組・1年2組（数は同じ教員）の小さな学校"""
+
+    def setUp(self):
+        self.school = School()
+        self.class1 = ClassReference(1, 1)
+        self.class2 = ClassReference(1, 2)
+        self.math = Subject("数")
+        self.english = Subject("英")
+        self.kajinaga = Teacher("梶永")
+        self.inoue = Teacher("井上")
+        self.suzuki = Teacher("鈴木")
+        for teacher in (self.kajinaga, self.inoue, self.suzuki):
+            self.school.add_teacher(teacher)
+        self.school.assign_teacher_subject(self.kajinaga, self.math)
+        self.school.assign_teacher_subject(self.inoue, self.english)
+        self.school.assign_teacher_subject(self.suzuki, self.english)
+        for class_ref, english_teacher in ((self.class1, self.inoue), (self.class2, self.suzuki)):
+            self.school.add_class(class_ref)
+            self.school.set_standard_hours(class_ref, self.math, 4)
+            self.school.set_standard_hours(class_ref, self.english, 4)
+            self.school.assign_teacher_to_class(self.kajinaga, self.math, class_ref)
+            self.school.assign_teacher_to_class(english_teacher, self.english, class_ref)
+
+        # 月曜1校時に梶永先生が2クラスを担当（教師重複）
+        self.schedule = Schedule()
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.class1, self.math, self.kajinaga))
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.class2, self.math, self.kajinaga))
+        self.schedule.assign(TimeSlot("月", 2), Assignment(self.class1, self.english, self.inoue))
+
+    def _optimize(self, strategy):
+        return strategy.optimize(
+            self.schedule, self.school, lambda s: evaluate(s, self.school), time_limit=2
+        )
+
+
+class TestNeighborhoodPropagation(_LnsTestBase):
+    """ConstraintPropagation.initialize_neighborhoodのテスト"""
+
+    def test_domains_exclude_values_fixed_outside(self):
+        """近傍の外の割り当て・不在教員と矛盾する値はドメインに入らない"""
+        self.school.set_teacher_unavailable("月", 3, self.suzuki)
+        cells = {(TimeSlot("月", 1), self.class2), (TimeSlot("月", 3), self.class2),
+                 (TimeSlot("月", 3), self.class1)}
+        propagation = ConstraintPropagation(self.school)
+        propagation.initialize_neighborhood(self.schedule, cells)
+
+        def values(time_slot, class_ref):
+            return propagation.domains[Variable(time_slot, class_ref)].values
+
+        self.assertEqual(len(propagation.variables), 3)
+        # 1組の月曜1校時（近傍の外）で梶永先生は授業中
+        self.assertEqual(values(TimeSlot("月", 1), self.class2), {("英", "鈴木")})
+        # 鈴木先生は月曜3校時に不在
+        self.assertEqual(values(TimeSlot("月", 3), self.class2), {("数", "梶永")})
+        # 1組は月曜に数・英が既にある
+        self.assertEqual(values(TimeSlot("月", 3), self.class1), set())
+
+
+class TestLargeNeighborhoodSearch(_LnsTestBase):
+    """LargeNeighborhoodSearchStrategyのテスト"""
+
+    def test_select_kind_prefers_improvement_per_second(self):
+        """試行済みなら1秒あたりの改善量が最も大きい種類を選ぶ"""
+        strategy = LargeNeighborhoodSearchStrategy(exploration_rate=0.0, seed=1)
+        strategy.neighborhood_stats = {
+            'teacher_week': NeighborhoodStats(attempts=3, improvement=30, elapsed=3.0),
+            'grade_day': NeighborhoodStats(attempts=3, improvement=30, elapsed=1.0),
+            'violation_cluster': NeighborhoodStats(),
+        }
+        self.assertEqual(strategy._select_kind(['teacher_week', 'grade_day', 'violation_cluster']),
+                         'violation_cluster')
+        self.assertEqual(strategy._select_kind(['teacher_week', 'grade_day']), 'grade_day')
+
+    def test_backtracking_repair_resolves_teacher_conflict(self):
+        """ソルバーが無くてもスマートバックトラッキングで教師重複を解消する"""
+        strategy = LargeNeighborhoodSearchStrategy(seed=1)
+        strategy._solver_checked = True
+
+        result = self._optimize(strategy)
+
+        self.assertEqual(result.get_teacher_conflicts(), [])
+        self.assertEqual(len(self.schedule.get_teacher_conflicts()), 1)
+        stats = strategy.get_statistics()
+        self.assertGreater(sum(s['accepted'] for s in stats.values()), 0)
+        self.assertGreater(sum(s['improvement_per_second'] for s in stats.values()), 0)
+
+    def test_locked_cells_are_kept(self):
+        """ロックされたセルは近傍に入らない"""
+        self.schedule.lock_cell(TimeSlot("月", 1), self.class1)
+        strategy = LargeNeighborhoodSearchStrategy(seed=1)
+        strategy._solver_checked = True
+
+        result = self._optimize(strategy)
+
+        self.assertEqual(result.get_assignment(TimeSlot("月", 1), self.class1).teacher, self.kajinaga)
+        self.assertEqual(result.get_teacher_conflicts(), [])
+
+    @unittest.skipUnless(HAS_ORTOOLS, "ortoolsがインストールされていません")
+    def test_solver_repair_resolves_teacher_conflict(self):
+        """ソルバーで近傍を解き直して教師重複を解消する"""
+        strategy = LargeNeighborhoodSearchStrategy(backend='cp-sat', repair_time_limit=2, seed=1)
+
+        result = self._optimize(strategy)
+
+        self.assertEqual(result.get_teacher_conflicts(), [])
+
+
+class TestStrategyPoolRegistration(unittest.TestCase):
+    """OptimizationStrategyPoolへの登録のテスト"""
+
+    def test_lns_is_registered_and_selected(self):
+        pool = OptimizationStrategyPool()
+        self.assertIn('LNS', pool.strategies)
+        self.assertEqual(pool.select_strategy({'optimization_level': 'lns'}).get_name(), 'LNS')
+        self.assertNotIn('LNS', OptimizationStrategyPool(lns_enabled=False).strategies)
+
+    def test_pipeline_passes_optimization_level_to_pool(self):
+        """生成の制約に lns を指定すると最適化ステージで LNS が使われる"""
+        pool = OptimizationStrategyPool()
+        constraint_manager = mock.Mock()
+        constraint_manager.check_schedule.return_value = []
+        orchestrator = PipelineOrchestrator(constraint_manager=constraint_manager, strategy_pool=pool)
+        schedule = Schedule()
+        with mock.patch.object(pool.strategies['LNS'], 'optimize', return_value=schedule) as lns:
+            orchestrator._optimize_schedule(
+                PipelineContext(schedule, School(), {'optimization_level': 'lns'})
+            )
+        lns.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
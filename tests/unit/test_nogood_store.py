@@ -0,0 +1,114 @@
+"""no-goodデータベースのテスト
+
+違反チェック・LRU削除・学校データのハッシュによる保存/読み込みと、
+SmartBacktrackingでの学習・再利用を確認します。
+"""
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.entities.school import School
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.services.ultrathink.algorithms.constraint_propagation import (
+    ConstraintPropagation, Variable
+)
+from src.domain.services.ultrathink.algorithms.nogood_store import NoGoodStore
+from src.domain.services.ultrathink.algorithms.smart_backtracking import (
+    AssignmentNode, SmartBacktracking
+)
+
+
+class TestNoGoodStore(unittest.TestCase):
+    """NoGoodStoreのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.class1 = ClassReference(1, 1)
+        self.class2 = ClassReference(1, 2)
+        for class_ref in (self.class1, self.class2):
+            self.school.add_class(class_ref)
+            self.school.set_standard_hours(class_ref, Subject("数"), 3)
+
+        self.var1 = Variable(TimeSlot("月", 1), self.class1)
+        self.var2 = Variable(TimeSlot("月", 1), self.class2)
+        self.var3 = Variable(TimeSlot("月", 2), self.class1)
+        self.math = ("数", "梶永")
+        self.english = ("英", "井上")
+
+    def test_find_violation_uses_literal_index(self):
+        """割り当てがno-goodの全リテラルを含む時だけ違反になる"""
+        store = NoGoodStore()
+        store.add({(self.var1, self.math), (self.var2, self.math)})
+
+        self.assertIsNone(store.find_violation({}, self.var1, self.math))
+        self.assertIsNone(store.find_violation({self.var2: self.english}, self.var1, self.math))
+        self.assertIsNotNone(store.find_violation({self.var2: self.math}, self.var1, self.math))
+        # 関係のない値はリテラル索引で候補にならない
+        self.assertIsNone(store.find_violation({self.var2: self.math}, self.var1, self.english))
+
+    def test_lru_eviction(self):
+        """上限を超えると最も使われていないno-goodが削除される"""
+        store = NoGoodStore(max_size=2)
+        first = {(self.var1, self.math), (self.var2, self.math)}
+        second = {(self.var1, self.math), (self.var3, self.math)}
+        store.add(first)
+        store.add(second)
+
+        # firstを使うとsecondが最も古くなる
+        store.find_violation({self.var2: self.math}, self.var1, self.math)
+        store.add({(self.var2, self.english), (self.var3, self.english)})
+
+        self.assertIn(frozenset(first), store)
+        self.assertNotIn(frozenset(second), store)
+        self.assertIsNone(store.find_violation({self.var3: self.math}, self.var1, self.math))
+        self.assertEqual(store.get_statistics()['evicted'], 1)
+
+    def test_save_and_load_by_school_hash(self):
+        """学校データのハッシュが一致する時だけ読み込まれる"""
+        store = NoGoodStore()
+        store.add({(self.var1, self.math), (self.var2, self.math)})
+        school_hash = NoGoodStore.compute_school_hash(self.school)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = str(Path(tmp_dir) / "nogoods.json")
+            store.save(path, school_hash)
+
+            loaded = NoGoodStore()
+            self.assertEqual(loaded.load(path, school_hash), 1)
+            self.assertTrue(loaded.is_reused(frozenset({(self.var1, self.math), (self.var2, self.math)})))
+
+            # 教員の不在が変わればハッシュも変わる
+            self.school.set_teacher_unavailable("月", 1, Teacher("梶永"))
+            changed_hash = NoGoodStore.compute_school_hash(self.school)
+            self.assertNotEqual(changed_hash, school_hash)
+            self.assertEqual(NoGoodStore().load(path, changed_hash), 0)
+
+    def test_backtracking_learns_and_reuses_nogoods(self):
+        """競合から最小のno-goodを学習し、再利用したno-goodで枝刈りした数を数える"""
+        propagation = ConstraintPropagation(self.school)
+        store = NoGoodStore()
+        store.add({(self.var1, self.english), (self.var3, self.english)}, reused=True)
+        backtracking = SmartBacktracking(self.school, propagation, nogood_store=store)
+
+        # 同じ時間の同じ教員 → 教師重複のno-goodを学習（無関係なvar3は含まない）
+        backtracking.assignments = {self.var2: self.math, self.var3: self.english, self.var1: self.math}
+        backtracking._analyze_conflict(AssignmentNode(self.var1, self.math, depth=3))
+        self.assertIn(frozenset({(self.var1, self.math), (self.var2, self.math)}), store)
+
+        # 読み込んだno-goodによる枝刈り
+        backtracking.assignments = {self.var3: self.english}
+        self.assertTrue(backtracking._violates_nogood(self.var1, self.english))
+
+        stats = backtracking.get_statistics()
+        self.assertEqual(stats['nogoods_learned'], 1)
+        self.assertEqual(stats['nodes_pruned'], 1)
+        self.assertEqual(stats['nodes_pruned_by_reused'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
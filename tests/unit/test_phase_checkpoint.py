@@ -0,0 +1,111 @@
+"""フェーズごとのチェックポイントのテスト
+
+入力ファイルやフェーズのパラメータが変わった時だけキーが変わることと、
+CSPOrchestratorImprovedが --resume 時に完了済みのフェーズを省略することを確認します。
+"""
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.application.services.csp_orchestrator import CSPOrchestratorImproved
+from src.application.services.generation_helpers.phase_checkpoint import PhaseCheckpointStore
+from src.application.services.generation_strategies.constraint_validator_adapter import ConstraintValidatorAdapter
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+
+PHASES = ['initialization', 'jiritsu', 'grade5', 'exchange_sync', 'regular_subjects', 'optimization']
+
+
+class TestPhaseCheckpoint(unittest.TestCase):
+    """PhaseCheckpointStoreのテスト"""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp = Path(tmp_dir.name)
+        (self.tmp / 'config').mkdir()
+        (self.tmp / 'config' / 'basics.csv').write_text("a,b\n", encoding='utf-8')
+        (self.tmp / 'input.csv').write_text("1年1組\n", encoding='utf-8')
+        (self.tmp / 'Follow-up.csv').write_text("月曜日\n", encoding='utf-8')
+        self.store = PhaseCheckpointStore(
+            self.tmp / 'checkpoints', self.tmp / 'input.csv',
+            self.tmp / 'config', self.tmp / 'Follow-up.csv'
+        )
+
+        self.class1 = ClassReference(1, 1)
+        self.school = School()
+        self.school.add_class(self.class1)
+        self.schedule = Schedule()
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.class1, Subject("数"), Teacher("梶永")))
+
+    def test_phase_keys_follow_inputs(self):
+        """入力ファイルの変更は全フェーズ、最適化の反復回数は最適化フェーズだけのキーを変える"""
+        keys = self.store.compute_phase_keys(self.schedule, PHASES, {'optimization': {'max_iterations': 100}})
+        self.assertEqual(len(set(keys)), len(PHASES))
+
+        other_iterations = self.store.compute_phase_keys(self.schedule, PHASES, {'optimization': {'max_iterations': 50}})
+        self.assertEqual(other_iterations[:-1], keys[:-1])
+        self.assertNotEqual(other_iterations[-1], keys[-1])
+
+        (self.tmp / 'Follow-up.csv').write_text("火曜日\n", encoding='utf-8')
+        changed = self.store.compute_phase_keys(self.schedule, PHASES, {'optimization': {'max_iterations': 100}})
+        self.assertTrue(all(a != b for a, b in zip(changed, keys)))
+
+    def test_save_and_load(self):
+        """キーが一致する時だけスケジュールと統計情報を読み込む"""
+        self.schedule.lock_cell(TimeSlot("月", 1), self.class1)
+        self.store.save('jiritsu', 'key1', self.schedule, {'jiritsu_placed': 3})
+
+        schedule, statistics = self.store.load('jiritsu', 'key1')
+        self.assertEqual(schedule.to_bytes(), self.schedule.to_bytes())
+        self.assertEqual(statistics, {'jiritsu_placed': 3})
+        self.assertIsNone(self.store.load('jiritsu', 'key2'))
+        self.assertIsNone(self.store.load('grade5', 'key1'))
+
+    def test_orchestrator_resumes_from_checkpoint(self):
+        """--resume では完了済みのフェーズを省略し、変わったフェーズから再実行する"""
+        orchestrator = CSPOrchestratorImproved(
+            ConstraintValidatorAdapter(UnifiedConstraintSystem()), checkpoint_store=self.store
+        )
+        calls = []
+
+        def phase(name, period=None):
+            def run(schedule, school, *args):
+                calls.append(name)
+                orchestrator.statistics[name] = 1
+                if period:
+                    schedule.assign(TimeSlot("火", period), Assignment(self.class1, Subject("英"), None))
+            return run
+
+        orchestrator._phase1_initialization = phase('initialization')
+        orchestrator._phase2_jiritsu_placement = phase('jiritsu')
+        orchestrator._phase3_grade5_synchronization = phase('grade5')
+        orchestrator._phase4_exchange_class_sync = phase('exchange_sync')
+        orchestrator._phase5_regular_subjects = phase('regular_subjects', period=2)
+        orchestrator._phase6_optimization = phase('optimization', period=3)
+
+        first = orchestrator.generate(self.school, 100, self.schedule.clone())
+        self.assertEqual(calls, PHASES)
+
+        calls.clear()
+        resumed = orchestrator.generate(self.school, 100, self.schedule.clone(), resume=True)
+        self.assertEqual(calls, [])
+        self.assertEqual(resumed.to_bytes(), first.to_bytes())
+        self.assertEqual(orchestrator.statistics['regular_subjects'], 1)
+
+        # 反復回数だけを変えれば最適化フェーズだけをやり直す
+        resumed = orchestrator.generate(self.school, 50, self.schedule.clone(), resume=True)
+        self.assertEqual(calls, ['optimization'])
+        self.assertEqual(resumed.get_assignment(TimeSlot("火", 2), self.class1).subject, Subject("英"))
+
+
+if __name__ == '__main__':
+    unittest.main()
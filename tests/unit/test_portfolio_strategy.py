@@ -0,0 +1,123 @@
+"""ポートフォリオ戦略のテスト
+
+違反0件のメンバーが見つかった時点で残りのメンバーを打ち切ることと、
+既定のメンバーが実データで実行できることを確認します。
+"""
+import importlib.util
+import logging
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.application.services.generation_strategies import portfolio_strategy
+from src.application.services.generation_strategies.portfolio_strategy import (
+    PortfolioMember, PortfolioStrategy
+)
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+from src.application.services.constraint_registration_service import ConstraintRegistrationService
+from src.application.services.data_loading_service import DataLoadingService
+from src.infrastructure.config.path_config import path_config
+
+
+def _return_as_is(school, schedule, constraint_system, max_iterations):
+    return schedule
+
+
+def _sleep(school, schedule, constraint_system, max_iterations):
+    time.sleep(30)
+    return schedule
+
+
+class TestPortfolioStrategy(unittest.TestCase):
+    """PortfolioStrategyのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.classes = [ClassReference(1, 1), ClassReference(1, 5), ClassReference(2, 5), ClassReference(3, 5)]
+        for class_ref in self.classes:
+            self.school.add_class(class_ref)
+
+        self.schedule = Schedule()
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.classes[0], Subject("数"), Teacher("梶永")))
+        self.schedule.assign(TimeSlot("月", 2), Assignment(self.classes[0], Subject("英"), None))
+        self.schedule.assign(TimeSlot("火", 3), Assignment(self.classes[1], Subject("国"), Teacher("金子み")))
+        self.schedule.lock_cell(TimeSlot("月", 1), self.classes[0])
+        self.schedule.lock_cell(TimeSlot("火", 3), self.classes[1])
+        self.schedule.set_test_periods({("水", 1), ("水", 2)})
+
+    def _contents(self, schedule):
+        return {
+            (time_slot, class_ref): (
+                assignment.subject.name,
+                assignment.teacher.name if assignment and assignment.teacher else None,
+                schedule.is_locked(time_slot, class_ref)
+            ) if (assignment := schedule.get_assignment(time_slot, class_ref)) else schedule.is_locked(time_slot, class_ref)
+            for time_slot in [TimeSlot(day, period) for day in "月火水木金" for period in range(1, 7)]
+            for class_ref in self.classes
+        }
+
+    def test_stops_when_zero_violation_found(self):
+        """違反0件のメンバーが見つかれば実行中・未実行のメンバーを打ち切る"""
+        portfolio_strategy.PORTFOLIO_GENERATORS['test_as_is'] = _return_as_is
+        portfolio_strategy.PORTFOLIO_GENERATORS['test_sleep'] = _sleep
+        self.addCleanup(portfolio_strategy.PORTFOLIO_GENERATORS.pop, 'test_as_is')
+        self.addCleanup(portfolio_strategy.PORTFOLIO_GENERATORS.pop, 'test_sleep')
+
+        strategy = PortfolioStrategy(
+            UnifiedConstraintSystem(),
+            members=[PortfolioMember('test_sleep'), PortfolioMember('test_as_is'),
+                     PortfolioMember('test_sleep', 1)],
+            max_workers=2
+        )
+        start_time = time.time()
+        schedule = strategy.generate(self.school, self.schedule)
+
+        self.assertLess(time.time() - start_time, 20)
+        self.assertEqual(self._contents(schedule), self._contents(self.schedule))
+        self.assertEqual([r.member.generator for r in strategy.results], ['test_as_is'])
+        self.assertEqual(strategy.results[0].violations, 0)
+
+
+
+class TestDefaultMembers(unittest.TestCase):
+    """既定のメンバーを実データ（data/ の入力時間割・制約）で実行する"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        data_dir = path_config.data_dir
+        data_loading_service = DataLoadingService()
+        cls.school, _ = data_loading_service.load_school_data(data_dir)
+        _, teacher_absences = data_loading_service.load_weekly_requirements(data_dir, cls.school)
+        cls.constraint_system = UnifiedConstraintSystem()
+        ConstraintRegistrationService().register_all_constraints(cls.constraint_system, data_dir, teacher_absences)
+        _, schedule_repo = data_loading_service.get_repositories(data_dir)
+        cls.schedule = schedule_repo.load(str(path_config.input_csv), cls.school)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_every_default_member_runs(self):
+        """既定のメンバーはどれも例外なくスケジュールを返す"""
+        for generator in dict.fromkeys(m.generator for m in PortfolioStrategy.DEFAULT_MEMBERS):
+            with self.subTest(generator=generator):
+                if generator == 'ultrathink_v14' and importlib.util.find_spec('numba') is None:
+                    self.skipTest("numbaがインストールされていません")
+                schedule = portfolio_strategy.PORTFOLIO_GENERATORS[generator](
+                    self.school, self.schedule.fork(), self.constraint_system, 10
+                )
+                self.assertGreater(len(schedule.get_all_assignments()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""時間割のバイナリ形式のテスト
+
+復元したスケジュールが Schedule.clone() と同じ状態（割り当て・ロック・5組ユニット・
+テスト期間・各種フラグ・教員と日内のインデックス）になることを確認します。
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.schedule_codec import ScheduleCodec
+from src.domain.entities.schedule_grid import ALL_TIME_SLOTS
+from src.domain.exceptions import DataLoadingError, InvalidAssignmentException
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+
+
+class TestScheduleCodec(unittest.TestCase):
+    """ScheduleCodecのテスト"""
+
+    def setUp(self):
+        self.class1 = ClassReference(1, 1)
+        self.class2 = ClassReference(2, 3)
+        self.grade5 = [ClassReference(1, 5), ClassReference(2, 5), ClassReference(3, 5)]
+        self.classes = [self.class1, self.class2] + self.grade5
+        self.inoue = Teacher("井上")
+
+        self.schedule = Schedule()
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.class1, Subject("数"), self.inoue))
+        self.schedule.assign(TimeSlot("月", 2), Assignment(self.class1, Subject("数"), self.inoue))
+        self.schedule.assign(TimeSlot("月", 1), Assignment(self.class2, Subject("英"), self.inoue))
+        self.schedule.assign(TimeSlot("火", 4), Assignment(self.class2, Subject("音"), None))
+        self.schedule.assign(TimeSlot("水", 3), Assignment(self.grade5[0], Subject("国"), Teacher("金子み")))
+        # 5組同期を止めて1クラスだけに書いたセル（ユニットには入らない）
+        self.schedule.disable_grade5_sync()
+        self.schedule.assign(TimeSlot("金", 2), Assignment(self.grade5[1], Subject("理"), None))
+        self.schedule.enable_grade5_sync()
+
+        self.schedule.lock_cell(TimeSlot("月", 1), self.class1)
+        self.schedule.lock_cell(TimeSlot("水", 3), self.grade5[0])
+        self.schedule.set_test_periods({("木", 1), ("木", 2)})
+        self.schedule.disable_fixed_subject_protection()
+
+    def _state(self, schedule):
+        cells = {
+            (time_slot, class_ref): (
+                schedule.get_assignment(time_slot, class_ref),
+                schedule.is_locked(time_slot, class_ref),
+                schedule.is_test_period(time_slot),
+            )
+            for time_slot in ALL_TIME_SLOTS for class_ref in self.classes
+        }
+        indexes = {
+            'teacher': [len(schedule.get_teacher_at_time(time_slot, self.inoue)) for time_slot in ALL_TIME_SLOTS],
+            'daily': [schedule.count_daily_subject(self.class1, day, Subject("数")) for day in "月火水木金"],
+            'duplicate': schedule.has_daily_duplicate(self.class1, "月"),
+            'unit': [schedule.grade5_unit.get_common_assignment(time_slot) for time_slot in ALL_TIME_SLOTS],
+            'count': len(schedule.get_all_assignments()),
+        }
+        flags = (schedule._grade5_sync_enabled, schedule._fixed_subject_protection_enabled)
+        return cells, indexes, flags
+
+    def test_round_trip_matches_clone(self):
+        """復元したスケジュールはclone()と同じ状態になる"""
+        data = self.schedule.to_bytes()
+        restored = Schedule.from_bytes(data)
+
+        self.assertEqual(self._state(restored), self._state(self.schedule.clone()))
+        self.assertIsNone(restored.grade5_unit.get_common_assignment(TimeSlot("金", 2)))
+        self.assertEqual(restored.to_bytes(), data)
+        self.assertLess(len(data), 1024)
+
+    def test_restored_schedule_behaves_like_clone(self):
+        """復元後の変更もclone()と同じように扱われる"""
+        restored = Schedule.from_bytes(self.schedule.to_bytes())
+        clone = self.schedule.clone()
+
+        for schedule in (restored, clone):
+            with self.assertRaises(InvalidAssignmentException):
+                schedule.assign(TimeSlot("水", 3), Assignment(self.grade5[2], Subject("数"), None))
+            schedule.remove_assignment(TimeSlot("月", 2), self.class1)
+            schedule.assign(TimeSlot("火", 1), Assignment(self.grade5[2], Subject("社"), self.inoue))
+
+        self.assertEqual(self._state(restored), self._state(clone))
+
+    def test_decode_from_memoryview(self):
+        """バッファの一部を指すmemoryviewからも復元できる"""
+        data = self.schedule.to_bytes()
+        buffer = bytearray(b"xx" + data + b"yy")
+        restored = ScheduleCodec.decode(memoryview(buffer)[2:-2])
+        self.assertEqual(self._state(restored), self._state(self.schedule.clone()))
+
+    def test_rejects_invalid_data(self):
+        """形式・バージョン・長さが不正なデータはDataLoadingError"""
+        data = bytearray(self.schedule.to_bytes())
+        with self.assertRaises(DataLoadingError):
+            ScheduleCodec.decode(b"XXXX" + bytes(data[4:]))
+        data[4] = 99
+        with self.assertRaises(DataLoadingError):
+            ScheduleCodec.decode(bytes(data))
+        with self.assertRaises(DataLoadingError):
+            ScheduleCodec.decode(self.schedule.to_bytes()[:-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
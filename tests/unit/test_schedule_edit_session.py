@@ -0,0 +1,115 @@
+"""セル編集の差分検証のテスト
+
+1セルの編集ごとに、その編集で増えた違反・解消した違反が返り、
+違反の合計が全体検証と一致することを確認します。
+"""
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.application.services.schedule_edit_service import CellEdit, ScheduleEditSession
+from src.domain.constraints.base import ConstraintValidator
+from src.domain.constraints.daily_duplicate_constraint import DailyDuplicateConstraint
+from src.domain.constraints.teacher_absence_constraint import TeacherAbsenceConstraint
+from src.domain.constraints.teacher_conflict_constraint import TeacherConflictConstraint
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.value_objects.assignment import Assignment
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+
+
+class TestScheduleEditSession(unittest.TestCase):
+    """ScheduleEditSessionのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.class1, self.class2 = ClassReference(1, 1), ClassReference(1, 2)
+        for class_ref, teacher_name in ((self.class1, "井上"), (self.class2, "北")):
+            teacher = Teacher(teacher_name)
+            self.school.add_class(class_ref)
+            self.school.add_teacher(teacher)
+            self.school.set_standard_hours(class_ref, Subject("数"), 3)
+            self.school.assign_teacher_subject(teacher, Subject("数"))
+            self.school.assign_teacher_to_class(teacher, Subject("数"), class_ref)
+
+        absence = TeacherAbsenceConstraint()
+        absence.constraint_validator.teacher_absences = {"井上": {("水", 1)}}
+        self.validator = ConstraintValidator([TeacherConflictConstraint(), DailyDuplicateConstraint(), absence])
+        self.schedule = Schedule()
+        self.schedule.assign(TimeSlot("木", 1), Assignment(self.class1, Subject("数"), Teacher("井上")))
+        self.session = ScheduleEditSession(self.school, self.schedule, self.validator)
+
+    def _edit(self, **data):
+        result = self.session.apply_edit(CellEdit.from_dict(data))
+        full = sum(len(r.violations) for r in self.validator.validate_all(self.schedule, self.school))
+        self.assertEqual(result.violation_count, full)
+        return result
+
+    def test_edit_reports_introduced_and_resolved(self):
+        """教員重複を作ってから直す"""
+        clash = self._edit(**{'class': '1年2組', 'day': '木', 'period': 1, 'subject': '数', 'teacher': '井上'})
+        self.assertTrue(clash.accepted)
+        self.assertEqual([v['constraint'] for v in clash.introduced], ["教師重複制約"])
+        self.assertEqual(clash.resolved, [])
+
+        fixed = self._edit(**{'class': '1年2組', 'day': '木', 'period': 1, 'subject': '数'})
+        self.assertEqual(fixed.current.teacher, Teacher("北"))  # 教員を省略すると担当教員
+        self.assertEqual(fixed.introduced, [])
+        self.assertEqual([v['constraint'] for v in fixed.resolved], ["教師重複制約"])
+        self.assertEqual(fixed.violation_count, 0)
+
+    def test_daily_duplicate_and_absence(self):
+        duplicate = self._edit(**{'class': '1年1組', 'day': '木', 'period': 3, 'subject': '数'})
+        self.assertEqual(len(duplicate.introduced), 1)
+        self.assertEqual(duplicate.introduced[0]['day'], '木')
+
+        absent = self._edit(**{'class': '1年1組', 'day': '水', 'period': 1, 'subject': '数'})
+        self.assertEqual([(v['constraint'], v['teacher']) for v in absent.introduced], [("教師不在制約", "井上")])
+
+        cleared = self._edit(**{'class': '1年1組', 'day': '水', 'period': 1, 'subject': ''})
+        self.assertIsNone(cleared.current)
+        self.assertEqual(len(cleared.resolved), 1)
+
+    def test_rejected_edit_leaves_schedule_unchanged(self):
+        self.schedule.lock_cell(TimeSlot("木", 1), self.class1)
+        result = self._edit(**{'class': '1年1組', 'day': '木', 'period': 1, 'subject': '英'})
+        self.assertFalse(result.accepted)
+        self.assertIn("ロック", result.error)
+        self.assertEqual(self.schedule.get_assignment(TimeSlot("木", 1), self.class1).subject, Subject("数"))
+        self.assertEqual(result.to_dict()['current'], {'subject': '数', 'teacher': '井上'})
+
+        with self.assertRaises(ValueError):
+            CellEdit.from_dict({'class': '1-1', 'day': '月', 'period': 1, 'subject': '数'})
+        with self.assertRaises(ValueError):
+            CellEdit.from_dict({'class': '1年1組', 'day': '土', 'period': 1, 'subject': '数'})
+
+    def test_unknown_subject_is_rejected(self):
+        """存在しない教科は accepted=False と理由を返す"""
+        result = self._edit(**{'class': '1年1組', 'day': '木', 'period': 1, 'subject': 'ほげ'})
+        self.assertFalse(result.accepted)
+        self.assertIn("ほげ", result.error)
+        self.assertEqual(self.schedule.get_assignment(TimeSlot("木", 1), self.class1).subject, Subject("数"))
+
+    def test_is_stale_after_file_is_rewritten(self):
+        """読み込んだ後に時間割ファイルが書き換わったら読み込み直しが必要"""
+        self.assertFalse(self.session.is_stale())  # ファイルから読み込んでいない
+        with tempfile.TemporaryDirectory() as tmp:
+            schedule_file = Path(tmp) / 'output.csv'
+            schedule_file.write_text('基本時間割\n', encoding='utf-8')
+            session = ScheduleEditSession(self.school, Schedule(), self.validator, schedule_file)
+            self.assertFalse(session.is_stale())
+            stat = schedule_file.stat()
+            os.utime(schedule_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertTrue(session.is_stale())
+            schedule_file.unlink()
+            self.assertTrue(session.is_stale())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""配列ベースのScheduleコアのテスト
+
+ScheduleGridのインデックス（教員占有・日内教科数）が、
+Scheduleの公開APIを通じた変更と常に整合していることを確認します。
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.schedule_grid import ScheduleGrid, ALL_TIME_SLOTS, slot_index
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+from src.domain.exceptions import InvalidAssignmentException
+
+
+class TestScheduleGrid(unittest.TestCase):
+    """ScheduleGridのテスト"""
+
+    def setUp(self):
+        self.grid = ScheduleGrid()
+        self.class_ref = ClassReference(1, 1)
+        self.teacher = Teacher("井上")
+
+    def test_slot_index_roundtrip(self):
+        """スロット番号とTimeSlotの相互変換"""
+        self.assertEqual(len(ALL_TIME_SLOTS), 30)
+        for index, time_slot in enumerate(ALL_TIME_SLOTS):
+            self.assertEqual(slot_index(time_slot), index)
+
+    def test_indexes_follow_cell_changes(self):
+        """セルの設定・上書き・削除でインデックスが更新される"""
+        math = Subject("数")
+        first = slot_index(TimeSlot("月", 1))
+        second = slot_index(TimeSlot("月", 2))
+
+        self.grid.set_cell(first, self.class_ref, Assignment(self.class_ref, math, self.teacher))
+        self.grid.set_cell(second, self.class_ref, Assignment(self.class_ref, math, self.teacher))
+        self.assertEqual(self.grid.daily_subject_count(self.class_ref, 0, math), 2)
+        self.assertTrue(self.grid.has_daily_excess(self.class_ref, 0))
+        self.assertEqual(len(self.grid.teacher_class_ids(first, self.teacher)), 1)
+
+        # 上書きで古い割り当てがインデックスから外れる
+        self.grid.set_cell(second, self.class_ref, Assignment(self.class_ref, Subject("英"), None))
+        self.assertFalse(self.grid.has_daily_excess(self.class_ref, 0))
+        self.assertEqual(self.grid.teacher_class_ids(second, self.teacher), ())
+
+        self.grid.set_cell(first, self.class_ref, None)
+        self.assertEqual(self.grid.weekly_subject_count(self.class_ref, math), 0)
+        self.assertEqual(len(self.grid), 1)
+
+    def test_fork_is_independent(self):
+        """複製への変更が元のグリッドに影響しない"""
+        slot = slot_index(TimeSlot("火", 3))
+        self.grid.set_cell(slot, self.class_ref, Assignment(self.class_ref, Subject("国"), self.teacher))
+        forked = self.grid.fork()
+        forked.set_cell(slot, self.class_ref, None)
+        forked.lock(slot, self.class_ref)
+
+        self.assertIsNotNone(self.grid.get_cell(slot, self.class_ref))
+        self.assertFalse(self.grid.is_locked(slot, self.class_ref))
+        self.assertEqual(len(self.grid.teacher_class_ids(slot, self.teacher)), 1)
+
+    def test_fork_shares_untouched_rows(self):
+        """複製は変更したクラス行だけを持ち直し、他の行は共有する"""
+        other_class = ClassReference(2, 1)
+        slot = slot_index(TimeSlot("水", 1))
+        self.grid.set_cell(slot, self.class_ref, Assignment(self.class_ref, Subject("国"), self.teacher))
+        self.grid.set_cell(slot, other_class, Assignment(other_class, Subject("数"), None))
+
+        forked = self.grid.fork()
+        self.assertIs(forked.get_row(self.class_ref), self.grid.get_row(self.class_ref))
+
+        forked.set_cell(slot, self.class_ref, Assignment(self.class_ref, Subject("英"), None))
+        self.assertIsNot(forked.get_row(self.class_ref), self.grid.get_row(self.class_ref))
+        self.assertIs(forked.get_row(other_class), self.grid.get_row(other_class))
+
+        # 元のグリッドへの書き込みも複製に漏れない
+        self.grid.set_cell(slot, other_class, None)
+        self.assertIsNotNone(forked.get_cell(slot, other_class))
+        self.assertEqual(self.grid.get_cell(slot, self.class_ref).subject, Subject("国"))
+        self.assertEqual(forked.teacher_class_ids(slot, self.teacher), ())
+
+
+class TestScheduleLookups(unittest.TestCase):
+    """Scheduleの教員・日内教科の参照のテスト"""
+
+    def setUp(self):
+        self.schedule = Schedule()
+        self.time_slot = TimeSlot("水", 2)
+        self.teacher = Teacher("梶永")
+
+    def test_teacher_availability(self):
+        """通常クラスを担当中の教員は空いていない"""
+        class_ref = ClassReference(2, 1)
+        self.assertTrue(self.schedule.is_teacher_available(self.time_slot, self.teacher))
+        self.schedule.assign(self.time_slot, Assignment(class_ref, Subject("数"), self.teacher))
+        self.assertFalse(self.schedule.is_teacher_available(self.time_slot, self.teacher))
+        self.assertEqual(len(self.schedule.get_teacher_at_time(self.time_slot, self.teacher)), 1)
+
+        self.schedule.remove_assignment(self.time_slot, class_ref)
+        self.assertTrue(self.schedule.is_teacher_available(self.time_slot, self.teacher))
+
+    def test_grade5_joint_class_counts_once(self):
+        """5組の合同授業は1つの授業として扱われる"""
+        self.schedule.assign(self.time_slot, Assignment(ClassReference(1, 5), Subject("数"), self.teacher))
+
+        self.assertTrue(self.schedule.is_teacher_available(self.time_slot, self.teacher))
+        self.assertEqual(len(self.schedule.get_teacher_at_time(self.time_slot, self.teacher)), 1)
+        self.assertEqual(len(self.schedule.get_assignments_by_teacher(self.teacher)), 3)
+
+    def test_locked_cell_rejects_assignment(self):
+        """ロックされたセルには割り当てできない"""
+        class_ref = ClassReference(3, 2)
+        self.schedule.lock_cell(self.time_slot, class_ref)
+        with self.assertRaises(InvalidAssignmentException):
+            self.schedule.assign(self.time_slot, Assignment(class_ref, Subject("英"), self.teacher))
+        self.assertNotIn(self.time_slot, self.schedule.get_empty_slots(class_ref))
+
+        clone = self.schedule.clone()
+        self.assertTrue(clone.is_locked(self.time_slot, class_ref))
+
+    def test_daily_duplicate_and_hours(self):
+        """日内重複と週当たり時数がインデックスから求まる"""
+        class_ref = ClassReference(1, 2)
+        subject = Subject("理")
+        self.schedule.assign(TimeSlot("木", 1), Assignment(class_ref, subject, self.teacher))
+        self.assertFalse(self.schedule.has_daily_duplicate(class_ref, "木"))
+        self.schedule.assign(TimeSlot("木", 4), Assignment(class_ref, subject, self.teacher))
+        self.schedule.assign(TimeSlot("金", 4), Assignment(class_ref, subject, self.teacher))
+
+        self.assertTrue(self.schedule.has_daily_duplicate(class_ref, "木"))
+        self.assertEqual(self.schedule.count_daily_subject(class_ref, "木", subject), 2)
+        self.assertEqual(self.schedule.count_subject_hours(class_ref, subject), 3)
+        self.assertEqual(self.schedule.get_daily_subjects(class_ref, "木"), [subject, subject])
+
+    def test_teacher_occupancy(self):
+        """教員の空き・1日の担当コマ数・重複が割り当ての変更に追従する"""
+        class21, class22 = ClassReference(2, 1), ClassReference(2, 2)
+        self.schedule.assign(self.time_slot, Assignment(ClassReference(1, 5), Subject("数"), self.teacher))
+        self.schedule.assign(TimeSlot("水", 3), Assignment(class21, Subject("数"), self.teacher))
+
+        # 5組の合同授業は同じ5組には空き、通常クラスには空いていない
+        self.assertTrue(self.schedule.is_teacher_free(self.time_slot, self.teacher, ClassReference(2, 5)))
+        self.assertFalse(self.schedule.is_teacher_free(self.time_slot, self.teacher, class21))
+        self.assertTrue(self.schedule.is_teacher_free(TimeSlot("水", 3), self.teacher, class21))
+        self.assertEqual(self.schedule.get_teacher_daily_load(self.teacher, "水"), 2)
+        self.assertEqual(self.schedule.get_teacher_conflicts(), [])
+
+        forked = self.schedule.fork()
+        self.schedule.assign(TimeSlot("水", 3), Assignment(class22, Subject("数"), self.teacher))
+        self.assertEqual(self.schedule.get_teacher_conflicts(),
+                         [(TimeSlot("水", 3), self.teacher, [class21, class22])])
+        self.assertEqual(self.schedule.get_teacher_daily_load(self.teacher, "水"), 2)
+        self.assertEqual(forked.get_teacher_conflicts(), [])
+
+        self.schedule.remove_assignment(TimeSlot("水", 3), class21)
+        self.assertEqual(self.schedule.get_teacher_conflicts(), [])
+
+    def test_jiritsu_team_teaching_is_not_conflict(self):
+        """同じ組番号の交流学級の自立活動は1人の教員が同時に担当できる"""
+        teacher = Teacher("財津")
+        for grade in (1, 2):
+            self.schedule.assign(self.time_slot, Assignment(ClassReference(grade, 6), Subject("自立"), teacher))
+        self.assertEqual(self.schedule.get_teacher_conflicts(), [])
+        self.assertTrue(self.schedule.is_teacher_free(self.time_slot, teacher, ClassReference(3, 6), Subject("自立")))
+        self.assertFalse(self.schedule.is_teacher_free(self.time_slot, teacher, ClassReference(3, 6), Subject("数")))
+
+
+if __name__ == '__main__':
+    unittest.main()
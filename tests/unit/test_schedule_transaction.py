@@ -0,0 +1,83 @@
+"""Scheduleのトランザクション（取り消しログ）のテスト
+
+begin / savepoint / rollback_to / commit で、5組ユニットを含むセルの変更が
+入れ子のセーブポイントごとに元に戻り、インデックスも整合することを確認します。
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.entities.schedule import Schedule
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+
+
+class TestScheduleTransaction(unittest.TestCase):
+    """Scheduleのトランザクションのテスト"""
+
+    def setUp(self):
+        self.schedule = Schedule()
+        self.time_slot = TimeSlot("火", 2)
+        self.class_ref = ClassReference(2, 3)
+        self.teacher = Teacher("梶永")
+        self.original = Assignment(self.class_ref, Subject("国"), Teacher("寺田"))
+        self.schedule.assign(self.time_slot, self.original)
+
+    def test_nested_savepoints(self):
+        """入れ子のセーブポイントまで順に巻き戻せる"""
+        changed = []
+        self.schedule.add_change_listener(lambda time_slot, class_ref: changed.append(class_ref))
+
+        self.schedule.begin()
+        outer = self.schedule.savepoint()
+        self.schedule.assign(self.time_slot, Assignment(self.class_ref, Subject("数"), self.teacher))
+        inner = self.schedule.savepoint()
+        self.schedule.remove_assignment(self.time_slot, self.class_ref)
+        self.schedule.assign(TimeSlot("火", 3), Assignment(self.class_ref, Subject("数"), self.teacher))
+
+        self.schedule.rollback_to(inner)
+        self.assertEqual(self.schedule.get_assignment(self.time_slot, self.class_ref).subject, Subject("数"))
+        self.assertIsNone(self.schedule.get_assignment(TimeSlot("火", 3), self.class_ref))
+
+        changed.clear()
+        self.schedule.rollback_to(outer)
+        self.schedule.commit()
+        self.assertIs(self.schedule.get_assignment(self.time_slot, self.class_ref), self.original)
+        self.assertEqual(changed, [self.class_ref])
+        self.assertTrue(self.schedule.is_teacher_free(self.time_slot, self.teacher))
+        self.assertEqual(self.schedule.count_subject_hours(self.class_ref, Subject("数")), 0)
+
+    def test_grade5_unit_is_restored(self):
+        """5組ユニットの割り当ても巻き戻る"""
+        grade5 = ClassReference(3, 5)
+        self.schedule.begin()
+        savepoint = self.schedule.savepoint()
+        self.schedule.assign(self.time_slot, Assignment(grade5, Subject("英"), self.teacher))
+        self.assertEqual(self.schedule.get_assignment(self.time_slot, ClassReference(1, 5)).subject, Subject("英"))
+
+        self.schedule.rollback_to(savepoint)
+        self.schedule.commit()
+        for class_number in (1, 2, 3):
+            self.assertIsNone(self.schedule.get_assignment(self.time_slot, ClassReference(class_number, 5)))
+        self.assertEqual(self.schedule.get_assignments_by_teacher(self.teacher), [])
+
+    def test_commit_keeps_changes(self):
+        """commit した変更は残り、トランザクション外ではセーブポイントを取れない"""
+        self.schedule.begin()
+        self.schedule.begin()
+        self.schedule.remove_assignment(self.time_slot, self.class_ref)
+        self.schedule.commit()
+        self.assertEqual(self.schedule.savepoint(), 1)
+        self.schedule.commit()
+
+        self.assertIsNone(self.schedule.get_assignment(self.time_slot, self.class_ref))
+        with self.assertRaises(RuntimeError):
+            self.schedule.savepoint()
+
+
+if __name__ == '__main__':
+    unittest.main()
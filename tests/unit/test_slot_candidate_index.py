@@ -0,0 +1,125 @@
+"""配置候補インデックスのテスト
+
+教員の不在・配置禁止教科・教員の重複による候補の除外と、
+セル変更に追従した候補の更新を確認します。
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+from src.domain.services.core.slot_candidate_index import SlotCandidateIndex
+
+
+class TestSlotCandidateIndex(unittest.TestCase):
+    """SlotCandidateIndexのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.class1 = ClassReference(1, 1)
+        self.class2 = ClassReference(1, 2)
+        self.math = Subject("数")
+        self.english = Subject("英")
+        self.kajinaga = Teacher("梶永")
+        self.inoue = Teacher("井上")
+        self.school.add_teacher(self.kajinaga)
+        self.school.add_teacher(self.inoue)
+        self.school.assign_teacher_subject(self.kajinaga, self.math)
+        self.school.assign_teacher_subject(self.inoue, self.english)
+        for class_ref in (self.class1, self.class2):
+            self.school.add_class(class_ref)
+            self.school.set_standard_hours(class_ref, self.math, 4)
+            self.school.set_standard_hours(class_ref, self.english, 4)
+            self.school.assign_teacher_to_class(self.kajinaga, self.math, class_ref)
+            self.school.assign_teacher_to_class(self.inoue, self.english, class_ref)
+        self.school.set_teacher_unavailable("火", 2, self.inoue)
+
+        self.schedule = Schedule()
+        self.slot = TimeSlot("月", 1)
+
+    def _index(self, **kwargs):
+        index = SlotCandidateIndex(self.school, **kwargs)
+        index.attach(self.schedule)
+        return index
+
+    def test_candidates_for_empty_schedule(self):
+        """空のスケジュールでは担当教員の組が全て候補になる"""
+        index = self._index()
+        self.assertEqual(
+            set(index.candidates(self.slot, self.class1)),
+            {(self.math, self.kajinaga), (self.english, self.inoue)}
+        )
+
+    def test_absent_teacher_and_forbidden_subject_are_excluded(self):
+        """不在の教員・配置禁止の教科は候補にならない"""
+        index = self._index(forbidden_cells={(self.slot, self.class1): {"数"}})
+        self.assertEqual(index.subjects(TimeSlot("火", 2), self.class1), {self.math})
+        self.assertEqual(index.subjects(self.slot, self.class1), {self.english})
+        self.assertFalse(index.is_feasible(self.slot, self.class1, self.math, self.kajinaga))
+
+    def test_follows_schedule_changes(self):
+        """割り当て・削除に合わせて、同じコマの他クラスの候補が更新される"""
+        index = self._index()
+        self.schedule.assign(self.slot, Assignment(self.class1, self.math, self.kajinaga))
+
+        self.assertEqual(index.candidates(self.slot, self.class1), ())
+        self.assertEqual(index.subjects(self.slot, self.class2), {self.english})
+        self.assertFalse(index.is_feasible(self.slot, self.class2, self.math, self.kajinaga))
+        # 別のコマには影響しない
+        self.assertIn(self.math, index.subjects(TimeSlot("月", 2), self.class2))
+
+        self.schedule.remove_assignment(self.slot, self.class1)
+        self.assertEqual(index.subjects(self.slot, self.class2), {self.math, self.english})
+
+    def test_rollback_restores_candidates(self):
+        """トランザクションの巻き戻しにも追従する"""
+        index = self._index()
+        self.schedule.begin()
+        savepoint = self.schedule.savepoint()
+        self.schedule.assign(self.slot, Assignment(self.class1, self.math, self.kajinaga))
+        self.assertNotIn(self.math, index.subjects(self.slot, self.class2))
+
+        self.schedule.rollback_to(savepoint)
+        self.schedule.commit()
+        self.assertIn(self.math, index.subjects(self.slot, self.class2))
+
+    def test_matches_full_recomputation(self):
+        """変更を重ねても、作り直したインデックスと同じ候補になる"""
+        index = self._index()
+        teachers = {self.math: self.kajinaga, self.english: self.inoue}
+        moves = [
+            (TimeSlot("月", 1), self.class1, self.math),
+            (TimeSlot("月", 2), self.class2, self.english),
+            (TimeSlot("月", 1), self.class1, None),
+            (TimeSlot("月", 2), self.class1, self.math),
+            (TimeSlot("月", 3), self.class2, self.math),
+        ]
+        for time_slot, class_ref, subject in moves:
+            if subject is None:
+                self.schedule.remove_assignment(time_slot, class_ref)
+            else:
+                self.schedule.assign(time_slot, Assignment(class_ref, subject, teachers[subject]))
+
+        fresh = self._index()
+        for time_slot in (TimeSlot("月", 1), TimeSlot("月", 2), TimeSlot("月", 3)):
+            for class_ref in (self.class1, self.class2):
+                self.assertEqual(index.candidates(time_slot, class_ref),
+                                 fresh.candidates(time_slot, class_ref))
+
+    def test_detach_stops_updates(self):
+        """購読を解除すると変更通知を受けない"""
+        index = self._index()
+        index.detach()
+        self.schedule.assign(self.slot, Assignment(self.class1, self.math, self.kajinaga))
+        self.assertEqual(index.get_statistics()['change_events'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""値オブジェクトのインターンのテスト
+
+同じ値の TimeSlot / ClassReference / Subject / Teacher が同一のインスタンスになり、
+正規化前の引数・キーワード引数・pickleでも同じインスタンスが返ることを確認します。
+"""
+import copy
+import pickle
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.shared.mixins.validation_mixin import ValidationError
+
+
+class TestValueObjectInterning(unittest.TestCase):
+    """値オブジェクトのインターンのテスト"""
+
+    def test_same_value_is_same_instance(self):
+        """同じ値は同じインスタンス（正規化前の値・キーワード引数でも）"""
+        self.assertIs(TimeSlot("月", 1), TimeSlot("月", 1))
+        self.assertIs(TimeSlot("月曜", 1), TimeSlot("月", 1))
+        self.assertIs(TimeSlot(day="月", period=1), TimeSlot("月", 1))
+        self.assertIs(ClassReference(2, 5), ClassReference(grade=2, class_number=5))
+        self.assertIs(Teacher("井上"), Teacher("井上"))
+        self.assertIs(Subject("数"), Subject("数"))
+
+    def test_equality_and_hash(self):
+        """等価比較・ハッシュは従来どおり値で決まる"""
+        self.assertEqual(TimeSlot("月", 1), TimeSlot("月", 1))
+        self.assertNotEqual(TimeSlot("月", 1), TimeSlot("月", 2))
+        self.assertNotEqual(TimeSlot("月", 1), ("月", 1))
+        self.assertEqual({TimeSlot("火", 3): 1}[TimeSlot("火", 3)], 1)
+        self.assertEqual(hash(Teacher("井上")), hash(Teacher("井上")))
+
+    def test_copy_and_pickle_return_interned_instance(self):
+        """copy・pickleで復元してもインターンされたインスタンスになる"""
+        for value in (TimeSlot("水", 4), ClassReference(1, 6), Subject("英"), Teacher("井上")):
+            self.assertIs(pickle.loads(pickle.dumps(value)), value)
+            self.assertIs(copy.deepcopy(value), value)
+
+    def test_invalid_values_are_rejected(self):
+        """不正な値は従来どおりValidationErrorになり、キャッシュされない"""
+        for _ in range(2):
+            with self.assertRaises(ValidationError):
+                TimeSlot("土", 1)
+            with self.assertRaises(ValidationError):
+                ClassReference(4, 1)
+        self.assertNotIn(("土", 1), TimeSlot._instances)
+
+
+if __name__ == '__main__':
+    unittest.main()
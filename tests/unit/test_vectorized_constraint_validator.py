@@ -0,0 +1,121 @@
+"""ベクトル化制約検証のテスト
+
+実データ（data/input/input.csv）と、違反を意図的に増やしたスケジュールで、
+ベクトル化検証と制約オブジェクトによる検証の結果が一致することを確認します。
+"""
+import logging
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.config.path_config import path_config
+from src.infrastructure.repositories.csv_repository import CSVScheduleRepository, CSVSchoolRepository
+from src.domain.constraints import (
+    DailySubjectDuplicateConstraint,
+    ExchangeClassSyncConstraint,
+    Grade5SameSubjectConstraint,
+    StandardHoursConstraint,
+    TeacherAbsenceConstraint,
+    TeacherConflictConstraint,
+)
+from src.domain.constraints.gym_usage_constraint import GymUsageConstraintRefactored
+from src.domain.entities.schedule_grid import ALL_TIME_SLOTS
+from src.domain.services.core.unified_constraint_system import UnifiedConstraintSystem, ConstraintPriority
+from src.domain.services.validators.vectorized_constraint_validator import VectorizedConstraintValidator
+from src.domain.value_objects.assignment import Assignment
+from src.domain.value_objects.time_slot import TimeSlot, Subject, Teacher
+
+
+class AbsenceLoader:
+    """教師不在情報ローダーの代わり"""
+
+    def __init__(self, teacher_absences):
+        self.teacher_absences = teacher_absences
+
+
+class TestVectorizedConstraintValidator(unittest.TestCase):
+    """VectorizedConstraintValidatorのテスト"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.school = CSVSchoolRepository(path_config.data_dir).load_school_data("config/base_timetable.csv")
+        cls.source = CSVScheduleRepository(path_config.data_dir).load("input/input.csv", cls.school)
+
+        cls.system = UnifiedConstraintSystem()
+        cls.system.register_constraint(TeacherConflictConstraint(), ConstraintPriority.CRITICAL)
+        cls.system.register_constraint(GymUsageConstraintRefactored(), ConstraintPriority.CRITICAL)
+        cls.system.register_constraint(ExchangeClassSyncConstraint(), ConstraintPriority.CRITICAL)
+        cls.system.register_constraint(
+            TeacherAbsenceConstraint(AbsenceLoader({"井上": {("月", 1), ("火", 3)}})), ConstraintPriority.CRITICAL
+        )
+        cls.system.register_constraint(DailySubjectDuplicateConstraint(), ConstraintPriority.HIGH)
+        cls.system.register_constraint(Grade5SameSubjectConstraint(), ConstraintPriority.HIGH)
+        # ベクトル化対象外の制約は従来方式で検証される
+        cls.system.register_constraint(StandardHoursConstraint(), ConstraintPriority.MEDIUM)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def _assert_parity(self, schedule):
+        expected = self.system.validate_schedule(schedule, self.school)
+        validator = VectorizedConstraintValidator(self.system)
+        actual = validator.validate_schedule(schedule, self.school)
+
+        self.assertEqual(
+            [(v.description, v.time_slot, v.assignment) for v in actual.violations],
+            [(v.description, v.time_slot, v.assignment) for v in expected.violations],
+        )
+        self.assertEqual(actual.violation_count_by_priority, expected.violation_count_by_priority)
+        self.assertEqual(validator.get_statistics(), {'vectorized_runs': 6, 'fallback_runs': 1})
+        return actual
+
+    def test_parity_on_input_schedule(self):
+        """入力時間割で従来方式と一致する"""
+        self._assert_parity(self.source.clone())
+
+    def test_parity_on_perturbed_schedules(self):
+        """ランダムに崩した時間割でも従来方式と一致する"""
+        subjects = [Subject(name) for name in ("国", "数", "英", "理", "社", "音")]
+        teachers = [Teacher(name) for name in ("井上", "梶永", "塚本", "金子ひ")] + [None]
+        classes = self.school.get_all_classes()
+
+        for seed in range(3):
+            rnd = random.Random(seed)
+            schedule = self.source.clone()
+            schedule.disable_fixed_subject_protection()
+            for _ in range(120):
+                time_slot = rnd.choice(ALL_TIME_SLOTS)
+                class_ref = rnd.choice(classes)
+                if schedule.is_locked(time_slot, class_ref):
+                    continue
+                if rnd.random() < 0.2:
+                    schedule.remove_assignment(time_slot, class_ref)
+                else:
+                    subject = Subject("保") if rnd.random() < 0.15 else rnd.choice(subjects)
+                    schedule.assign(time_slot, Assignment(class_ref, subject, rnd.choice(teachers)))
+            result = self._assert_parity(schedule)
+            self.assertFalse(result.is_valid)
+
+    def test_tensor_matches_get_assignment(self):
+        """テンソルの内容はget_assignment()と一致する"""
+        classes = self.school.get_all_classes()
+        tensor = self.source.to_tensor(classes)
+        for column, class_ref in enumerate(classes):
+            for slot, time_slot in enumerate(ALL_TIME_SLOTS):
+                assignment = self.source.get_assignment(time_slot, class_ref)
+                subject_id = tensor.subject_ids[slot, column]
+                if assignment is None:
+                    self.assertEqual(subject_id, -1)
+                else:
+                    self.assertEqual(tensor.subject_names[subject_id], assignment.subject.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Webエディタのセル編集API（/api/edit-cell）のテスト
+
+Flaskのテストクライアントで、編集で増えた違反と解消した違反が返ること、
+時間割ファイルが書き換わったら編集の検証がファイルから読み込み直されることを確認します。
+Flask・flask-cors がインストールされていなければスキップします。
+"""
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference
+
+HAS_FLASK = all(importlib.util.find_spec(name) is not None for name in ('flask', 'flask_cors'))
+
+
+@unittest.skipUnless(HAS_FLASK, "Flask・flask-corsがインストールされていません")
+class TestEditCellApi(unittest.TestCase):
+    """/api/edit-cell・/api/edit-violations のテスト"""
+
+    def setUp(self):
+        from web_interface import app as web_app
+        self.web_app = web_app
+
+        # 実際の入力をコピーした一時ファイルを編集対象にする（元のファイルは変えない）
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.schedule_csv = Path(self.tmp.name) / 'input.csv'
+        shutil.copy(project_root / 'data' / 'input' / 'input.csv', self.schedule_csv)
+
+        patcher = mock.patch.dict(web_app.EDIT_TARGETS, {'input': str(self.schedule_csv)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        web_app.discard_edit_session('input')
+        self.addCleanup(web_app.discard_edit_session, 'input')
+        self.client = web_app.app.test_client()
+
+    def _edit(self, class_name, subject, teacher):
+        data = {'target': 'input', 'class': class_name, 'day': '水', 'period': 2,
+                'subject': subject, 'teacher': teacher}
+        response = self.client.post('/api/edit-cell', json=data)
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertTrue(body['success'], body)
+        self.assertTrue(body['accepted'], body)
+        return body
+
+    def _violation_count(self):
+        body = self.client.get('/api/edit-violations?target=input').get_json()
+        self.assertTrue(body['success'], body)
+        return body['violationCount']
+
+    def test_conflict_introduced_and_resolved(self):
+        """別学年のクラスに同じ教員を入れて教員重複を作り、元の教員に戻して解消する"""
+        initial = self._violation_count()
+        schedule = self.web_app.get_edit_session('input').schedule
+        slot = TimeSlot("水", 2)
+        other = schedule.get_assignment(slot, ClassReference(1, 1))
+        original = schedule.get_assignment(slot, ClassReference(2, 1))
+        self.assertNotEqual(other.teacher, original.teacher)
+
+        clash = self._edit('2年1組', original.subject.name, other.teacher.name)
+        self.assertIn("教師重複制約", [v['constraint'] for v in clash['introduced']])
+        self.assertNotIn("教師重複制約", [v['constraint'] for v in clash['resolved']])
+
+        fixed = self._edit('2年1組', original.subject.name, original.teacher.name)
+        self.assertIn("教師重複制約", [v['constraint'] for v in fixed['resolved']])
+        self.assertNotIn("教師重複制約", [v['constraint'] for v in fixed['introduced']])
+        self.assertEqual(fixed['violationCount'], initial)
+        self.assertEqual(self._violation_count(), initial)
+
+        # ファイルが書き換わったら（生成・CLIなど）、次の編集はファイルの内容から検証し直す
+        clash = self._edit('2年1組', original.subject.name, other.teacher.name)
+        self.assertEqual(self._violation_count(), clash['violationCount'])
+        shutil.copy(project_root / 'data' / 'input' / 'input.csv', self.schedule_csv)
+        stat = self.schedule_csv.stat()
+        os.utime(self.schedule_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self._violation_count(), initial)
+
+    def test_discard_sessions_for_rewritten_file(self):
+        """生成ジョブが書き換えたファイルのセッションだけを破棄する"""
+        session = self.web_app.get_edit_session('input')
+        self.web_app.discard_edit_sessions_for(Path(self.tmp.name) / 'other.csv')
+        self.assertIs(self.web_app.get_edit_session('input'), session)
+        self.web_app.discard_edit_sessions_for(self.schedule_csv)
+        self.assertIsNot(self.web_app.get_edit_session('input'), session)
+
+    def test_invalid_edit_is_rejected(self):
+        response = self.client.post('/api/edit-cell', json={'target': 'input', 'class': '1年1組'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.get_json()['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
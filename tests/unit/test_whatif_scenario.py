@@ -0,0 +1,133 @@
+"""What-ifシナリオ一括評価のテスト
+
+シナリオファイルの読み込み、Follow-upへのシナリオの適用、シナリオごとの評価で
+土台の学校情報・時間割が変わらず、変更セル数と教員の担当コマ数の増減が出ることを確認します。
+"""
+import json
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.application.services.exact_solver.solver_backends import HAS_ORTOOLS
+from src.application.services.generation_helpers.followup_delta import FollowUpSnapshot
+from src.application.services.whatif_scenario_service import (
+    WhatIfScenario, WhatIfScenarioService, format_comparison_table, load_scenarios
+)
+from src.domain.entities.schedule import Schedule
+from src.domain.entities.school import School
+from src.domain.services.core.unified_constraint_system import UnifiedConstraintSystem
+from src.domain.value_objects.time_slot import TimeSlot, ClassReference, Subject, Teacher
+from src.domain.value_objects.assignment import Assignment
+
+
+class TestWhatIfScenario(unittest.TestCase):
+    """WhatIfScenarioのテスト"""
+
+    def test_load_and_apply(self):
+        """シナリオファイルを読み込み、Follow-upに不在・会議の移動を加える"""
+        data = {'scenarios': [{
+            'name': '井上先生が木曜不在',
+            'absences': [{'teacher': '井上', 'day': '木'}, {'teacher': '北', 'day': '金', 'periods': [3]}],
+            'meeting_moves': [{'meeting': '企画', 'from': ['火', 3], 'to': ['火', 5]}],
+            'forbidden_cells': [{'class': '1年1組', 'day': '月', 'period': 1, 'subjects': ['数']}],
+        }]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'scenarios.json'
+            path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+            scenario, = load_scenarios(path)
+
+        baseline = FollowUpSnapshot(absences=frozenset({("梶永", "月", 1)}),
+                                    meetings=frozenset({("企画", "火", 3)}))
+        snapshot = scenario.apply_to(baseline)
+        self.assertEqual(len(snapshot.absences), 8)
+        self.assertEqual(snapshot.meetings, {("企画", "火", 5)})
+        self.assertEqual(scenario.get_forbidden_cells(),
+                         {(TimeSlot("月", 1), ClassReference(1, 1)): {"数"}})
+
+    def test_invalid_class_name(self):
+        with self.assertRaises(ValueError):
+            WhatIfScenario.from_dict({'name': 'x', 'forbidden_cells': [
+                {'class': '1-1', 'day': '月', 'period': 1, 'subjects': ['数']}
+            ]})
+
+
+class TestWhatIfScenarioService(unittest.TestCase):
+    """WhatIfScenarioServiceのテスト"""
+
+    def setUp(self):
+        self.school = School()
+        self.class1 = ClassReference(1, 1)
+        self.teachers = {name: Teacher(name) for name in ("梶永", "井上", "塚本")}
+        for teacher in self.teachers.values():
+            self.school.add_teacher(teacher)
+        self.school.add_class(self.class1)
+        for subject_name, teacher_name in (("数", "梶永"), ("英", "井上"), ("理", "塚本")):
+            subject, teacher = Subject(subject_name), self.teachers[teacher_name]
+            self.school.set_standard_hours(self.class1, subject, 3)
+            self.school.assign_teacher_subject(teacher, subject)
+            self.school.assign_teacher_to_class(teacher, subject, self.class1)
+
+        self.base = Schedule()
+        self.base.assign(TimeSlot("月", 1), Assignment(self.class1, Subject("数"), self.teachers["梶永"]))
+        self.base.assign(TimeSlot("月", 2), Assignment(self.class1, Subject("英"), self.teachers["井上"]))
+        self.service = WhatIfScenarioService(UnifiedConstraintSystem(), time_limit=5, max_workers=1)
+
+    @unittest.skipUnless(HAS_ORTOOLS, "ortoolsがインストールされていません")
+    def test_evaluate_reports_churn_and_teacher_load(self):
+        """シナリオごとに解き直し、土台は変更しない"""
+        scenarios = [
+            WhatIfScenario("梶永先生が月曜不在", absences=frozenset({("梶永", "月", 1)})),
+            WhatIfScenario("変更なし"),
+        ]
+        baseline, (absent, unchanged) = self.service.evaluate(
+            self.school, self.base, FollowUpSnapshot(), scenarios
+        )
+
+        self.assertEqual(baseline.violations, 0)
+        self.assertIsNone(absent.error)
+        self.assertEqual(absent.changed_cells, 1)
+        self.assertEqual(absent.teacher_load_changes.get("梶永"), -1)
+        self.assertEqual(unchanged.changed_cells, 0)
+        self.assertEqual(unchanged.teacher_load_changes, {})
+        # 学校情報・土台の時間割は変わらない
+        self.assertFalse(self.school.is_teacher_unavailable("月", 1, self.teachers["梶永"]))
+        self.assertEqual(self.base.get_assignment(TimeSlot("月", 1), self.class1).teacher,
+                         self.teachers["梶永"])
+        self.assertIn("梶永先生が月曜不在", format_comparison_table(baseline, [absent, unchanged]))
+
+    @unittest.skipUnless(HAS_ORTOOLS, "ortoolsがインストールされていません")
+    def test_meeting_move_resolves_cells_of_members(self):
+        """会議を移すと、設定の参加教員（企画: 蒲地・小野塚など）の移動先のセルが解き直される"""
+        for name, subject_name in (("蒲地", "社"), ("小野塚", "国")):
+            teacher, subject = Teacher(name), Subject(subject_name)
+            self.school.add_teacher(teacher)
+            self.school.set_standard_hours(self.class1, subject, 3)
+            self.school.assign_teacher_subject(teacher, subject)
+            self.school.assign_teacher_to_class(teacher, subject, self.class1)
+        class2 = ClassReference(1, 2)
+        self.school.add_class(class2)
+        self.school.set_standard_hours(class2, Subject("国"), 3)
+        self.school.assign_teacher_to_class(Teacher("小野塚"), Subject("国"), class2)
+        self.base.assign(TimeSlot("火", 5), Assignment(self.class1, Subject("社"), Teacher("蒲地")))
+        self.base.assign(TimeSlot("火", 5), Assignment(class2, Subject("国"), Teacher("小野塚")))
+
+        scenario = WhatIfScenario.from_dict({'name': '企画を火5へ', 'meeting_moves': [
+            {'meeting': '企画', 'from': ['火', 3], 'to': ['火', 5]}
+        ]})
+        _, (moved,) = self.service.evaluate(
+            self.school, self.base, FollowUpSnapshot(meetings=frozenset({("企画", "火", 3)})), [scenario]
+        )
+
+        self.assertIsNone(moved.error)
+        self.assertEqual(moved.changed_cells, 2)
+        self.assertEqual(moved.teacher_load_changes.get("蒲地"), -1)
+        self.assertEqual(moved.teacher_load_changes.get("小野塚"), -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,14 +3,16 @@
 時間割編集用Webサーバー
 input.csvとoutput.csvの読み込み・編集・保存機能を提供
 """
-from flask import Flask, request, jsonify, send_from_directory, make_response
+from flask import Flask, Response, request, jsonify, send_from_directory, make_response, stream_with_context
 from flask_cors import CORS
 import os
 import sys
 import csv
 import json
 import shutil
+import threading
 from datetime import datetime
+from pathlib import Path
 
 app = Flask(__name__, static_folder='.', static_url_path='')
 CORS(app)
@@ -24,6 +26,56 @@ BACKUP_DIR = os.path.join(PROJECT_ROOT, 'data', 'backup')
 # バックアップディレクトリを作成
 os.makedirs(BACKUP_DIR, exist_ok=True)
 
+# 生成ジョブサービスを使うため src をインポートできるようにする
+sys.path.insert(0, PROJECT_ROOT)
+
+# SSEで進捗がない間に送るコメントの間隔（秒）
+SSE_HEARTBEAT_SECONDS = 15
+
+_job_service = None
+
+
+def get_job_service():
+    """生成ジョブサービス（初回に事前読み込み済みのワーカーを起動）"""
+    global _job_service
+    if _job_service is None:
+        from src.application.services.generation_job_service import GenerationJobService
+        # /api/jobs・/api/run-timetable のどちらで生成しても（保存済みの結果の復元も含め）
+        # output.csv が書き換わったら、セル編集の検証をファイルから読み込み直す
+        _job_service = GenerationJobService(on_output_written=discard_edit_sessions_for).start()
+    return _job_service
+
+
+# セル編集の検証対象（input.csv / output.csv）ごとのメモリ上の時間割
+EDIT_TARGETS = {'input': INPUT_PATH, 'output': OUTPUT_PATH}
+_edit_sessions = {}
+_edit_sessions_lock = threading.Lock()
+
+
+def get_edit_session(target):
+    """セル編集の検証セッション（初回と、ファイルが書き換わった後にファイルから読み込む）"""
+    if target not in EDIT_TARGETS:
+        raise ValueError(f'不明な編集対象です: {target}')
+    with _edit_sessions_lock:
+        session = _edit_sessions.get(target)
+        if session is None or session.is_stale():
+            from src.application.services.schedule_edit_service import ScheduleEditSession
+            _edit_sessions[target] = ScheduleEditSession.load(Path(EDIT_TARGETS[target]))
+        return _edit_sessions[target]
+
+
+def discard_edit_session(target):
+    """ファイルが保存・再生成されたら、次の編集で読み込み直す"""
+    with _edit_sessions_lock:
+        _edit_sessions.pop(target, None)
+
+
+def discard_edit_sessions_for(path):
+    """書き換わったファイルを検証対象とするセル編集のセッションを破棄する"""
+    for target, target_path in EDIT_TARGETS.items():
+        if Path(target_path).resolve() == Path(path).resolve():
+            discard_edit_session(target)
+
 @app.route('/')
 def index():
     """メインページを返す"""
@@ -41,6 +93,8 @@ def load_input():
         
         with open(INPUT_PATH, 'r', encoding='utf-8') as f:
             content = f.read()
+        # エディタが読み込み直したら、セル編集の検証もファイルの内容からやり直す
+        discard_edit_session('input')
         
         return jsonify({
             'success': True,
@@ -64,6 +118,8 @@ def load_output():
         
         with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
             content = f.read()
+        # エディタが読み込み直したら、セル編集の検証もファイルの内容からやり直す
+        discard_edit_session('output')
         
         return jsonify({
             'success': True,
@@ -97,6 +153,7 @@ def save_input():
         # 新しいデータを保存
         with open(INPUT_PATH, 'w', encoding='utf-8', newline='') as f:
             f.write(content)
+        discard_edit_session('input')
         
         return jsonify({
             'success': True,
@@ -133,51 +190,140 @@ def download_output():
 
 @app.route('/api/run-timetable', methods=['POST'])
 def run_timetable():
-    """時間割生成プログラムを実行する"""
+    """時間割生成を実行し、完了まで待って結果を返す"""
     try:
-        import subprocess
-        
-        # main.pyを実行
-        main_script = os.path.join(PROJECT_ROOT, 'main.py')
-        
-        if not os.path.exists(main_script):
-            return jsonify({
-                'success': False,
-                'error': 'main.pyが見つかりません'
-            })
-        
-        # Pythonスクリプトを実行（デフォルトのstrategyを指定）
-        result = subprocess.run(
-            [sys.executable, main_script, 'generate', '--strategy', 'ultrathink'],
-            cwd=PROJECT_ROOT,
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
-        
-        if result.returncode != 0:
-            error_message = result.stderr if result.stderr else '時間割生成に失敗しました'
+        service = get_job_service()
+        job = service.submit('generate', {'strategy': 'ultrathink'})
+        job = service.wait(job.job_id)
+        result = job.result or {}
+
+        if job.status != 'done' or not result.get('success'):
+            error_message = job.error or result.get('message') or '時間割生成に失敗しました'
             return jsonify({
                 'success': False,
                 'error': error_message
             })
-        
-        # 生成されたoutput.csvを読み込む
-        if os.path.exists(OUTPUT_PATH):
-            with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
-                output_data = f.read()
-            
-            return jsonify({
-                'success': True,
-                'message': '時間割生成が完了しました',
-                'outputData': output_data
-            })
-        else:
+
+        output_data = result.get('output_csv')
+        if output_data is None:
             return jsonify({
                 'success': False,
                 'error': 'output.csvが生成されませんでした'
             })
-            
+
+        return jsonify({
+            'success': True,
+            'message': '時間割生成が完了しました',
+            'outputData': output_data,
+            'cached': job.cached
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """生成・検証ジョブを受け付け、ジョブIDをすぐに返す
+
+    リクエスト: {"kind": "generate" | "validate", "params": {...}}
+    """
+    try:
+        data = request.get_json() or {}
+        job = get_job_service().submit(data.get('kind', 'generate'), data.get('params') or {})
+        return jsonify({
+            'success': True,
+            'jobId': job.job_id,
+            'status': job.status,
+            'cached': job.cached
+        }), 202
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """ジョブの状態・進捗・結果を返す"""
+    job = get_job_service().get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'ジョブが見つかりません'
+        }), 404
+    return jsonify(dict(job.to_dict(), success=True))
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """ジョブの進捗をServer-Sent Eventsで送る（Last-Event-IDで再接続できる）"""
+    service = get_job_service()
+    if service.get(job_id) is None:
+        return jsonify({
+            'success': False,
+            'error': 'ジョブが見つかりません'
+        }), 404
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('after') or '0'
+    after = int(last_event_id) if last_event_id.isdigit() else 0
+
+    def generate():
+        for event in service.iter_events(job_id, after=after, heartbeat=SSE_HEARTBEAT_SECONDS):
+            yield ': keep-alive\n\n' if event is None else event.to_sse()
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/edit-cell', methods=['POST'])
+def edit_cell():
+    """1セルの編集を検証し、その編集で増えた違反・解消した違反を返す
+
+    リクエスト: {"target": "input" | "output", "class": "1年1組", "day": "月", "period": 1,
+                 "subject": "数", "teacher": "梶永"}（subjectが空なら空きにする、teacherは省略可）
+    ファイルには保存しない（保存は /api/save-input）。
+    """
+    try:
+        from src.application.services.schedule_edit_service import CellEdit
+
+        data = request.get_json() or {}
+        edit = CellEdit.from_dict(data)
+        result = get_edit_session(data.get('target', 'input')).apply_edit(edit)
+        return jsonify(dict(result.to_dict(), success=True))
+    except (ValueError, KeyError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'編集内容が不正です: {e}'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/edit-violations', methods=['GET'])
+def edit_violations():
+    """編集中の時間割の現在の違反一覧を返す（?target=input|output）"""
+    try:
+        violations = get_edit_session(request.args.get('target', 'input')).get_violations()
+        return jsonify({
+            'success': True,
+            'violations': violations,
+            'violationCount': len(violations)
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,